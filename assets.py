@@ -0,0 +1,248 @@
+# ░░░  GMAT-Club Scraper – image asset store  ░░░
+#
+#   python assets.py results.jsonl localized.jsonl     # download + rewrite a result file
+#   python assets.py results.sqlite localized.jsonl --root ./assets -w 16
+#
+# GRAPHS and MSR results only carry `image_url`; the same chart is often
+# referenced from every MSR tab and from several topics.  AssetStore pulls
+# every referenced image once, over HttpFetcher's pooled, cookie-carrying
+# session (attachments under /download/file.php need the login), and keeps
+# it content-addressed.  Downloads from the site itself go through the
+# fetcher's limiter like every other request to it – a 429 or challenge on
+# an attachment slows the whole process down; other image hosts are not
+# paced:
+#
+#   <root>/index.sqlite          url → sha, ext, size  (or error, tries)
+#   <root>/blobs/ab/abcdef….png  one file per distinct image body
+#
+# localize() rewrites each `image_url` to the local file and keeps the
+# original under `image_src`.  Downloads are streamed to a .part file and
+# renamed into place, and the index is committed per image, so an
+# interrupted run resumes with what is missing.  scrape_many(assets=…)
+# runs it as a stage on finished pages.
+
+from __future__ import annotations
+import argparse, hashlib, logging, mimetypes, os, sqlite3, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import metrics
+from page_cache import DEFAULT_ROOT
+
+LOG = logging.getLogger("gmat.scraper.assets")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    url        TEXT PRIMARY KEY,
+    sha        TEXT,
+    ext        TEXT,
+    size       INTEGER,
+    fetched_at REAL,
+    tries      INTEGER NOT NULL DEFAULT 0,
+    error      TEXT
+);
+CREATE INDEX IF NOT EXISTS assets_sha ON assets(sha);
+"""
+_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".bmp")
+
+
+def image_urls(data: Any) -> Iterator[str]:
+    """Every `image_url` anywhere in a result (GRAPHS top level, MSR blocks)."""
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if k == "image_url" and isinstance(v, str) and v:
+                yield v
+            else:
+                yield from image_urls(v)
+    elif isinstance(data, list):
+        for v in data:
+            yield from image_urls(v)
+
+
+class AssetStore:
+    """Thread-safe, content-addressed image store; see module header."""
+
+    def __init__(self, root: Optional[Path] = None, *, http=None, workers: int = 8,
+                 max_tries: int = 3, max_bytes: int = 20 << 20,
+                 paced_hosts: Optional[Iterable[str]] = None):
+        from main_code import SITE, HttpFetcher
+        self.root = Path(root or DEFAULT_ROOT / "assets")
+        (self.root / "blobs").mkdir(parents=True, exist_ok=True)
+        self.workers, self.max_tries, self.max_bytes = workers, max_tries, max_bytes
+        self.paced_hosts = set(paced_hosts if paced_hosts is not None
+                               else [urlsplit(SITE).hostname])
+        self._own_http = http is None
+        self.http = http or HttpFetcher(pool_size=workers)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    # ─── blobs ──────────────────────────────────────────────────────
+    def _blob(self, sha: str, ext: str) -> Path:
+        return self.root / "blobs" / sha[:2] / f"{sha}{ext}"
+
+    def path(self, url: str) -> Optional[Path]:
+        """Local file of `url` if it was downloaded (and is still there)."""
+        with self._lock:
+            row = self._db.execute("SELECT sha, ext FROM assets WHERE url=? AND sha IS NOT NULL",
+                                   (url,)).fetchone()
+        if row is None:
+            return None
+        p = self._blob(*row)
+        return p if p.exists() else None
+
+    # ─── download ───────────────────────────────────────────────────
+    def _wanted(self, urls: Iterable[str]) -> List[str]:
+        """The URLs of `urls` not yet stored and not given up on."""
+        out = []
+        for url in dict.fromkeys(urls):
+            if not url.startswith(("http://", "https://")):
+                continue
+            with self._lock:
+                row = self._db.execute("SELECT sha, ext, tries FROM assets WHERE url=?",
+                                       (url,)).fetchone()
+            if row is None or (row[0] is None and row[2] < self.max_tries) \
+                    or (row[0] is not None and not self._blob(row[0], row[1]).exists()):
+                out.append(url)
+        return out
+
+    def _open(self, url: str):
+        """Streamed GET; paced by the fetcher's limiter for `paced_hosts`."""
+        if urlsplit(url).hostname in self.paced_hosts:
+            return self.http._get(url, stream=True)
+        return self.http.session.get(url, timeout=self.http.timeout, stream=True)
+
+    def _download(self, url: str) -> bool:
+        part = self.root / "blobs" / f".{threading.get_ident()}-{time.time_ns()}.part"
+        try:
+            with metrics.span("asset"):
+                with self._open(url) as r:
+                    metrics.inc("asset_responses_total", status=r.status_code)
+                    if r.status_code != 200:
+                        raise IOError(f"HTTP {r.status_code}")
+                    ctype = r.headers.get("Content-Type", "").split(";")[0].strip()
+                    if ctype and not ctype.startswith("image/"):
+                        raise IOError(f"not an image ({ctype})")
+                    h, size = hashlib.sha256(), 0
+                    with open(part, "wb") as f:
+                        for chunk in r.iter_content(1 << 16):
+                            size += len(chunk)
+                            if size > self.max_bytes:
+                                raise IOError(f"larger than {self.max_bytes} bytes")
+                            h.update(chunk)
+                            f.write(chunk)
+            sha, ext = h.hexdigest(), _ext(url, ctype)
+            blob = self._blob(sha, ext)
+            if blob.exists():
+                metrics.inc("assets_total", outcome="duplicate")
+                part.unlink()
+            else:
+                blob.parent.mkdir(exist_ok=True)
+                os.replace(part, blob)
+                metrics.inc("assets_total", outcome="stored")
+                metrics.inc("asset_bytes_total", size)
+            with self._lock, self._db:
+                self._db.execute("INSERT OR REPLACE INTO assets VALUES (?,?,?,?,?,0,NULL)",
+                                 (url, sha, ext, size, time.time()))
+            return True
+        except OSError as e:                        # requests' errors are OSErrors too
+            part.unlink(missing_ok=True)
+            metrics.inc("assets_total", outcome="failed")
+            LOG.info("assets: %s failed (%s)", url, e)
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT INTO assets (url, tries, error) VALUES (?,1,?) "
+                    "ON CONFLICT(url) DO UPDATE SET tries=tries+1, error=excluded.error",
+                    (url, str(e)))
+            return False
+
+    def fetch(self, urls: Iterable[str]) -> Dict[str, int]:
+        """Download every missing URL of `urls` concurrently; returns counts."""
+        todo = self._wanted(urls)
+        ok = 0
+        if todo:
+            with ThreadPoolExecutor(max_workers=self.workers) as ex:
+                ok = sum(ex.map(self._download, todo))
+        return {"downloaded": ok, "failed": len(todo) - ok}
+
+    # ─── rewrite ────────────────────────────────────────────────────
+    def localize(self, data: Any, base_url: str = "") -> Any:
+        """Point every `image_url` at its local file (original → `image_src`)."""
+        if isinstance(data, list):
+            return [self.localize(v, base_url) for v in data]
+        if not isinstance(data, dict):
+            return data
+        out = {k: self.localize(v, base_url) for k, v in data.items()}
+        src = data.get("image_url")
+        if isinstance(src, str) and src:
+            p = self.path(urljoin(base_url, src))
+            if p is not None:
+                out["image_src"], out["image_url"] = src, str(p)
+        return out
+
+    def stream(self, results: Iterable[Tuple[str, Any]], window: int = 32
+               ) -> Iterator[Tuple[str, Any]]:
+        """
+        (page url, result) pairs → the same with local image paths.  Images
+        of `window` results are fetched together, so charts shared between
+        pages in a window are one download.  Exceptions pass through.
+        """
+        buf: List[Tuple[str, Any]] = []
+
+        def flush():
+            urls = [urljoin(u, src) for u, d in buf if not isinstance(d, Exception)
+                    for src in image_urls(d)]
+            self.fetch(urls)
+            for u, d in buf:
+                yield u, d if isinstance(d, Exception) else self.localize(d, u)
+            buf.clear()
+
+        for item in results:
+            buf.append(item)
+            if len(buf) >= window:
+                yield from flush()
+        if buf:
+            yield from flush()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+        if self._own_http:
+            self.http.close()
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc): self.close()
+
+
+def _ext(url: str, ctype: str) -> str:
+    ext = os.path.splitext(urlsplit(url).path)[1].lower()
+    if ext in _EXTS:
+        return ext
+    guess = mimetypes.guess_extension(ctype) if ctype else None
+    return ".jpg" if guess == ".jpe" else (guess or ".img")
+
+
+# ─── CLI ────────────────────────────────────────────────────────────
+def main(argv=None):
+    from sinks import open_sink, read_results
+
+    ap = argparse.ArgumentParser(description="download result images and rewrite image_url")
+    ap.add_argument("results", help=".jsonl / .sqlite result sink")
+    ap.add_argument("out", help="sink for the rewritten results")
+    ap.add_argument("--root", type=Path, help="asset store (default: cache dir/assets)")
+    ap.add_argument("-w", "--workers", type=int, default=8)
+    a = ap.parse_args(argv)
+
+    with AssetStore(a.root, workers=a.workers) as store, open_sink(a.out) as sink:
+        counts = store.fetch(urljoin(u, src) for u, _, d in read_results(a.results)
+                             for src in image_urls(d))
+        for url, q, data in read_results(a.results):
+            sink.write(url, q, store.localize(data, url))
+    print(counts)
+    return 1 if counts["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
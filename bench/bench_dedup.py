@@ -0,0 +1,77 @@
+# ░░░  near-duplicate index benchmark  ░░░
+#
+#   python bench/bench_dedup.py                   # 100k stored questions, 2k lookups
+#   python bench/bench_dedup.py -n 300000 --db /tmp/dedup.sqlite
+#
+# Fills a DupIndex with synthetic CR-sized questions (random words from a
+# fixed vocabulary), then looks up lightly edited copies of stored ones
+# (must be found) and fresh questions (must not be).  Reports insert rate,
+# check() latency (signature + lookup, median / p99), recall and false
+# positives.  Exit status 1 if the p99 lookup exceeds --budget-ms.
+
+from __future__ import annotations
+import argparse, random, statistics, sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+from dedup import DupIndex, DuplicateQuestion, signature
+
+def question(rng: random.Random, vocab, words: int = 90) -> str:
+    stem = " ".join(rng.choice(vocab) for _ in range(words))
+    opts = "\n".join(f"{l}- " + " ".join(rng.choice(vocab) for _ in range(8)) for l in "ABCDE")
+    return f"{stem}\n{opts}"
+
+def edit(rng: random.Random, text: str) -> str:
+    """A re-post: other whitespace / case, a couple of words changed."""
+    words = text.split()
+    for _ in range(2):
+        words[rng.randrange(len(words))] = "typo"
+    return "  ".join(words).upper()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="near-duplicate index benchmark")
+    ap.add_argument("-n", type=int, default=100_000, help="questions stored")
+    ap.add_argument("-q", type=int, default=2_000, help="lookups of each kind")
+    ap.add_argument("--db", default=":memory:", help="index file (default: in memory)")
+    ap.add_argument("--budget-ms", type=float, default=1.0, help="p99 check() budget")
+    a = ap.parse_args(argv)
+
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(5000)]
+    idx = DupIndex(a.db)
+    stored = []
+    t0 = time.perf_counter()
+    for start in range(0, a.n, 1000):
+        chunk = [question(rng, vocab) for _ in range(start, min(a.n, start + 1000))]
+        idx.add_many((f"q{start + i}", signature(t), "cr") for i, t in enumerate(chunk))
+        stored += chunk[:a.q - len(stored)]
+    ins = time.perf_counter() - t0
+    print(f"stored {len(idx)} questions in {ins:.1f}s ({a.n / ins:,.0f}/s)")
+
+    lat, hits, fps = [], 0, 0
+    for i, text in enumerate(stored):
+        t = time.perf_counter()
+        try:
+            idx.check(f"copy{i}", edit(rng, text))
+        except DuplicateQuestion:
+            hits += 1
+        lat.append(time.perf_counter() - t)
+    for i in range(a.q):
+        text = question(rng, vocab)
+        t = time.perf_counter()
+        try:
+            idx.check(f"new{i}", text)
+        except DuplicateQuestion:
+            fps += 1
+        lat.append(time.perf_counter() - t)
+    lat.sort()
+    p50, p99 = statistics.median(lat) * 1e3, lat[int(len(lat) * 0.99)] * 1e3
+    print(f"check(): median {p50:.3f} ms, p99 {p99:.3f} ms")
+    print(f"recall {hits / len(stored):.1%} of edited copies, "
+          f"{fps} false positives in {a.q} fresh questions")
+    idx.close()
+    return 1 if p99 > a.budget_ms or hits < 0.95 * len(stored) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
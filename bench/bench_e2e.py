@@ -0,0 +1,211 @@
+# ░░░  end-to-end throughput benchmark  ░░░
+#
+#   python bench/bench_e2e.py                                  # HTTP path, 1/2/4/8 workers
+#   python bench/bench_e2e.py -c 1,4,16 --latency 150 --jitter 100 --error-rate 0.02
+#   python bench/bench_e2e.py --browser --cf-rate 0.1          # Chrome too, every type
+#   python bench/bench_e2e.py --json now.json --baseline last.json
+#
+# Starts bench/standin.py on a free port, points the scraper at it
+# (GMAT_SITE, a throw-away GMAT_COOKIE_FILE holding a session obtained
+# through the stand-in's login form) and pushes the same batch of topics
+# through every entry point at each concurrency level:
+#
+#   scrape        scrape() from a thread pool of c, sharing one HttpFetcher / DriverPool
+#   scrape_many   scrape_many(workers=c)
+#   pipeline      pipeline.Pipeline(workers=c).run()
+#
+# and reports pages per minute, p50 / p99 per-page latency (from the moment
+# the entry point pulled the job to the moment it yielded the result),
+# failure rate and what the server answered (429s, challenges, 5xx).  Every
+# run gets a fresh main_code.LIMITER at `--rate`, so a backoff in one run
+# does not slow the next.  Without --browser only CR / DS / PS topics are
+# used and a page the HTTP path declines (500, challenge) counts as a
+# failure as soon as no Chrome can be started.  --baseline exits 1 when a
+# run lost more than --tolerance of its pages/min or gained failures.
+
+from __future__ import annotations
+import argparse, json, logging, os, pickle, statistics, sys, tempfile, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+sys.path.insert(0, str(ROOT))
+from standin import add_fault_args, from_args
+
+EMAIL, PASSWORD = "bench@example.com", "bench"
+MODES = ("scrape", "scrape_many", "pipeline")
+_SERVER_KEYS = {"429": "429", "challenges": "cf", "500": "5xx"}
+
+
+# ─── setup ──────────────────────────────────────────────────────────
+def cookie_jar(base: str, path: Path) -> int:
+    """Log in through the stand-in's form; store the cookies as _save_cookies would."""
+    import requests
+    from urllib.parse import urlsplit
+    with requests.Session() as s:
+        s.post(f"{base}/forum/ucp.php?mode=login",
+               data={"username": EMAIL, "password": PASSWORD, "login": "Login"})
+        host = urlsplit(base).hostname
+        jar = [{"name": c.name, "value": c.value, "domain": host, "path": c.path or "/",
+                "secure": False, "expiry": c.expires} for c in s.cookies]
+    path.write_bytes(pickle.dumps(jar))
+    return len(jar)
+
+def _pct(xs, q: float) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, max(0, round(q * len(xs) + 0.5) - 1))]   # nearest rank
+
+
+# ─── one run ────────────────────────────────────────────────────────
+class _Clock:
+    """Wraps the jobs: notes when the entry point pulled each one."""
+
+    def __init__(self, jobs):
+        self.jobs, self.pulled = jobs, {}
+
+    def __iter__(self):
+        for url, q in self.jobs:
+            self.pulled[url] = time.perf_counter()
+            yield url, q
+
+def run(mode: str, conc: int, jobs, a) -> dict:
+    import main_code
+    from main_code import DriverPool, HttpFetcher, QuestionType, scrape, scrape_many
+    from pipeline import Pipeline
+    from throttle import RateLimiter
+
+    main_code.LIMITER = RateLimiter(a.rate, burst=max(2, conc), max_rate=max(a.rate, 4 * a.rate),
+                                    base_backoff=a.backoff)
+    http_first = not a.no_http
+    clock, lat, errors = _Clock(jobs), [], {}
+    lock = threading.Lock()
+
+    def done(url, result):
+        dt = time.perf_counter() - clock.pulled[url]
+        with lock:
+            lat.append(dt)
+            if isinstance(result, Exception):
+                errors[type(result).__name__] = errors.get(type(result).__name__, 0) + 1
+
+    t0 = time.perf_counter()
+    if mode == "scrape":
+        pool = DriverPool(conc, email=EMAIL, password=PASSWORD, headless=not a.show)
+        http = HttpFetcher(pool_size=conc) if http_first else None
+
+        def one(url, q):
+            clock.pulled[url] = time.perf_counter()      # the call itself, not the queue
+            try:
+                data = scrape(url=url, q_type=QuestionType(q), email=EMAIL, password=PASSWORD,
+                              pool=pool, http=http, snapshot=True, retries=a.retries)
+            except Exception as e:
+                data = e
+            done(url, data)
+        try:
+            with ThreadPoolExecutor(max_workers=conc) as ex:
+                for f in [ex.submit(one, u, q) for u, q in jobs]:
+                    f.result()
+        finally:
+            pool.close()
+            if http is not None:
+                http.close()
+    elif mode == "scrape_many":
+        for url, data in scrape_many(clock, email=EMAIL, password=PASSWORD, workers=conc,
+                                     headless=not a.show, retries=a.retries, snapshot=True,
+                                     http_first=http_first):
+            done(url, data)
+    else:
+        with Pipeline(email=EMAIL, password=PASSWORD, workers=conc, parsers=a.parsers,
+                      headless=not a.show, retries=a.retries, http_first=http_first) as pipe:
+            for url, data in pipe.run(clock):
+                done(url, data)
+    wall = time.perf_counter() - t0
+
+    failed = sum(errors.values())
+    return {"pages": len(lat), "ok": len(lat) - failed, "wall_s": round(wall, 3),
+            "pages_per_min": round((len(lat) - failed) * 60 / wall, 1) if wall else 0.0,
+            "p50_s": round(_pct(lat, 0.50), 3), "p99_s": round(_pct(lat, 0.99), 3),
+            "mean_s": round(statistics.fmean(lat), 3) if lat else 0.0,
+            "fail_rate": round(failed / len(lat), 4) if lat else 0.0, "errors": errors}
+
+
+# ─── report ─────────────────────────────────────────────────────────
+def regressions(results: dict, baseline: dict, tolerance: float):
+    for mode, by_c in results.items():
+        for c, r in by_c.items():
+            old = baseline.get(mode, {}).get(c)
+            if old is None:
+                continue
+            if r["pages_per_min"] < old["pages_per_min"] * (1 - tolerance):
+                yield f"{mode} c={c}: {r['pages_per_min']} pages/min (was {old['pages_per_min']})"
+            if r["fail_rate"] > old["fail_rate"] + 0.01:
+                yield f"{mode} c={c}: {r['fail_rate']:.1%} failed (was {old['fail_rate']:.1%})"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="end-to-end throughput benchmark")
+    ap.add_argument("-c", "--concurrency", default="1,2,4,8",
+                    help="comma-separated worker counts")
+    ap.add_argument("-n", "--topics", type=int, default=60, help="topics per run")
+    ap.add_argument("--modes", default=",".join(MODES), help=f"subset of {','.join(MODES)}")
+    ap.add_argument("--browser", action="store_true", help="every question type; Chrome allowed")
+    ap.add_argument("--no-http", action="store_true", help="Chrome only (implies --browser)")
+    ap.add_argument("--show", action="store_true", help="visible browsers")
+    ap.add_argument("-v", "--verbose", action="store_true", help="keep the scraper's log")
+    ap.add_argument("--rate", type=float, default=50.0, help="LIMITER req/s per host")
+    ap.add_argument("--backoff", type=float, default=1.0, help="LIMITER base backoff, s")
+    ap.add_argument("--retries", type=int, default=1)
+    ap.add_argument("--parsers", type=int, default=2, help="Pipeline parse threads")
+    ap.add_argument("--json", type=Path, help="also write results here")
+    ap.add_argument("--baseline", type=Path, help="earlier --json to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="pages/min drop vs. --baseline that counts as a regression")
+    add_fault_args(ap)
+    a = ap.parse_args(argv)
+    a.browser = a.browser or a.no_http
+    levels = [int(c) for c in a.concurrency.split(",") if c.strip()]
+    modes = [m for m in a.modes.split(",") if m in MODES]
+
+    si = from_args(a)
+    base = si.start()
+    tmp = Path(tempfile.mkdtemp(prefix="bench_e2e_"))
+    os.environ["GMAT_SITE"] = base                 # read when main_code is imported
+    os.environ["GMAT_COOKIE_FILE"] = str(tmp / "cookies.pkl")
+    cookie_jar(base, tmp / "cookies.pkl")
+    import main_code                               # noqa: F401 – after the environment
+    if not a.verbose:                              # injected faults would flood stderr
+        logging.getLogger("gmat.scraper").setLevel(logging.CRITICAL)
+    jobs = si.topics(a.topics, None if a.browser else ["cr", "ds", "ps"])
+
+    results: dict = {}
+    print(f"{len(jobs)} topics from {base}  latency {a.latency:.0f}+{a.jitter:.0f} ms  "
+          f"errors {a.error_rate:.1%}  cf {a.cf_rate:.1%}")
+    print(f"{'mode':<12} {'c':>3} {'pages':>6} {'fail':>6} {'pages/min':>10} "
+          f"{'p50 s':>7} {'p99 s':>7} {'429':>5} {'cf':>4} {'5xx':>4}")
+    try:
+        for mode in modes:
+            for c in levels:
+                before = si.stats()
+                r = run(mode, c, jobs, a)
+                after = si.stats()
+                r["server"] = {k: after.get(s, 0) - before.get(s, 0)
+                               for s, k in _SERVER_KEYS.items()}
+                results.setdefault(mode, {})[str(c)] = r
+                print(f"{mode:<12} {c:>3} {r['pages']:>6} {r['fail_rate']:>6.1%} "
+                      f"{r['pages_per_min']:>10.1f} {r['p50_s']:>7.3f} {r['p99_s']:>7.3f} "
+                      f"{r['server']['429']:>5} {r['server']['cf']:>4} {r['server']['5xx']:>4}")
+    finally:
+        si.close()
+
+    if a.json:
+        a.json.write_text(json.dumps(results, indent=2))
+    if a.baseline:
+        worse = list(regressions(results, json.loads(a.baseline.read_text()), a.tolerance))
+        for w in worse:
+            print("REGRESSION", w)
+        return 1 if worse else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# ░░░  cold-import benchmark  ░░░
+#
+#   python bench/bench_import.py                  # main_code + satellites, 7 runs each
+#   python bench/bench_import.py -n 15 --budget-ms 200
+#   python bench/bench_import.py --top 15         # also list the slowest imports
+#
+# Every run is a fresh interpreter, so nothing is warm in sys.modules (the
+# OS file cache is, which is what a worker restart sees too).  For each
+# module it reports the median / max import time and checks the import is
+# side-effect free: no subprocess started (the old Chrome probe), and none
+# of the browser / network / OpenAI stacks pulled in.  Exit status 1 when a
+# check fails or main_code's median exceeds the budget.
+
+from __future__ import annotations
+import argparse, json, statistics, subprocess, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = ("main_code", "textproc", "page_cache", "metrics", "polish", "crawler", "sinks")
+HEAVY   = ("selenium", "undetected_chromedriver", "openai", "requests")
+
+_CHILD = r"""
+import json, subprocess, sys, time
+spawned = []
+_init = subprocess.Popen.__init__
+def _spy(self, *a, **k):
+    spawned.append(str(a[0] if a else k.get("args"))[:80])
+    _init(self, *a, **k)
+subprocess.Popen.__init__ = _spy
+t0 = time.perf_counter()
+__import__(sys.argv[1])
+dt = time.perf_counter() - t0
+print(json.dumps({"s": dt, "spawned": spawned,
+                  "heavy": [m for m in json.loads(sys.argv[2]) if m in sys.modules]}))
+"""
+
+def run_once(mod: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", _CHILD, mod, json.dumps(HEAVY)],
+                         cwd=ROOT, capture_output=True, text=True)
+    if out.returncode:
+        raise SystemExit(f"import {mod} failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def top_imports(mod: str, k: int):
+    """Slowest entries of `python -X importtime` (cumulative µs)."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {mod}"],
+                         cwd=ROOT, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            self_us, cum_us, name = line[len("import time:"):].split("|")
+            rows.append((int(cum_us), int(self_us), name.rstrip()))
+    return sorted(rows, reverse=True)[:k]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="cold-import benchmark")
+    ap.add_argument("-n", type=int, default=7, help="fresh interpreters per module")
+    ap.add_argument("--budget-ms", type=float, default=250.0,
+                    help="fail if main_code's median import exceeds this")
+    ap.add_argument("--top", type=int, default=0, help="show the N slowest imports of main_code")
+    ap.add_argument("--json", type=Path, help="also write results here")
+    a = ap.parse_args(argv)
+
+    results, failed = [], []
+    print(f"{'module':<12} {'med ms':>8} {'max ms':>8}  side effects")
+    for mod in MODULES:
+        runs = [run_once(mod) for _ in range(a.n)]
+        times = [r["s"] * 1e3 for r in runs]
+        spawned = sorted({p for r in runs for p in r["spawned"]})
+        heavy = sorted({m for r in runs for m in r["heavy"]})
+        med = statistics.median(times)
+        notes = ([f"spawned {', '.join(spawned)}"] if spawned else []) + \
+                ([f"loaded {', '.join(heavy)}"] if heavy else [])
+        print(f"{mod:<12} {med:8.1f} {max(times):8.1f}  {'; '.join(notes) or 'none'}")
+        results.append({"module": mod, "median_ms": med, "max_ms": max(times),
+                        "spawned": spawned, "heavy": heavy})
+        if notes:
+            failed.append(mod)
+        if mod == "main_code" and med > a.budget_ms:
+            print(f"main_code import {med:.1f} ms > budget {a.budget_ms:.0f} ms")
+            failed.append(mod)
+
+    if a.top:
+        print("\nslowest imports under main_code (ms, cumulative / self):")
+        for cum, own, name in top_imports("main_code", a.top):
+            print(f"  {cum / 1e3:8.1f} {own / 1e3:8.1f}  {name}")
+    if a.json:
+        a.json.write_text(json.dumps(results, indent=2))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# ░░░  lean-browsing benchmark  ░░░
+#
+#   python bench/bench_lean.py manifest.csv                # full vs lean vs lean+no-css
+#   python bench/bench_lean.py manifest.csv -n 3 --show    # 3 loads per page, visible
+#   python bench/bench_lean.py manifest.csv --json out.json
+#
+# Loads every (url, type) of the manifest (csv / tsv / jsonl, as for the
+# orchestrator) once per mode in a fresh browser – logged in when
+# GMAT_EMAIL / GMAT_PASSWORD are set – and reports per question type the
+# median time drv.get() blocked, DOMContentLoaded, bytes transferred and
+# resources fetched, plus the saving against the full page.  Bytes come
+# from the Resource Timing API, which reports 0 for cross-origin responses
+# without Timing-Allow-Origin, so the "full" column (and so the saving)
+# is a lower bound.  Needs Chrome; nothing is parsed.
+
+from __future__ import annotations
+import argparse, json, os, statistics, sys, time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+from main_code import _ensure_login, _quit_quietly, _new_driver, _wait_ready, page_stats
+from orchestrator import read_manifest
+
+MODES = {"full": (False, False), "lean": (True, False), "lean+no-css": (True, True)}
+
+def run_mode(jobs, lean: bool, block_css: bool, n: int, headless: bool):
+    drv = _new_driver(headless, lean, block_css)
+    try:
+        email, pw = os.getenv("GMAT_EMAIL"), os.getenv("GMAT_PASSWORD")
+        if email and pw:
+            _ensure_login(drv, email, pw)
+        rows = []
+        for url, q in jobs:
+            for _ in range(n):
+                t0 = time.perf_counter()
+                drv.get(url)
+                get_s = time.perf_counter() - t0
+                _wait_ready(drv)
+                rows.append({"type": q or "?", "get_s": get_s, **page_stats(drv)})
+        return rows
+    finally:
+        _quit_quietly(drv)
+
+def summarise(rows):
+    by_type = defaultdict(list)
+    for r in rows:
+        by_type[r["type"]].append(r)
+    med = lambda rs, k: statistics.median(r[k] for r in rs)
+    return {t: {"pages": len(rs), "get_s": med(rs, "get_s"), "ready_s": med(rs, "ready_s"),
+                "kb": med(rs, "bytes") / 1024, "resources": med(rs, "resources")}
+            for t, rs in sorted(by_type.items())}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="lean-browsing benchmark")
+    ap.add_argument("manifest")
+    ap.add_argument("-n", type=int, default=1, help="loads per page and mode")
+    ap.add_argument("--show", action="store_true", help="visible browser")
+    ap.add_argument("--json", type=Path, help="also write results here")
+    a = ap.parse_args(argv)
+
+    jobs = list(read_manifest(a.manifest))
+    results = {mode: summarise(run_mode(jobs, lean, css, a.n, not a.show))
+               for mode, (lean, css) in MODES.items()}
+
+    print(f"{'type':<6} {'mode':<12} {'get s':>7} {'DCL s':>7} {'KB':>8} {'res':>5}  saving")
+    for t, full in results["full"].items():
+        for mode in MODES:
+            s = results[mode].get(t)
+            if s is None:
+                continue
+            save = "" if mode == "full" else \
+                f"{1 - s['get_s'] / full['get_s']:6.1%} time  " \
+                f"{1 - s['kb'] / full['kb'] if full['kb'] else 0:6.1%} bytes"
+            print(f"{t:<6} {mode:<12} {s['get_s']:7.2f} {s['ready_s']:7.2f} "
+                  f"{s['kb']:8.0f} {s['resources']:5.0f}  {save}")
+    if a.json:
+        a.json.write_text(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
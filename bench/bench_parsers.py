@@ -0,0 +1,101 @@
+# ░░░  offline parser benchmark  ░░░
+#
+#   python bench/bench_parsers.py                 # all fixtures, check + time
+#   python bench/bench_parsers.py -k msr -n 200   # only MSR, 200 iterations
+#   python bench/bench_parsers.py --update        # rewrite *.expected.json
+#   python bench/bench_parsers.py --json out.json # machine-readable results
+#
+# Runs every SNAPSHOT_PARSERS entry over the saved pages in bench/fixtures/
+# (no browser, no network) and reports per-fixture latency (median / p95),
+# allocations (tracemalloc peak + blocks for one parse) and throughput.
+# Each result is compared with <fixture>.expected.json first – a faster
+# parser that changes output fails the run (exit status 1), and so does a
+# fixture that detect_type() files under the wrong QuestionType.
+
+from __future__ import annotations
+import argparse, json, statistics, sys, time, tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+from main_code import QuestionType, SNAPSHOT_PARSERS, detect_type, parse_html
+
+FIXTURES = ROOT / "fixtures"
+
+def fixtures(pattern: str = ""):
+    for q in QuestionType:
+        for html in sorted((FIXTURES / q.value).glob("*.html")):
+            name = f"{q.value}/{html.stem}"
+            if pattern in name:
+                yield name, q, html
+
+def _alloc(html: str, q: QuestionType):
+    tracemalloc.start()
+    try:
+        parse_html(html, q)
+        snap = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(s.count for s in snap.statistics("filename"))
+    return peak, blocks
+
+def bench_one(name: str, q: QuestionType, path: Path, n: int, update: bool) -> dict:
+    html = path.read_text(encoding="utf-8")
+    exp_path = path.with_suffix(".expected.json")
+    got = parse_html(html, q)
+    if update:
+        exp_path.write_text(json.dumps(got, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        ok = True
+    else:
+        ok = exp_path.exists() and json.loads(exp_path.read_text(encoding="utf-8")) == got
+
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        parse_html(html, q)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    peak, blocks = _alloc(html, q)
+    found, conf = detect_type(html)
+    med = statistics.median(times)
+    return {
+        "fixture": name, "q_type": q.value, "ok": ok, "bytes": len(html.encode()),
+        "detected": found.value if found else None, "confidence": conf,
+        "n": n, "median_ms": med * 1e3, "p95_ms": times[int(.95 * (n - 1))] * 1e3,
+        "pages_per_s": 1 / med, "mb_per_s": len(html.encode()) / med / 2**20,
+        "peak_kib": peak / 1024, "alloc_blocks": blocks,
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="offline parser benchmark")
+    ap.add_argument("-k", default="", help="only fixtures whose name contains this")
+    ap.add_argument("-n", type=int, default=50, help="timed iterations per fixture")
+    ap.add_argument("--update", action="store_true", help="rewrite expected outputs")
+    ap.add_argument("--json", type=Path, help="also write results here")
+    a = ap.parse_args(argv)
+
+    missing = [q.value for q in SNAPSHOT_PARSERS if not any(fixtures(q.value + "/"))]
+    if missing:
+        print("no fixtures for:", ", ".join(missing))
+
+    results = [bench_one(name, q, p, a.n, a.update) for name, q, p in fixtures(a.k)]
+    print(f"{'fixture':<16} {'ok':>3} {'KiB':>6} {'med ms':>8} {'p95 ms':>8} "
+          f"{'pages/s':>8} {'MiB/s':>6} {'peak KiB':>9} {'blocks':>7}  detected")
+    for r in results:
+        print(f"{r['fixture']:<16} {'✓' if r['ok'] else '✗':>3} {r['bytes'] / 1024:6.1f} "
+              f"{r['median_ms']:8.2f} {r['p95_ms']:8.2f} {r['pages_per_s']:8.0f} "
+              f"{r['mb_per_s']:6.2f} {r['peak_kib']:9.0f} {r['alloc_blocks']:7d}  "
+              f"{r['detected'] or '-'} ({r['confidence']:.2f})")
+    if a.json:
+        a.json.write_text(json.dumps(results, indent=2))
+    bad = [r["fixture"] for r in results if not r["ok"]]
+    if bad:
+        print("output mismatch:", ", ".join(bad))
+    wrong = [r["fixture"] for r in results if r["detected"] != r["q_type"]]
+    if wrong:
+        print("type detected wrongly:", ", ".join(wrong))
+    return 1 if bad or wrong or missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+# ░░░  textproc micro-benchmarks  ░░░
+#
+#   python bench/bench_textproc.py [--n 20000] [--processes 4]
+#
+# Times each textproc helper against the per-call-compiled originals it
+# replaced (copied below as legacy_*), on a synthetic corpus of DS/PS/CR-style
+# post bodies – with the blank, tab and nbsp runs real posts have – and checks
+# that the outputs agree.  legacy_basic_clean was effectively a no-op (its \\s
+# was escaped), so clean() is timed against regex_clean, the per-line re.sub
+# it was meant to be, and the extract row and the parity checks use
+# legacy_extract with that clean swapped in.
+
+from __future__ import annotations
+import argparse, random, re, sys, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import textproc as tp
+
+# ─── the originals (main_code.py before textproc) ──────────────────
+def legacy_basic_clean(t:str)->str: return re.sub(r"\\s+"," ", t.replace("\\r"," ").replace("\\n"," ")).strip()
+
+def regex_clean(t: str) -> str:
+    """What legacy_basic_clean meant to do, keeping the line breaks clean() keeps."""
+    return "\n".join(re.sub(r"\s+", " ", ln).strip() for ln in t.splitlines()).strip()
+
+def legacy_split_opts(raw: str) -> tuple[str, dict[str, str]]:
+    pattern = r"""
+        (?:^|\n|\r)            # start of line
+        [\s\(\[]*              # optional whitespace / opening bracket
+        (?P<lbl>[A-E])         # capture A-E
+        [\)\].\-–:]?           # closing ) ] . : - –
+        \s+                    # at least one space before the real text
+    """
+    matches = list(re.finditer(pattern, raw, re.I | re.VERBOSE))
+    if not matches:
+        return raw.strip(), {}
+    stem = raw[: matches[0].start()].strip()
+    opts = {}
+    for i, m in enumerate(matches):
+        start = m.end()
+        end   = matches[i + 1].start() if i + 1 < len(matches) else len(raw)
+        opts[m.group("lbl").upper()] = raw[start:end].strip()
+    return stem, opts
+
+def legacy_clean_opt(txt: str) -> str:
+    cut_marks = [r"\nShow\s*Answer", r"\n[_]{5,}", r"\nNew to the GMAT Club\?"]
+    for mark in cut_marks:
+        m = re.search(mark, txt, flags=re.I)
+        if m:
+            txt = txt[: m.start()]
+            break
+    return txt.strip()
+
+def legacy_split_opts_cr(raw: str):
+    parts = re.split(r"(?m)^[A-Ea-e]-\s*", raw.strip())
+    if len(parts) == 1:
+        return raw.strip(), {}
+    stem = parts[0].strip()
+    choices = parts[1:]
+    letters = list("ABCDE")[: len(choices)]
+    return stem, {ltr: txt.strip() for ltr, txt in zip(letters, choices)}
+
+_LEGACY_OA_RE = re.compile(r"\b(?:OA|Answer|Correct)[\s\:\-\–]*([A-E])\b", re.I)
+
+def legacy_first_choice(txt: str) -> str:
+    m = _LEGACY_OA_RE.search(txt)
+    if not m:
+        m = re.search(r"\b([A-E])\b", txt)
+    return m.group(1).upper() if m else ""
+
+def legacy_extract(raw: str, cr: bool = False, clean=legacy_basic_clean):
+    if cr:
+        raw = re.split(r"Show\s+Spoiler", raw, 1)[0]
+    raw = clean(raw)
+    if cr:
+        stem, opts = legacy_split_opts_cr(raw)
+        if opts:
+            return stem, opts
+    stem, opts = legacy_split_opts(raw)
+    return stem, {k: legacy_clean_opt(v) for k, v in opts.items()}
+
+# ─── synthetic corpus ──────────────────────────────────────────────
+_WORDS = ("the manager argues that revenue rose because costs fell while demand "
+          "for premium units x y 12 percent stayed flat over three quarters").split()
+
+_GAPS = (" ",) * 12 + ("  ", "   ", "\t", " \xa0", "\xa0\xa0", " \t ")
+
+def _sentence(rng: random.Random, n: int) -> str:
+    words = [rng.choice(_WORDS) for _ in range(n)]
+    return "".join(w + rng.choice(_GAPS) for w in words[:-1]).capitalize() + words[-1] + "."
+
+def _pad(rng: random.Random, line: str) -> str:
+    """Leading / trailing blanks as copy-pasted posts have them."""
+    return rng.choice(("", "", " ", "\xa0 ", "\t")) + line + rng.choice(("", "", "  ", "\xa0", " \r"))
+
+def make_corpus(n: int, seed: int = 7) -> list[tuple[str, bool]]:
+    rng, out = random.Random(seed), []
+    for i in range(n):
+        cr = i % 3 == 0
+        stem = "\n".join(_pad(rng, _sentence(rng, rng.randint(8, 30)))
+                         for _ in range(rng.randint(1, 4)))
+        style = "{}- " if cr else rng.choice(["({}) ", "{}) ", "{}. ", "({})\xa0 "])
+        opts = "\n".join(_pad(rng, style.format(l) + _sentence(rng, rng.randint(3, 12)))
+                         for l in "ABCDE")
+        tail = rng.choice(["", "\nShow Answer\nHide", "\n______\nNew to the GMAT Club?"])
+        if cr:
+            tail += "\nShow Spoiler\nOA: C"
+        out.append((stem + "\n" + opts + tail, cr))
+    return out
+
+# ─── runner ────────────────────────────────────────────────────────
+def _time(fn, items, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for it in items:
+            fn(*it)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--processes", type=int, default=0, help="also time extract_many()")
+    a = ap.parse_args(argv)
+
+    corpus = make_corpus(a.n)
+    raws   = [(r,) for r, _ in corpus]
+    spoils = [("Show Spoiler\nOA: " + "ABCDE"[i % 5] + " because …",) for i in range(a.n)]
+    cleaned = [(tp.clean(r),) for r, _ in corpus]
+
+    runs = re.compile(r"[ \t\xa0]{2,}|\xa0")
+    blank = sum(bool(runs.search(r)) for r, _ in corpus)
+    bad_clean = sum(tp.clean(r) != regex_clean(r) for r, _ in corpus)
+    mismatches = sum(legacy_extract(r, cr, regex_clean) != tp.extract(r, cr=cr)
+                     for r, cr in corpus)
+
+    rows = [
+        ("clean",        regex_clean,          tp.clean,        raws),
+        ("split_opts",   legacy_split_opts,    tp.split_opts,   cleaned),
+        ("split_opts_cr",legacy_split_opts_cr, tp.split_opts_cr, cleaned),
+        ("clean_opt",    legacy_clean_opt,     tp.clean_opt,    raws),
+        ("first_choice", legacy_first_choice,  tp.first_choice, spoils),
+        ("extract",      lambda r, cr: legacy_extract(r, cr, regex_clean),
+                         lambda r, cr: tp.extract(r, cr=cr), corpus),
+    ]
+    print(f"{'helper':<14} {'legacy ms':>10} {'textproc ms':>12} {'speed-up':>9}"
+          f"   (clean: vs regex_clean)")
+    for name, old, new, items in rows:
+        t_old, t_new = _time(old, items), _time(new, items)
+        print(f"{name:<14} {t_old*1e3:10.1f} {t_new*1e3:12.1f} {t_old/t_new:8.2f}x")
+
+    if a.processes > 1:
+        t0 = time.perf_counter()
+        sum(1 for _ in tp.extract_many((r for r, _ in corpus), processes=a.processes))
+        print(f"extract_many({a.processes} procs): {(time.perf_counter()-t0)*1e3:.1f} ms")
+
+    print(f"bodies with blank / nbsp runs: {blank}/{a.n}")
+    print(f"clean() outputs differing from regex_clean: {bad_clean}/{a.n}")
+    print(f"extract() outputs differing from legacy (regex_clean): {mismatches}/{a.n}")
+    return 1 if bad_clean or mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# ░░░  build the offline parser fixtures  ░░░
+#
+#   python bench/make_fixtures.py            # (re)writes bench/fixtures/*/*.html
+#
+# Pages are modelled on saved GMAT Club topics (phpBB post body, spoiler
+# answer-blocks, DI tables / tabs / drop-downs) with the text replaced.  The
+# "large" variants stress the parsers: a long multi-question RC passage and a
+# TABLES page with hundreds of rows.  Output is deterministic.
+
+from __future__ import annotations
+import random
+from pathlib import Path
+
+OUT = Path(__file__).resolve().parent / "fixtures"
+
+_WORDS = ("analysts noted that regional output expanded although the council argued "
+          "that subsidies distorted prices and smaller firms reported weaker margins "
+          "during the period while exports to neighbouring markets stabilised").split()
+
+def _s(rng: random.Random, lo: int = 8, hi: int = 24) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(lo, hi))).capitalize() + "."
+
+def _page(body: str, extra: str = "") -> str:
+    return f"""<!DOCTYPE html>
+<html><head><title>GMAT Club Forum</title>
+<script>var _gaq = _gaq || [];</script><style>.downRow{{display:none}}</style></head>
+<body><div id="page-body"><div class="post bg2"><div class="inner">
+<div class="postbody"><div class="content">
+<div class="item text">{body}</div>
+{extra}
+</div></div>
+<div class="tags"><a class="tag_css_link" href="#">Sub 605 Level</a></div>
+</div></div></div>
+<div class="footer">New to the GMAT Club? Sign up</div></body></html>
+"""
+
+def _spoiler(inner: str) -> str:
+    return f"""<div class="answer-block"><div class="upRow">
+<a class="btn-show-answer" href="#">Show Spoiler</a></div>
+<div class="downRow" style="display:none">{inner}</div></div>"""
+
+# ─── one builder per QuestionType ─────────────────────────────────
+def cr(rng):
+    opts = "".join(f"{l}- {_s(rng, 5, 14)}<br>\n" for l in "ABCDE")
+    body = (f"{_s(rng)} {_s(rng)}<br>\n{_s(rng)}<br><br>\n"
+            f"Which of the following most weakens the argument above?<br><br>\n{opts}"
+            + _spoiler("OA: D"))
+    return _page(body)
+
+def ds(rng):
+    body = ("Is the integer x divisible by 6?<br><br>\n"
+            "(1) x is divisible by 3<br>\n(2) x is divisible by 4<br><br>\n"
+            "(A) Statement (1) ALONE is sufficient, but statement (2) alone is not sufficient.<br>\n"
+            "(B) Statement (2) ALONE is sufficient, but statement (1) alone is not sufficient.<br>\n"
+            "(C) BOTH statements TOGETHER are sufficient, but NEITHER statement ALONE is sufficient.<br>\n"
+            "(D) EACH statement ALONE is sufficient.<br>\n"
+            "(E) Statements (1) and (2) TOGETHER are not sufficient.<br>\n"
+            "Show Answer<br>\n" + _spoiler("Official Answer: C"))
+    return _page(body)
+
+def ps(rng):
+    opts = "".join(f"({l}) {v}<br>\n" for l, v in zip("ABCDE", ("12", "18", "24", "30", "36")))
+    body = (f"If a train covers 360 km in 4 hours, what is its speed in m/s?<br><br>\n{opts}"
+            "<br>\n______________<br>\n" + _spoiler("Answer: C"))
+    return _page(body)
+
+def rc(rng, n_par: int = 3, n_q: int = 3):
+    passage = "<br><br>\n".join(" ".join(_s(rng) for _ in range(6)) for _ in range(n_par))
+    qs = []
+    for i in range(n_q):
+        qs.append(f'<div id="rc_timer_placeholder_{i}">00:00</div>'
+                  f'<span style="font-weight: bold">{i + 1}. {_s(rng, 8, 16)[:-1]}?</span>\n'
+                  + "\n".join(f"({l}) {_s(rng, 5, 12)}" for l in "ABCDE") + "\n<br>")
+    body = (f'<div class="bbcodeBoxOut"><div class="bbcodeBoxIn">{passage}</div>'
+            f'<div class="bbcodeBoxIn">{"".join(qs)}</div></div>')
+    extra = "\n".join(_spoiler(f"OA: {'ABCDE'[rng.randrange(5)]}") for _ in range(n_q))
+    return _page(body, extra)
+
+def _di_row(cls_yes: str, cls_no: str, text: str) -> str:
+    return (f'<tr><td class="{cls_yes}"><input type="radio"></td>'
+            f'<td class="{cls_no}"><input type="radio"></td><td>{text}</td></tr>')
+
+def _grid(rng, n: int, head=("Yes", "No")) -> str:
+    rows = []
+    for _ in range(n):
+        yes = rng.random() < .5
+        rows.append(_di_row("official_answer" if yes else "", "" if yes else "official_answer",
+                            _s(rng, 6, 14)))
+    return (f'<table class="stoker di"><tr><td>{head[0]}</td><td>{head[1]}</td><td></td></tr>'
+            + "".join(rows) + "</table>")
+
+def tpa(rng):
+    rows = [_s(rng, 2, 5)[:-1] for _ in range(5)]
+    grid = ('<table class="stoker di"><tr><td>Strengthen</td><td>Weaken</td><td></td></tr>'
+            + "".join(_di_row("", "", r) for r in rows) + "</table>")
+    body = f"{_s(rng)} {_s(rng)}<br><br>\n{grid}"
+    return _page(body, _spoiler(f"1 : {rows[1]}<br>2 : {rows[3]}"))
+
+def graphs(rng):
+    sels = []
+    for i in range(2):
+        opts = "".join(f'<option value="{l}">{v}</option>'
+                       for l, v in zip("ABCD", ("10%", "25%", "40%", "55%")))
+        sels.append(f'The share in region {i + 1} is closest to '
+                    f'<select class="di_graph_dropdown"><option value="">Select...</option>{opts}</select><br>')
+    body = (f'{_s(rng)}<br><img class="reimg" src="https://gmatclub.com/forum/download/file.php?id=1234"><br>'
+            + "\n".join(sels))
+    return _page(body, _spoiler("Drop-down 1: B<br>Drop-down 2: D"))
+
+def tables(rng, n_rows: int = 12):
+    headers = ["Country", "Exports", "Imports", "Growth", "Rank"]
+    rows = "".join(
+        "<tr>" + "".join(f"<td>{c}</td>" for c in (
+            f"C{r:03d}", rng.randint(100, 999), rng.randint(100, 999),
+            f"{rng.uniform(-5, 9):.1f}", r + 1)) + "</tr>"
+        for r in range(n_rows))
+    tbl = ('<table class="stoker table-sortable"><tr>' + "".join(f"<th>{h}</th>" for h in headers)
+           + f"</tr>{rows}</table>")
+    body = f"{_s(rng)}<br>\n{tbl}<br>\nFor each statement select Yes or No.<br>\n{_grid(rng, 3)}"
+    return _page(body)
+
+def msr(rng):
+    tabs = "".join(f'<button class="tablinks_di_ms">Source {i}</button>' for i in (1, 2, 3))
+    panes = "".join(
+        f'<div class="tabcontent_di_ms"><div class="item text">{_s(rng)} {_s(rng)}'
+        + ('<img class="reimg" src="https://gmatclub.com/forum/download/file.php?id=99">' if i == 2 else "")
+        + "</div></div>" for i in (1, 2, 3))
+    mcq_rows = "".join(
+        f'<tr><td class="{"official_answer" if l == "C" else ""}"><input type="radio"></td>'
+        f"<td>{_s(rng, 4, 8)}</td></tr>" for l in "ABCDE")
+    right = ('<div class="tabcontent_di_ms_right">'
+             + _grid(rng, 3)
+             + _grid(rng, 3, ("Yes – Positive Impact", "No – No Clear Impact"))
+             + f'<table class="stoker di"><tr><td></td><td>Which is best?</td></tr>{mcq_rows}</table>'
+             + "</div>")
+    body = f'<div class="tab_di_ms_wrapper">{tabs}{panes}</div>{right}'
+    return _page(body)
+
+CASES = {
+    "cr":     {"basic": cr},
+    "ds":     {"basic": ds},
+    "ps":     {"basic": ps},
+    "rc":     {"basic": rc, "large": lambda rng: rc(rng, n_par=40, n_q=8)},
+    "tpa":    {"basic": tpa},
+    "graphs": {"basic": graphs},
+    "tables": {"basic": tables, "large": lambda rng: tables(rng, n_rows=600)},
+    "msr":    {"basic": msr},
+}
+
+def main():
+    for q, builders in CASES.items():
+        (OUT / q).mkdir(parents=True, exist_ok=True)
+        for name, build in builders.items():
+            html = build(random.Random(f"{q}/{name}"))
+            (OUT / q / f"{name}.html").write_text(html, encoding="utf-8")
+            print(f"wrote {q}/{name}.html  ({len(html) // 1024} KiB)")
+
+if __name__ == "__main__":
+    main()
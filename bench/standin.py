@@ -0,0 +1,387 @@
+# ░░░  local GMAT Club stand-in server  ░░░
+#
+#   python bench/standin.py                                   # :8800, prints a manifest
+#   python bench/standin.py --latency 150 --jitter 100 --error-rate 0.02 --cf-rate 0.05
+#   python bench/standin.py --topics 200 --replies 25 --manifest jobs.csv
+#
+# Serves the offline fixtures (bench/fixtures/<type>/*.html) as phpBB topics
+# so the scraper can be load-tested without touching gmatclub.com:
+#
+#   /forum/<type>-<fixture>-<id>[-<offset>].html   topic (+ reply pages of 20)
+#   /forum/ucp.php?mode=login                      login form; POST sets the
+#                                                  phpBB `_u` / `_sid` cookies
+#   /forum/ucp.php?i=ucp_main                      session probe (302 for guests)
+#   /forum/                                        index with a logout link
+#
+# Guests get topics with the spoiler bodies removed, as on the real site.
+# Faults are injected per topic request: `latency` + `jitter` ms before
+# answering, `error_rate` 500s, a Cloudflare "Just a moment…" page at
+# `cf_rate` for clients without a cf_clearance cookie (a browser passes it
+# after `cf_delay` seconds of JavaScript; plain HTTP never does) and 429 +
+# Retry-After once requests exceed `rate_limit` per second.  Topics carry an
+# ETag and answer If-None-Match with 304.  Point the scraper at it with
+# GMAT_SITE=http://127.0.0.1:8800 (login / cookie URLs) – bench/bench_e2e.py
+# does all of this itself.
+
+from __future__ import annotations
+import argparse, hashlib, random, re, secrets, sys, threading, time
+from collections import Counter
+from email.utils import formatdate
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parent
+FIXTURES = ROOT / "fixtures"
+
+PER_PAGE = 20
+_TOPIC_RE = re.compile(r"^/forum/([a-z]+)-([a-z0-9_]+)-(\d+)(?:-(\d+))?\.html$")
+_COOKIE = "phpbb3_gc"                      # phpBB prefix → <prefix>_u, <prefix>_sid
+
+_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>GMAT Club - Login</title></head><body>
+<form method="post" action="/forum/ucp.php?mode=login">{error}
+<input type="text" name="username"><input type="password" name="password">
+<input type="submit" name="login" value="Login"></form></body></html>"""
+
+_INDEX_PAGE = """<!DOCTYPE html>
+<html><head><title>GMAT Club Forum</title></head><body>
+<div id="page-body">{who}</div></body></html>"""
+
+_CHALLENGE_PAGE = """<!DOCTYPE html>
+<html><head><title>Just a moment...</title></head><body>
+<div id="challenge-platform" class="cf-browser-verification">Checking your browser…</div>
+<script>window._cf_chl_opt = {{}};
+setTimeout(function () {{
+  document.cookie = "cf_clearance={token}; path=/";
+  location.reload();
+}}, {delay_ms});</script></body></html>"""
+
+_REPLY = """<div class="post bg1{extra}" id="p{pid}"><div class="inner">
+<div class="author"><a class="username" href="#">{author}</a></div>
+<div class="postbody"><div class="content"><div class="item text">{text}</div></div></div>
+<div class="kudos-count">{kudos} Kudos</div></div></div>
+"""
+
+
+# ─── pages ──────────────────────────────────────────────────────────
+def _fixtures() -> List[Tuple[str, str, str]]:
+    """(type, fixture name, html) of every fixture page."""
+    return [(p.parent.name, p.stem, p.read_text(encoding="utf-8"))
+            for p in sorted(FIXTURES.glob("*/*.html"))]
+
+def _guest(html: str) -> str:
+    """The page as a logged-out visitor sees it: spoiler bodies gone."""
+    soup = BeautifulSoup(html, "html.parser")
+    for row in soup.select(".downRow"):
+        row.clear()
+    return str(soup)
+
+def _replies(tid: int, page: int, n: int, rng: random.Random) -> str:
+    out = []
+    for i in range(n):
+        pid = tid * 1000 + (page - 1) * PER_PAGE + i
+        expert = rng.random() < 0.1
+        out.append(_REPLY.format(
+            pid=pid, extra=" expertPost" if expert else "",
+            author=("Expert" if expert else "member") + str(pid % 97), kudos=rng.randint(0, 40),
+            text=f"Reply {pid}: the answer follows from statement {rng.randint(1, 2)}.<br>"
+                 f"Hence option {rng.choice('ABCDE')}."))
+    return "".join(out)
+
+def _pagination(base: str, tid: int, pages: int) -> str:
+    if pages < 2:
+        return ""
+    links = "".join(f'<a href="/forum/{base}-{tid}{f"-{(p - 1) * PER_PAGE}" if p > 1 else ""}.html">{p}</a>'
+                    for p in range(1, pages + 1))
+    return f'<div class="pagination">{links}</div>\n'
+
+
+# ─── server ─────────────────────────────────────────────────────────
+class StandIn:
+    """
+    ThreadingHTTPServer on 127.0.0.1; start() returns the base URL.  Every
+    fault knob can be changed while it runs; stats() counts the answers.
+    """
+
+    def __init__(self, *, port: int = 0, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0.0, cf_rate: float = 0.0, cf_delay: float = 1.0,
+                 rate_limit: float = 0.0, retry_after: int = 1, pages: int = 1,
+                 replies: int = 0, seed: int = 7):
+        self.port = port
+        self.latency_ms, self.jitter_ms, self.error_rate = latency_ms, jitter_ms, error_rate
+        self.cf_rate, self.cf_delay = cf_rate, cf_delay
+        self.rate_limit, self.retry_after = rate_limit, retry_after
+        self.pages, self.replies = max(1, pages), replies
+        self._rng = random.Random(seed)
+        self._seed = seed
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, str] = {}         # sid → user id
+        self._clearances: set = set()
+        self._tokens, self._stamp = max(1.0, rate_limit), time.monotonic()
+        self._stats: Counter = Counter()
+        self._pages = {(t, name): (html, _guest(html)) for t, name, html in _fixtures()}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # ─── lifecycle ──────────────────────────────────────────────────
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> str:
+        standin = self
+
+        class Handler(_Handler):
+            server_ref = standin
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="standin", daemon=True).start()
+        return self.base_url
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):  self.start(); return self
+    def __exit__(self, *exc): self.close()
+
+    # ─── topics ─────────────────────────────────────────────────────
+    def topics(self, n: Optional[int] = None, types: Optional[List[str]] = None
+               ) -> List[Tuple[str, str]]:
+        """(url, type) of `n` distinct topics, cycling through the fixtures of `types`."""
+        keys = [k for k in sorted(self._pages) if types is None or k[0] in types]
+        if not keys:
+            raise ValueError(f"no fixtures for {types}")
+        n = len(keys) if n is None else n
+        return [(f"{self.base_url}/forum/{t}-{name}-{200000 + i}.html", t)
+                for i, (t, name) in ((i, keys[i % len(keys)]) for i in range(n))]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def count(self, what: str):
+        with self._lock:
+            self._stats[what] += 1
+
+    # ─── faults ─────────────────────────────────────────────────────
+    def _roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _over_limit(self) -> bool:
+        if not self.rate_limit:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(max(1.0, self.rate_limit),
+                               self._tokens + (now - self._stamp) * self.rate_limit)
+            self._stamp = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+
+    def _delay(self):
+        ms = self.latency_ms + (self._roll() * self.jitter_ms if self.jitter_ms else 0)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+    # ─── sessions ───────────────────────────────────────────────────
+    def login(self, username: str, password: str) -> Optional[Tuple[str, str]]:
+        """(user id, sid) for any non-empty credentials."""
+        if not username or not password:
+            return None
+        uid = str(2 + int(hashlib.sha1(username.encode()).hexdigest()[:6], 16))
+        sid = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[sid] = uid
+        return uid, sid
+
+    def user(self, cookies: SimpleCookie) -> Optional[str]:
+        sid = cookies.get(f"{_COOKIE}_sid")
+        with self._lock:
+            return self._sessions.get(sid.value) if sid is not None else None
+
+    def clear(self, cookies: SimpleCookie) -> bool:
+        c = cookies.get("cf_clearance")
+        with self._lock:
+            return c is not None and c.value in self._clearances
+
+    def issue_clearance(self) -> str:
+        token = secrets.token_hex(8)
+        with self._lock:
+            self._clearances.add(token)
+        return token
+
+    def topic(self, q_type: str, name: str, tid: int, offset: int, member: bool) -> Optional[str]:
+        pages = self._pages.get((q_type, name))
+        if pages is None:
+            return None
+        page = offset // PER_PAGE + 1
+        if page > self.pages:
+            return None
+        rng = random.Random(self._seed * 1_000_003 + tid * 101 + page)
+        extra = _replies(tid, page, self.replies, rng) + \
+            _pagination(f"{q_type}-{name}", tid, self.pages)
+        html = pages[0] if member else pages[1]
+        if page > 1:                            # reply pages: no question post
+            html = re.sub(r'<div id="page-body">.*?<div class="footer">',
+                          '<div id="page-body"></div>\n<div class="footer">', html, flags=re.S)
+        return html.replace('<div class="footer">', extra + '<div class="footer">', 1)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"              # keep-alive, as HttpFetcher's pool expects
+    server_ref: StandIn
+
+    def log_message(self, *args):              # quiet; stats() counts instead
+        pass
+
+    def _cookies(self) -> SimpleCookie:
+        c = SimpleCookie()
+        try:
+            c.load(self.headers.get("Cookie", ""))
+        except Exception:
+            pass
+        return c
+
+    def _send(self, status: int, body: str = "", headers: Optional[Dict[str, str]] = None,
+              cookies: Optional[List[str]] = None):
+        raw = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        for c in cookies or ():
+            self.send_header("Set-Cookie", c)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(raw)
+        self.server_ref.count(str(status))
+
+    def _redirect(self, where: str, cookies: Optional[List[str]] = None):
+        self._send(302, "", {"Location": where}, cookies)
+
+    # ─── routes ─────────────────────────────────────────────────────
+    def do_GET(self):
+        si, parts = self.server_ref, urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        cookies = self._cookies()
+        uid = si.user(cookies)
+        if parts.path == "/forum/ucp.php":
+            mode = query.get("mode")
+            if mode == "login":
+                return self._send(200, _LOGIN_PAGE.format(error=""))
+            if mode == "logout":
+                return self._redirect("/forum/", [f"{_COOKIE}_sid=; Path=/; Max-Age=0",
+                                                  f"{_COOKIE}_u=1; Path=/"])
+            if uid is None:
+                return self._redirect("/forum/ucp.php?mode=login")
+            return self._send(200, _INDEX_PAGE.format(
+                who=f'<a href="./ucp.php?mode=logout&amp;sid=x">Logout [ user{uid} ]</a>'))
+        if parts.path in ("/", "/forum", "/forum/", "/forum/index.php"):
+            who = (f'<a href="./ucp.php?mode=logout&amp;sid=x">Logout [ user{uid} ]</a>'
+                   if uid else '<a href="./ucp.php?mode=login">Login</a>')
+            return self._send(200, _INDEX_PAGE.format(who=who))
+        m = _TOPIC_RE.match(parts.path)
+        if m is None:
+            return self._send(404, "not found")
+        return self._topic(m, cookies, uid)
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        si, parts = self.server_ref, urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8", "replace")
+        form = {k: v[0] for k, v in parse_qs(body).items()}
+        if parts.path != "/forum/ucp.php" or "mode=login" not in parts.query:
+            return self._send(404, "not found")
+        si._delay()
+        got = si.login(form.get("username", ""), form.get("password", ""))
+        if got is None:
+            return self._send(200, _LOGIN_PAGE.format(error="<p class=error>Incorrect login</p>"))
+        uid, sid = got
+        expires = formatdate(time.time() + 365 * 86400, usegmt=True)
+        si.count("logins")
+        self._redirect("/forum/", [f"{_COOKIE}_u={uid}; Path=/; Expires={expires}",
+                                   f"{_COOKIE}_sid={sid}; Path=/; Expires={expires}",
+                                   f"{_COOKIE}_k=; Path=/; Expires={expires}"])
+
+    def _topic(self, m: re.Match, cookies: SimpleCookie, uid: Optional[str]):
+        si = self.server_ref
+        q_type, name, tid, offset = m.group(1), m.group(2), int(m.group(3)), int(m.group(4) or 0)
+        si._delay()
+        if si._over_limit():
+            si.count("rate_limited")
+            return self._send(429, "Too Many Requests", {"Retry-After": str(si.retry_after)})
+        if si.error_rate and si._roll() < si.error_rate:
+            return self._send(500, "Internal Server Error")
+        if si.cf_rate and not si.clear(cookies) and si._roll() < si.cf_rate:
+            si.count("challenges")
+            return self._send(403, _CHALLENGE_PAGE.format(
+                token=si.issue_clearance(), delay_ms=int(si.cf_delay * 1000)))
+        html = si.topic(q_type, name, tid, offset, uid is not None)
+        if html is None:
+            return self._send(404, "not found")
+        etag = '"%s"' % hashlib.sha1(html.encode("utf-8")).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, "", {"ETag": etag})
+        self._send(200, html, {"ETag": etag, "Cache-Control": "private, no-cache"})
+
+
+# ─── CLI ────────────────────────────────────────────────────────────
+def add_fault_args(ap: argparse.ArgumentParser):
+    """The fault / shape options, shared with bench_e2e.py."""
+    ap.add_argument("--latency", type=float, default=0, help="ms before every answer")
+    ap.add_argument("--jitter", type=float, default=0, help="extra random ms (uniform)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of topic requests → 500")
+    ap.add_argument("--cf-rate", type=float, default=0.0,
+                    help="share of topic requests → Cloudflare challenge (until cleared)")
+    ap.add_argument("--cf-delay", type=float, default=1.0, help="seconds the challenge JS takes")
+    ap.add_argument("--rate-limit", type=float, default=0.0,
+                    help="topic requests/s before 429s (0: unlimited)")
+    ap.add_argument("--pages", type=int, default=1, help="thread pages per topic")
+    ap.add_argument("--replies", type=int, default=0, help="replies per thread page")
+
+def from_args(a: argparse.Namespace, port: int = 0) -> StandIn:
+    return StandIn(port=port, latency_ms=a.latency, jitter_ms=a.jitter,
+                   error_rate=a.error_rate, cf_rate=a.cf_rate, cf_delay=a.cf_delay,
+                   rate_limit=a.rate_limit, pages=a.pages, replies=a.replies)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="local GMAT Club stand-in server")
+    ap.add_argument("--port", type=int, default=8800)
+    ap.add_argument("--topics", type=int, help="topics in the manifest (default: one per fixture)")
+    ap.add_argument("--manifest", type=Path, help="write url,type rows here instead of stdout")
+    add_fault_args(ap)
+    a = ap.parse_args(argv)
+
+    si = from_args(a, a.port)
+    base = si.start()
+    rows = "".join(f"{u},{t}\n" for u, t in si.topics(a.topics))
+    if a.manifest:
+        a.manifest.write_text("url,type\n" + rows)
+    else:
+        sys.stdout.write(rows)
+    print(f"serving on {base}  (GMAT_SITE={base})", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(10)
+            print(f"  {si.stats()}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        si.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
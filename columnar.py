@@ -0,0 +1,305 @@
+# ░░░  GMAT-Club Scraper – columnar export  ░░░
+#
+#   python columnar.py results.jsonl corpus/            # corpus/<q_type>.parquet
+#   python columnar.py results.sqlite corpus/ --arrow   # Arrow IPC streams (.arrows) instead
+#
+# One file per QuestionType, each with its own schema (SCHEMAS), written in
+# row groups of `batch` questions so memory stays flat however big the
+# corpus.  Repeated strings – difficulty labels, answers, option letters,
+# table headers, MSR verdicts – are Arrow dictionary columns, so they are
+# stored (and loaded) once per row group instead of once per question.
+# (.arrows is the IPC *stream* format: the file format allows only one
+# dictionary per column for the whole file.)
+# Options ({"A": …}) become a list of {letter, text}; table rows a list of
+# cells aligned with `headers`.  Fields a schema does not know are dropped.
+#
+# load() reads one file back as slotted records (RECORDS[q_type]) – no
+# per-question dict, interned repeated strings – optionally only some
+# columns and only matching rows (pushed down to the row groups).
+#
+# pyarrow is optional and only imported when a file is written or read.
+
+from __future__ import annotations
+import argparse, logging, sys
+from pathlib import Path
+from typing import (Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple, Union)
+
+from main_code import PARSER_VERSION, QuestionType
+
+LOG = logging.getLogger("gmat.scraper.columnar")
+
+# ─── schemas (field, kind) – kinds map to Arrow types in _arrow_type ─
+#   str    plain string           cat     dictionary-encoded string
+#   opt    string that is left out of the dict when missing (assets' image_src)
+#   opts   {"A": text} → list<{letter: cat, text: str}>
+#   strs / cats   list of str / cat        nested lists: ("list", [fields])
+_Q_OPTS = [("prompt", "str"), ("options", "opts"), ("answer", "cat")]
+SCHEMAS: Dict[QuestionType, List[Tuple[str, Any]]] = {
+    QuestionType.CR: [("prompt", "str"), ("options", "opts"), ("answer", "cat"),
+                      ("difficulty", "cat"), ("explanation", "str")],
+    QuestionType.DS: [("question", "str"), ("options", "opts"), ("answer", "cat"),
+                      ("difficulty", "cat")],
+    QuestionType.PS: [("question", "str"), ("options", "opts"), ("answer", "cat"),
+                      ("difficulty", "cat")],
+    QuestionType.RC: [("passage", "str"), ("difficulty", "cat"), ("questions", ("list", _Q_OPTS))],
+    QuestionType.GRAPHS: [("passage", "str"), ("image_url", "str"), ("image_src", "opt"),
+                          ("difficulty", "cat"),
+                          ("questions", ("list", [("prompt", "str"), ("options", "cats"),
+                                                  ("answer", "cat")]))],
+    QuestionType.TABLES: [("passage", "str"), ("headers", "cats"), ("rows", "rows"),
+                          ("statements", ("list", [("prompt", "str"), ("answer", "cat")])),
+                          ("difficulty", "cat")],
+    QuestionType.TPA: [("passage", "str"), ("choices", "strs"), ("answer_blank1", "str"),
+                       ("answer_blank2", "str"), ("difficulty", "cat")],
+    QuestionType.MSR: [("sources", ("list", [("source_title", "cat"), ("text", "str"),
+                                             ("image_url", "str"), ("image_src", "opt")])),
+                       ("support_statements", ("list", [("statement", "str"),
+                                                        ("official", "cat")])),
+                       ("impact_factors", ("list", [("factor", "str"), ("official", "cat")])),
+                       ("mcq", ("struct", [("choices", "strs"), ("official", "str")])),
+                       ("difficulty", "cat")],
+}
+
+def _arrow_type(pa, kind):
+    cat = pa.dictionary(pa.int32(), pa.string())
+    if kind in ("str", "opt"): return pa.string()
+    if kind == "cat":   return cat
+    if kind == "strs":  return pa.list_(pa.string())
+    if kind == "cats":  return pa.list_(cat)
+    if kind == "rows":  return pa.list_(pa.list_(pa.string()))
+    if kind == "opts":  return pa.list_(pa.struct([("letter", cat), ("text", pa.string())]))
+    tag, fields = kind
+    st = pa.struct([(n, _arrow_type(pa, k)) for n, k in fields])
+    return pa.list_(st) if tag == "list" else st
+
+def arrow_schema(q_type: QuestionType):
+    import pyarrow as pa
+    return pa.schema([("url", pa.string())] +
+                     [(n, _arrow_type(pa, k)) for n, k in SCHEMAS[QuestionType(q_type)]],
+                     metadata={"q_type": QuestionType(q_type).value,
+                               "parser_version": str(PARSER_VERSION)})
+
+
+# ─── dict ⇄ row ─────────────────────────────────────────────────────
+def _encode(fields, data: Dict[str, Any]) -> Dict[str, Any]:
+    out = {}
+    for name, kind in fields:
+        v = data.get(name)
+        if v is None:
+            out[name] = None
+        elif kind == "opts":
+            out[name] = [{"letter": k, "text": t} for k, t in v.items()]
+        elif kind == "rows":
+            heads = data.get("headers") or []
+            out[name] = [[r.get("cells", {}).get(h) for h in heads] for r in v]
+        elif isinstance(kind, tuple):
+            out[name] = [_encode(kind[1], x) for x in v] if kind[0] == "list" else _encode(kind[1], v)
+        else:
+            out[name] = v
+    return out
+
+def _decode(fields, row: Dict[str, Any], intern: Callable[[str], str]) -> Dict[str, Any]:
+    out = {}
+    for name, kind in fields:
+        if name not in row:
+            continue                                  # column not loaded
+        v = row[name]
+        if v is None:
+            if kind != "opt":
+                out[name] = None
+        elif kind == "cat":
+            out[name] = intern(v)
+        elif kind == "cats":
+            out[name] = [intern(x) for x in v]
+        elif kind == "opts":
+            out[name] = {intern(o["letter"]): _short(o["text"], intern) for o in v}
+        elif kind == "strs":
+            out[name] = [_short(x, intern) for x in v]
+        elif kind == "rows":
+            heads = row.get("headers") or []
+            out[name] = [{"cells": dict(zip(map(intern, heads), (_short(c, intern) for c in r)))}
+                         for r in v]
+        elif isinstance(kind, tuple):
+            out[name] = [_decode(kind[1], x, intern) for x in v] if kind[0] == "list" \
+                else _decode(kind[1], v, intern)
+        else:
+            out[name] = _short(v, intern)
+    return out
+
+def _short(v: Optional[str], intern: Callable[[str], str]) -> Optional[str]:
+    """Short strings (numeric options, table cells) repeat a lot – share them."""
+    return intern(v) if isinstance(v, str) and len(v) <= 24 else v
+
+
+# ─── slotted records ────────────────────────────────────────────────
+class Record:
+    """Base of the per-type records: attribute access, as_dict() for the original shape."""
+    __slots__ = ("url",)
+    fields: Tuple[str, ...] = ()
+    optional: FrozenSet[str] = frozenset()        # "opt" fields: left out of as_dict() when None
+
+    def __init__(self, url: str, **values):
+        self.url = url
+        for f in self.fields:
+            setattr(self, f, values.get(f))
+
+    def as_dict(self) -> Dict[str, Any]:
+        out = {}
+        for f in self.fields:
+            v = getattr(self, f)
+            if v is not None or f not in self.optional:
+                out[f] = v
+        return out
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.url!r})"
+
+RECORDS: Dict[QuestionType, type] = {
+    q: type(f"{q.name.title()}Record", (Record,),
+            {"__slots__": tuple(n for n, _ in fields), "fields": tuple(n for n, _ in fields),
+             "optional": frozenset(n for n, k in fields if k == "opt")})
+    for q, fields in SCHEMAS.items()
+}
+
+
+# ─── write ──────────────────────────────────────────────────────────
+class ColumnarWriter:
+    """Streams (url, q_type, data) into <out_dir>/<q_type>.parquet (or .arrows)."""
+
+    def __init__(self, out_dir: Union[str, Path], *, fmt: str = "parquet", batch: int = 10_000,
+                 compression: str = "zstd"):
+        if fmt not in ("parquet", "arrow"):
+            raise ValueError(f"unknown columnar format {fmt!r}")
+        self.out_dir, self.fmt, self.batch, self.compression = Path(out_dir), fmt, batch, compression
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._rows: Dict[QuestionType, List[Dict[str, Any]]] = {}
+        self._writers: Dict[QuestionType, Any] = {}
+        self.counts: Dict[str, int] = {}
+
+    def path(self, q_type: QuestionType) -> Path:
+        ext = "parquet" if self.fmt == "parquet" else "arrows"
+        return self.out_dir / f"{QuestionType(q_type).value}.{ext}"
+
+    def write(self, url: str, q_type: Union[QuestionType, str], data: Dict[str, Any]):
+        q = QuestionType(q_type)
+        rows = self._rows.setdefault(q, [])
+        rows.append({"url": url, **_encode(SCHEMAS[q], data)})
+        if len(rows) >= self.batch:
+            self._flush(q)
+
+    def _flush(self, q: QuestionType):
+        import pyarrow as pa
+        rows = self._rows.pop(q, None)
+        if not rows:
+            return
+        schema = arrow_schema(q)
+        table = pa.Table.from_pylist(rows, schema=schema)
+        w = self._writers.get(q)
+        if w is None:
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+                w = pq.ParquetWriter(self.path(q), schema, compression=self.compression)
+            else:
+                import pyarrow.ipc as ipc
+                w = ipc.new_stream(self.path(q), schema,
+                                   options=ipc.IpcWriteOptions(compression=self.compression))
+            self._writers[q] = w
+        w.write_table(table)
+        self.counts[q.value] = self.counts.get(q.value, 0) + len(rows)
+
+    def close(self):
+        for q in list(self._rows):
+            self._flush(q)
+        for w in self._writers.values():
+            w.close()
+        self._writers.clear()
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc): self.close()
+
+
+def export(results: Iterable[Tuple[str, Optional[str], Dict[str, Any]]],
+           out_dir: Union[str, Path], **kw) -> Dict[str, int]:
+    """Write (url, q_type, data) triples – e.g. sinks.read_results() – per type."""
+    skipped = 0
+    with ColumnarWriter(out_dir, **kw) as w:
+        for url, q, data in results:
+            if not q or "duplicate_of" in data:
+                skipped += 1
+                continue
+            w.write(url, q, data)
+    if skipped:
+        LOG.warning("columnar: %d results without a q_type (or duplicates) skipped", skipped)
+    return w.counts
+
+
+# ─── read ───────────────────────────────────────────────────────────
+def load(path: Union[str, Path], *, columns: Optional[Sequence[str]] = None,
+         filters: Optional[List[Tuple[str, str, Any]]] = None) -> Iterator[Record]:
+    """
+    Records of one exported file, streamed per row group.  `columns` limits
+    what is read (url is always there); `filters` are pyarrow predicates such
+    as [("difficulty", "==", "805+ Level")] and skip non-matching rows (and
+    whole row groups, where their statistics allow) before decoding.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    path = Path(path)
+    cols = None if columns is None else ["url"] + [c for c in columns if c != "url"]
+    expr = None
+    for name, op, value in filters or ():
+        e = _predicate(ds.field(name), op, value)
+        expr = e if expr is None else expr & e
+    if path.suffix == ".arrows":
+        import pyarrow.ipc as ipc
+        reader = ipc.open_stream(path)
+        schema = reader.schema
+    else:
+        dset = ds.dataset(path, format="parquet")
+        schema = dset.schema
+    if cols and "rows" in cols and "headers" not in cols and "headers" in schema.names:
+        cols.append("headers")                         # row cells are keyed by the headers
+    if path.suffix == ".arrows":
+        batches = (pa.Table.from_batches([b]) for b in reader)
+        # filter before select: the predicate may name a column that is not loaded
+        batches = (t.filter(expr) if expr is not None else t for t in batches)
+        batches = (t.select(cols) if cols else t for t in batches)
+    else:
+        batches = dset.to_batches(columns=cols, filter=expr)
+    q = QuestionType(schema.metadata[b"q_type"].decode())
+    cls, fields = RECORDS[q], SCHEMAS[q]
+    pool: Dict[str, str] = {}
+    intern = lambda s: pool.setdefault(s, s) if s is not None else None
+    for batch in batches:
+        for row in batch.to_pylist():
+            yield cls(row["url"], **_decode(fields, row, intern))
+
+def _predicate(field, op: str, value):
+    if op in ("==", "="): return field == value
+    if op == "!=":        return field != value
+    if op == "<":         return field < value
+    if op == "<=":        return field <= value
+    if op == ">":         return field > value
+    if op == ">=":        return field >= value
+    if op == "in":        return field.isin(list(value))
+    raise ValueError(f"unknown filter operator {op!r}")
+
+
+# ─── CLI ────────────────────────────────────────────────────────────
+def main(argv=None):
+    from sinks import read_results
+
+    ap = argparse.ArgumentParser(description="export results to Parquet / Arrow per question type")
+    ap.add_argument("results", help=".jsonl / .sqlite result sink")
+    ap.add_argument("out_dir")
+    ap.add_argument("--arrow", action="store_true", help="Arrow IPC streams instead of Parquet")
+    ap.add_argument("--batch", type=int, default=10_000, help="questions per row group")
+    a = ap.parse_args(argv)
+    counts = export(read_results(a.results), a.out_dir,
+                    fmt="arrow" if a.arrow else "parquet", batch=a.batch)
+    print(counts)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
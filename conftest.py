@@ -0,0 +1,142 @@
+# ░░░  GMAT-Club Scraper – shared test fixtures  ░░░
+#
+# `drivers` swaps Chrome for FakeDriver, so pool and scrape logic runs
+# without a browser; `pages` are small topic pages in GMAT Club's markup;
+# `serve` starts a local HTTP server from a route table.  main_code.LIMITER
+# is swapped for one that never sleeps, so stub servers answer at once.
+
+from __future__ import annotations
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import main_code
+from throttle import RateLimiter
+
+
+PAGES = {
+    "cr": """<html><head><title>The council argues - Critical Reasoning (CR)</title></head><body>
+<div class="item text">The council argues that the new bridge will cut traffic.<br>
+Which of the following most weakens the argument?<br>
+A- Most drivers avoid tolls.<br>B- The bridge is narrow.<br>C- Traffic fell last year.<br>
+D- Buses will use the bridge.<br>E- The river floods often.<br>
+<div class="answer-block"><div class="downRow">OA: B</div></div></div>
+<a class="tag_css_link">Sub 505 Level</a></body></html>""",
+    "ds": """<html><head><title>Is x positive? - Data Sufficiency (DS)</title></head><body>
+<div class="item text">Is x &gt; 0?<br>(1) x^2 = 4<br>(2) x^3 = 8<br>
+(A) Statement (1) ALONE is sufficient<br>(B) Statement (2) ALONE is sufficient<br>
+(C) BOTH statements TOGETHER are sufficient<br>(D) EACH statement ALONE is sufficient<br>
+(E) Statements (1) and (2) TOGETHER are not sufficient<br>
+<div class="answer-block"><div class="downRow">OA: B</div></div></div>
+<a class="tag_css_link">605-655 Level</a></body></html>""",
+    "tables": """<html><body><div class="item text">The table shows sales by region.</div>
+<table class="stoker table-sortable"><tr><th>Region</th><th>Sales</th></tr>
+<tr><td>North</td><td>12</td></tr><tr><td>South</td><td>7</td></tr></table>
+<table class="stoker di"><tr><td>Yes</td><td>No</td><td></td></tr>
+<tr><td class="official_answer"></td><td></td><td>North sold more than South.</td></tr>
+<tr><td></td><td class="official_answer"></td><td>South sold more than 10.</td></tr></table>
+<a class="tag_css_link">705-805 Level</a></body></html>""",
+}
+
+
+class FakeDriver:
+    """Just enough of a Chrome session for DriverPool's checks."""
+
+    def __init__(self):
+        self.alive, self.quitted, self.visited = True, False, []
+        self.window_handles, self.page_source, self.title = ["main"], "", ""
+
+    def execute_script(self, js, *args):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        if js == main_code._PAGE_STATS_JS:
+            return [0, 0, 0, 0]                 # no navigation timing
+        return 1
+
+    def get(self, url):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        self.visited.append(url)
+
+    def quit(self):
+        self.quitted = True
+
+
+@pytest.fixture(autouse=True)
+def limiter(monkeypatch):
+    fast = RateLimiter(rate=1000, burst=1000, jitter=0, base_backoff=0)
+    monkeypatch.setattr(main_code, "LIMITER", fast)
+    return fast
+
+@pytest.fixture
+def drivers(monkeypatch):
+    """Every FakeDriver the code under test started, in order."""
+    main_code._load_driver_stack()          # the real _new_driver() does this first
+    made = []
+
+    def new_driver(*a, **kw):
+        made.append(FakeDriver())
+        return made[-1]
+    monkeypatch.setattr(main_code, "_new_driver", new_driver)
+    monkeypatch.setattr(main_code, "_ensure_login", lambda drv, email, pw: None)
+    return made
+
+@pytest.fixture
+def pages():
+    return dict(PAGES)
+
+
+# ─── local HTTP server ─────────────────────────────────────────────
+class Site(ThreadingHTTPServer):
+    """
+    Serves `routes`: path (with query) → (status, headers, body) or a
+    callable taking the request handler and returning one.  `headers` is
+    a Content-Type or a dict; unknown paths are 404.  Every request path
+    is appended to `hits`.
+    """
+    daemon_threads = True
+
+    def __init__(self, routes):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.routes, self.hits = routes, []
+        self.base = f"http://127.0.0.1:{self.server_port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *a):
+        pass
+
+    def _answer(self):
+        self.body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.hits.append(self.path)
+        route = self.server.routes.get(self.path, (404, "text/plain", "not here"))
+        status, headers, body = route(self) if callable(route) else route
+        raw = body.encode() if isinstance(body, str) else body
+        if isinstance(headers, str):
+            headers = {"Content-Type": headers}
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(raw)
+
+    do_GET = do_POST = do_HEAD = _answer
+
+
+@pytest.fixture
+def serve():
+    started = []
+
+    def start(routes) -> Site:
+        site = Site(routes)
+        threading.Thread(target=site.serve_forever, args=(0.05,), daemon=True).start()
+        started.append(site)
+        return site
+    yield start
+    for site in started:
+        site.shutdown()
+        site.server_close()
@@ -0,0 +1,255 @@
+# ░░░  GMAT-Club Scraper – listing crawler / frontier  ░░░
+#
+# Walks sub-forum and tag listing pages, pulls out topic ids, guesses a
+# QuestionType for each and keeps everything in a SQLite frontier:
+#
+#   listings  url → q_type hint, state (todo / done / failed)
+#   topics    topic_id → url, q_type, state (new / leased / done / failed)
+#
+# Every state change is committed straight away, so a crashed crawl resumes
+# where it stopped (Frontier.recover() hands stale leases back).  Fetches go
+# through HttpFetcher and so are paced per host by main_code.LIMITER, like
+# every other request.  scrape_frontier() feeds the frontier into
+# scrape_many().
+
+from __future__ import annotations
+import logging, re, sqlite3, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from dedup import DuplicateQuestion
+from main_code import HttpFetcher, QuestionType, infer_type, scrape_many
+from throttle import RateLimiter
+
+LOG = logging.getLogger("gmat.scraper.crawler")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    url        TEXT PRIMARY KEY,
+    q_type     TEXT,
+    state      TEXT NOT NULL DEFAULT 'todo',
+    tries      INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS topics (
+    topic_id   INTEGER PRIMARY KEY,
+    url        TEXT NOT NULL,
+    q_type     TEXT,
+    title      TEXT,
+    source     TEXT,
+    state      TEXT NOT NULL DEFAULT 'new',
+    tries      INTEGER NOT NULL DEFAULT 0,
+    leased_at  REAL,
+    updated_at REAL,
+    error      TEXT
+);
+CREATE INDEX IF NOT EXISTS topics_state ON topics(state);
+"""
+
+# ─── topic ids / type hints (keywords: main_code.infer_type) ────────
+_TOPIC_ID_RES = (re.compile(r"-(\d{3,})\.html(?:$|[?#])"),      # /forum/some-slug-123456.html
+                 re.compile(r"[?&]t=(\d+)"))                     # viewtopic.php?t=123456
+
+def topic_id(url: str) -> Optional[int]:
+    for rx in _TOPIC_ID_RES:
+        m = rx.search(url)
+        if m:
+            return int(m.group(1))
+    return None
+
+def parse_listing(html: str, base_url: str, hint: Optional[QuestionType] = None
+                  ) -> Tuple[List[Dict[str, Any]], List[str], Optional[QuestionType]]:
+    """
+    One listing page → (topics, further listing pages, page type).  Each
+    topic is {"topic_id", "url", "title", "q_type"}; q_type comes from the
+    row's tags, else the caller's hint, else the page breadcrumb / title.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    crumb = " ".join(a.get_text(" ", strip=True) for a in soup.select(
+        ".breadcrumbs a, .navlinks a, #nav-main a, .forum-title, h2"))
+    page_type = hint or infer_type(crumb, soup.title.get_text() if soup.title else "")
+
+    topics, seen = [], set()
+    for a in soup.select("a.topictitle, a.topic-title, .topic-list a[href]"):
+        url = urljoin(base_url, a["href"])
+        tid = topic_id(url)
+        if tid is None or tid in seen:
+            continue
+        seen.add(tid)
+        row = a.find_parent(["li", "tr", "dl"]) or a
+        tags = " ".join(t.get_text(" ", strip=True) for t in row.select(".tag_css_link, .tags a"))
+        topics.append({"topic_id": tid, "url": url.split("#")[0],
+                       "title": a.get_text(" ", strip=True),
+                       "q_type": infer_type(tags) or page_type})
+
+    nxt = []
+    for a in soup.select("link[rel=next], a[rel=next], .pagination a.next, .pagination li.next a"):
+        href = a.get("href")
+        if href:
+            nxt.append(urljoin(base_url, href))
+    return topics, nxt, page_type
+
+
+# ─── frontier ───────────────────────────────────────────────────────
+class Frontier:
+    """Crash-safe, de-duplicated work list of listing pages and topics."""
+
+    def __init__(self, path: Union[str, Path] = "frontier.sqlite", lease_timeout: float = 1800):
+        self.lease_timeout = lease_timeout
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self.recover()
+
+    def _exec(self, sql: str, args: tuple = ()):
+        with self._lock:
+            cur = self._db.execute(sql, args)
+            self._db.commit()
+            return cur
+
+    def recover(self) -> int:
+        """Hand leases older than `lease_timeout` back (worker crashed)."""
+        n = self._exec("UPDATE topics SET state='new', leased_at=NULL "
+                       "WHERE state='leased' AND leased_at < ?",
+                       (time.time() - self.lease_timeout,)).rowcount
+        if n:
+            LOG.info("frontier: %d stale leases returned", n)
+        return n
+
+    # -- listings --------------------------------------------------------
+    def add_listing(self, url: str, q_type: Optional[QuestionType] = None):
+        self._exec("INSERT OR IGNORE INTO listings(url, q_type, updated_at) VALUES (?,?,?)",
+                   (url, q_type.value if q_type else None, time.time()))
+
+    def next_listing(self) -> Optional[Tuple[str, Optional[QuestionType]]]:
+        with self._lock:
+            row = self._db.execute("SELECT url, q_type FROM listings WHERE state='todo' "
+                                   "ORDER BY tries, rowid LIMIT 1").fetchone()
+        return (row[0], QuestionType(row[1]) if row[1] else None) if row else None
+
+    def listing_done(self, url: str, topics: List[Dict[str, Any]], more: List[str],
+                     hint: Optional[QuestionType]):
+        """Store a page's topics + next pages (which inherit `hint`) and mark
+        it done – one transaction."""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO topics(topic_id, url, q_type, title, source, updated_at) "
+                "VALUES (?,?,?,?,?,?)",
+                [(t["topic_id"], t["url"], t["q_type"].value if t["q_type"] else None,
+                  t["title"], url, now) for t in topics])
+            # a later listing may know the type of a topic first seen untyped
+            self._db.executemany(
+                "UPDATE topics SET q_type=? WHERE topic_id=? AND q_type IS NULL",
+                [(t["q_type"].value, t["topic_id"]) for t in topics if t["q_type"]])
+            self._db.executemany(
+                "INSERT OR IGNORE INTO listings(url, q_type, updated_at) VALUES (?,?,?)",
+                [(u, hint.value if hint else None, now) for u in more])
+            self._db.execute("UPDATE listings SET state='done', updated_at=? WHERE url=?",
+                             (now, url))
+
+    def listing_failed(self, url: str, max_tries: int = 3):
+        self._exec("UPDATE listings SET tries=tries+1, updated_at=?, "
+                   "state=CASE WHEN tries+1 >= ? THEN 'failed' ELSE 'todo' END WHERE url=?",
+                   (time.time(), max_tries, url))
+
+    # -- topics ----------------------------------------------------------
+    def lease(self, n: int, *, include_untyped: bool = False
+              ) -> List[Tuple[str, Optional[QuestionType]]]:
+        """Check out up to `n` new topics as (url, q_type)."""
+        where = "state='new'" + ("" if include_untyped else " AND q_type IS NOT NULL")
+        with self._lock, self._db:
+            rows = self._db.execute(f"SELECT topic_id, url, q_type FROM topics WHERE {where} "
+                                    "ORDER BY tries, topic_id LIMIT ?", (n,)).fetchall()
+            self._db.executemany("UPDATE topics SET state='leased', leased_at=? WHERE topic_id=?",
+                                 [(time.time(), r[0]) for r in rows])
+        return [(r[1], QuestionType(r[2]) if r[2] else None) for r in rows]
+
+    def set_type(self, url: str, q_type: QuestionType):
+        """Record a type detected on the topic page itself."""
+        self._exec("UPDATE topics SET q_type=? WHERE topic_id=?", (q_type.value, topic_id(url)))
+
+    def done(self, url: str):
+        self._exec("UPDATE topics SET state='done', error=NULL, updated_at=? WHERE topic_id=?",
+                   (time.time(), topic_id(url)))
+
+    def failed(self, url: str, error: str, max_tries: int = 3):
+        self._exec("UPDATE topics SET tries=tries+1, error=?, updated_at=?, leased_at=NULL, "
+                   "state=CASE WHEN tries+1 >= ? THEN 'failed' ELSE 'new' END WHERE topic_id=?",
+                   (error[:500], time.time(), max_tries, topic_id(url)))
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {t: dict(self._db.execute(f"SELECT state, COUNT(*) FROM {t} GROUP BY state"))
+                    for t in ("listings", "topics")}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# ─── crawl / feed ───────────────────────────────────────────────────
+def crawl(frontier: Frontier, seeds: Iterable[Union[str, Tuple[str, Optional[QuestionType]]]] = (),
+          *, fetcher: Optional[HttpFetcher] = None, limiter: Optional[RateLimiter] = None,
+          max_pages: Optional[int] = None) -> int:
+    """
+    Walk listing pages breadth-first from `seeds` (plus whatever the frontier
+    still has queued) until none are left or `max_pages` were fetched.
+    `limiter` paces the fetcher this call creates (default: LIMITER); a
+    given `fetcher` brings its own.  Returns the number of listing pages
+    processed.
+    """
+    for s in seeds:
+        url, hint = (s, None) if isinstance(s, str) else s
+        frontier.add_listing(url, QuestionType(hint) if hint else None)
+    own = fetcher is None
+    fetcher = fetcher or HttpFetcher(limiter=limiter)
+    pages = 0
+    try:
+        while max_pages is None or pages < max_pages:
+            nxt = frontier.next_listing()
+            if nxt is None:
+                break
+            url, hint = nxt
+            html = fetcher.fetch(url)
+            if html is None:
+                frontier.listing_failed(url)
+                continue
+            topics, more, page_type = parse_listing(html, url, hint)
+            frontier.listing_done(url, topics, more, page_type)
+            pages += 1
+            LOG.info("crawl: %s → %d topics, %d more pages", url, len(topics), len(more))
+    finally:
+        if own:
+            fetcher.close()
+    return pages
+
+def scrape_frontier(frontier: Frontier, *, chunk: int = 50, untyped: bool = True,
+                    **scrape_kw) -> Iterator[Tuple[str, Any]]:
+    """
+    Lease topics `chunk` at a time, push them through scrape_many() (same
+    keyword arguments) and record done / failed in the frontier.  Topics
+    no listing could type are included unless `untyped=False`; their type
+    is detected on the page and written back (then passed on to the
+    caller's `on_detect`, if any).
+    """
+    on_detect = scrape_kw.pop("on_detect", None)
+
+    def detected(u: str, q: QuestionType, conf: float):
+        frontier.set_type(u, q)
+        if on_detect is not None:
+            on_detect(u, q, conf)
+    while True:
+        jobs = frontier.lease(chunk, include_untyped=untyped)
+        if not jobs:
+            return
+        for url, res in scrape_many(jobs, on_detect=detected, **scrape_kw):
+            if isinstance(res, Exception) and not isinstance(res, DuplicateQuestion):
+                frontier.failed(url, f"{type(res).__name__}: {res}")
+            else:
+                frontier.done(url)
+            yield url, res
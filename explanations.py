@@ -0,0 +1,228 @@
+# ░░░  GMAT-Club Scraper – explanation posts  ░░░
+#
+#   scrape(url=…, explain=ExplanationCollector())        # or scrape_many(…, explain=…)
+#   python explanations.py https://gmatclub.com/forum/some-topic-119740.html
+#
+# The first post of a topic is the question; the explanations are the
+# replies below it, spread over pages of 20 (`slug-119740-20.html`, `-40`, …;
+# viewtopic.php?…&start=20).  ExplanationCollector reads page 1, takes the
+# page count from its pagination links and fetches pages 2..N at once over
+# HttpFetcher (paced by main_code.LIMITER like every other request) – while
+# the question itself is still being parsed and polished.  Every page is
+# parsed as a static HTML snapshot; replies are ranked expert first, then by
+# kudos.
+#
+# Cost is bounded by `max_pages` (page 1 included) and `max_posts`; replies
+# below `min_kudos` are dropped unless an expert wrote them.  A page that
+# cannot be fetched (Cloudflare, network) is skipped, never fatal.  Page 1
+# is the HTML scrape() already has (submit(url, first)); only without it is
+# it fetched, and it is never written to the topic's cache row.  With a
+# PageCache, reply pages are kept there under "explain:<url>".
+
+from __future__ import annotations
+import argparse, json, logging, re, sys
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup, Tag
+
+import metrics
+from main_code import _BS_FEATURES, HttpFetcher, _inner_text
+from page_cache import PageCache
+
+LOG = logging.getLogger("gmat.scraper.explanations")
+
+PER_PAGE = 20
+_REPLY_KEY = "explain:"                    # PageCache key prefix: never a topic's own row
+_SLUG_PAGE_RE = re.compile(r"-(\d{3,})(?:-(\d+))?\.html$")      # …-119740[-40].html
+
+# phpBB + GMAT Club's own markup; first match wins
+_POST_CSS    = "div.post"
+_BODY_CSS    = ("div.item.text", ".postbody .content", ".postbody")
+_AUTHOR_CSS  = (".author .username", ".author a", ".username", ".author")
+_KUDOS_CSS   = (".kudos-count", ".kudosCount", ".post-kudos .count", ".kudos")
+_EXPERT_CSS  = ".expert-reply, .expertReply, .expert-badge, .rank-expert, .expertPost"
+_NUMBER_RE   = re.compile(r"\d+")
+
+Post = Dict[str, Any]
+
+
+# ─── thread pages ───────────────────────────────────────────────────
+def page_url(url: str, page: int, per_page: int = PER_PAGE) -> str:
+    """URL of page `page` (1-based) of the topic at `url`."""
+    parts = urlsplit(url)
+    m = _SLUG_PAGE_RE.search(parts.path)
+    offset = (page - 1) * per_page
+    if m:
+        path = parts.path[:m.start()] + f"-{m.group(1)}" + (f"-{offset}" if offset else "") + ".html"
+        return urlunsplit(parts._replace(path=path))
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "start"]
+    if offset:
+        query.append(("start", str(offset)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def _topic_id(parts) -> Optional[str]:
+    m = _SLUG_PAGE_RE.search(parts.path)
+    return m.group(1) if m else dict(parse_qsl(parts.query)).get("t")
+
+def _offset(href: str, topic: Optional[str]) -> Optional[int]:
+    """Post offset of a link to topic `topic`; None for links anywhere else."""
+    parts = urlsplit(href)
+    if topic is None or _topic_id(parts) != topic:     # forum listings paginate too
+        return None
+    m = _SLUG_PAGE_RE.search(parts.path)
+    if m:
+        return int(m.group(2) or 0)
+    start = dict(parse_qsl(parts.query)).get("start")
+    return int(start) if start and start.isdigit() else 0
+
+def page_count(soup: BeautifulSoup, url: str, per_page: int = PER_PAGE) -> int:
+    """Pages of the thread, from the links of any of its pages to the same topic."""
+    topic = _topic_id(urlsplit(url))
+    offsets = [o for a in soup.select("a[href]")
+               if (o := _offset(a["href"], topic)) is not None]
+    return max(offsets, default=0) // per_page + 1
+
+
+# ─── replies ────────────────────────────────────────────────────────
+def _first(node: Tag, selectors) -> Optional[Tag]:
+    for css in selectors:
+        hit = node.select_one(css)
+        if hit is not None:
+            return hit
+    return None
+
+def parse_posts(soup: BeautifulSoup, page: int = 1) -> List[Post]:
+    """Every reply on a thread page – on page 1 without the question post."""
+    out = []
+    for i, post in enumerate(soup.select(_POST_CSS)):
+        if page == 1 and i == 0:
+            continue
+        body = _first(post, _BODY_CSS)
+        if body is None:
+            continue
+        text = _inner_text(body, skip_spoilers=False)   # replies hide their working in spoilers
+        if not text:
+            continue
+        author = _first(post, _AUTHOR_CSS)
+        kudos = _first(post, _KUDOS_CSS)
+        n = _NUMBER_RE.search(kudos.get_text()) if kudos is not None else None
+        out.append({"post_id": post.get("id"), "page": page,
+                    "author": author.get_text(strip=True) if author is not None else "",
+                    "kudos": int(n.group()) if n else 0,
+                    "expert": post.select_one(_EXPERT_CSS) is not None
+                              or "expert" in " ".join(post.get("class", [])).lower(),
+                    "text": text})
+    return out
+
+def rank(posts: List[Post], max_posts: int, min_kudos: int = 1) -> List[Post]:
+    """Expert replies first, then by kudos; at most `max_posts`."""
+    keep = [p for p in posts if p["expert"] or p["kudos"] >= min_kudos]
+    keep.sort(key=lambda p: (not p["expert"], -p["kudos"], p["page"]))
+    return keep[:max_posts]
+
+
+# ─── collector ──────────────────────────────────────────────────────
+class ExplanationCollector:
+    """Thread-safe; `workers` thread pages in flight at once across all topics."""
+
+    def __init__(self, *, max_pages: int = 5, max_posts: int = 3, min_kudos: int = 1,
+                 workers: int = 4, http: Optional[HttpFetcher] = None,
+                 cache: Optional[PageCache] = None):
+        self.max_pages, self.max_posts, self.min_kudos = max_pages, max_posts, min_kudos
+        self.cache = cache
+        self._own_http = http is None
+        self.http = http or HttpFetcher(pool_size=workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="explain")
+        self._topics = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="explain-topic")
+
+    def _page(self, url: str, store: bool = True) -> Optional[str]:
+        """A thread page over HTTP; reply pages are cached under their own key."""
+        key = _REPLY_KEY + url
+        html = self.cache.get_html(key) if store and self.cache is not None else None
+        if html is None:
+            with metrics.span("explain_page"):
+                html = self.http.fetch(url)
+            metrics.inc("explanation_pages_total", outcome="ok" if html else "failed")
+            if html is None:
+                LOG.info("explanations: skipped %s", url)
+            elif store and self.cache is not None:
+                self.cache.put(key, html)
+        return html
+
+    def _first(self, url: str) -> Optional[str]:
+        """Page 1 when the caller had none: the topic's cached snapshot, else HTTP.
+        Never written back – the topic's own cache row belongs to scrape()."""
+        html = self.cache.get_html(url) if self.cache is not None else None
+        return html or self._page(page_url(url, 1), store=False)
+
+    def collect(self, url: str, first_html: Optional[str] = None) -> List[Post]:
+        """Best replies of the topic at `url`; page 1 is fetched unless given."""
+        html = first_html or self._first(url)
+        if html is None:
+            return []
+        soup = BeautifulSoup(html, _BS_FEATURES)
+        pages = min(page_count(soup, url), self.max_pages)
+        posts = parse_posts(soup, 1)
+        rest = [self._pool.submit(self._page, page_url(url, p)) for p in range(2, pages + 1)]
+        for p, fut in enumerate(rest, start=2):
+            page_html = fut.result()
+            if page_html is not None:
+                posts += parse_posts(BeautifulSoup(page_html, _BS_FEATURES), p)
+        best = rank(posts, self.max_posts, self.min_kudos)
+        metrics.inc("explanations_total", len(best))
+        return best
+
+    def _after(self, url: str, first: "Future[Optional[str]]") -> List[Post]:
+        try:
+            html = first.result()
+        except CancelledError:                   # the topic itself failed
+            return []
+        return self.collect(url, html)
+
+    def submit(self, url: str, first: "Optional[Future[Optional[str]]]" = None
+               ) -> "Future[List[Post]]":
+        """
+        collect(url) in the background.  `first` is the caller's promise of
+        page 1 (None once it knows it has no HTML, cancelled if the topic
+        failed); reply pages start as soon as it is kept.
+        """
+        if first is None:
+            return self._topics.submit(self.collect, url)
+        return self._topics.submit(self._after, url, first)
+
+    @staticmethod
+    def fill(data: Dict[str, Any], posts: List[Post]) -> Dict[str, Any]:
+        """`data` with `explanations` set and – for CR – `explanation` = the best reply."""
+        out = dict(data, explanations=posts)
+        if "explanation" in out:
+            out["explanation"] = posts[0]["text"] if posts else ""
+        return out
+
+    def close(self):
+        self._topics.shutdown(wait=True, cancel_futures=True)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._own_http:
+            self.http.close()
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc): self.close()
+
+
+# ─── CLI ────────────────────────────────────────────────────────────
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="best explanation posts of GMAT Club topics")
+    ap.add_argument("urls", nargs="+")
+    ap.add_argument("--pages", type=int, default=5, help="thread pages read per topic")
+    ap.add_argument("--posts", type=int, default=3, help="replies kept per topic")
+    ap.add_argument("--min-kudos", type=int, default=1)
+    a = ap.parse_args(argv)
+    with ExplanationCollector(max_pages=a.pages, max_posts=a.posts,
+                              min_kudos=a.min_kudos) as ex:
+        for url, fut in [(u, ex.submit(u)) for u in a.urls]:
+            print(json.dumps({"url": url, "explanations": fut.result()}, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+# ░░░  GMAT-Club Scraper – incremental re-scrape  ░░░
+#
+#   python incremental.py manifest.csv                      # state: ~/.cache/gmat_scraper/incremental.sqlite
+#   python incremental.py manifest.csv --seed results.jsonl # start from an earlier full run
+#   python incremental.py manifest.csv --diff diff.jsonl --export results.jsonl
+#
+# A weekly full pass re-renders every topic to catch the odd edited OA or
+# difficulty tag.  Here each topic is first probed with one plain HTTP GET:
+#
+#   • conditional (If-None-Match / If-Modified-Since) – a 304 ends it there
+#   • otherwise page_fingerprint() of the body: a hash of the first post and
+#     its tags only, so new replies, view counts and session ids don't count
+#
+# Unchanged topics stop after the probe.  Changed (and new) CR/DS/PS topics
+# are parsed straight from the probe's HTML; the rest go through
+# scrape_many() and their PARSERS entry.  A topic last parsed by another
+# PARSER_VERSION counts as changed whatever the probe says: it is fetched
+# without validators and parsed again, and stored even if nothing differs.  Each changed topic's old and new
+# results are diffed field by field (`questions[2].official`, …); diffs are
+# kept in the `changes` table and yielded to the caller.
+#
+#   topics   url → q_type, etag, last_modified, fingerprint, result, timestamps
+#   changes  url, ts, field, old, new
+
+from __future__ import annotations
+import argparse, json, logging, sqlite3, sys, threading, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import metrics
+from main_code import (HttpFetcher, PARSER_VERSION, QuestionType, page_fingerprint,
+                       scrape_many)
+from page_cache import DEFAULT_ROOT
+
+LOG = logging.getLogger("gmat.scraper.incremental")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    url           TEXT PRIMARY KEY,
+    q_type        TEXT,
+    etag          TEXT,
+    last_modified TEXT,
+    fingerprint   TEXT,
+    parser_ver    INTEGER,
+    result        TEXT,
+    checked_at    REAL,
+    changed_at    REAL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    url   TEXT NOT NULL,
+    ts    REAL NOT NULL,
+    field TEXT NOT NULL,
+    old   TEXT,
+    new   TEXT
+);
+CREATE INDEX IF NOT EXISTS changes_url ON changes(url);
+"""
+
+Diff = Dict[str, Tuple[Any, Any]]
+
+
+# ─── field diff ─────────────────────────────────────────────────────
+def diff_fields(old: Any, new: Any, path: str = "") -> Diff:
+    """{dotted path: (old, new)} of every leaf that differs."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        out: Diff = {}
+        for k in list(old) + [k for k in new if k not in old]:
+            out.update(diff_fields(old.get(k), new.get(k), f"{path}.{k}" if path else k))
+        return out
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        out = {}
+        for i, (a, b) in enumerate(zip(old, new)):
+            out.update(diff_fields(a, b, f"{path}[{i}]"))
+        return out
+    return {} if old == new else {path or ".": (old, new)}
+
+
+# ─── state ──────────────────────────────────────────────────────────
+class TopicState:
+    """What the last visit to each topic saw; thread-safe."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path or DEFAULT_ROOT / "incremental.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT q_type, etag, last_modified, fingerprint, parser_ver, result FROM topics"
+                " WHERE url=?", (url,)).fetchone()
+        if row is None:
+            return None
+        return {"q_type": row[0], "etag": row[1], "last_modified": row[2],
+                "fingerprint": row[3], "parser_ver": row[4],
+                "result": json.loads(row[5]) if row[5] else None}
+
+    def checked(self, url: str, validators: Dict[str, Optional[str]],
+                fingerprint: Optional[str] = None, parser_ver: Optional[int] = None):
+        """Unchanged visit: refresh validators, check time and – after a re-parse – parser_ver."""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE topics SET etag=COALESCE(?, etag), last_modified=COALESCE(?, last_modified),"
+                " fingerprint=COALESCE(?, fingerprint), parser_ver=COALESCE(?, parser_ver),"
+                " checked_at=? WHERE url=?",
+                (validators.get("etag"), validators.get("last_modified"), fingerprint,
+                 parser_ver, time.time(), url))
+
+    def store(self, url: str, q_type: Optional[str], result: Dict[str, Any],
+              validators: Dict[str, Optional[str]], fingerprint: Optional[str],
+              diff: Diff):
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO topics VALUES (?,?,?,?,?,?,?,?,?)",
+                (url, q_type, validators.get("etag"), validators.get("last_modified"),
+                 fingerprint, PARSER_VERSION, json.dumps(result, ensure_ascii=False), now, now))
+            self._db.executemany(
+                "INSERT INTO changes VALUES (?,?,?,?,?)",
+                [(url, now, f, json.dumps(a, ensure_ascii=False), json.dumps(b, ensure_ascii=False))
+                 for f, (a, b) in diff.items()])
+
+    def seed(self, rows: Iterable[Tuple[str, Optional[str], Dict[str, Any]]]) -> int:
+        """Import (url, q_type, result) of an earlier full run; no fingerprints yet."""
+        n = 0
+        with self._lock, self._db:
+            for url, q, data in rows:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO topics (url, q_type, result, parser_ver) VALUES (?,?,?,?)",
+                    (url, q, json.dumps(data, ensure_ascii=False), None))
+                n += 1
+        return n
+
+    def results(self) -> Iterator[Tuple[str, Optional[str], Dict[str, Any]]]:
+        cur = self._db.cursor()
+        for url, q, data in cur.execute("SELECT url, q_type, result FROM topics WHERE result IS NOT NULL"):
+            yield url, q, json.loads(data)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc): self.close()
+
+
+# ─── probe + re-scrape ──────────────────────────────────────────────
+def _stale(old: Optional[Dict[str, Any]]) -> bool:
+    """Stored result made by another PARSER_VERSION (seeded rows: unknown, not stale)."""
+    return old is not None and old["parser_ver"] is not None and \
+        old["parser_ver"] != PARSER_VERSION
+
+def rescrape(state: TopicState, jobs: Iterable[Tuple[str, Optional[str]]], *,
+             http: Optional[HttpFetcher] = None, probe_workers: int = 8, **scrape_kw
+             ) -> Iterator[Tuple[str, str, Union[Diff, Exception]]]:
+    """
+    Yield (url, status, diff) per job, status one of unchanged / changed /
+    new / failed (diff is then the exception).  Only changed and new topics
+    are parsed; those that need a browser go to scrape_many(**scrape_kw)
+    once every probe is in.  A topic whose probe fails (network, Cloudflare)
+    is re-scraped rather than assumed unchanged, and one parsed by an older
+    PARSER_VERSION is re-parsed and reported as changed.
+    """
+    own = http is None
+    http = http or HttpFetcher(pool_size=probe_workers)
+    browser: List[Tuple[str, Optional[str]]] = []
+    probed: Dict[str, Tuple[Dict[str, Optional[str]], Optional[str]]] = {}
+
+    def probe(job):
+        url, q = job
+        old = state.get(url)
+        etag, modified = (old["etag"], old["last_modified"]) if old and not _stale(old) \
+            else (None, None)                  # stale: a 304 would leave nothing to parse
+        with metrics.span("probe"):
+            status, html, seen = http.probe(url, etag, modified)
+        return url, q, old, status, html, seen
+
+    def probed_all():                      # bounded in-flight: bodies don't pile up
+        with ThreadPoolExecutor(max_workers=probe_workers) as ex:
+            todo, running = iter(jobs), set()
+            while True:
+                for job in todo:
+                    running.add(ex.submit(probe, job))
+                    if len(running) >= 2 * probe_workers:
+                        break
+                if not running:
+                    return
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for f in done:
+                    yield f.result()
+
+    def finish(url, q, old, data, seen, fp):
+        diff = diff_fields(old["result"], data) if old and old["result"] is not None else {}
+        if old is not None and old["result"] is not None and not diff and not _stale(old):
+            state.checked(url, seen, fp, PARSER_VERSION)   # first fingerprint of a seeded topic
+            metrics.inc("incremental_total", outcome="unchanged")
+            return url, "unchanged", {}
+        state.store(url, q, data, seen, fp, diff)
+        outcome = "new" if old is None or old["result"] is None else "changed"
+        metrics.inc("incremental_total", outcome=outcome)
+        return url, outcome, diff
+
+    try:
+        for url, q, old, status, html, seen in probed_all():
+            q = q or (old["q_type"] if old else None)
+            fp = page_fingerprint(html) if html else None
+            if old is not None and old["result"] is not None and not _stale(old) and (
+                    status == 304 or fp is not None and fp == old["fingerprint"]):
+                state.checked(url, seen)
+                metrics.inc("incremental_total", outcome="unchanged")
+                yield url, "unchanged", {}
+                continue
+            found = [QuestionType(q) if q else None]
+            data = http.parse(url, html, found[0],
+                              on_detect=lambda u, t, c: found.append(t)) if fp else None
+            if data is not None:
+                yield finish(url, found[-1].value if found[-1] else q, old, data, seen, fp)
+                continue
+            probed[url] = (seen, fp)
+            browser.append((url, q))
+        LOG.info("incremental: %d of the probed topics need a browser", len(browser))
+
+        types = dict(browser)
+
+        def detected(u, t, c):
+            types[u] = t.value
+        for url, res in scrape_many(browser, on_detect=detected, **scrape_kw):
+            if isinstance(res, Exception):
+                metrics.inc("incremental_total", outcome="failed")
+                yield url, "failed", res
+                continue
+            seen, fp = probed[url]
+            yield finish(url, types.get(url), state.get(url), res, seen, fp)
+    finally:
+        if own:
+            http.close()
+
+
+# ─── CLI ────────────────────────────────────────────────────────────
+def main(argv=None):
+    import os
+    from orchestrator import read_manifest
+    from sinks import open_sink, read_results
+
+    ap = argparse.ArgumentParser(description="re-scrape only the topics that changed")
+    ap.add_argument("manifest", help="url[,q_type] per line (.csv / .tsv / .jsonl)")
+    ap.add_argument("--state", help="state database (default: cache dir)")
+    ap.add_argument("--seed", help="import an earlier full run (.jsonl / .sqlite sink) first")
+    ap.add_argument("--diff", type=Path, help="append one JSON line per changed topic")
+    ap.add_argument("--export", help="write every stored result to this sink afterwards")
+    ap.add_argument("--email", default=os.getenv("GMAT_EMAIL"))
+    ap.add_argument("--password", default=os.getenv("GMAT_PASSWORD"))
+    ap.add_argument("-w", "--workers", type=int, default=2, help="browsers for changed topics")
+    ap.add_argument("--lean", action="store_true")
+    a = ap.parse_args(argv)
+
+    with TopicState(a.state) as state:
+        if a.seed:
+            LOG.info("seeded %d topics", state.seed(read_results(a.seed)))
+        counts = {"unchanged": 0, "changed": 0, "new": 0, "failed": 0}
+        out = open(a.diff, "a", encoding="utf-8") if a.diff else None
+        try:
+            for url, status, diff in rescrape(state, read_manifest(a.manifest),
+                                              email=a.email, password=a.password,
+                                              workers=a.workers, snapshot=True, lean=a.lean):
+                counts[status] += 1
+                if status == "failed":
+                    LOG.warning("%s: %s", url, diff)
+                elif status == "changed":
+                    LOG.info("%s changed: %s", url, ", ".join(diff))
+                    if out:
+                        out.write(json.dumps({"url": url, "ts": round(time.time(), 3),
+                                              "diff": diff}, ensure_ascii=False) + "\n")
+        finally:
+            if out:
+                out.close()
+        total = sum(counts.values()) or 1
+        print(f"{counts} – {1 - counts['unchanged'] / total:.1%} of topics re-parsed")
+        if a.export:
+            with open_sink(a.export) as sink:
+                for url, q, data in state.results():
+                    sink.write(url, q, data)
+    return 1 if counts["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
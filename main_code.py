@@ -1,21 +1,40 @@
 # ░░░  GMAT-Club Scraper  ░░░  (CR, DS, RC, …)
+#
+# Importing this module starts nothing: selenium / undetected_chromedriver
+# are loaded by the first browser (_load_driver_stack), requests by the first
+# HttpFetcher, the Chrome version is probed on first use and cached on disk,
+# and the OpenAI client is built by the first polish call.  Parse-only code
+# pays for bs4 alone –
+# bench/bench_import.py keeps an eye on that.
 
 from __future__ import annotations
-import json, logging, os, pickle, random, re, subprocess, sys, time
+import hashlib, importlib.util, json, logging, os, pickle, queue, re, shutil, subprocess, sys, \
+    threading, time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from enum  import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, TypedDict, Union
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, TypedDict, Union)
+from urllib.parse import urlsplit
 from bs4 import BeautifulSoup, NavigableString,Tag
 
-import undetected_chromedriver as uc
-from selenium.webdriver            import Chrome
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by   import By
-from selenium.webdriver.support.ui  import WebDriverWait
-from selenium.webdriver.support     import expected_conditions as EC
-from selenium.common.exceptions     import TimeoutException
-from openai import OpenAI, OpenAIError
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome
+    from assets import AssetStore
+    from explanations import ExplanationCollector
+
+import metrics
+from dedup import DupIndex, DuplicateQuestion
+from memory import MemoryGovernor
+from page_cache import DEFAULT_ROOT, PageCache
+from polish import PolishStage
+from sessions import Account, SessionBroker, SessionError
+from textproc import (clean as basic_clean, clean_opt as _clean_opt,
+                      explode_answer_blob as _explode_answer_blob, extract as extract_question,
+                      first_choice as _first_choice, split_opts as _split_opts,
+                      split_opts_cr as _split_opts_cr, strip_rc_noise as _strip_rc_noise)
+from throttle import BLOCKED, OK, SLOW, RateLimiter, retry_after as _retry_after
 
 # ─── logging ───────────────────────────────────────────────────────
 LOG = logging.getLogger("gmat.scraper")
@@ -29,9 +48,84 @@ if not LOG.handlers:
 class QuestionType(str, Enum):
     CR="cr"; DS="ds"; RC="rc"; PS="ps"; TPA="tpa"; MSR="msr"; GRAPHS="graphs"; TABLES="tables"
 
-# …  all your CRDict / RCDict / GraphDict / …   definitions unchanged …
+class ScrapeError(RuntimeError):
+    """Page did not have the shape the parser expected (or login failed)."""
+
+class Throttled(ScrapeError):
+    """The site answered with a Cloudflare challenge / 429 instead of the page."""
+
+class CRDict(TypedDict):
+    prompt: str; options: Dict[str, str]; answer: str; difficulty: str; explanation: str
+
+class DSDict(TypedDict):
+    question: str; options: Dict[str, str]; answer: str; difficulty: str
+
+class RCQuestion(TypedDict):
+    prompt: str; options: Dict[str, str]; answer: str
+
+class RCDict(TypedDict):
+    passage: str; difficulty: str; questions: List[RCQuestion]
+
+class GraphDropdown(TypedDict):
+    prompt: str; options: List[str]; answer: str
+
+class GraphDict(TypedDict):
+    passage: str; image_url: Optional[str]; difficulty: str; questions: List[GraphDropdown]
+
+class TableRow(TypedDict):
+    cells: Dict[str, str]
+
+class TableStatement(TypedDict):
+    prompt: str; answer: Optional[str]
+
+class TableDict(TypedDict):
+    passage: str; headers: List[str]; rows: List[TableRow]
+    statements: List[TableStatement]; difficulty: str
+
+class TPADict(TypedDict):
+    passage: str; choices: List[str]
+    answer_blank1: Optional[str]; answer_blank2: Optional[str]; difficulty: str
+
+class MSRDict(TypedDict):
+    sources: List[Dict[str, Any]]; support_statements: List[Dict[str, str]]
+    impact_factors: List[Dict[str, str]]; mcq: Optional[Dict[str, Any]]; difficulty: str
+
+QuestionData = Union[CRDict, DSDict, RCDict, GraphDict, TableDict, TPADict, MSRDict, Dict[str, Any]]
+
+# ─── lazy driver stack ─────────────────────────────────────────────
+class _NotLoaded(Exception):
+    """Stand-in for selenium's exceptions until the driver stack is imported
+    – `except WebDriverException` must work (and match nothing) before that."""
+
+uc = Options = By = WebDriverWait = EC = None
+TimeoutException = WebDriverException = _NotLoaded
+_stack_lock = threading.Lock()
+
+def _load_driver_stack():
+    """Import undetected_chromedriver + selenium into this module (once)."""
+    global uc, Options, By, WebDriverWait, EC, TimeoutException, WebDriverException
+    with _stack_lock:
+        if uc is not None:
+            return
+        import undetected_chromedriver as _uc
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by   import By
+        from selenium.webdriver.support.ui  import WebDriverWait
+        from selenium.webdriver.support     import expected_conditions as EC
+        from selenium.common.exceptions     import TimeoutException, WebDriverException
+        uc = _uc
 
 # ─── detect local Chrome major version ─────────────────────────────
+# Probed once per Chrome binary and kept in DEFAULT_ROOT/chrome_version.json;
+# the entry is keyed by the binary's path + mtime, so an update re-probes.
+# (Windows reads the registry instead – that entry simply expires daily.)
+# A failed probe is remembered for the process under the same key, so hosts
+# without Chrome don't re-run it for every HttpFetcher.
+CHROME_VERSION_FILE = DEFAULT_ROOT / "chrome_version.json"
+_MAC_CHROME = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+_chrome_major: Optional[int] = None
+_chrome_error: Optional[Tuple[str, RuntimeError]] = None     # (key, error) of a failed probe
+
 def _detect_chrome_major() -> int:
     """Return the installed Chrome major version (135, 136, …)."""
     if sys.platform.startswith("darwin"):
@@ -48,11 +142,84 @@ def _detect_chrome_major() -> int:
         out = subprocess.check_output(["google-chrome", "--version"], text=True)
     return int(re.search(r"(\d+)\.", out).group(1))
 
-CHROME_MAJOR = _detect_chrome_major()
+def _chrome_key() -> str:
+    if sys.platform.startswith("win"):
+        return f"win:{int(time.time() // 86400)}"
+    exe = _MAC_CHROME if sys.platform.startswith("darwin") else shutil.which("google-chrome")
+    try:
+        return f"{exe}:{os.stat(exe).st_mtime_ns}"
+    except (OSError, TypeError):
+        return ""
+
+def chrome_major() -> int:
+    """Installed Chrome major version – probed on first call, cached on disk."""
+    global _chrome_major, _chrome_error
+    if _chrome_major is not None:
+        return _chrome_major
+    key = _chrome_key()
+    if _chrome_error is not None and _chrome_error[0] == key:
+        raise _chrome_error[1]
+    try:
+        cached = json.loads(CHROME_VERSION_FILE.read_text())
+        if key and cached.get("key") == key:
+            _chrome_major = int(cached["major"])
+            return _chrome_major
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    try:
+        _chrome_major = _detect_chrome_major()
+    except (OSError, subprocess.SubprocessError, AttributeError) as e:
+        err = RuntimeError(f"could not find the local Chrome version: {e}")
+        err.__cause__ = e
+        _chrome_error = (key, err)
+        raise err
+    if key:
+        try:
+            CHROME_VERSION_FILE.parent.mkdir(parents=True, exist_ok=True)
+            CHROME_VERSION_FILE.write_text(json.dumps({"key": key, "major": _chrome_major}))
+        except OSError:
+            pass
+    return _chrome_major
+
+def __getattr__(name: str):                     # old CHROME_MAJOR constant, now lazy
+    if name == "CHROME_MAJOR":
+        return chrome_major()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ─── driver helper ─────────────────────────────────────────────────
-@contextmanager
-def get_driver(headless: bool = True):
+# Lean browsing: the parsers read the post HTML, the spoiler blocks and the
+# img.reimg *URL* – never image bytes, fonts, ads or trackers.  `lean=True`
+# starts Chrome with the "eager" page-load strategy (drv.get returns at
+# DOMContentLoaded) and has the DevTools Network domain refuse those
+# requests by URL pattern; `block_css=True` refuses stylesheets as well.
+# GMAT Club's own scripts and the Cloudflare challenge are never blocked –
+# spoilers, DI tabs and login need them.
+LEAN_BLOCK_URLS = (
+    # images / attachments / avatars (graph images included – only the src is kept)
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*",
+    "*/download/file.php*", "*/images/avatars/*",
+    # fonts and media
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*.mp4*", "*.webm*", "*.mp3*",
+    # ads, analytics, social widgets
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*googleadservices.com*",
+    "*amazon-adsystem.com*", "*adnxs.com*", "*pubmatic.com*", "*rubiconproject.com*",
+    "*criteo.*", "*taboola.com*", "*outbrain.com*", "*quantserve.com*",
+    "*scorecardresearch.com*", "*hotjar.com*", "*facebook.net*", "*facebook.com/tr*",
+    "*connect.facebook.*", "*platform.twitter.com*", "*youtube.com/embed*",
+    "*static.cloudflareinsights.com*", "*clarity.ms*", "*bing.com/bat*",
+)
+LEAN_BLOCK_CSS = ("*.css*", "*fonts.googleapis.com*")
+
+def _new_driver(headless: bool = True, lean: bool = False, block_css: bool = False) -> Chrome:
+    with metrics.span("driver_start"):
+        drv = metrics.instrument_driver(_start_chrome(headless, lean))
+        if lean:
+            _go_lean(drv, block_css)
+        return drv
+
+def _start_chrome(headless: bool, lean: bool = False) -> Chrome:
+    _load_driver_stack()
     opts = Options()
     opts.add_argument("--no-sandbox")
     opts.add_argument("--disable-dev-shm-usage")
@@ -60,151 +227,414 @@ def get_driver(headless: bool = True):
     opts.add_argument("--disable-blink-features=AutomationControlled")
     if headless:
         opts.add_argument("--headless=new")        # Chrome ≥ 109
-    drv: Chrome = uc.Chrome(options=opts, version_main=CHROME_MAJOR)
+    if lean:
+        opts.page_load_strategy = "eager"
+        opts.add_argument("--blink-settings=imagesEnabled=false")
+    return uc.Chrome(options=opts, version_main=chrome_major())
+
+def _go_lean(drv: Chrome, block_css: bool = False):
+    urls = list(LEAN_BLOCK_URLS) + (list(LEAN_BLOCK_CSS) if block_css else [])
+    drv.execute_cdp_cmd("Network.enable", {})
+    drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+
+@contextmanager
+def get_driver(headless: bool = True, lean: bool = False, block_css: bool = False):
+    drv = _new_driver(headless, lean, block_css)
     try:
         yield drv
     finally:
         drv.quit()
 
-# ─── cookies / login  (single fixed file) ──────────────────────────
-COOKIE_FILE = (Path(__file__).resolve().parent if "__file__" in globals() else Path.cwd()) \
-              / "emmarose0012_gmail_com.pkl"
+# ─── event-driven waits (instead of fixed time.sleep) ───────────────
+# Each wait returns as soon as its condition holds.  The time actually spent
+# is booked per (question type, step) against the sleep it replaced, so
+# wait_report() shows what every question type saves.
+_OLD_SLEEPS = {"cookies": 2.7, "login": 4.0, "spoiler": 1.0, "answer": 0.4, "tpa": 0.6}
+_WAITS: Dict[Tuple[str, str], List[float]] = {}
+_WAITS_LOCK = threading.Lock()
+_ctx = threading.local()               # .q_type (and .url) of the page being parsed
+metrics.REGISTRY.default_labels = lambda: {"q_type": getattr(_ctx, "q_type", "-")}
+
+_WAIT_CONTENT_JS = """
+const [target, ms] = arguments, done = arguments[arguments.length - 1];
+const find = () => typeof target === 'string' ? document.querySelector(target) : target;
+const ok = () => { const el = find(); return !!el && el.textContent.trim().length > 0; };
+if (ok()) return done(true);
+const root = typeof target === 'string' ? document.body : target;
+const obs = new MutationObserver(() => { if (ok()) { obs.disconnect(); clearTimeout(t); done(true); } });
+obs.observe(root, {childList: true, subtree: true, characterData: true});
+const t = setTimeout(() => { obs.disconnect(); done(ok()); }, ms);
+"""
+# innerText-like text that also works on display:none nodes
+_DOM_TEXT_JS = """
+window.__gcText = window.__gcText || (el => {
+  const c = el.cloneNode(true);
+  c.querySelectorAll('br').forEach(b => b.replaceWith('\\n'));
+  c.querySelectorAll('div,p,li,tr').forEach(b => b.append('\\n'));
+  return c.textContent.replace(/[ \\t\\u00a0]+/g, ' ').replace(/ *\\n */g, '\\n')
+                      .replace(/\\n{2,}/g, '\\n').trim();
+});
+"""
+_ANSWER_TEXTS_JS = _DOM_TEXT_JS + """
+return [...document.querySelectorAll('.answer-block')].map(b => {
+  const r = b.querySelector('.downRow');
+  return r ? window.__gcText(r) : '';
+});
+"""
+_ELEMENT_TEXT_JS = _DOM_TEXT_JS + "return window.__gcText(arguments[0]);"
+
+@contextmanager
+def _timed_wait(step: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        key = (getattr(_ctx, "q_type", "-"), step)
+        with _WAITS_LOCK:
+            rec = _WAITS.setdefault(key, [0, 0.0, 0.0])
+            rec[0] += 1; rec[1] += dt; rec[2] += _OLD_SLEEPS[step] - dt
+        metrics.observe("wait_seconds", dt, step=step)
+
+def wait_report() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """{q_type: {step: {"n", "waited_s", "saved_s"}}} since start / last reset."""
+    out: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with _WAITS_LOCK:
+        for (q, step), (n, waited, saved) in sorted(_WAITS.items()):
+            out.setdefault(q, {})[step] = {"n": n, "waited_s": round(waited, 3),
+                                           "saved_s": round(saved, 3)}
+    return out
+
+def reset_wait_report():
+    with _WAITS_LOCK:
+        _WAITS.clear()
+
+def _wait_for_content(drv: Chrome, target, timeout: float) -> bool:
+    """MutationObserver wait until `target` (element or CSS) has text."""
+    try:
+        ok = bool(drv.execute_async_script(_WAIT_CONTENT_JS, target, int(timeout * 1000)))
+    except WebDriverException:
+        ok = False
+    if not ok and timeout > 0:
+        metrics.inc("timeouts_total", where="content")
+    return ok
+
+def _wait_ready(drv: Chrome, timeout: float = 10):
+    try:
+        WebDriverWait(drv, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script("return document.readyState") in ("interactive", "complete"))
+    except TimeoutException:
+        metrics.inc("timeouts_total", where="ready")
+
+# ─── cookies / login  (default jar; several accounts: sessions.py) ──
+# GMAT_SITE points login / cookies at another host (bench/standin.py);
+# GMAT_COOKIE_FILE moves the default jar.
+SITE = os.getenv("GMAT_SITE", "https://gmatclub.com").rstrip("/")
+COOKIE_FILE = Path(os.getenv("GMAT_COOKIE_FILE") or
+                   (Path(__file__).resolve().parent if "__file__" in globals() else Path.cwd())
+                   / "emmarose0012_gmail_com.pkl")
+
+# one element lookup in the browser instead of shipping page_source back
+_LOGGED_IN_JS = "return !!document.querySelector('a[href*=\"mode=logout\"], a[href*=\"logout\"]');"
 
 def _is_logged_in(drv: Chrome) -> bool:
-    return "logout" in drv.page_source.lower()
+    try:
+        return bool(drv.execute_script(_LOGGED_IN_JS))
+    except WebDriverException:
+        return False
 
-def _load_cookies(drv: Chrome) -> bool:
+def _load_cookies(drv: Chrome, cookie_file: Path = COOKIE_FILE) -> bool:
     """Return True ⇢ cookies existed *and* we end up logged-in."""
-    if not COOKIE_FILE.exists():
+    if not cookie_file.exists():
         return False
-    # 1️⃣ open the domain first so add_cookie will accept them
-    drv.get("https://gmatclub.com/forum/")
-    time.sleep(1.2)
-    for c in pickle.loads(COOKIE_FILE.read_bytes()):
-        try:
-            drv.add_cookie(c)
-        except Exception:
-            pass    # skip expired / incompatible cookies
-    drv.refresh()
-    time.sleep(1.5)
+    with _timed_wait("cookies"):
+        # 1️⃣ open the domain first so add_cookie will accept them
+        drv.get(f"{SITE}/forum/")
+        _wait_ready(drv)
+        for c in pickle.loads(cookie_file.read_bytes()):
+            try:
+                drv.add_cookie(c)
+            except Exception:
+                pass    # skip expired / incompatible cookies
+        drv.refresh()
+        _wait_ready(drv)
     ok = _is_logged_in(drv)
     LOG.info("cookies loaded -> logged-in: %s", ok)
     return ok
 
-def _save_cookies(drv: Chrome):
-    COOKIE_FILE.write_bytes(pickle.dumps(drv.get_cookies()))
-    LOG.info("✅ cookies saved → %s", COOKIE_FILE)
+def _save_cookies(drv: Chrome, cookie_file: Path = COOKIE_FILE):
+    tmp = cookie_file.with_name(cookie_file.name + ".tmp")   # other workers read it
+    tmp.write_bytes(pickle.dumps(drv.get_cookies()))
+    os.replace(tmp, cookie_file)
+    LOG.info("✅ cookies saved → %s", cookie_file)
 
-def _login(drv: Chrome, email: str, pw: str, timeout: int = 30):
+def _login(drv: Chrome, email: str, pw: str, timeout: int = 30,
+           cookie_file: Path = COOKIE_FILE):
     """Manual login (one-time); saves cookies for future runs."""
-    drv.get("https://gmatclub.com/forum/ucp.php?mode=login")
+    drv.get(f"{SITE}/forum/ucp.php?mode=login")
     WebDriverWait(drv, timeout).until(EC.presence_of_element_located((By.NAME, "username")))
     drv.find_element(By.NAME, "username").send_keys(email)
     drv.find_element(By.NAME, "password").send_keys(pw)
     drv.find_element(By.NAME, "login").click()
-    time.sleep(4)                          # Cloudflare / redirect
+    with _timed_wait("login"):             # Cloudflare / redirect
+        try:
+            WebDriverWait(drv, timeout, poll_frequency=0.2).until(
+                lambda d: "mode=login" not in d.current_url
+                          or "just a moment" in d.title.lower())
+        except TimeoutException:
+            metrics.inc("timeouts_total", where="login")
 
     if "just a moment" in drv.title.lower():
         input("⚠️  Solve CAPTCHA in the browser, then press <ENTER> here…")
 
     if not WebDriverWait(drv, timeout).until(lambda d: _is_logged_in(d)):
         raise ScrapeError("Login failed – check credentials")
-    _save_cookies(drv)
-
+    _save_cookies(drv, cookie_file)
+
+def _ensure_login(drv: Chrome, email: str, pw: str, cookie_file: Path = COOKIE_FILE):
+    with metrics.span("login"):
+        if not _load_cookies(drv, cookie_file):
+            _login(drv, email, pw, cookie_file=cookie_file)
+
+def _login_as(drv: Chrome, broker: SessionBroker, acct: Account):
+    """Log `drv` in as `acct`; a stale jar is renewed once, by whichever worker is first."""
+    with metrics.span("login"):
+        if broker.valid(acct) and _load_cookies(drv, acct.cookie_file):
+            return
+        broker.refresh(acct, login=lambda a: _login(drv, a.email, a.password,
+                                                    cookie_file=a.cookie_file))
+        if not _is_logged_in(drv) and not _load_cookies(drv, acct.cookie_file):
+            raise ScrapeError(f"no usable session for {acct.key}")
+
+def refresh_session(acct: Account, headless: bool = True):
+    """SessionBroker login hook: log `acct` in with a throw-away browser."""
+    with get_driver(headless=headless) as drv:
+        _login(drv, acct.email, acct.password, cookie_file=acct.cookie_file)
+
+
+# ─── driver pool (long-lived, logged-in browsers) ──────────────────
+class DriverPool:
+    """
+    Keeps up to `size` authenticated Chrome sessions alive between pages.
 
-# ─── basic cleaner (whitespace only) ────────────────────────────────
-def basic_clean(t:str)->str: return re.sub(r"\\s+"," ", t.replace("\\r"," ").replace("\\n"," ")).strip()
+        with DriverPool(2, email=…, password=…) as pool:
+            with pool.checkout() as drv:
+                drv.get(url)
 
-# ─── optional GPT polish (spacing) ─────────────────────────────────
-_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY")) if os.getenv("OPENAI_API_KEY") else None
-def _polish(d:QuestionData,q:QuestionType)->QuestionData:
-    if not _client: return d
-    try:
-        r=_client.chat.completions.create(
-            model=os.getenv("GPT_POLISH_MODEL","gpt-4o-mini"),
-            response_format={"type":"json_object"},
-            messages=[{"role":"system","content":"Fix spacing only."},{"role":"user","content":json.dumps({"type":q.value,"data":d})}],
-            max_tokens=2048)
-        return json.loads(r.choices[0].message.content)
-    except (OpenAIError,json.JSONDecodeError):
-        LOG.warning("Polish failed"); return d
+    A driver that fails the health check on checkout, or that raised a
+    WebDriverException while checked out, is quit and replaced lazily.
 
-# ─── helpers --------------------------------------------------------
-def _split_opts(raw: str) -> tuple[str, dict[str, str]]:
+    With a `broker`, each browser is logged in as the account the broker
+    assigns, and every checkout waits for that account's rate budget.
+    `lean` / `block_css` start the browsers in lean mode (see _new_driver).
+    With a `governor`, a browser past its page or memory limit is quit on
+    return and replaced by the next checkout (see memory.py).
     """
-    Works for
-        (A) text   •  A- text   •  A) text   •  (A). text
-    Returns (stem, {"A": ..., "B": ...})
-    """
-    pattern = r"""
-        (?:^|\n|\r)            # start of line
-        [\s\(\[]*              # optional whitespace / opening bracket
-        (?P<lbl>[A-E])         # capture A-E
-        [\)\].\-–:]?           # closing ) ] . : - –
-        \s+                    # at least one space before the real text
-    """
-    matches = list(re.finditer(pattern, raw, re.I | re.VERBOSE))
-    if not matches:
-        return raw.strip(), {}
 
-    stem = raw[: matches[0].start()].strip()
-    opts = {}
+    def __init__(self, size: int = 1, *, email: Optional[str] = None,
+                 password: Optional[str] = None, headless: bool = True,
+                 broker: Optional[SessionBroker] = None,
+                 lean: bool = False, block_css: bool = False,
+                 governor: Optional[MemoryGovernor] = None):
+        if broker is None and not (email and password):
+            raise ValueError("DriverPool needs email + password or a SessionBroker")
+        self.size, self.email, self.password, self.headless = size, email, password, headless
+        self.lean, self.block_css = lean, block_css
+        self.broker, self.governor = broker, governor
+        self._idle: "queue.Queue[Chrome]" = queue.Queue()
+        self._lock    = threading.Lock()
+        self._spawned = 0
+        self._closed  = False
+        self._account: Dict[int, Account] = {}        # id(driver) → account
+
+    # -- lifecycle -------------------------------------------------------
+    def _spawn(self) -> Chrome:
+        drv = _new_driver(self.headless, self.lean, self.block_css)
+        acct = None
+        try:
+            if self.broker is None:
+                _ensure_login(drv, self.email, self.password)
+            else:
+                acct = self.broker.assign()
+                _login_as(drv, self.broker, acct)
+                self._account[id(drv)] = acct
+        except Exception:
+            if acct is not None:
+                self.broker.release(acct)
+            _quit_quietly(drv)
+            raise
+        LOG.info("pool: new driver ready%s", f" ({acct.key})" if acct else "")
+        return drv
+
+    @staticmethod
+    def _healthy(drv: Chrome) -> bool:
+        try:
+            return drv.execute_script("return 1") == 1 and bool(drv.window_handles)
+        except Exception:
+            return False
+
+    def _acquire(self, timeout: Optional[float]) -> Chrome:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                grow = self._spawned < self.size
+                if grow:
+                    self._spawned += 1
+            if grow:
+                try:
+                    return self._spawn()
+                except Exception:
+                    with self._lock:
+                        self._spawned -= 1
+                    raise
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("no idle driver in pool")
+            try:                           # poll so a discarded slot can be re-spawned
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    def _discard(self, drv: Chrome, recycled: bool = False):
+        acct = self._account.pop(id(drv), None)
+        if acct is not None:
+            self.broker.release(acct)
+        if self.governor is not None:
+            self.governor.forget(id(drv))
+        _quit_quietly(drv)
+        with self._lock:
+            self._spawned -= 1
+        if not recycled:
+            LOG.warning("pool: driver discarded (%s/%s alive)", self._spawned, self.size)
+
+    def _release(self, drv: Chrome):
+        """Back to the idle queue – or out, if the governor says it has served enough."""
+        if self.governor is not None and self.governor.after_page(
+                id(drv), _driver_pids(drv), getattr(_ctx, "q_type", "-"),
+                getattr(_ctx, "url", None)):
+            self._discard(drv, recycled=True)
+        else:
+            self._idle.put(drv)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+        drv = self._acquire(timeout)
+        if not self._healthy(drv):
+            self._discard(drv)
+            drv = self._acquire(timeout)
+        acct = self._account.get(id(drv))
+        if acct is not None:
+            with metrics.span("throttle"):
+                self.broker.throttle(acct)
+        try:
+            yield drv
+        except WebDriverException as e:
+            if isinstance(e, TimeoutException) and self._healthy(drv):
+                self._release(drv)
+            else:
+                self._discard(drv)
+            raise
+        except BaseException:
+            self._release(drv)
+            raise
+        else:
+            self._release(drv)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                drv = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            acct = self._account.pop(id(drv), None)
+            if acct is not None:
+                self.broker.release(acct)
+            _quit_quietly(drv)
+        self._spawned = 0
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc): self.close()
+
+def _quit_quietly(drv: Chrome):
+    try:
+        drv.quit()
+    except Exception:
+        pass
+
+def _driver_pids(drv: Chrome) -> List[int]:
+    """chromedriver's pid and – undetected_chromedriver starts it itself – Chrome's."""
+    service = getattr(getattr(drv, "service", None), "process", None)
+    return [p for p in (getattr(drv, "browser_pid", None), getattr(service, "pid", None)) if p]
 
-    for i, m in enumerate(matches):
-        start = m.end()                              # ← begin **after** label/sep
-        end   = matches[i + 1].start() if i + 1 < len(matches) else len(raw)
-        label = m.group("lbl").upper()
-        opts[label] = raw[start:end].strip()
 
-    return stem, opts
+# ─── optional GPT polish (spacing) – batching / cache in polish.py ──
+_polisher: Optional[PolishStage] = None
+_polisher_lock = threading.Lock()
 
+def _polish_stage() -> PolishStage:
+    global _polisher
+    with _polisher_lock:
+        if _polisher is None:
+            _polisher = PolishStage()
+        return _polisher
 
+def _polish(d:QuestionData,q:QuestionType)->QuestionData:
+    return _polish_stage().polish_many([(d, q)])[0]
 
+# ─── helpers --------------------------------------------------------
 def _open_spoiler(d:Chrome):
-    try: d.find_element(By.CSS_SELECTOR,".upRow a").click(); time.sleep(1)
-    except: pass
+    """Click the first spoiler open – unless its body is already in the DOM."""
+    with _timed_wait("spoiler"):
+        try:
+            if _wait_for_content(d, ".downRow", 0):
+                return                            # hidden OA is readable as-is
+            d.find_element(By.CSS_SELECTOR,".upRow a").click()
+            _wait_for_content(d, ".downRow", _OLD_SLEEPS["spoiler"])
+        except Exception:
+            pass
 
 def _get_difficulty(d:Chrome):
     try: return d.find_element(By.CLASS_NAME,"tag_css_link").text.strip()
     except: return ""
 
-# --- put near the other regex helpers ---------------------------------
-_OA_RE = re.compile(
-    r"""\b          # word-boundary
-        (?:OA|Answer|Correct)   # usual keywords
-        [\s\:\-\–]*             # :, -, – or just spaces
-        ([A-E])                 # capture A … E
-        \b""",
-    re.I | re.X,
-)
-
-def _first_choice(txt: str) -> str:
+def _get_answer_texts(d: Chrome, step: str = "answer") -> List[str]:
     """
-    Extract the FIRST A-E choice from a spoiler block.
-    Falls back to the first stand-alone capital A-E if no keyword present.
+    Raw downRow text of every answer-block.  Official answers that are
+    already in the DOM (just hidden) are read in one script call; only the
+    empty ones are clicked open and waited on.
     """
-    m = _OA_RE.search(txt)
-    if not m:
-        # fall-back: any isolated capital A-E
-        m = re.search(r"\b([A-E])\b", txt)
-    return m.group(1).upper() if m else ""
-
-
+    with _timed_wait(step):
+        try:
+            texts = list(d.execute_script(_ANSWER_TEXTS_JS) or [])
+        except WebDriverException:
+            texts = []
+        if all(texts):
+            return texts
+        blocks = d.find_elements(By.CLASS_NAME, "answer-block")
+        texts += [""] * (len(blocks) - len(texts))
+        for i, blk in enumerate(blocks):
+            if texts[i]:
+                continue
+            try:                               # open the spoiler
+                blk.find_element(By.CLASS_NAME, "btn-show-answer").click()
+            except Exception:
+                pass
+            try:
+                row = blk.find_element(By.CLASS_NAME, "downRow")
+                _wait_for_content(d, row, _OLD_SLEEPS["answer"])
+                texts[i] = d.execute_script(_ELEMENT_TEXT_JS, row) or ""
+            except Exception:
+                texts[i] = ""
+    return texts
 
 def _get_answers(d: Chrome) -> List[str]:
-    answers = []
-    for blk in d.find_elements(By.CLASS_NAME, "answer-block"):
-        try:                                   # open the spoiler
-            blk.find_element(By.CLASS_NAME, "btn-show-answer").click()
-            time.sleep(0.4)
-        except Exception:
-            pass
-        try:
-            raw = blk.find_element(By.CLASS_NAME, "downRow").text
-            answers.append(_first_choice(raw))
-        except Exception:
-            answers.append("")
-    return answers
+    return [_first_choice(t) if t else "" for t in _get_answer_texts(d)]
 
 
 def _parse_di_grid(rows, yes_is_first: bool, labels=("Supported",
@@ -255,87 +685,12 @@ def _parse_multichoice(tbl) -> Dict[str, Any]:
             official = txt
     return {"choices": choices, "official": official}
 
-def _clean_opt(txt: str) -> str:
-    """
-    Strip GMAT-Club boiler-plate that sometimes gets appended
-    to the last answer choice.
-    """
-    # anything that starts a spoiler / footer
-    cut_marks = [r"\nShow\s*Answer",         #  Show\nAnswer
-                 r"\n[_]{5,}",               #  _____
-                 r"\nNew to the GMAT Club\?"]
-    for mark in cut_marks:
-        m = re.search(mark, txt, flags=re.I)
-        if m:
-            txt = txt[: m.start()]
-            break
-    return txt.strip()
-
-# ─── CR-specific option splitter ────────────────────────────────────
-def _split_opts_cr(raw: str):
-    """
-    Accepts answer choices written as:
-       A- text
-       B- text
-       C- text   …   (also tolerates lowercase a-, b-, etc.)
-    Returns:  stem_text,  {"A":choiceA, "B":choiceB, ...}
-    """
-    # Split the blob the *first* time a line starts with  A- / B- / ...
-    parts = re.split(r"(?m)^[A-Ea-e]-\s*", raw.strip())
-    if len(parts) == 1:                      # no choices found
-        return raw.strip(), {}
-
-    stem = parts[0].strip()
-    choices = parts[1:]
-    letters = list("ABCDE")[: len(choices)]
-    return stem, {ltr: txt.strip() for ltr, txt in zip(letters, choices)}
-
-
-# ─── RC noise-filter helpers ────────────────────────────────────────
-_RC_NOISE_PAT = re.compile(
-    r"""
-    ^\s*(?:                       # entire line contains ONLY …
-        \d{2}:\d{2} |                #   00:00 timers
-        Show\s+Answer | Hide | Show\s+Spoiler |
-        History | Add\s+Mistake |
-        Difficulty: | Question\s+Stats: |
-        Date | Time | Result | not\s+attempted\s+yet
-    )\s*$""",
-    re.I | re.X
-)
-
-def _strip_rc_noise(block: str) -> str:
-    """Remove GC timer / statistics garbage from a question-stem block."""
-    return "\n".join(
-        ln for ln in block.splitlines() if not _RC_NOISE_PAT.match(ln)
-    ).strip()
 def _remove_timer(html: str) -> str:
     """Delete every <div id="rc_timer_placeholder_* … </div> block."""
     # non-greedy so we kill exactly one widget at a time
     return re.sub(r'<div id="rc_timer_placeholder_.*?</div>\s*</div>', '',
                   html, flags=re.S|re.I)
 
-_QA_LINE_RE = re.compile(r"\b(\d+)\s*[\.\:\-]?\s*([A-E])\b", re.I)
-
-def _explode_answer_blob(blob: str, n_q: int) -> list[str]:
-    """
-    If `blob` contains several '1. A  2.B' style answers, return them as
-    a list of length `n_q`.  Otherwise return [first_choice(blob)].
-    """
-    found = _QA_LINE_RE.findall(blob)
-    if len(found) >= n_q:                     # looks like a combined list
-        # place by question number (1-based in blob)
-        out = [""] * n_q
-        for num, letter in found:
-            idx = int(num) - 1
-            if 0 <= idx < n_q:
-                out[idx] = letter.upper()
-        return out
-    # fallback – treat blob as a single spoiler (old behaviour)
-    return [_first_choice(blob)]
-
-
-
 # ─── CR parser (fixed) ─────────────────────────────────────────────
 def _parse_cr(d: Chrome) -> CRDict:
     WebDriverWait(d, 15).until(
@@ -343,15 +698,8 @@ def _parse_cr(d: Chrome) -> CRDict:
     )
     raw = d.find_element(By.CSS_SELECTOR, "div.item.text").text
 
-    # 1️⃣ cut everything that follows the first “Show Spoiler”
-    raw = re.split(r"Show\s+Spoiler", raw, 1)[0]
-    raw = basic_clean(raw)
-
-    # 2️⃣ try the A- / B- splitter first; if it fails → generic splitter
-    stem, opts = _split_opts_cr(raw)
-    if not opts:
-        stem, opts = _split_opts(raw)
-        opts = {k: _clean_opt(v) for k, v in opts.items()}
+    # 1️⃣ cut at the first “Show Spoiler”, 2️⃣ A- / B- splitter, else generic
+    stem, opts = extract_question(raw, cr=True)
     # 3️⃣ OA & metadata
     _open_spoiler(d)
     ans = (_get_answers(d) or [""])[0]
@@ -370,12 +718,8 @@ def _parse_ds(d: Chrome) -> DSDict:
     WebDriverWait(d, 20).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, "div.item.text"))
     )
-    raw = basic_clean(d.find_element(By.CSS_SELECTOR, "div.item.text").text)
-
-    stem, opts = _split_opts(raw)
-
-    # ── scrub each answer choice ────────────────────────────────
-    opts = {k: _clean_opt(v) for k, v in opts.items()}
+    # clean → split → scrub each answer choice
+    stem, opts = extract_question(d.find_element(By.CSS_SELECTOR, "div.item.text").text)
 
     _open_spoiler(d)
     answers = _get_answers(d)
@@ -404,14 +748,20 @@ def _parse_rc(d: Chrome) -> RCDict:
 
     # Raw HTML for Q&A block
     raw_html = boxes[1].get_attribute('innerHTML')
-    # Strip out GMAT Timer placeholders
-    raw_html = re.sub(r'<div id="rc_timer_placeholder_\d+">.*?</div>', '', raw_html, flags=re.DOTALL)
-    soup = BeautifulSoup(raw_html, 'html.parser')
 
     # Difficulty and official answers
     difficulty = _get_difficulty(d)
     answers = _get_answers(d)
 
+    qlist = _rc_questions(raw_html, answers)
+    return RCDict(passage=passage_text, difficulty=difficulty, questions=qlist)
+
+def _rc_questions(raw_html: str, answers: List[str]) -> List[RCQuestion]:
+    """Bold <span> stems followed by (A)…(E) text nodes → RCQuestion list."""
+    # Strip out GMAT Timer placeholders
+    raw_html = re.sub(r'<div id="rc_timer_placeholder_\d+">.*?</div>', '', raw_html, flags=re.DOTALL)
+    soup = BeautifulSoup(raw_html, 'html.parser')
+
     # Find question stems and options
     qlist = []
     stems = soup.find_all('span', style=lambda v: v and 'font-weight: bold' in v)
@@ -433,19 +783,15 @@ def _parse_rc(d: Chrome) -> RCDict:
             current = current.next_sibling
         oa = answers[idx] if idx < len(answers) else ""
         qlist.append(RCQuestion(prompt=stem, options=opts, answer=oa))
-
-    return RCDict(passage=passage_text, difficulty=difficulty, questions=qlist)
+    return qlist
 
 # ─── PS parser ──────────────────────────────────────────────────────
 def _parse_ps(d: Chrome) -> DSDict:
     WebDriverWait(d, 20).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, "div.item.text"))
     )
-    raw = basic_clean(d.find_element(By.CSS_SELECTOR, "div.item.text").text)
-    stem, opts = _split_opts(raw)
-
-    # ── scrub each answer choice ────────────────────────────────
-    opts = {k: _clean_opt(v) for k, v in opts.items()}
+    # clean → split → scrub each answer choice
+    stem, opts = extract_question(d.find_element(By.CSS_SELECTOR, "div.item.text").text)
 
     _open_spoiler(d)
     answers = _get_answers(d)
@@ -502,13 +848,8 @@ def _parse_graphs(d: Chrome) -> GraphDict:
 
     # 4) open spoiler → grab OAs (format: "Drop-down 1:  D", …)
     _open_spoiler(d)
-    oa_blob = (_get_answers(d) or [""])[0]           # one big string
-    for line in oa_blob.split("\n"):
-        m = re.match(r"\s*Drop[- ]?down\s+(\d+)\s*:\s*([A-Z])", line, re.I)
-        if m:
-            idx = int(m.group(1)) - 1                # 1-based in page ⇒ 0-based list
-            if 0 <= idx < len(q_list):
-                q_list[idx]["answer"] = m.group(2)
+    oa_blob = (_get_answer_texts(d) or [""])[0]      # one big string
+    _fill_dropdown_answers(q_list, oa_blob)
 
     return GraphDict(
         passage    = passage,
@@ -517,6 +858,14 @@ def _parse_graphs(d: Chrome) -> GraphDict:
         questions  = q_list,
     )
 
+def _fill_dropdown_answers(q_list: List[GraphDropdown], oa_blob: str):
+    for line in oa_blob.split("\n"):
+        m = re.match(r"\s*Drop[- ]?down\s+(\d+)\s*:\s*([A-Z])", line, re.I)
+        if m:
+            idx = int(m.group(1)) - 1                # 1-based in page ⇒ 0-based list
+            if 0 <= idx < len(q_list):
+                q_list[idx]["answer"] = m.group(2)
+
 # ─── TABLES parser ──────────────────────────────────────────────────
 def _parse_tables(d: Chrome) -> TableDict:
     """
@@ -594,14 +943,7 @@ def _parse_tpa(d: Chrome) -> TPADict:
     # --- open spoiler & grab official mappings ----------------------
     answer1 = answer2 = None
     try:
-        d.find_element(By.CSS_SELECTOR, ".answer-block a").click()
-        time.sleep(0.6)
-        lines = (d.find_element(By.CSS_SELECTOR, ".answer-block .downRow")
-                   .text.strip().split("\n"))
-        mapping = {int(l.split(":", 1)[0]): l.split(":", 1)[1].strip()
-                   for l in lines if ":" in l}
-        answer1 = mapping.get(1)
-        answer2 = mapping.get(2)
+        answer1, answer2 = _tpa_answers((_get_answer_texts(d, step="tpa") or [""])[0])
     except Exception:
         pass
 
@@ -613,6 +955,12 @@ def _parse_tpa(d: Chrome) -> TPADict:
         difficulty    = _get_difficulty(d),
     )
 
+def _tpa_answers(blob: str) -> tuple[Optional[str], Optional[str]]:
+    lines = blob.strip().split("\n")
+    mapping = {int(l.split(":", 1)[0]): l.split(":", 1)[1].strip()
+               for l in lines if ":" in l}
+    return mapping.get(1), mapping.get(2)
+
 # ─── MSR parser ─────────────────────────────────────────────────────
 def _parse_msr(d: Chrome) -> MSRDict:
     WebDriverWait(d, 25).until(
@@ -675,6 +1023,641 @@ def _parse_msr(d: Chrome) -> MSRDict:
         mcq                = mcq,
         difficulty         = _get_difficulty(d)
     )
+# ─── snapshot parsers (one page_source, zero per-element RPCs) ─────
+# Bump PARSER_VERSION whenever a parser or text helper changes its output:
+# cached results from older versions are then re-parsed by reparse_cache().
+PARSER_VERSION = 3
+
+# Same output shapes as the live parsers above, but they work on a single
+# HTML string – taken once after the spoilers are open, or loaded from disk.
+_BS_FEATURES = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+_BLOCK_TAGS  = {"address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+                "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+                "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "option",
+                "p", "pre", "section", "table", "tbody", "thead", "tfoot", "tr", "ul"}
+_BLOCK_MARK  = "\x00"                  # block edge; runs of them = one line break
+_BLOCK_RUN_RE = re.compile(r"[ \x00]*\x00[ \x00]*")
+_SKIP_TAGS   = {"script", "style", "noscript", "template", "head"}
+
+_OPEN_SPOILERS_JS = """
+const seen = new Set();
+const first = document.querySelector('.upRow a');
+if (first) seen.add(first);
+document.querySelectorAll('.answer-block .btn-show-answer').forEach(b => seen.add(b));
+seen.forEach(el => { try { el.click(); } catch (e) {} });
+return seen.size;
+"""
+_SPOILERS_READY_JS = """
+return [...document.querySelectorAll('.answer-block .downRow')]
+       .every(el => el.textContent.trim().length > 0);
+"""
+
+def _inner_text(el: Tag, *, skip_spoilers: bool = True) -> str:
+    """
+    Rough equivalent of WebElement.text for a soup node: block elements and
+    <br> become newlines, runs of whitespace collapse.  Spoiler bodies
+    (.downRow) are skipped by default because the live parsers read the
+    post text before clicking them open.
+    """
+    out: List[str] = []
+
+    def walk(node: Tag):
+        for c in node.children:
+            if isinstance(c, NavigableString):
+                if type(c) is NavigableString:
+                    out.append(re.sub(r"\s+", " ", str(c)))
+                continue
+            if c.name in _SKIP_TAGS:
+                continue
+            if "display:none" in c.get("style", "").replace(" ", ""):
+                continue
+            if skip_spoilers and "downRow" in c.get("class", []):
+                continue
+            if c.name == "br":
+                out.append("\n")
+            elif c.name in ("td", "th"):
+                walk(c); out.append(" ")
+            elif c.name in _BLOCK_TAGS:
+                out.append(_BLOCK_MARK); walk(c); out.append(_BLOCK_MARK)
+            else:
+                walk(c)
+
+    walk(el)
+    txt = _BLOCK_RUN_RE.sub("\n", "".join(out))
+    return re.sub(r" *\n *", "\n", txt).strip(" \n")
+
+def _cls(el: Tag) -> str:
+    """Class attribute as a string – same as get_attribute("class")."""
+    return " ".join(el.get("class", []))
+
+def _need(soup: Tag, css: str) -> Tag:
+    el = soup.select_one(css)
+    if el is None:
+        raise ScrapeError(f"snapshot has no {css!r}")
+    return el
+
+def _snap_difficulty(soup: BeautifulSoup) -> str:
+    el = soup.select_one(".tag_css_link")
+    return _inner_text(el) if el else ""
+
+def _snap_answer_texts(soup: BeautifulSoup) -> List[str]:
+    out = []
+    for blk in soup.select(".answer-block"):
+        dr = blk.select_one(".downRow")
+        out.append(_inner_text(dr, skip_spoilers=False) if dr else "")
+    return out
+
+def _snap_answers(soup: BeautifulSoup) -> List[str]:
+    return [_first_choice(t) if t else "" for t in _snap_answer_texts(soup)]
+
+def _snap_rows(tbl: Tag) -> List[Tag]:
+    trs = tbl.find_all("tr")
+    if trs:
+        head = _inner_text(trs[0])
+        if "Yes" in head and "No" in head:
+            return trs[1:]
+    return trs
+
+def _snap_binary_grid(tbl: Tag) -> List[Dict[str, str]]:
+    out = []
+    for tr in _snap_rows(tbl):
+        tds = tr.find_all("td")
+        if len(tds) < 3:
+            continue
+        off = "Yes" if "official_answer" in _cls(tds[0]) else "No"
+        out.append({"statement": _inner_text(tds[2]), "official": off})
+    return out
+
+def _snap_multichoice(tbl: Tag) -> Dict[str, Any]:
+    choices, official = [], None
+    for tr in _snap_rows(tbl):
+        tds = tr.find_all("td")
+        if len(tds) < 2:
+            continue
+        txt = _inner_text(tds[1])
+        choices.append(txt)
+        if "official_answer" in _cls(tds[0]):
+            official = txt
+    return {"choices": choices, "official": official}
+
+def _snap_cr(soup: BeautifulSoup) -> CRDict:
+    stem, opts = extract_question(_inner_text(_need(soup, "div.item.text")), cr=True)
+    return CRDict(
+        prompt      = stem,
+        options     = opts,
+        answer      = (_snap_answers(soup) or [""])[0],
+        difficulty  = _snap_difficulty(soup),
+        explanation = ""
+    )
+
+def _snap_ds(soup: BeautifulSoup) -> DSDict:          # DS and PS share a layout
+    stem, opts = extract_question(_inner_text(_need(soup, "div.item.text")))
+    return DSDict(
+        question   = stem,
+        options    = opts,
+        answer     = (_snap_answers(soup) or [""])[0],
+        difficulty = _snap_difficulty(soup),
+    )
+
+def _snap_rc(soup: BeautifulSoup) -> RCDict:
+    wrapper = _need(soup, ".bbcodeBoxOut")
+    boxes = wrapper.find_all(class_="bbcodeBoxIn", recursive=False)
+    if len(boxes) < 2:
+        raise ScrapeError("RC page did not expose passage + questions")
+    return RCDict(
+        passage    = basic_clean(_inner_text(boxes[0])),
+        difficulty = _snap_difficulty(soup),
+        questions  = _rc_questions(boxes[1].decode_contents(), _snap_answers(soup)),
+    )
+
+def _snap_graphs(soup: BeautifulSoup) -> GraphDict:
+    body = _need(soup, "div.item.text")
+    img  = soup.select_one("img.reimg")
+    q_list: List[GraphDropdown] = []
+    for sel in soup.select("select.di_graph_dropdown"):
+        prev = sel.previous_sibling
+        while prev is not None and not isinstance(prev, NavigableString):
+            prev = prev.previous_sibling
+        q_list.append(GraphDropdown(
+            prompt  = str(prev).strip() if prev is not None else "",
+            options = [_inner_text(o) for o in sel.find_all("option") if o.get("value")],
+            answer  = "",
+        ))
+    _fill_dropdown_answers(q_list, (_snap_answer_texts(soup) or [""])[0])
+    return GraphDict(
+        passage    = basic_clean(_inner_text(body)),
+        image_url  = img.get("src") if img else None,
+        difficulty = _snap_difficulty(soup),
+        questions  = q_list,
+    )
+
+def _snap_tables(soup: BeautifulSoup) -> TableDict:
+    passage = basic_clean(_inner_text(_need(soup, "div.item.text")))
+    headers, row_objs = [], []
+    tbl = soup.select_one("table.stoker.table-sortable")
+    if tbl is not None:
+        headers = [_inner_text(th) for th in tbl.find_all("th")]
+        for tr in tbl.find_all("tr")[1:]:
+            cells = [_inner_text(td) for td in tr.find_all("td")]
+            if cells:
+                row_objs.append(TableRow(cells=dict(zip(headers, cells))))
+
+    statement_list: List[TableStatement] = []
+    diag = soup.select_one("table.stoker.di")
+    if diag is not None:
+        for tr in diag.find_all("tr")[1:]:
+            tds = tr.find_all("td")
+            if len(tds) != 3:
+                continue
+            if "official_answer" in _cls(tds[0]):
+                answer = "Yes"
+            elif "official_answer" in _cls(tds[1]):
+                answer = "No"
+            else:
+                answer = None
+            statement_list.append(TableStatement(prompt=_inner_text(tds[2]), answer=answer))
+
+    return TableDict(
+        passage    = passage,
+        headers    = headers,
+        rows       = row_objs,
+        statements = statement_list,
+        difficulty = _snap_difficulty(soup),
+    )
+
+def _snap_tpa(soup: BeautifulSoup) -> TPADict:
+    passage = basic_clean(_inner_text(_need(soup, "div.item.text")))
+    choices = []
+    grid = soup.select_one("table.stoker.di")
+    if grid is not None:
+        try:
+            choices = [_inner_text(r.find_all("td")[2]) for r in grid.find_all("tr")[1:]]
+        except IndexError:
+            choices = []
+    answer1 = answer2 = None
+    dr = soup.select_one(".answer-block .downRow")
+    if dr is not None:
+        try:
+            answer1, answer2 = _tpa_answers(_inner_text(dr, skip_spoilers=False))
+        except ValueError:
+            pass
+    return TPADict(
+        passage       = passage,
+        choices       = choices,
+        answer_blank1 = answer1,
+        answer_blank2 = answer2,
+        difficulty    = _snap_difficulty(soup),
+    )
+
+def _snap_msr(soup: BeautifulSoup) -> MSRDict:
+    _need(soup, ".tab_di_ms_wrapper")
+    sources = []
+    for t, p in zip(soup.select(".tablinks_di_ms"), soup.select(".tabcontent_di_ms")):
+        block = p.select_one(".item.text")
+        if block is None:
+            continue
+        img = block.select_one("img.reimg")
+        sources.append({
+            "source_title": _inner_text(t),
+            "text": block.get_text().strip(),        # textContent, like the live parser
+            "image_url": img.get("src") if img else None
+        })
+
+    right_pane = _need(soup, ".tabcontent_di_ms_right")
+    binaries, impacts, mcq = [], [], None
+    for tbl in right_pane.select("table.stoker.di"):
+        trs = tbl.find_all("tr")
+        first_row_tds = trs[1].find_all("td") if len(trs) > 1 else []
+        if len(first_row_tds) >= 3 and all(td.find("input") for td in first_row_tds[:2]):
+            rows = _snap_binary_grid(tbl)
+            hdrs = [_inner_text(c).lower() for c in trs[0].find_all("td")[:2]]
+            if hdrs and "positive" in hdrs[0]:
+                impacts = [{"factor": r["statement"],
+                            "official": ("Positive Impact" if r["official"] == "Yes"
+                                         else "No Clear Impact")}
+                           for r in rows]
+            else:
+                binaries.extend([{"statement": r["statement"],
+                                  "official": ("Supported" if r["official"] == "Yes"
+                                               else "Not Supported")}
+                                 for r in rows])
+        else:
+            mcq = _snap_multichoice(tbl)
+
+    return MSRDict(
+        sources            = sources,
+        support_statements = binaries,
+        impact_factors     = impacts,
+        mcq                = mcq,
+        difficulty         = _snap_difficulty(soup)
+    )
+
+SNAPSHOT_PARSERS: Dict[QuestionType, Callable[[BeautifulSoup], QuestionData]] = {
+    QuestionType.CR: _snap_cr, QuestionType.DS: _snap_ds, QuestionType.RC: _snap_rc,
+    QuestionType.PS: _snap_ds, QuestionType.TPA: _snap_tpa, QuestionType.MSR: _snap_msr,
+    QuestionType.GRAPHS: _snap_graphs, QuestionType.TABLES: _snap_tables
+}
+
+def parse_html(html: str, q_type: QuestionType) -> QuestionData:
+    """Parse a stored/fetched topic page – no browser needed."""
+    return SNAPSHOT_PARSERS[QuestionType(q_type)](BeautifulSoup(html, _BS_FEATURES))
+
+def take_snapshot(drv: Chrome, timeout: float = 5) -> str:
+    """Open every spoiler with one JS call, wait for their bodies, return the DOM."""
+    WebDriverWait(drv, 20).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "div.item.text, .bbcodeBoxOut"))
+    )
+    if drv.execute_script(_OPEN_SPOILERS_JS):
+        try:
+            WebDriverWait(drv, timeout).until(lambda d: d.execute_script(_SPOILERS_READY_JS))
+        except TimeoutException:
+            metrics.inc("timeouts_total", where="spoilers")
+            LOG.debug("spoilers still empty after %.1fs – snapshotting anyway", timeout)
+    return drv.page_source
+
+# ─── question-type detection (one look at the DOM) ──────────────────
+# Every DI layout carries a marker no other type has (MSR tabs, GRAPHS
+# drop-downs, the sortable TABLES table, the TPA two-column grid, the RC
+# passage box).  Without one, the breadcrumb / tags and the shape of the post
+# text decide between CR, DS and PS.  Each signal votes for a type with a
+# weight; votes combine noisy-or style and the confidence is the winner's
+# score minus half the runner-up's.  A layout marker on its own clears
+# DETECT_OVERRIDE, text heuristics on their own never do.
+DETECT_OVERRIDE = 0.85
+
+_TYPE_HINTS: List[Tuple[re.Pattern, QuestionType]] = [
+    (re.compile(r"multi[- ]?source|\bMSR\b", re.I),            QuestionType.MSR),
+    (re.compile(r"two[- ]?part|\bTPA\b", re.I),                QuestionType.TPA),
+    (re.compile(r"table[- ]analysis|\bTA\b", re.I),            QuestionType.TABLES),
+    (re.compile(r"graphics? interpretation|graphs?\b|\bGI\b", re.I), QuestionType.GRAPHS),
+    (re.compile(r"critical[- ]reasoning|\bCR\b", re.I),        QuestionType.CR),
+    (re.compile(r"reading[- ]comprehension|\bRC\b", re.I),     QuestionType.RC),
+    (re.compile(r"data[- ]sufficiency|\bDS\b", re.I),          QuestionType.DS),
+    (re.compile(r"problem[- ]solving|\bPS\b", re.I),           QuestionType.PS),
+]
+_CRUMB_CSS   = ".breadcrumbs a, .navlinks a, #nav-main a, .crumb a"
+_DS_STMT_RE  = re.compile(r"statements?\s*\(?[12]\)?\s*(?:ALONE|TOGETHER)|EACH\s+statement\s+ALONE", re.I)
+_DS_PAIR_RE  = re.compile(r"(?m)^\s*\(1\).*\n(?:.*\n)*?\s*\(2\)")
+_CR_OPT_RE   = re.compile(r"(?m)^\s*[A-E]-\s")
+_CR_STEM_RE  = re.compile(r"\b(?:weaken|strengthen|assum|argument|conclusion|infer|flaw|"
+                          r"paradox|discrepanc|undermine)", re.I)
+_PAREN_OPT_RE = re.compile(r"(?m)^\s*\(?[A-E]\)\s")
+
+_DETECT_JS = """
+const n = s => document.querySelectorAll(s).length;
+const txt = s => [...document.querySelectorAll(s)].map(e => e.textContent).join(' ');
+const box = document.querySelector('.bbcodeBoxOut');
+const body = document.querySelector('div.item.text');
+return {msr: n('.tab_di_ms_wrapper, .tablinks_di_ms'), dropdown: n('select.di_graph_dropdown'),
+        sortable: n('table.stoker.table-sortable'), grid: n('table.stoker.di'),
+        rc_boxes: box ? box.querySelectorAll(':scope > .bbcodeBoxIn').length : 0,
+        crumb: txt(arguments[0]) + ' ' + document.title, tags: txt('.tag_css_link'),
+        body: body ? body.innerText.slice(0, 6000) : ''};
+"""
+
+def infer_type(*texts: Optional[str]) -> Optional[QuestionType]:
+    """First QuestionType whose keywords appear in the given texts, in order."""
+    for t in texts:
+        if not t:
+            continue
+        for rx, q in _TYPE_HINTS:
+            if rx.search(t):
+                return q
+    return None
+
+def _soup_signals(soup: BeautifulSoup) -> Dict[str, Any]:
+    box  = soup.select_one(".bbcodeBoxOut")
+    body = soup.select_one("div.item.text")
+    return {
+        "msr":      len(soup.select(".tab_di_ms_wrapper, .tablinks_di_ms")),
+        "dropdown": len(soup.select("select.di_graph_dropdown")),
+        "sortable": len(soup.select("table.stoker.table-sortable")),
+        "grid":     len(soup.select("table.stoker.di")),
+        "rc_boxes": len(box.find_all(class_="bbcodeBoxIn", recursive=False)) if box else 0,
+        "crumb":    " ".join(a.get_text(" ", strip=True) for a in soup.select(_CRUMB_CSS))
+                    + " " + (soup.title.get_text() if soup.title else ""),
+        "tags":     " ".join(t.get_text(" ", strip=True) for t in soup.select(".tag_css_link")),
+        "body":     _inner_text(body)[:6000] if body else "",
+    }
+
+def _classify(sig: Dict[str, Any]) -> Tuple[Optional[QuestionType], float]:
+    votes: Dict[QuestionType, float] = {}
+
+    def vote(q: QuestionType, w: float):       # noisy-or: 1 - Π(1 - w)
+        votes[q] = 1 - (1 - votes.get(q, 0.0)) * (1 - w)
+
+    if sig["msr"]:
+        vote(QuestionType.MSR, .97)
+    elif sig["dropdown"]:
+        vote(QuestionType.GRAPHS, .95)
+    elif sig["sortable"]:
+        vote(QuestionType.TABLES, .95)
+    elif sig["grid"]:
+        vote(QuestionType.TPA, .9)
+    elif sig["rc_boxes"] >= 2:
+        vote(QuestionType.RC, .9)
+    else:                                     # no layout marker → read the text
+        body = sig["body"]
+        if _DS_STMT_RE.search(body):
+            vote(QuestionType.DS, .7)
+        elif _DS_PAIR_RE.search(body):
+            vote(QuestionType.DS, .3)
+        if len(_CR_OPT_RE.findall(body)) >= 3:
+            vote(QuestionType.CR, .5)
+        if _CR_STEM_RE.search(body):
+            vote(QuestionType.CR, .3)
+        if QuestionType.DS not in votes and len(_PAREN_OPT_RE.findall(body)) >= 4:
+            vote(QuestionType.PS, .4)
+    for text, w in ((sig["crumb"], .6), (sig["tags"], .5)):
+        hint = infer_type(text)
+        if hint is not None:
+            vote(hint, w)
+
+    if not votes:
+        return None, 0.0
+    ranked = sorted(votes.items(), key=lambda kv: -kv[1])
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+    return ranked[0][0], round(max(0.0, ranked[0][1] - runner_up / 2), 3)
+
+def detect_type(page: Union[str, BeautifulSoup]) -> Tuple[Optional[QuestionType], float]:
+    """(QuestionType, confidence 0‥1) for a topic page's HTML; (None, 0) if no clue."""
+    if isinstance(page, str):
+        page = BeautifulSoup(page, _BS_FEATURES)
+    return _classify(_soup_signals(page))
+
+def detect_type_live(drv: Chrome, timeout: float = 10) -> Tuple[Optional[QuestionType], float]:
+    """Same as detect_type() for the page loaded in `drv` – one JS round-trip."""
+    _wait_for_content(drv, "div.item.text, .bbcodeBoxOut", timeout)
+    return _classify(drv.execute_script(_DETECT_JS, _CRUMB_CSS))
+
+def _resolve_type(url: str, given: Optional[QuestionType],
+                  found: Tuple[Optional[QuestionType], float],
+                  on_detect: Optional[Callable[[str, QuestionType, float], None]] = None
+                  ) -> QuestionType:
+    """
+    The caller's type unless the page confidently says otherwise (DS/PS
+    share a parser, so that mix-up is let through); with no caller type the
+    detected one, or ScrapeError if the page gives no clue.
+    """
+    q, conf = found
+    if given is not None:
+        given = QuestionType(given)
+        if q is None or q is given or conf < DETECT_OVERRIDE \
+                or {q, given} <= {QuestionType.DS, QuestionType.PS}:
+            return given
+        LOG.warning("%s was labelled %s but looks like %s (%.2f) – parsing as %s",
+                    url, given.value, q.value, conf, q.value)
+    elif q is None:
+        raise ScrapeError(f"could not tell the question type of {url}")
+    else:
+        LOG.info("%s detected as %s (%.2f)", url, q.value, conf)
+    if on_detect is not None:
+        on_detect(url, q, conf)
+    return q
+
+# ─── HTTP fast path (no Chrome for server-rendered topics) ──────────
+# CR / DS / PS topics are plain phpBB HTML, so a pooled requests.Session that
+# carries the cookies from COOKIE_FILE is enough.  Anything that looks like a
+# Cloudflare challenge or JS-built markup returns None → caller uses Chrome.
+HTTP_TYPES   = {QuestionType.CR, QuestionType.DS, QuestionType.PS}
+_CF_MARKERS  = ("<title>just a moment", "cf-browser-verification", "challenge-platform",
+                "cf_chl_opt", "cf-turnstile")
+_JS_MARKERS  = ("tab_di_ms_wrapper", "di_graph_dropdown", "table-sortable")
+_UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+       "(KHTML, like Gecko) Chrome/{v}.0.0.0 Safari/537.36")
+_UA_FALLBACK_MAJOR = 130               # hosts without Chrome still need a plausible UA
+
+# Every page request of the process – browsers and HttpFetcher alike – is
+# paced by this limiter (see throttle.py); replace it to change the limits.
+LIMITER = RateLimiter()
+
+def _http_outcome(status: int, html: str = "") -> str:
+    if status == 429 or (status in (403, 503) and _is_challenge(html)) or \
+            (status == 200 and _is_challenge(html)):
+        return BLOCKED
+    return SLOW if status >= 500 else OK
+
+class HttpFetcher:
+    """Thread-safe pooled HTTP client that reuses the browser's saved cookies."""
+
+    def __init__(self, cookie_file: Optional[Path] = None, pool_size: int = 8, timeout: float = 20,
+                 limiter: Optional[RateLimiter] = None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self.timeout, self.limiter = timeout, limiter
+        self._net_errors = requests.RequestException
+        self.session = requests.Session()
+        # Retry-After goes to the limiter (see _get), not a sleep inside the request
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=Retry(total=2, backoff_factor=0.5,
+                                                status_forcelist=(502, 503, 504),
+                                                respect_retry_after_header=False))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        try:
+            major = chrome_major()
+        except RuntimeError:
+            major = _UA_FALLBACK_MAJOR
+        self.session.headers.update({
+            "User-Agent": _UA.format(v=major),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        self.load_cookies(cookie_file or COOKIE_FILE)
+
+    def load_cookies(self, path: Path) -> int:
+        """Copy Selenium cookie dicts (as written by _save_cookies) into the jar."""
+        if not path.exists():
+            return 0
+        n = 0
+        for c in pickle.loads(path.read_bytes()):
+            try:
+                self.session.cookies.set(c["name"], c["value"],
+                                         domain=c.get("domain", urlsplit(SITE).hostname),
+                                         path=c.get("path", "/"),
+                                         secure=c.get("secure", False),
+                                         expires=c.get("expiry"))
+                n += 1
+            except (KeyError, TypeError):
+                pass
+        return n
+
+    def _get(self, url: str, **kw):
+        """
+        session.get() paced by the limiter, which hears how it went.  With
+        `stream=True` only an HTML answer (a challenge, an error page) is
+        read to judge it; anything else is left for the caller to stream.
+        """
+        limiter = self.limiter or LIMITER
+        with limiter.slot(url):
+            try:
+                r = self.session.get(url, timeout=self.timeout, **kw)
+            except self._net_errors:
+                limiter.report(url, SLOW)
+                raise
+        html = r.text if not kw.get("stream") or \
+            "html" in r.headers.get("Content-Type", "") else ""
+        limiter.report(url, _http_outcome(r.status_code, html),
+                       _retry_after(r.headers.get("Retry-After")))
+        return r
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Page HTML, or None on a challenge / non-200 answer."""
+        try:
+            r = self._get(url)
+        except self._net_errors as e:
+            metrics.inc("http_responses_total", status=type(e).__name__)
+            LOG.info("http: %s failed (%s)", url, e)
+            return None
+        html = r.text
+        metrics.inc("http_responses_total", status=r.status_code)
+        if r.status_code != 200 or _is_challenge(html):
+            LOG.info("http: %s → %s%s", url, r.status_code,
+                     " (cloudflare)" if _is_challenge(html) else "")
+            return None
+        return html
+
+    def probe(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+              ) -> Tuple[Optional[int], Optional[str], Dict[str, Optional[str]]]:
+        """
+        Conditional GET: (status, html, validators).  status is None when the
+        site could not be reached, 304 when the validators still match; html
+        is only set for a 200 that is not a Cloudflare challenge.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            r = self._get(url, headers=headers)
+        except self._net_errors as e:
+            metrics.inc("http_responses_total", status=type(e).__name__)
+            LOG.info("http: probe of %s failed (%s)", url, e)
+            return None, None, {}
+        metrics.inc("http_responses_total", status=r.status_code)
+        seen = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+        if r.status_code != 200 or _is_challenge(r.text):
+            return r.status_code, None, seen
+        return 200, r.text, seen
+
+    def scrape(self, url: str, q_type: Optional[QuestionType],
+               cache: Optional[PageCache] = None,
+               on_detect: Optional[Callable[[str, QuestionType, float], None]] = None,
+               dedup: Optional[DupIndex] = None, page: Optional[Future] = None
+               ) -> Optional[QuestionData]:
+        """
+        Parse `url` without a browser; None means "use get_driver() instead".
+        With `q_type=None` the type is detected from the fetched page.  A
+        `page` future is given the HTML of a page it could parse.
+        """
+        if q_type is not None and QuestionType(q_type) not in HTTP_TYPES:
+            return None
+        html = self.fetch(url)
+        if html is None:
+            return None
+        data = self.parse(url, html, q_type, cache, on_detect, dedup)
+        if data is not None:                   # declined pages go to Chrome, which hands over
+            _hand_over(page, html)
+        return data
+
+    def parse(self, url: str, html: str, q_type: Optional[QuestionType],
+              cache: Optional[PageCache] = None,
+              on_detect: Optional[Callable[[str, QuestionType, float], None]] = None,
+              dedup: Optional[DupIndex] = None) -> Optional[QuestionData]:
+        """The parsing half of scrape(), for HTML fetched some other way (probe())."""
+        if _needs_js(html):
+            return None
+        soup = BeautifulSoup(html, _BS_FEATURES)
+        try:
+            q_type = _resolve_type(url, q_type, detect_type(soup), on_detect)
+            _ctx.q_type = q_type.value
+            if q_type not in HTTP_TYPES:
+                return None
+            sig = None
+            if dedup is not None and dedup.wants(q_type):
+                body = soup.select_one("div.item.text")
+                sig = _dedup_check(dedup, url, body.get_text() if body else "")
+            data = SNAPSHOT_PARSERS[q_type](soup)
+        except ScrapeError as e:
+            LOG.info("http: %s not parseable without JS (%s)", url, e)
+            return None
+        if not data.get("answer") or not data.get("options"):
+            return None                        # spoiler / options filled in by JS
+        if sig is not None:
+            dedup.add(url, sig, q_type)
+        if cache is not None:
+            cache.put(url, html, q_type=q_type.value, result=data,
+                      parser_version=PARSER_VERSION)
+        return data
+
+    def close(self):
+        self.session.close()
+
+# What makes a topic "the same" between two visits: the first post (question,
+# answer blocks, OA spoilers) and its difficulty tags – not the replies, view
+# counts, session ids or ads around them, which change on every load.
+_VOLATILE_RE = re.compile(r"([?&;])sid=[0-9a-f]+|\s+")
+
+def page_fingerprint(page: Union[str, BeautifulSoup]) -> Optional[str]:
+    """sha256 of the first post + tags, or None if the page has no post."""
+    soup = BeautifulSoup(page, _BS_FEATURES) if isinstance(page, str) else page
+    post = soup.select_one("div.post") or soup.select_one("div.item.text")
+    if post is None:
+        return None
+    body = post.select_one(".postbody") or post
+    tags = " ".join(t.get_text(" ", strip=True) for t in soup.select(".tag_css_link"))
+    norm = _VOLATILE_RE.sub(lambda m: m.group(1) if m.group(1) else " ", str(body))
+    return hashlib.sha256(f"{norm}\x00{tags}".encode("utf-8")).hexdigest()
+
+def _is_challenge(html: str) -> bool:
+    head = html[:20000].lower()
+    return any(m in head for m in _CF_MARKERS)
+
+def _needs_js(html: str) -> bool:
+    return any(m in html for m in _JS_MARKERS)
+
 # ─── registry & scrape ─────────────────────────────────────────────
 def _todo(l:str)->Callable[[Chrome],QuestionData]: return lambda d:{"html":d.page_source,"note":f"{l} TODO"}
 PARSERS:Dict[QuestionType,Callable[[Chrome],QuestionData]]={
@@ -683,23 +1666,379 @@ PARSERS:Dict[QuestionType,Callable[[Chrome],QuestionData]]={
     QuestionType.GRAPHS: _parse_graphs, QuestionType.TABLES:_parse_tables
 }
 
-def scrape(*, url: str, q_type: QuestionType,
-           email: str, password: str,
-           headless: bool = True, polish: bool = False, retries: int = 1
-           ) -> QuestionData:
-    for attempt in range(retries + 1):
+def _fetch_page(drv: Chrome, url: str, q_type: Optional[QuestionType],
+                dedup: Optional[DupIndex] = None, snapshot: bool = True
+                ) -> Tuple[Optional[str], Optional[Tuple[int, ...]]]:
+    """
+    The browser half of a scrape: wait for the rate limiter, navigate, dedup
+    check and – with `snapshot` – the page's HTML.  Returns (html, signature).
+    Raises Throttled if Cloudflare still holds the page after `_CF_GRACE` s.
+    """
+    with metrics.span("delay"):
+        LIMITER.wait(url)
+    with metrics.span("navigate"):
         try:
-            with get_driver(headless=headless) as drv:
-                if not _load_cookies(drv):
-                    _login(drv, email, password)
-                time.sleep(random.uniform(1.5, 3.0))
-                drv.get(url)
-                data = PARSERS[q_type](drv)
-                return _polish(data, q_type) if polish else data
+            drv.get(url)
+        except TimeoutException:
+            LIMITER.report(url, SLOW)
+            raise
+        _check_challenge(drv, url)
+    sig = None
+    if dedup is not None and dedup.wants(q_type):   # before any spoiler is opened
+        with metrics.span("dedup"):
+            sig = _dedup_check(dedup, url, drv.execute_script(_POST_TEXT_JS) or "")
+    if not snapshot:
+        return None, sig
+    with metrics.span("snapshot"):
+        html = take_snapshot(drv)
+    _page_stats(drv)
+    return html, sig
+
+_CF_GRACE = 8                          # s a browser may spend on a JS challenge
+
+def _check_challenge(drv: Chrome, url: str):
+    """Report the page just loaded to LIMITER; raise Throttled if it is still a challenge."""
+    if "just a moment" not in drv.title.lower():
+        LIMITER.report(url, OK)
+        return
+    LIMITER.report(url, BLOCKED)              # passed or not, the host wants us slower
+    try:
+        with metrics.span("challenge"):
+            WebDriverWait(drv, _CF_GRACE, poll_frequency=0.5).until(
+                lambda d: "just a moment" not in d.title.lower())
+    except TimeoutException:
+        raise Throttled(f"{url}: Cloudflare challenge") from None
+
+def _narrow_retries(url: str, budget: List[int], attempt: Callable[[bool], Any]) -> Any:
+    """
+    attempt(navigate) in the same browser until it succeeds or `budget`
+    (a shared one-item list) is used up.  A parse that failed on a loaded
+    page is first retried on the same DOM (navigate=False); timeouts and
+    challenges re-navigate once LIMITER lets them.  Anything else – a dead
+    browser – is left to the caller.
+    """
+    navigate = True
+    while True:
+        try:
+            return attempt(navigate)
         except (TimeoutException, ScrapeError) as e:
-            if attempt == retries:
+            if isinstance(e, TimeoutException):
+                metrics.inc("timeouts_total", where="parser")
+            if budget[0] <= 0:
                 raise
-            LOG.warning("retry %s because %s", attempt + 1, e)
+            budget[0] -= 1
+            navigate = not (navigate and type(e) is ScrapeError)
+            scope = "navigate" if navigate else "reparse"
+            metrics.inc("retries_total", scope=scope)
+            LOG.warning("retry %s (%s) because %s", url, scope, e)
+
+def _hand_over(page: Optional[Future], html: Optional[str]):
+    """Keep the promise of a topic's page-1 HTML (ExplanationCollector.submit) – once."""
+    if page is not None and not page.done():
+        page.set_result(html)
+
+def _parse_snapshot(url: str, html: str, q_type: Optional[QuestionType],
+                    cache: Optional[PageCache] = None,
+                    on_detect: Optional[Callable[[str, QuestionType, float], None]] = None
+                    ) -> Tuple[QuestionType, QuestionData]:
+    """The browser-free half: detect the type of `html` and run its SNAPSHOT_PARSERS entry."""
+    with metrics.span("soup"):
+        soup = BeautifulSoup(html, _BS_FEATURES)
+    with metrics.span("detect"):
+        q_type = _resolve_type(url, q_type, detect_type(soup), on_detect)
+    _ctx.q_type = q_type.value
+    with metrics.span("parse"):
+        data = SNAPSHOT_PARSERS[q_type](soup)
+    if cache is not None:
+        cache.put(url, html, q_type=q_type.value, result=data,
+                  parser_version=PARSER_VERSION)
+    return q_type, data
+
+def _scrape_page(drv: Chrome, url: str, q_type: Optional[QuestionType], polish: bool,
+                 snapshot: bool = False, cache: Optional[PageCache] = None,
+                 on_detect: Optional[Callable[[str, QuestionType, float], None]] = None,
+                 dedup: Optional[DupIndex] = None, budget: Optional[List[int]] = None,
+                 page: Optional[Future] = None) -> QuestionData:
+    keep_html = snapshot or cache is not None          # caching needs the raw HTML
+    sig = [None]
+
+    def attempt(navigate: bool):
+        if navigate:
+            html, sig[0] = _fetch_page(drv, url, q_type, dedup, keep_html)
+        elif keep_html:
+            with metrics.span("snapshot"):
+                html = take_snapshot(drv)
+        else:
+            html = None
+        if html is not None:
+            _hand_over(page, html)
+            return _parse_snapshot(url, html, q_type, cache, on_detect)
+        with metrics.span("detect"):
+            q = _resolve_type(url, q_type, detect_type_live(drv), on_detect)
+        _ctx.q_type = q.value
+        with metrics.span("parse"):
+            data = PARSERS[q](drv)
+        _page_stats(drv)
+        return q, data
+
+    q_type, data = _narrow_retries(url, budget if budget is not None else [0], attempt)
+    if sig[0] is not None:
+        dedup.add(url, sig[0], q_type)
+    return _polish(data, q_type) if polish else data
+
+# textContent, not innerText: hidden spoiler text counts, no layout needed
+_POST_TEXT_JS = "const b = document.querySelector('div.item.text'); return b ? b.textContent : '';"
+
+def _dedup_check(dedup: DupIndex, url: str, text: str):
+    """Signature of the post text; DuplicateQuestion if the index already has it."""
+    try:
+        return dedup.check(url, text)
+    except DuplicateQuestion as e:
+        metrics.inc("duplicates_total")
+        LOG.info("%s is a %s", url, e)
+        raise
+
+# Navigation timing of the page just parsed plus the bytes of every resource
+# it pulled.  transferSize is 0 for cross-origin responses without
+# Timing-Allow-Origin, so the byte count is a lower bound – in both modes.
+_PAGE_STATS_JS = """
+const n = performance.getEntriesByType('navigation')[0] || {};
+let bytes = n.transferSize || 0, count = 0;
+for (const r of performance.getEntriesByType('resource')) { bytes += r.transferSize || 0; count++; }
+return [n.domContentLoadedEventEnd || 0, n.loadEventEnd || 0, bytes, count];
+"""
+
+def page_stats(drv: Chrome) -> Dict[str, float]:
+    """{"ready_s", "load_s" (0 while still loading), "bytes", "resources"} of the current page."""
+    ready, load, nbytes, count = drv.execute_script(_PAGE_STATS_JS)
+    return {"ready_s": ready / 1e3, "load_s": load / 1e3, "bytes": nbytes, "resources": count}
+
+def _page_stats(drv: Chrome):
+    try:
+        st = page_stats(drv)
+    except WebDriverException:
+        return
+    metrics.observe("page_ready_seconds", st["ready_s"])
+    metrics.inc("page_bytes_total", st["bytes"])
+    metrics.inc("page_resources_total", st["resources"])
+
+def _from_cache(cache: PageCache, url: str, q_type: Optional[QuestionType],
+                on_detect: Optional[Callable[[str, QuestionType, float], None]] = None
+                ) -> Optional[Tuple[QuestionType, QuestionData]]:
+    """(type, data) from the fresh cached result, or a re-parse of the fresh cached HTML."""
+    q_type = QuestionType(q_type) if q_type is not None else None
+    data = cache.get_result(url, PARSER_VERSION, q_type.value if q_type else None)
+    if data is not None:
+        stored = q_type.value if q_type else cache.q_type(url)
+        if stored is not None:
+            _ctx.q_type = stored
+            return QuestionType(stored), data
+    html = cache.get_html(url)
+    if html is None:
+        return None
+    soup = BeautifulSoup(html, _BS_FEATURES)
+    try:
+        q_type = _resolve_type(url, q_type, detect_type(soup), on_detect)
+        _ctx.q_type = q_type.value
+        data = SNAPSHOT_PARSERS[q_type](soup)
+    except ScrapeError:
+        return None
+    cache.put(url, html, q_type=q_type.value, result=data, parser_version=PARSER_VERSION)
+    return q_type, data
+
+def reparse_cache(cache: PageCache, *, only_stale: bool = True
+                  ) -> Iterator[Tuple[str, Union[QuestionData, Exception]]]:
+    """
+    Re-run the snapshot parsers over every cached page (ignoring TTL) –
+    by default only those parsed by an older PARSER_VERSION.  No network.
+    """
+    for url, q in cache.pages(stale_for=PARSER_VERSION if only_stale else None):
+        html = cache.get_html(url, ignore_ttl=True)
+        if html is None or q is None:
+            continue
+        try:
+            data = parse_html(html, QuestionType(q))
+        except Exception as e:
+            yield url, e
+            continue
+        cache.put_result(url, data, PARSER_VERSION)
+        yield url, data
+
+def scrape(*, url: str, q_type: Optional[QuestionType] = None,
+           email: str, password: str,
+           headless: bool = True, polish: bool = False, retries: int = 1,
+           pool: Optional[DriverPool] = None, snapshot: bool = False,
+           http: Optional[HttpFetcher] = None, cache: Optional[PageCache] = None,
+           on_detect: Optional[Callable[[str, QuestionType, float], None]] = None,
+           lean: bool = False, block_css: bool = False, dedup: Optional[DupIndex] = None,
+           explain: Optional[ExplanationCollector] = None) -> QuestionData:
+    """
+    Scrape one topic.  Pass `pool` to reuse a logged-in browser; with
+    `snapshot=True` the page is parsed from one page_source via parse_html().
+    With an `http` fetcher, CR/DS/PS pages are tried without Chrome first.
+    With a `cache`, fresh cached pages are served without any request.
+    Leave `q_type` out to have it detected from the loaded page; a given
+    type that the page clearly contradicts is overridden.  `on_detect` is
+    called with (url, type, confidence) whenever detection picked the type.
+    `lean` skips images, fonts, ads and trackers (`block_css`: stylesheets
+    too) in the browser this call starts; a `pool` brings its own setting.
+    With a `dedup` index, a fetched page whose post text is a near-copy of
+    a stored question raises DuplicateQuestion before spoilers, parsing or
+    polish; other CR/PS/DS pages are added to the index once parsed.
+    Pages are paced by LIMITER.  The `retries` stay in the same browser
+    where they can (re-parse the loaded DOM, re-navigate after a timeout or
+    challenge); only a broken browser is replaced.  With an `explain`
+    collector the topic's best replies are fetched alongside – starting from
+    the page-1 HTML this call loaded – and added as `explanations` (CR:
+    `explanation` = the best one).
+    Timings and counters go to metrics.REGISTRY.
+    """
+    found = [q_type]
+
+    def detected(u, q, conf):
+        found.append(q)
+        if on_detect is not None:
+            on_detect(u, q, conf)
+
+    def run() -> QuestionData:
+        _ctx.q_type = QuestionType(q_type).value if q_type else "auto"
+        with metrics.span("scrape"):
+            if cache is not None:
+                with metrics.span("cache"):
+                    hit = _from_cache(cache, url, q_type, detected)
+                if hit is not None:
+                    metrics.inc("pages_total", source="cache")
+                    if first is not None:
+                        _hand_over(first, cache.get_html(url))
+                    q, data = hit
+                    return _polish(data, q) if polish else data
+            if http is not None:
+                with metrics.span("http"):
+                    data = http.scrape(url, q_type, cache, detected, dedup, first)
+                if data is not None:
+                    metrics.inc("pages_total", source="http")
+                    return _polish(data, found[-1]) if polish else data
+                LOG.info("http fast path declined %s – using Chrome", url)
+            budget = [retries]                 # shared with the in-browser retries
+            while True:
+                try:
+                    if pool is not None:
+                        with pool.checkout() as drv:
+                            data = _scrape_page(drv, url, q_type, polish, snapshot, cache,
+                                                on_detect, dedup, budget, first)
+                    else:
+                        with get_driver(headless, lean, block_css) as drv:
+                            _ensure_login(drv, email, password)
+                            data = _scrape_page(drv, url, q_type, polish, snapshot, cache,
+                                                on_detect, dedup, budget, first)
+                    metrics.inc("pages_total", source="chrome")
+                    return data
+                except (WebDriverException, ScrapeError) as e:
+                    if budget[0] <= 0:
+                        metrics.inc("failures_total", error=type(e).__name__)
+                        raise
+                    budget[0] -= 1             # browser died or could not log in: start over
+                    metrics.inc("retries_total", scope="driver")
+                    LOG.warning("retry %s in a new browser because %s", url, e)
+
+    first: Optional[Future] = Future() if explain is not None else None   # page-1 HTML
+    pending = explain.submit(url, first) if explain is not None else None
+    try:
+        data = run()
+    except BaseException:
+        if pending is not None:
+            first.cancel()
+            pending.cancel()
+        raise
+    if pool is not None and pool.governor is not None:
+        data = pool.governor.spill(data)       # cache and HTTP results too, not just Chrome's
+    if pending is not None:
+        _hand_over(first, None)                # live parse: the collector fetches page 1
+        with metrics.span("explain"):
+            data = explain.fill(data, pending.result())
+    return data
+
+def scrape_many(jobs: Iterable[Tuple[str, Optional[QuestionType]]], *,
+                email: Optional[str] = None, password: Optional[str] = None,
+                workers: int = 2, headless: bool = True, polish: bool = False,
+                retries: int = 1, pool: Optional[DriverPool] = None,
+                snapshot: bool = False, http_first: bool = False,
+                cache: Optional[PageCache] = None, polish_window: int = 32,
+                on_detect: Optional[Callable[[str, QuestionType, float], None]] = None,
+                broker: Optional[SessionBroker] = None,
+                lean: bool = False, block_css: bool = False,
+                assets: Optional[AssetStore] = None, dedup: Optional[DupIndex] = None,
+                governor: Optional[MemoryGovernor] = None,
+                explain: Optional[ExplanationCollector] = None
+                ) -> Iterator[Tuple[str, Union[QuestionData, Exception]]]:
+    """
+    Batch entry point: push many (url, QuestionType) pairs through a pool
+    of `workers` logged-in browsers.  Yields (url, data) as pages finish;
+    a page that still fails after `retries` yields (url, exception) instead
+    of aborting the batch.  `http_first` tries HttpFetcher before Chrome;
+    browsers are only started once some page actually needs one.  With
+    `polish`, finished pages go through PolishStage in windows of
+    `polish_window` so several questions share one GPT request.  A job's
+    type may be None – it is then detected per page (see scrape()).
+    With a `broker` the browsers are spread over its accounts instead of
+    all logging in as `email`.  `lean` / `block_css` as in scrape().
+    With an `assets` store, images of finished pages are downloaded (same
+    windows) and each `image_url` is rewritten to the local file.  With a
+    `dedup` index, near-duplicates yield (url, DuplicateQuestion).  A
+    `governor` recycles the browsers this call starts on page / memory
+    limits and spills large result strings to disk.  `explain` as in scrape().
+    """
+    own = pool is None
+    if own:
+        pool = DriverPool(workers, email=email, password=password, headless=headless,
+                          broker=broker, lean=lean, block_css=block_css, governor=governor)
+    http = HttpFetcher(pool_size=max(workers, 1)) if http_first else None
+
+    def one(url: str, q_type: Optional[QuestionType]):
+        found = [q_type]
+
+        def detected(u: str, q: QuestionType, conf: float):
+            found.append(q)
+            if on_detect is not None:
+                on_detect(u, q, conf)
+        try:
+            return url, scrape(url=url, q_type=q_type, email=email, password=password,
+                               retries=retries, pool=pool, snapshot=snapshot, http=http,
+                               cache=cache, on_detect=detected, dedup=dedup,
+                               explain=explain), found[-1]
+        except DuplicateQuestion as e:     # skipped on purpose, not a failure
+            return url, e, found[-1]
+        except Exception as e:             # keep the batch going
+            LOG.error("giving up on %s: %s", url, e)
+            return url, e, found[-1]
+
+    def finished():                        # bounded in-flight → flat memory
+        with ThreadPoolExecutor(max_workers=pool.size) as ex:
+            todo, running = iter(jobs), set()
+            while True:
+                for url, q in todo:
+                    running.add(ex.submit(one, url, QuestionType(q) if q else None))
+                    if len(running) >= 2 * pool.size:
+                        break
+                if not running:
+                    return
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for f in done:
+                    yield f.result()
+
+    try:
+        if polish:
+            out = _polish_stage().stream(finished(), window=polish_window)
+        else:
+            out = ((url, data) for url, data, _ in finished())
+        if assets is not None:
+            out = assets.stream(out, window=polish_window)
+        yield from out
+    finally:
+        if own:
+            pool.close()
+        if http is not None:
+            http.close()
 
 # ─── quick smoke-test ───────────────────────────────────────────────
 if __name__ == "__main__":
@@ -0,0 +1,193 @@
+# ░░░  GMAT-Club Scraper – memory governor  ░░░
+#
+# A Chrome that stays up for hundreds of topics keeps growing (renderer
+# caches, detached DOM, DevTools buffers) until the OOM killer takes the
+# whole worker.  MemoryGovernor, handed to DriverPool(governor=…), looks at
+# each browser after every page it served:
+#
+#   • RSS of the browser's process tree (chromedriver + Chrome + renderers,
+#     summed – shared pages count once per process, so it errs high)
+#   • pages served since it started
+#
+# and has the pool quit and replace it – between pages, never during one –
+# once either passes its limit.  spill() moves large strings out of result
+# dicts (the `_todo` fallback keeps a whole page_source) into
+# content-addressed files under <root>/spill, so results in flight stay
+# small.  peaks() reports the highest browser / scraper RSS seen per
+# question type; a page whose type is only detected after the browser is
+# released (Pipeline's parse stage) is booked once label() names it.
+#
+# RSS comes from psutil when it is installed, else /proc (Linux); elsewhere
+# the page limit still applies and memory reads as unknown.
+
+from __future__ import annotations
+import hashlib, logging, os, threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import metrics
+from page_cache import DEFAULT_ROOT
+
+LOG = logging.getLogger("gmat.scraper.memory")
+
+_MB = 1 << 20
+_MAX_UNLABELLED = 1024
+try:
+    _PAGE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE = 4096
+
+
+# ─── RSS ────────────────────────────────────────────────────────────
+def _proc_table() -> Dict[int, Tuple[int, int]]:
+    """{pid: (ppid, rss bytes)} of every process, from /proc."""
+    out = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                rest = f.read().rsplit(b")", 1)[1].split()   # comm may contain spaces
+        except OSError:                        # exited meanwhile
+            continue
+        out[int(name)] = (int(rest[1]), int(rest[21]) * _PAGE)
+    return out
+
+def tree_rss(pids: Iterable[int]) -> Optional[int]:
+    """Summed RSS in bytes of `pids` and all their descendants; None if unknown."""
+    roots = {p for p in pids if p}
+    if not roots:
+        return None
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        seen, total = set(), 0
+        for pid in roots:
+            try:
+                proc = psutil.Process(pid)
+                for p in [proc] + proc.children(recursive=True):
+                    if p.pid not in seen:
+                        seen.add(p.pid)
+                        total += p.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+    if not os.path.isdir("/proc"):
+        return None
+    table = _proc_table()
+    children: Dict[int, list] = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    todo, seen, total = [p for p in roots if p in table], set(), 0
+    while todo:
+        pid = todo.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total += table[pid][1]
+        todo += children.get(pid, ())
+    return total
+
+def self_rss() -> Optional[int]:
+    """RSS of this process alone (its browsers are child processes) in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+# ─── governor ───────────────────────────────────────────────────────
+class MemoryGovernor:
+    """Thread-safe; one per DriverPool (or shared by several)."""
+
+    def __init__(self, *, max_pages: int = 200, max_rss_mb: float = 1500,
+                 spill_bytes: int = 64 << 10, root: Optional[Path] = None):
+        self.max_pages, self.max_rss = max_pages, max_rss_mb * _MB
+        self.spill_bytes = spill_bytes
+        self.spill_dir = Path(root or DEFAULT_ROOT) / "spill"
+        self._lock = threading.Lock()
+        self._pages: Dict[int, int] = {}                # id(driver) → pages served
+        self._peaks: Dict[str, Dict[str, int]] = {}     # q_type → {"browser", "scraper"}
+        self._unlabelled: Dict[str, Tuple[int, int]] = {}   # ref → (browser, scraper) RSS
+
+    def _book(self, q_type: str, rss: int, own: int):
+        peak = self._peaks.setdefault(q_type, {"browser": 0, "scraper": 0})
+        peak["browser"] = max(peak["browser"], rss)
+        peak["scraper"] = max(peak["scraper"], own)
+
+    def after_page(self, key: int, pids: Iterable[int], q_type: str = "-",
+                   ref: Optional[str] = None) -> Optional[str]:
+        """
+        Book one page for browser `key`; returns why it should be recycled,
+        if it should.  With q_type "auto" (not detected yet) and a `ref`
+        (the page URL), the RSS is held until label(ref, q_type).
+        """
+        rss, own = tree_rss(pids), self_rss()
+        with self._lock:
+            n = self._pages[key] = self._pages.get(key, 0) + 1
+            if q_type == "auto" and ref is not None:
+                if len(self._unlabelled) >= _MAX_UNLABELLED:     # failed parses never label
+                    self._unlabelled.pop(next(iter(self._unlabelled)))
+                self._unlabelled[ref] = (rss or 0, own or 0)
+            else:
+                self._book(q_type, rss or 0, own or 0)
+        if rss is not None and rss > self.max_rss:
+            reason = "rss"
+        elif self.max_pages and n >= self.max_pages:
+            reason = "pages"
+        else:
+            return None
+        LOG.info("memory: recycling browser after %d pages (%s MB, %s)",
+                 n, "?" if rss is None else rss // _MB, reason)
+        metrics.inc("drivers_recycled_total", reason=reason)
+        return reason
+
+    def label(self, ref: str, q_type: str):
+        """Book the RSS held for page `ref` under its detected `q_type`."""
+        with self._lock:
+            sample = self._unlabelled.pop(ref, None)
+            if sample is not None:
+                self._book(q_type, *sample)
+
+    def forget(self, key: int):
+        with self._lock:
+            self._pages.pop(key, None)
+
+    def peaks(self) -> Dict[str, Dict[str, float]]:
+        """{q_type: {"browser_mb", "scraper_mb"}} – highest RSS seen after a page of that type."""
+        with self._lock:
+            return {q: {"browser_mb": round(p["browser"] / _MB, 1),
+                        "scraper_mb": round(p["scraper"] / _MB, 1)}
+                    for q, p in sorted(self._peaks.items())}
+
+    # ─── spill ──────────────────────────────────────────────────────
+    def spill(self, data: Any) -> Any:
+        """
+        `data` with every top-level string over `spill_bytes` written to
+        <root>/spill/<sha>.txt; the field `k` becomes `k_file` (the path).
+        """
+        if not isinstance(data, dict):
+            return data
+        big = [k for k, v in data.items() if isinstance(v, str) and len(v) > self.spill_bytes]
+        if not big:
+            return data
+        out = dict(data)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        for k in big:
+            raw = out.pop(k).encode("utf-8")
+            path = self.spill_dir / f"{hashlib.sha256(raw).hexdigest()}.txt"
+            if not path.exists():                  # same page twice: one file
+                tmp = path.with_suffix(f".{threading.get_ident()}.part")
+                tmp.write_bytes(raw)
+                os.replace(tmp, path)
+            out[f"{k}_file"] = str(path)
+            metrics.inc("spilled_bytes_total", len(raw))
+        return out
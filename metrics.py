@@ -0,0 +1,215 @@
+# ░░░  GMAT-Club Scraper – metrics / instrumentation  ░░░
+#
+# One process-wide registry (REGISTRY) of counters and latency histograms:
+#
+#   with span("parse"):  …          → gmat_stage_seconds{stage="parse", q_type=…}
+#   inc("retries_total")            → gmat_retries_total{q_type=…}
+#   instrument_driver(drv)          → gmat_webdriver_commands_total{command, stage, q_type}
+#
+# Labels supplied by `default_labels` (main_code sets the q_type of the page
+# the current thread is on) are added to every sample, and WebDriver commands
+# are booked against the innermost open span.  Export with write_prometheus()
+# (node-exporter textfile format), write_jsonl() (one snapshot per line) or
+# events_to() (one line per finished span).  Profiler hooks wrap chosen
+# stages – see cprofile_hook().
+#
+# Stdlib only, like textproc: no selenium import needed to count selenium calls.
+
+from __future__ import annotations
+import bisect, cProfile, json, logging, os, threading, time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Tuple, Union
+
+LOG = logging.getLogger("gmat.scraper.metrics")
+
+PREFIX  = "gmat_"
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+Labels  = Tuple[Tuple[str, str], ...]
+Hook    = Callable[[str, Dict[str, str]], ContextManager]
+
+
+class Metrics:
+    def __init__(self, default_labels: Optional[Callable[[], Dict[str, str]]] = None):
+        self.default_labels = default_labels
+        self._lock = threading.Lock()
+        self._tls = threading.local()                    # .stack of open span names
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._hists: Dict[Tuple[str, Labels], List[float]] = {}  # [count, sum, max, *buckets]
+        self._hooks: List[Hook] = []
+        self._events = None
+
+    # ─── recording ──────────────────────────────────────────────────
+    def _labels(self, extra: Dict[str, Any]) -> Labels:
+        base = self.default_labels() if self.default_labels else {}
+        return tuple(sorted({**base, **{k: str(v) for k, v in extra.items()}}.items()))
+
+    def inc(self, name: str, n: float = 1, **labels):
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, self._labels(labels))
+        with self._lock:
+            h = self._hists.get(key)
+            if h is None:
+                h = self._hists[key] = [0, 0.0, 0.0] + [0] * (len(BUCKETS) + 1)
+            h[0] += 1; h[1] += seconds; h[2] = max(h[2], seconds)
+            h[3 + bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def current_stage(self) -> str:
+        stack = getattr(self._tls, "stack", None)
+        return stack[-1] if stack else "-"
+
+    @contextmanager
+    def span(self, stage: str, **labels):
+        """Time the block as `stage`; runs profiler hooks around it."""
+        stack = self._tls.__dict__.setdefault("stack", [])
+        stack.append(stage)
+        t0 = time.perf_counter()
+        try:
+            with ExitStack() as hooks:
+                if self._hooks:
+                    full = dict(self._labels(labels))
+                    for h in self._hooks:
+                        hooks.enter_context(h(stage, full))
+                yield
+        finally:
+            dt = time.perf_counter() - t0
+            stack.pop()
+            self.observe("stage_seconds", dt, stage=stage, **labels)
+            if self._events is not None:
+                self._event(stage, dt, labels)
+
+    # ─── hooks / event stream ───────────────────────────────────────
+    def add_hook(self, hook: Hook):
+        """`hook(stage, labels)` returns a context manager entered around every span."""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Hook):
+        self._hooks.remove(hook)
+
+    def events_to(self, path: Union[str, Path, None]):
+        """Append one JSON line per finished span to `path` (None stops)."""
+        with self._lock:
+            if self._events is not None:
+                self._events.close()
+            self._events = open(path, "a", encoding="utf-8") if path else None
+
+    def _event(self, stage: str, dt: float, labels: Dict[str, Any]):
+        line = json.dumps({"ts": round(time.time(), 3), "stage": stage, "s": round(dt, 6),
+                           **dict(self._labels(labels))}) + "\n"
+        with self._lock:
+            if self._events is not None:
+                self._events.write(line)
+                self._events.flush()
+
+    # ─── export ─────────────────────────────────────────────────────
+    def snapshot(self) -> Dict[str, Any]:
+        """{"counters": [...], "histograms": [...]} – plain JSON-able data."""
+        with self._lock:
+            counters = [{"name": n, "labels": dict(l), "value": v}
+                        for (n, l), v in sorted(self._counters.items())]
+            hists = [{"name": n, "labels": dict(l), "count": h[0], "sum": round(h[1], 6),
+                      "max": round(h[2], 6), "buckets": dict(zip(map(str, BUCKETS + ("+Inf",)),
+                                                               _cumulative(h[3:])))}
+                     for (n, l), h in sorted(self._hists.items())]
+        return {"ts": round(time.time(), 3), "counters": counters, "histograms": hists}
+
+    def write_jsonl(self, path: Union[str, Path]):
+        """Append the current snapshot as one line (call it periodically)."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+
+    def to_prometheus(self) -> str:
+        snap, out, typed = self.snapshot(), [], set()
+        for c in snap["counters"]:
+            name = PREFIX + c["name"]
+            if name not in typed:
+                typed.add(name); out.append(f"# TYPE {name} counter")
+            out.append(f"{name}{_fmt(c['labels'])} {c['value']:g}")
+        for h in snap["histograms"]:
+            name = PREFIX + h["name"]
+            if name not in typed:
+                typed.add(name); out.append(f"# TYPE {name} histogram")
+            for le, n in h["buckets"].items():
+                out.append(f"{name}_bucket{_fmt({**h['labels'], 'le': le})} {n}")
+            out.append(f"{name}_sum{_fmt(h['labels'])} {h['sum']:g}")
+            out.append(f"{name}_count{_fmt(h['labels'])} {h['count']}")
+        return "\n".join(out) + "\n"
+
+    def write_prometheus(self, path: Union[str, Path]):
+        """Atomically (re)write a textfile-collector .prom file."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.to_prometheus(), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._hists.clear()
+
+
+def _cumulative(counts: Iterable[int]) -> List[int]:
+    out, run = [], 0
+    for n in counts:
+        run += n
+        out.append(run)
+    return out
+
+def _fmt(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels.items()) + "}"
+
+
+# ─── module-level registry ──────────────────────────────────────────
+REGISTRY = Metrics()
+inc, observe, span = REGISTRY.inc, REGISTRY.observe, REGISTRY.span
+
+def instrument_driver(drv, registry: Metrics = REGISTRY):
+    """
+    Count every WebDriver command `drv` sends.  All of selenium's calls –
+    find_element, click, execute_script, get … – go through drv.execute(),
+    so wrapping that one bound method on the instance sees them all.
+    """
+    execute = drv.execute
+
+    def counted(driver_command, params=None):
+        registry.inc("webdriver_commands_total", command=driver_command,
+                     stage=registry.current_stage())
+        return execute(driver_command, params)
+
+    drv.execute = counted
+    return drv
+
+def cprofile_hook(stages: Iterable[str], out_dir: Union[str, Path]) -> Hook:
+    """
+    Profiler hook: each span whose stage is in `stages` is run under cProfile
+    and dumped to <out_dir>/<stage>-<q_type>-<ns>.prof (open with snakeviz /
+    pstats).  Only one profile can run at a time; overlapping spans on other
+    threads are skipped.
+    """
+    stages, out_dir = set(stages), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def hook(stage: str, labels: Dict[str, str]):
+        if stage not in stages:
+            yield
+            return
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:                      # another profiler is active
+            yield
+            return
+        try:
+            yield
+        finally:
+            prof.disable()
+            prof.dump_stats(out_dir / f"{stage}-{labels.get('q_type', '-')}-{time.time_ns()}.prof")
+    return hook
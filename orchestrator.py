@@ -0,0 +1,455 @@
+# ░░░  GMAT-Club Scraper – multi-process orchestrator  ░░░
+#
+#   python orchestrator.py add    jobs.sqlite manifest.csv      # url[,q_type] per line (or .jsonl)
+#   python orchestrator.py run    jobs.sqlite -n 8 --snapshot   # 8 worker processes, 1 Chrome each
+#   python orchestrator.py status jobs.sqlite
+#   python orchestrator.py export jobs.sqlite results.jsonl     # or results.sqlite
+#
+# The queue is one SQLite file (WAL).  Workers lease a few jobs at a time, so
+# fast workers simply take more; every worker heartbeats into `workers`, and
+# leases held by a worker that died – a local process that exited, or any
+# worker (other machine) whose heartbeat went stale – go back to 'new'.
+# Several machines can run `run` against the same file on a shared disk
+# (SQLite locking over NFS is only as good as the NFS lock daemon – prefer a
+# local disk per box and `add` the same manifest to each if in doubt).
+#
+# Results are stored in the queue row; `export` merges them into one sink.
+# Credentials: --email / --password, or GMAT_EMAIL / GMAT_PASSWORD – or
+# --accounts accounts.json to spread the browsers over several accounts
+# (sessions.SessionBroker; each process gets 1/N of every account's rpm,
+# and only worker slot 0 refreshes sessions in the background).
+
+from __future__ import annotations
+import argparse, csv, json, logging, multiprocessing as mp, os, socket, sqlite3, sys, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from dedup import DupIndex, DuplicateQuestion
+from explanations import ExplanationCollector
+from main_code import DriverPool, QuestionType, refresh_session, scrape_many
+from memory import MemoryGovernor
+from page_cache import PageCache
+from sessions import SessionBroker
+from sinks import open_sink
+
+LOG = logging.getLogger("gmat.scraper.orchestrator")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    url       TEXT PRIMARY KEY,
+    q_type    TEXT,
+    state     TEXT NOT NULL DEFAULT 'new',
+    worker    TEXT,
+    tries     INTEGER NOT NULL DEFAULT 0,
+    leased_at REAL,
+    done_at   REAL,
+    result    TEXT,
+    error     TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state);
+CREATE TABLE IF NOT EXISTS workers (
+    id         TEXT PRIMARY KEY,
+    host       TEXT,
+    pid        INTEGER,
+    started_at REAL,
+    beat_at    REAL,
+    done       INTEGER NOT NULL DEFAULT 0,
+    failed     INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+# ─── shared work queue ──────────────────────────────────────────────
+class WorkQueue:
+    """SQLite job queue shared by processes (and machines) – one instance per process."""
+
+    def __init__(self, path: Union[str, Path], *, max_tries: int = 3):
+        self.path, self.max_tries = str(path), max_tries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=60, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def _tx(self, fn):
+        """Run fn(db) inside BEGIN IMMEDIATE – one writer at a time, across processes."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return out
+
+    # -- producer side ----------------------------------------------------
+    def add(self, jobs: Iterable[Tuple[str, Optional[str]]], chunk: int = 1000) -> int:
+        """Insert (url, q_type|None) pairs; URLs already queued are left alone."""
+        added, buf = 0, []
+
+        def flush(db):
+            before = db.total_changes
+            db.executemany("INSERT OR IGNORE INTO jobs(url, q_type) VALUES (?,?)", buf)
+            return db.total_changes - before
+        for url, q in jobs:
+            buf.append((url, QuestionType(q).value if q else None))
+            if len(buf) >= chunk:
+                added += self._tx(flush); buf = []
+        if buf:
+            added += self._tx(flush)
+        return added
+
+    # -- worker side ------------------------------------------------------
+    def register(self, worker: str):
+        now = time.time()
+        self._tx(lambda db: db.execute(
+            "INSERT OR REPLACE INTO workers(id, host, pid, started_at, beat_at) VALUES (?,?,?,?,?)",
+            (worker, socket.gethostname(), os.getpid(), now, now)))
+
+    def beat(self, worker: str):
+        self._tx(lambda db: db.execute("UPDATE workers SET beat_at=? WHERE id=?",
+                                       (time.time(), worker)))
+
+    def lease(self, worker: str, n: int) -> List[Tuple[str, Optional[QuestionType]]]:
+        def take(db):
+            rows = db.execute("SELECT url, q_type FROM jobs WHERE state='new' "
+                              "ORDER BY tries, rowid LIMIT ?", (n,)).fetchall()
+            db.executemany("UPDATE jobs SET state='leased', worker=?, leased_at=? WHERE url=?",
+                           [(worker, time.time(), r[0]) for r in rows])
+            return rows
+        return [(u, QuestionType(q) if q else None) for u, q in self._tx(take)]
+
+    def done(self, worker: str, url: str, data: Dict[str, Any]):
+        blob = json.dumps(data, ensure_ascii=False)
+        def fn(db):
+            db.execute("UPDATE jobs SET state='done', result=?, error=NULL, done_at=?, worker=? "
+                       "WHERE url=?", (blob, time.time(), worker, url))
+            db.execute("UPDATE workers SET done=done+1, beat_at=? WHERE id=?", (time.time(), worker))
+        self._tx(fn)
+
+    def failed(self, worker: str, url: str, error: str):
+        def fn(db):
+            db.execute("UPDATE jobs SET tries=tries+1, error=?, worker=NULL, leased_at=NULL, "
+                       "state=CASE WHEN tries+1 >= ? THEN 'failed' ELSE 'new' END WHERE url=?",
+                       (error[:500], self.max_tries, url))
+            db.execute("UPDATE workers SET failed=failed+1, beat_at=? WHERE id=?",
+                       (time.time(), worker))
+        self._tx(fn)
+
+    # -- supervisor side --------------------------------------------------
+    def requeue(self, worker: Optional[str] = None, *, stale_after: float = 120,
+                lease_timeout: float = 3600) -> int:
+        """
+        Hand back leases of `worker` (known dead), of any worker whose last
+        heartbeat is older than `stale_after`, and any lease older than
+        `lease_timeout`.  Returns the number of jobs re-queued.
+        """
+        now = time.time()
+        def fn(db):
+            if worker is not None:
+                cur = db.execute("UPDATE jobs SET state='new', worker=NULL, leased_at=NULL "
+                                 "WHERE state='leased' AND worker=?", (worker,))
+                n = cur.rowcount
+            else:
+                n = 0
+            cur = db.execute(
+                "UPDATE jobs SET state='new', worker=NULL, leased_at=NULL WHERE state='leased' "
+                "AND (leased_at < ? OR worker NOT IN "
+                "     (SELECT id FROM workers WHERE beat_at >= ?))",
+                (now - lease_timeout, now - stale_after))
+            return n + cur.rowcount
+        n = self._tx(fn)
+        if n:
+            LOG.warning("queue: %d leased jobs re-queued%s", n, f" from {worker}" if worker else "")
+        return n
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            c = dict(self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"))
+        return {s: c.get(s, 0) for s in ("new", "leased", "done", "failed")}
+
+    def workers(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute("SELECT id, host, pid, beat_at, done, failed FROM workers "
+                                    "ORDER BY id").fetchall()
+        now = time.time()
+        return [{"id": w, "host": h, "pid": p, "beat_age_s": round(now - b, 1),
+                 "done": d, "failed": f} for w, h, p, b, d, f in rows]
+
+    def results(self) -> Iterator[Tuple[str, Optional[str], str, Optional[Dict[str, Any]]]]:
+        """(url, q_type, state, data) of finished or failed jobs, streamed."""
+        db = sqlite3.connect(self.path, timeout=60)
+        try:
+            for url, q, state, res, err in db.execute(
+                    "SELECT url, q_type, state, result, error FROM jobs "
+                    "WHERE state IN ('done', 'failed') ORDER BY rowid"):
+                yield url, q, state, json.loads(res) if res else {"error": err}
+        finally:
+            db.close()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# ─── worker process ─────────────────────────────────────────────────
+def _worker_main(queue_path: str, worker: str, opts: Dict[str, Any]):
+    """One process: one logged-in Chrome, leasing `batch` jobs at a time."""
+    q = WorkQueue(queue_path, max_tries=opts["max_tries"])
+    q.register(worker)
+    stop = threading.Event()
+
+    def heartbeat():
+        hb = WorkQueue(queue_path)                  # own connection for the thread
+        while not stop.wait(opts["beat"]):
+            hb.beat(worker)
+        hb.close()
+    threading.Thread(target=heartbeat, daemon=True).start()
+
+    cache = PageCache(opts["cache"]) if opts.get("cache") else None
+    dedup = DupIndex(opts["dedup"]) if opts.get("dedup") else None
+    explain = ExplanationCollector(max_pages=opts["explain_pages"], cache=cache) \
+        if opts.get("explain_pages") else None
+    broker = None
+    if opts.get("accounts"):
+        broker = SessionBroker.from_file(opts["accounts"], login=refresh_session,
+                                         rpm_scale=1 / opts["processes"])
+        if opts["refresher"]:
+            broker.start()
+    governor = MemoryGovernor(max_pages=opts["max_pages"], max_rss_mb=opts["max_rss_mb"])
+    pool = DriverPool(1, email=opts["email"], password=opts["password"],
+                      headless=opts["headless"], broker=broker,
+                      lean=opts["lean"], block_css=opts["block_css"], governor=governor)
+    try:
+        while True:
+            jobs = q.lease(worker, opts["batch"])
+            if not jobs:
+                break
+            for url, res in scrape_many(jobs, email=opts["email"], password=opts["password"],
+                                        pool=pool, retries=opts["retries"],
+                                        polish=opts["polish"], snapshot=opts["snapshot"],
+                                        http_first=opts["http_first"], cache=cache,
+                                        dedup=dedup, explain=explain):
+                if isinstance(res, DuplicateQuestion):
+                    q.done(worker, url, res.as_result())
+                elif isinstance(res, Exception):
+                    q.failed(worker, url, f"{type(res).__name__}: {res}")
+                else:
+                    q.done(worker, url, res)
+    finally:
+        stop.set()
+        pool.close()
+        LOG.info("%s peak memory per type: %s", worker, governor.peaks())
+        if broker is not None:
+            broker.close()
+        if cache is not None:
+            cache.close()
+        if dedup is not None:
+            dedup.close()
+        if explain is not None:
+            explain.close()
+        q.close()
+
+
+# ─── supervisor ─────────────────────────────────────────────────────
+def run(queue_path: Union[str, Path], *, processes: int = os.cpu_count() or 2,
+        email: Optional[str] = None, password: Optional[str] = None,
+        accounts: Optional[str] = None, headless: bool = True, snapshot: bool = True,
+        http_first: bool = False, polish: bool = False, cache: Optional[str] = None,
+        retries: int = 1, max_tries: int = 3, batch: int = 4, beat: float = 15,
+        stale_after: float = 120, report_every: float = 30, stagger: float = 3,
+        max_restarts: int = 3, lean: bool = False, block_css: bool = False,
+        dedup: Optional[str] = None, max_pages: int = 200,
+        max_rss_mb: float = 1500, explain_pages: int = 0) -> Dict[str, int]:
+    """
+    Start `processes` workers on this machine and supervise them until the
+    queue is drained: dead workers' leases are re-queued and the worker is
+    restarted (at most `max_restarts` times per slot).  Each worker's
+    browser is replaced after `max_pages` pages or above `max_rss_mb`.
+    With `explain_pages`, the best replies of that many thread pages per
+    topic are collected too.
+    Logs throughput and queue depth every `report_every` seconds; returns
+    the final counts.
+    """
+    queue = WorkQueue(queue_path, max_tries=max_tries)
+    opts = dict(email=email, password=password, accounts=accounts, processes=processes,
+                headless=headless, snapshot=snapshot, http_first=http_first, polish=polish,
+                cache=cache, retries=retries, max_tries=max_tries, batch=batch, beat=beat,
+                lean=lean, block_css=block_css, dedup=dedup, max_pages=max_pages,
+                max_rss_mb=max_rss_mb, explain_pages=explain_pages)
+    ctx = mp.get_context("spawn")               # no inherited threads / sockets
+    host = socket.gethostname()
+    procs: Dict[int, Tuple[str, mp.Process]] = {}
+    restarts = [0] * processes
+
+    def spawn(slot: int):
+        worker = f"{host}-{os.getpid()}-{slot}.{restarts[slot]}"
+        p = ctx.Process(target=_worker_main,
+                        args=(str(queue_path), worker, dict(opts, refresher=slot == 0)),
+                        name=worker, daemon=False)
+        p.start()
+        procs[slot] = (worker, p)
+
+    queue.requeue(stale_after=stale_after)     # leftovers from an earlier crash
+    for slot in range(processes):
+        spawn(slot)
+        time.sleep(stagger)                    # don't log N browsers in at once
+
+    t0 = last_t = time.monotonic()
+    last_done = start_done = queue.counts()["done"]
+    try:
+        while procs:
+            time.sleep(1)
+            for slot, (worker, p) in list(procs.items()):
+                if p.is_alive():
+                    continue
+                del procs[slot]
+                queue.requeue(worker, stale_after=stale_after)
+                left = queue.counts()["new"]
+                if p.exitcode != 0:
+                    LOG.warning("worker %s died (exit %s)", worker, p.exitcode)
+                    if left and restarts[slot] < max_restarts:
+                        restarts[slot] += 1
+                        spawn(slot)
+                elif left and not procs:           # drained, but leases came back since
+                    spawn(slot)
+            now = time.monotonic()
+            if now - last_t >= report_every:
+                queue.requeue(stale_after=stale_after)   # other machines' dead workers
+                _report(queue, now - last_t, queue.counts()["done"] - last_done, len(procs))
+                last_t, last_done = now, queue.counts()["done"]
+    except KeyboardInterrupt:
+        LOG.warning("interrupted – stopping workers, leases go back to the queue")
+        for worker, p in procs.values():
+            p.terminate()
+        for worker, p in procs.values():
+            p.join(10)
+            queue.requeue(worker)
+        raise
+    finally:
+        c = queue.counts()
+        el = time.monotonic() - t0
+        LOG.info("run finished: %d pages in %.0fs (%.1f/min) – %s",
+                 c["done"] - start_done, el, (c["done"] - start_done) / el * 60 if el else 0, c)
+        queue.close()
+    return c
+
+def _report(queue: WorkQueue, dt: float, done: int, alive: int):
+    c = queue.counts()
+    rate = done / dt * 60 if dt else 0.0
+    eta = (c["new"] + c["leased"]) / rate if rate else float("inf")
+    LOG.info("%.1f pages/min | queue new=%d leased=%d done=%d failed=%d | %d workers | ETA %s",
+             rate, c["new"], c["leased"], c["done"], c["failed"], alive,
+             f"{eta:.0f} min" if eta != float("inf") else "–")
+
+
+# ─── manifests / export ─────────────────────────────────────────────
+def read_manifest(path: Union[str, Path]) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    `.jsonl`: {"url": …, "q_type": …} per line.  Anything else: CSV/TSV rows
+    url[,q_type] – blank lines, '#' comments and a `url` header are skipped.
+    A missing q_type means "detect it on the page".
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    d = json.loads(line)
+                    yield d["url"], d.get("q_type") or None
+            return
+        dialect = "excel-tab" if path.suffix.lower() == ".tsv" else "excel"
+        for row in csv.reader(f, dialect):
+            if not row or not row[0].strip() or row[0].startswith("#") or row[0] == "url":
+                continue
+            yield row[0].strip(), (row[1].strip() or None) if len(row) > 1 else None
+
+def export(queue_path: Union[str, Path], out: Union[str, Path]) -> Dict[str, int]:
+    """Merge every finished / failed job into one result sink."""
+    q = WorkQueue(queue_path)
+    counts = {"written": 0, "failed": 0}
+    try:
+        with open_sink(out) as sink:
+            for url, q_type, state, data in q.results():
+                if state == "done":
+                    sink.write(url, q_type, data); counts["written"] += 1
+                else:
+                    sink.fail(url, q_type, RuntimeError(data.get("error") or "failed"))
+                    counts["failed"] += 1
+    finally:
+        q.close()
+    return counts
+
+
+# ─── CLI ────────────────────────────────────────────────────────────
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="sharded GMAT Club scraping")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    a_add = sub.add_parser("add", help="queue the URLs of a manifest")
+    a_add.add_argument("queue"); a_add.add_argument("manifest")
+
+    a_run = sub.add_parser("run", help="start worker processes on this machine")
+    a_run.add_argument("queue")
+    a_run.add_argument("--manifest", help="queue this manifest first")
+    a_run.add_argument("-n", "--processes", type=int, default=os.cpu_count() or 2)
+    a_run.add_argument("--email", default=os.getenv("GMAT_EMAIL"))
+    a_run.add_argument("--password", default=os.getenv("GMAT_PASSWORD"))
+    a_run.add_argument("--accounts", help='JSON list of {"email", "password", "rpm"}')
+    a_run.add_argument("--show", action="store_true", help="visible browsers")
+    a_run.add_argument("--live", action="store_true", help="live parsers instead of snapshots")
+    a_run.add_argument("--http-first", action="store_true")
+    a_run.add_argument("--lean", action="store_true",
+                       help="no images, fonts, ads or trackers; eager page loads")
+    a_run.add_argument("--no-css", action="store_true", help="with --lean: block stylesheets too")
+    a_run.add_argument("--polish", action="store_true")
+    a_run.add_argument("--cache", help="PageCache directory")
+    a_run.add_argument("--dedup", help="near-duplicate index (SQLite file) shared by the workers")
+    a_run.add_argument("--batch", type=int, default=4, help="jobs leased per request")
+    a_run.add_argument("--max-pages", type=int, default=200,
+                       help="replace a worker's browser after this many pages (0: never)")
+    a_run.add_argument("--max-rss-mb", type=float, default=1500,
+                       help="... or once its process tree uses more memory than this")
+    a_run.add_argument("--explain-pages", type=int, default=0,
+                       help="collect the best explanation replies from up to N thread pages")
+    a_run.add_argument("--report-every", type=float, default=30)
+
+    a_st = sub.add_parser("status", help="queue depth and workers as JSON")
+    a_st.add_argument("queue")
+
+    a_ex = sub.add_parser("export", help="merge results into .jsonl / .sqlite")
+    a_ex.add_argument("queue"); a_ex.add_argument("out")
+
+    a = ap.parse_args(argv)
+    if a.cmd == "add":
+        q = WorkQueue(a.queue)
+        print(f"queued {q.add(read_manifest(a.manifest))} new URLs – {q.counts()}")
+        q.close()
+    elif a.cmd == "run":
+        if not (a.accounts or a.email and a.password):
+            ap.error("credentials needed: --accounts, --email/--password "
+                     "or GMAT_EMAIL/GMAT_PASSWORD")
+        if a.manifest:
+            q = WorkQueue(a.queue)
+            LOG.info("queued %d new URLs", q.add(read_manifest(a.manifest)))
+            q.close()
+        c = run(a.queue, processes=a.processes, email=a.email, password=a.password,
+                accounts=a.accounts,
+                headless=not a.show, snapshot=not a.live, http_first=a.http_first,
+                polish=a.polish, cache=a.cache, batch=a.batch, report_every=a.report_every,
+                lean=a.lean or a.no_css, block_css=a.no_css, dedup=a.dedup,
+                max_pages=a.max_pages, max_rss_mb=a.max_rss_mb,
+                explain_pages=a.explain_pages)
+        return 1 if c["failed"] else 0
+    elif a.cmd == "status":
+        q = WorkQueue(a.queue)
+        print(json.dumps({"jobs": q.counts(), "workers": q.workers()}, indent=2))
+        q.close()
+    elif a.cmd == "export":
+        print(export(a.queue, a.out))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
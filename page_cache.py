@@ -0,0 +1,209 @@
+# ░░░  GMAT-Club Scraper – raw page cache  ░░░
+#
+# Content-addressed store of topic HTML (taken after the spoilers are open)
+# plus the parsed result and the PARSER_VERSION that produced it.
+#
+#   <root>/index.sqlite               url → blob sha, q_type, timestamps, result
+#   <root>/blobs/ab/abcdef….html.gz   one gzip file per distinct page body
+#
+# Identical bodies share a blob.  Entries expire after `ttl` seconds and the
+# least-recently-used ones are dropped once the blobs exceed `max_bytes`.
+
+from __future__ import annotations
+import gzip, hashlib, json, logging, os, sqlite3, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urldefrag
+
+LOG = logging.getLogger("gmat.scraper.cache")
+
+DEFAULT_ROOT = Path(os.getenv("GMAT_CACHE_DIR", Path.home() / ".cache" / "gmat_scraper"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url         TEXT PRIMARY KEY,
+    q_type      TEXT,
+    sha         TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    fetched_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    parser_ver  INTEGER,
+    result      TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_sha ON pages(sha);
+CREATE INDEX IF NOT EXISTS pages_lru ON pages(accessed_at);
+"""
+
+def _key(url: str) -> str:
+    return urldefrag(url.strip())[0]
+
+
+class PageCache:
+    """Thread-safe on-disk cache; see module header for the layout."""
+
+    def __init__(self, root: Optional[Path] = None, *,
+                 ttl: Optional[float] = 7 * 86400,
+                 max_bytes: Optional[int] = 2 << 30):
+        self.root      = Path(root or DEFAULT_ROOT)
+        self.ttl       = ttl
+        self.max_bytes = max_bytes
+        (self.root / "blobs").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db   = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._bytes = self._sum_bytes()            # kept up to date by put / evict
+
+    # ─── blobs ──────────────────────────────────────────────────────
+    def _blob(self, sha: str) -> Path:
+        return self.root / "blobs" / sha[:2] / f"{sha}.html.gz"
+
+    def _write_blob(self, sha: str, raw: bytes):
+        p = self._blob(sha)
+        p.parent.mkdir(exist_ok=True)
+        tmp = p.with_name(f".{sha}.{threading.get_ident()}-{time.time_ns()}.tmp")   # one per writer
+        tmp.write_bytes(gzip.compress(raw, compresslevel=6))
+        tmp.replace(p)                                  # atomic on POSIX
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return self.ttl is None or time.time() - fetched_at <= self.ttl
+
+    # ─── read ───────────────────────────────────────────────────────
+    def _row(self, url: str):
+        return self._db.execute(
+            "SELECT sha, fetched_at, parser_ver, result, q_type FROM pages WHERE url=?",
+            (_key(url),)).fetchone()
+
+    def get_html(self, url: str, *, ignore_ttl: bool = False) -> Optional[str]:
+        with self._lock:
+            row = self._row(url)
+            if row is None or not (ignore_ttl or self._fresh(row[1])):
+                return None
+            self._touch(url)
+        try:
+            return gzip.decompress(self._blob(row[0]).read_bytes()).decode("utf-8")
+        except FileNotFoundError:
+            LOG.warning("cache: blob for %s vanished", url)
+            return None
+
+    def q_type(self, url: str) -> Optional[str]:
+        """Type the cached page was last parsed as, if any."""
+        with self._lock:
+            row = self._row(url)
+        return row[4] if row is not None else None
+
+    def get_result(self, url: str, parser_version: int,
+                   q_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cached parse of a fresh page, only if made by `parser_version`
+        (and, when given, for the same `q_type`)."""
+        with self._lock:
+            row = self._row(url)
+            if row is None or row[2] != parser_version or row[3] is None \
+                    or not self._fresh(row[1]) or (q_type and row[4] != q_type):
+                return None
+            self._touch(url)
+        return json.loads(row[3])
+
+    def _touch(self, url: str):
+        self._db.execute("UPDATE pages SET accessed_at=? WHERE url=?", (time.time(), _key(url)))
+        self._db.commit()
+
+    # ─── write ──────────────────────────────────────────────────────
+    def put(self, url: str, html: str, *, q_type: Optional[str] = None,
+            result: Optional[Dict[str, Any]] = None,
+            parser_version: Optional[int] = None):
+        raw = html.encode("utf-8")
+        sha = hashlib.sha256(raw).hexdigest()
+        p = self._blob(sha)
+        if not p.exists():                             # compress + write outside the lock
+            self._write_blob(sha, raw)
+        now = time.time()
+        with self._lock:
+            # Blobs are only unlinked under the lock, so one that exists here
+            # stays until the row below is in.
+            if not p.exists():                         # orphaned by a concurrent put / evict
+                self._write_blob(sha, raw)
+            size = p.stat().st_size
+            new_blob = not self._db.execute(
+                "SELECT 1 FROM pages WHERE sha=? LIMIT 1", (sha,)).fetchone()
+            old = self._db.execute("SELECT sha, size FROM pages WHERE url=?",
+                                   (_key(url),)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?,?,?,?,?,?,?,?)",
+                (_key(url), q_type, sha, size, now, now,
+                 parser_version if result is not None else None,
+                 json.dumps(result, ensure_ascii=False) if result is not None else None))
+            self._db.commit()
+            if new_blob:
+                self._bytes += size
+            if old is not None and old[0] != sha and not self._db.execute(
+                    "SELECT 1 FROM pages WHERE sha=? LIMIT 1", (old[0],)).fetchone():
+                self._blob(old[0]).unlink(missing_ok=True)
+                self._bytes -= old[1]
+            over = self.max_bytes is not None and self._bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def put_result(self, url: str, result: Dict[str, Any], parser_version: int):
+        with self._lock:
+            self._db.execute("UPDATE pages SET parser_ver=?, result=? WHERE url=?",
+                             (parser_version, json.dumps(result, ensure_ascii=False), _key(url)))
+            self._db.commit()
+
+    # ─── corpus walk (re-parse) ─────────────────────────────────────
+    def pages(self, *, stale_for: Optional[int] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """(url, q_type) of every cached page – or only those whose result
+        was not produced by parser version `stale_for`."""
+        sql, args = "SELECT url, q_type FROM pages", ()
+        if stale_for is not None:
+            sql, args = sql + " WHERE parser_ver IS NULL OR parser_ver != ?", (stale_for,)
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        yield from rows
+
+    # ─── eviction ───────────────────────────────────────────────────
+    def _sum_bytes(self) -> int:
+        rows = self._db.execute("SELECT sha, MAX(size) FROM pages GROUP BY sha").fetchall()
+        return sum(r[1] for r in rows)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._bytes
+
+    def evict(self) -> int:
+        """Drop expired entries, then LRU ones until under `max_bytes`."""
+        removed, dropped = 0, set()
+        with self._lock:
+            if self.ttl is not None:
+                cutoff = time.time() - self.ttl
+                for url, sha in self._db.execute(
+                        "SELECT url, sha FROM pages WHERE fetched_at < ?", (cutoff,)).fetchall():
+                    self._db.execute("DELETE FROM pages WHERE url=?", (url,))
+                    dropped.add(sha); removed += 1
+            if self.max_bytes is not None:
+                blobs = dict(self._db.execute("SELECT sha, MAX(size) FROM pages GROUP BY sha"))
+                total = sum(blobs.values())
+                for url, sha in self._db.execute(
+                        "SELECT url, sha FROM pages ORDER BY accessed_at").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM pages WHERE url=?", (url,))
+                    dropped.add(sha); removed += 1
+                    if sha in blobs and not self._db.execute(
+                            "SELECT 1 FROM pages WHERE sha=? LIMIT 1", (sha,)).fetchone():
+                        total -= blobs.pop(sha)
+            self._db.commit()
+            orphans = [sha for sha in dropped if not self._db.execute(
+                "SELECT 1 FROM pages WHERE sha=? LIMIT 1", (sha,)).fetchone()]
+            for sha in orphans:
+                self._blob(sha).unlink(missing_ok=True)
+            self._bytes = self._sum_bytes()
+        if removed:
+            LOG.info("cache: evicted %d entries (%d blobs)", removed, len(orphans))
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc): self.close()
@@ -0,0 +1,416 @@
+# ░░░  GMAT-Club Scraper – staged pipeline  ░░░
+#
+#   for url, data in Pipeline(email=…, password=…, workers=3, polish=True).run(jobs): …
+#   async for url, data in ascrape_many(jobs, email=…, password=…): …
+#   data = await ascrape(url=…, email=…, password=…)
+#
+# scrape() does one page start to finish: navigate, parse, polish, return –
+# the browser idles while GPT answers and GPT idles while pages load.  Here
+# every step is its own group of threads, linked by bounded queues:
+#
+#   jobs ─▶ fetch ─▶ parse ─▶ finish ─▶ write ─▶ run() / ascrape_many()
+#           one per   CPU     polish +   sink,
+#           browser           assets in  if any
+#                             windows
+#
+# A browser goes back to the pool as soon as its snapshot is taken; a full
+# queue blocks the stage before it, so a slow GPT or a slow consumer holds
+# the browsers back instead of piling pages up in memory.  Failed pages
+# travel down the queues as (url, exception) like in scrape_many().
+
+from __future__ import annotations
+import asyncio, functools, logging, queue, threading, time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional, Tuple, Union
+
+import main_code, metrics
+from dedup import DuplicateQuestion
+from main_code import (DriverPool, HttpFetcher, QuestionData, QuestionType, ScrapeError, _ctx,
+                       _fetch_page, _from_cache, _hand_over, _narrow_retries, _parse_snapshot,
+                       _polish_stage, _scrape_page, scrape)
+
+LOG = logging.getLogger("gmat.scraper.pipeline")
+
+_DONE = object()                           # end of stream, one per downstream thread
+_POLL = 0.2                                # how often blocked threads look at stop
+
+
+class _Item:
+    """One page on its way through the stages."""
+    __slots__ = ("url", "q_type", "data", "html", "sig")
+
+    def __init__(self, url: str, q_type: Optional[QuestionType], data: Any = None,
+                 html: Optional[str] = None, sig=None):
+        self.url, self.q_type, self.data, self.html, self.sig = url, q_type, data, html, sig
+
+
+class Pipeline:
+    """
+    fetch → parse → finish → write with their own concurrency; see module
+    header.  Options as in scrape_many(); in addition `parsers` threads
+    parse snapshots, `queue_size` bounds every queue (default: twice the
+    browsers), `polish_linger` is how long a polish window waits to fill
+    up, and a `sink` (sinks.ResultSink) is written from its own thread.
+    `snapshot=False` parses live in the fetch threads (no parse stage) –
+    unless there is a `cache`, which keeps the HTML and so parses it there.
+    An `explain` collector starts on a topic's thread pages as soon as its
+    fetch has page 1; the finish stage adds them.
+    """
+
+    def __init__(self, *, email: Optional[str] = None, password: Optional[str] = None,
+                 workers: int = 2, parsers: int = 2, headless: bool = True,
+                 polish: bool = False, polish_window: int = 32, polish_linger: float = 2.0,
+                 retries: int = 1, pool: Optional[DriverPool] = None, snapshot: bool = True,
+                 http_first: bool = False, cache=None, on_detect=None, broker=None,
+                 lean: bool = False, block_css: bool = False, assets=None, dedup=None,
+                 governor=None, explain=None, sink=None, queue_size: Optional[int] = None):
+        self.email, self.password, self.retries = email, password, retries
+        self.snapshot, self.cache, self.on_detect = snapshot, cache, on_detect
+        self.polish, self.window, self.linger = polish, polish_window, polish_linger
+        self.assets, self.dedup, self.sink = assets, dedup, sink
+        self.explain, self._pending = explain, {}   # url → explanation future
+        self._own_pool = pool is None
+        self.pool = pool or DriverPool(workers, email=email, password=password,
+                                       headless=headless, broker=broker, lean=lean,
+                                       block_css=block_css, governor=governor)
+        self.parsers = max(1, parsers) if snapshot or cache is not None else 0   # cache needs HTML
+        self.http = HttpFetcher(pool_size=max(self.pool.size, 1)) if http_first else None
+        self.queue_size = queue_size or 2 * self.pool.size
+        self._stop = threading.Event()
+
+    # ─── queue plumbing ─────────────────────────────────────────────
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Blocking put that gives up once the pipeline is stopped."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, q: queue.Queue, stage: str, timeout: Optional[float] = None):
+        """Blocking get; time spent waiting is pipeline_idle_seconds{stage}."""
+        t0, deadline = time.perf_counter(), None if timeout is None else time.monotonic() + timeout
+        try:
+            while not self._stop.is_set():
+                wait = _POLL if deadline is None else min(_POLL, deadline - time.monotonic())
+                if wait <= 0:
+                    raise queue.Empty
+                try:
+                    return q.get(timeout=wait)
+                except queue.Empty:
+                    pass
+            return _DONE
+        finally:
+            metrics.observe("pipeline_idle_seconds", time.perf_counter() - t0, stage=stage)
+
+    def _stage(self, name: str, n: int, fn, inq: queue.Queue, outq: queue.Queue,
+               downstream: int, failures: bool = False) -> List[threading.Thread]:
+        """
+        `n` threads running fn(item) → item on `inq` (failed items too with
+        `failures`); the last one to see the end of the stream passes
+        `downstream` end markers on.
+        """
+        left = [n]
+        lock = threading.Lock()
+
+        def loop():
+            try:
+                while True:
+                    item = self._get(inq, name)
+                    if item is _DONE:
+                        break
+                    if isinstance(item.data, Exception) and not failures:
+                        out = item                 # failures just travel on
+                    else:
+                        try:
+                            out = fn(item)
+                        except Exception as e:
+                            if not isinstance(e, DuplicateQuestion):
+                                LOG.error("giving up on %s: %s", item.url, e)
+                            out = _Item(item.url, item.q_type, e)
+                    if not self._put(outq, out):
+                        break
+            finally:
+                with lock:
+                    left[0] -= 1
+                    last = left[0] == 0
+                if last:
+                    for _ in range(downstream):
+                        self._put(outq, _DONE)
+
+        return [threading.Thread(target=loop, name=f"pipeline-{name}-{i}", daemon=True)
+                for i in range(n)]
+
+    # ─── stages ─────────────────────────────────────────────────────
+    def _fetch(self, item: _Item) -> _Item:
+        if self.explain is None:
+            return self._load(item)
+        first = Future()                          # page 1 for the thread pages
+        self._pending[item.url] = self.explain.submit(item.url, first)
+        try:
+            out = self._load(item, first)
+        except BaseException:
+            first.cancel()
+            raise
+        _hand_over(first, out.html)
+        return out
+
+    def _load(self, item: _Item, first: Optional[Future] = None) -> _Item:
+        url, q_type = item.url, item.q_type
+        _ctx.q_type = q_type.value if q_type else "auto"
+        _ctx.url = url                            # "auto" RSS is booked once parse knows the type
+        found = [q_type]
+
+        def detected(u, q, conf):
+            found.append(q)
+            if self.on_detect is not None:
+                self.on_detect(u, q, conf)
+        if self.cache is not None:
+            with metrics.span("cache"):
+                hit = _from_cache(self.cache, url, q_type, detected)
+            if hit is not None:
+                metrics.inc("pages_total", source="cache")
+                if first is not None:
+                    _hand_over(first, self.cache.get_html(url))
+                return _Item(url, hit[0], self._spill(hit[1]))
+        if self.http is not None:
+            with metrics.span("http"):
+                data = self.http.scrape(url, q_type, self.cache, detected, self.dedup, first)
+            if data is not None:
+                metrics.inc("pages_total", source="http")
+                return _Item(url, found[-1], self._spill(data))
+        budget = [self.retries]
+        while True:
+            try:
+                with metrics.span("fetch"), self.pool.checkout() as drv:
+                    if not self.snapshot and self.cache is None:    # live parse needs the browser
+                        data = _scrape_page(drv, url, q_type, False, on_detect=detected,
+                                            dedup=self.dedup, budget=budget, page=first)
+                        html = sig = None
+                    else:
+                        html, sig = _narrow_retries(url, budget, lambda navigate: _fetch_page(
+                            drv, url, q_type, self.dedup))
+                metrics.inc("pages_total", source="chrome")
+                if html is None:
+                    return _Item(url, found[-1], self._spill(data))
+                return _Item(url, q_type, None, html, sig)
+            except (main_code.WebDriverException, ScrapeError) as e:   # selenium's, once loaded
+                if budget[0] <= 0:
+                    metrics.inc("failures_total", error=type(e).__name__)
+                    raise
+                budget[0] -= 1
+                metrics.inc("retries_total", scope="driver")
+                LOG.warning("retry %s in a new browser because %s", url, e)
+
+    def _parse(self, item: _Item) -> _Item:
+        if item.html is None:                      # cache / http / live: already parsed
+            return item
+        _ctx.q_type = item.q_type.value if item.q_type else "auto"
+        try:
+            q_type, data = _parse_snapshot(item.url, item.html, item.q_type,
+                                           self.cache, self.on_detect)
+        except ScrapeError:                        # the HTML is all there is: no retry
+            metrics.inc("failures_total", error="ScrapeError")
+            raise
+        if item.q_type is None and self.pool.governor is not None:
+            self.pool.governor.label(item.url, q_type.value)
+        if item.sig is not None:
+            self.dedup.add(item.url, item.sig, q_type)
+        return _Item(item.url, q_type, self._spill(data))
+
+    def _spill(self, data):
+        return data if self.pool.governor is None else self.pool.governor.spill(data)
+
+    def _explained(self, item: _Item):
+        fut = self._pending.pop(item.url, None)
+        if fut is None:
+            return
+        if isinstance(item.data, Exception):
+            fut.cancel()
+            return
+        with metrics.span("explain"):
+            item.data = self.explain.fill(item.data, fut.result())
+
+    def _finish_loop(self, inq: queue.Queue, outq: queue.Queue):
+        """Explanations, then polish / localize in windows: up to `window` pages or `linger` seconds."""
+        stage, assets = _polish_stage() if self.polish else None, self.assets
+        window = self.window if stage is not None or assets is not None else 1
+        done = False
+        while not done:
+            buf: List[_Item] = []
+            item = self._get(inq, "finish")
+            while item is not _DONE:
+                buf.append(item)
+                if len(buf) >= window:
+                    break
+                try:
+                    item = self._get(inq, "finish", timeout=self.linger)
+                except queue.Empty:
+                    break
+            done = item is _DONE
+            for i in buf:
+                self._explained(i)
+            ok = [i for i in buf if not isinstance(i.data, Exception)]
+            if ok and stage is not None:
+                for i, d in zip(ok, stage.polish_many([(i.data, i.q_type) for i in ok])):
+                    i.data = d
+            if ok and assets is not None:
+                for i, (_, d) in zip(ok, assets.stream(((i.url, i.data) for i in ok),
+                                                       window=len(ok))):
+                    i.data = d
+            for i in buf:
+                if not self._put(outq, i):
+                    return
+        self._put(outq, _DONE)
+
+    def _write(self, item: _Item) -> _Item:
+        q = item.q_type.value if item.q_type else None
+        with metrics.span("write"):
+            if isinstance(item.data, DuplicateQuestion):
+                self.sink.write(item.url, q, item.data.as_result())
+            elif isinstance(item.data, Exception):
+                self.sink.fail(item.url, q, item.data)
+            else:
+                self.sink.write(item.url, q, item.data)
+        return item
+
+    # ─── run ────────────────────────────────────────────────────────
+    def run(self, jobs: Iterable[Tuple[str, Optional[QuestionType]]]
+            ) -> Iterator[Tuple[str, Union[QuestionData, Exception]]]:
+        """(url, data) – or (url, exception) – per job, as pages come out of the last stage."""
+        n = self.queue_size
+        todo, fetched, parsed, finished, out = (queue.Queue(n) for _ in range(5))
+        fetchers = self.pool.size
+        threads = self._stage("fetch", fetchers, self._fetch, todo, fetched,
+                              self.parsers or 1)
+        if self.parsers:
+            threads += self._stage("parse", self.parsers, self._parse, fetched, parsed, 1)
+        else:
+            parsed = fetched
+        threads.append(threading.Thread(target=self._finish_loop, args=(parsed, finished),
+                                        name="pipeline-finish", daemon=True))
+        if self.sink is not None:
+            threads += self._stage("write", 1, self._write, finished, out, 1, failures=True)
+        else:
+            out = finished
+
+        def feed():
+            for url, q in jobs:
+                if not self._put(todo, _Item(url, QuestionType(q) if q else None)):
+                    return
+            for _ in range(fetchers):
+                self._put(todo, _DONE)
+        threads.append(threading.Thread(target=feed, name="pipeline-feed", daemon=True))
+
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                item = self._get(out, "consumer")
+                if item is _DONE:
+                    return
+                yield item.url, item.data
+        finally:
+            self._stop.set()
+            for t in threads:
+                t.join()
+            self._stop = threading.Event()         # ready for another run()
+
+    def stop(self):
+        """Make a running run() wind down and return (from any thread)."""
+        self._stop.set()
+
+    def close(self):
+        self._stop.set()
+        if self._own_pool:
+            self.pool.close()
+        if self.http is not None:
+            self.http.close()
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc): self.close()
+
+
+# ─── asyncio ────────────────────────────────────────────────────────
+async def ascrape(**kw) -> QuestionData:
+    """scrape(**kw) on the loop's default executor, so the loop keeps running."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(scrape, **kw))
+
+
+async def ascrape_many(jobs: Union[Iterable[Tuple[str, Any]], AsyncIterator[Tuple[str, Any]]],
+                       **kw) -> AsyncIterator[Tuple[str, Union[QuestionData, Exception]]]:
+    """
+    Pipeline(**kw).run(jobs) as an async iterator.  `jobs` may be an async
+    iterator too; leaving the `async for` early stops the pipeline.
+    """
+    loop = asyncio.get_running_loop()
+    pipe = Pipeline(**kw)
+    results: asyncio.Queue = asyncio.Queue(pipe.queue_size)
+    stop = threading.Event()
+    feeder = None
+    if hasattr(jobs, "__aiter__"):
+        inbox: queue.Queue = queue.Queue(pipe.queue_size)
+
+        async def put(item):
+            while not stop.is_set():
+                try:
+                    return inbox.put_nowait(item)
+                except queue.Full:
+                    await asyncio.sleep(_POLL / 4)
+
+        async def feed(source):
+            async for job in source:
+                await put(job)
+            await put(_DONE)
+
+        def pulled():
+            while not stop.is_set():
+                try:
+                    job = inbox.get(timeout=_POLL)
+                except queue.Empty:
+                    continue
+                if job is _DONE:
+                    return
+                yield job
+        feeder = asyncio.ensure_future(feed(jobs))
+        jobs = pulled()
+
+    def bridge():                              # pipeline thread → event loop
+        it = pipe.run(jobs)
+        try:
+            for res in it:
+                fut = asyncio.run_coroutine_threadsafe(results.put(res), loop)
+                while True:
+                    try:
+                        fut.result(_POLL)
+                        break
+                    except FutureTimeout:
+                        if stop.is_set():
+                            fut.cancel()
+                            return
+        except Exception as e:                 # e.g. the pool could not start a browser
+            asyncio.run_coroutine_threadsafe(results.put(e), loop)
+        finally:
+            it.close()
+            pipe.close()
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(results.put(_DONE), loop)
+
+    worker = loop.run_in_executor(None, bridge)
+    try:
+        while True:
+            res = await results.get()
+            if res is _DONE:
+                break
+            if isinstance(res, Exception):
+                raise res
+            yield res
+    finally:
+        stop.set()
+        pipe.stop()
+        if feeder is not None:
+            feeder.cancel()
+        await worker
@@ -0,0 +1,270 @@
+# ░░░  GMAT-Club Scraper – GPT polish stage  ░░░
+#
+# Spacing clean-up for scraped questions, done in bulk:
+#   • questions the local cleaner already left well-formed are skipped
+#   • results are cached in SQLite under a hash of (model, prompt, input)
+#   • the rest are packed several per request up to a token budget
+#   • requests run concurrently behind a requests-per-minute limiter, with
+#     exponential backoff on 429 / 5xx / timeouts
+#   • a reply is only accepted if it differs from the input in whitespace
+#     alone – anything else keeps the original
+#
+# Point `base_url` (or OPENAI_BASE_URL) at a local stub to test offline.
+# The openai package is only imported once a client is actually built.
+
+from __future__ import annotations
+import hashlib, json, logging, os, random, re, sqlite3, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple, TypeVar)
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+from metrics import inc, span
+from page_cache import DEFAULT_ROOT
+
+LOG = logging.getLogger("gmat.scraper.polish")
+
+PROMPT_VERSION = 1
+SYSTEM_PROMPT = (
+    "Fix spacing only. The user sends JSON {\"items\": [{\"id\", \"type\", \"data\"}]}. "
+    "Reply with JSON {\"items\": [{\"id\", \"data\"}]} – same ids, and each data with "
+    "exactly the same structure, keys and characters; only add or remove whitespace."
+)
+
+# glued sentences, glued words, doubled blanks, blank before punctuation
+_DEFECT_RE = re.compile(r"[a-z][.?!,;:][A-Z][a-z]|[a-z]{2}[A-Z][a-z]{2}| {2,}|\w [,;:.?!](?:\s|$)")
+
+K = TypeVar("K")
+Item = Tuple[Dict[str, Any], str]            # (question data, q_type value)
+
+def needs_polish(data: Any) -> bool:
+    """True if any string in `data` shows a spacing defect worth a GPT call."""
+    if isinstance(data, str):
+        return bool(_DEFECT_RE.search(data))
+    if isinstance(data, dict):
+        return any(needs_polish(v) for v in data.values())
+    if isinstance(data, list):
+        return any(needs_polish(v) for v in data)
+    return False
+
+def same_but_spacing(orig: Any, new: Any) -> bool:
+    """Same structure and keys, and strings equal once whitespace is dropped."""
+    if isinstance(orig, dict):
+        return isinstance(new, dict) and orig.keys() == new.keys() and \
+            all(same_but_spacing(orig[k], new[k]) for k in orig)
+    if isinstance(orig, list):
+        return isinstance(new, list) and len(orig) == len(new) and \
+            all(same_but_spacing(a, b) for a, b in zip(orig, new))
+    if isinstance(orig, str):
+        return isinstance(new, str) and "".join(orig.split()) == "".join(new.split())
+    return orig == new
+
+def _openai_errors() -> Tuple[tuple, type]:
+    """(retryable exception types, OpenAIError) – imports openai on first use."""
+    from openai import (APIConnectionError, APITimeoutError, InternalServerError,
+                        OpenAIError, RateLimitError)
+    return (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError), OpenAIError
+
+def _tokens(obj: Any) -> int:
+    return len(json.dumps(obj, ensure_ascii=False)) // 4 + 8      # ~4 chars / token
+
+
+class _Limiter:
+    """Spaces request starts at least 60/rpm seconds apart (all threads)."""
+
+    def __init__(self, rpm: float):
+        self.gap, self._next, self._lock = 60.0 / rpm if rpm else 0.0, 0.0, threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.gap
+        if start > now:
+            time.sleep(start - now)
+
+
+class PolishStage:
+    def __init__(self, client: Optional[OpenAI] = None, *,
+                 model: Optional[str] = None, base_url: Optional[str] = None,
+                 token_budget: int = 6000, concurrency: int = 4, rpm: float = 60,
+                 max_retries: int = 5, cache_path: Optional[Path] = None,
+                 use_cache: bool = True):
+        if client is None:
+            key = os.getenv("OPENAI_API_KEY")
+            base_url = base_url or os.getenv("OPENAI_BASE_URL")
+            if key or base_url:
+                from openai import OpenAI
+                client = OpenAI(api_key=key or "stub", base_url=base_url, max_retries=0)
+        self.client       = client
+        self.model        = model or os.getenv("GPT_POLISH_MODEL", "gpt-4o-mini")
+        self.token_budget = token_budget
+        self.concurrency  = concurrency
+        self.max_retries  = max_retries
+        self._limiter     = _Limiter(rpm)
+        self._lock        = threading.Lock()
+        self.stats        = {"skipped": 0, "cached": 0, "requests": 0,
+                             "polished": 0, "rejected": 0, "failed": 0}
+        self._db = None
+        if use_cache:
+            path = Path(cache_path or DEFAULT_ROOT / "polish.sqlite")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS polish (key TEXT PRIMARY KEY, data TEXT)")
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    # ─── cache ──────────────────────────────────────────────────────
+    def _key(self, data: Dict[str, Any], q: str) -> str:
+        blob = json.dumps({"m": self.model, "v": PROMPT_VERSION, "t": q, "d": data},
+                          sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute("SELECT data FROM polish WHERE key=?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _cache_put(self, key: str, data: Dict[str, Any]):
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO polish VALUES (?,?)",
+                             (key, json.dumps(data, ensure_ascii=False)))
+            self._db.commit()
+
+    def _count(self, stat: str, n: int = 1):
+        with self._lock:
+            self.stats[stat] += n
+        inc("polish_total", n, outcome=stat)
+
+    # ─── public API ─────────────────────────────────────────────────
+    def polish_many(self, items: Sequence[Item]) -> List[Dict[str, Any]]:
+        """Polished copies of `items`, in order; failures keep the input."""
+        out: List[Dict[str, Any]] = [d for d, _ in items]
+        if not self.enabled:
+            return out
+        with span("polish"):
+            return self._polish_into(out, items)
+
+    def _polish_into(self, out: List[Dict[str, Any]], items: Sequence[Item]
+                     ) -> List[Dict[str, Any]]:
+        pending: List[Tuple[int, str, Dict[str, Any], str]] = []
+        for i, (data, q) in enumerate(items):
+            q = getattr(q, "value", q)
+            if not needs_polish(data):
+                self._count("skipped")
+                continue
+            key = self._key(data, q)
+            hit = self._cache_get(key)
+            if hit is not None:
+                self._count("cached")
+                out[i] = hit
+            else:
+                pending.append((i, key, data, q))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as ex:
+            for done in ex.map(self._run_batch, self._pack(pending)):
+                for i, key, data in done:
+                    out[i] = data
+                    self._cache_put(key, data)
+        return out
+
+    def stream(self, items: Iterable[Tuple[K, Any, Any]], window: int = 64
+               ) -> Iterator[Tuple[K, Any]]:
+        """
+        (key, data, q_type) → (key, polished data), buffering up to `window`
+        questions per polish_many() call.  Non-dict data (e.g. an exception
+        from a failed scrape) passes straight through.
+        """
+        buf: List[Tuple[K, Any, Any]] = []
+        for key, data, q in items:
+            if not isinstance(data, dict):
+                yield key, data
+                continue
+            buf.append((key, data, q))
+            if len(buf) >= window:
+                yield from self._flush(buf)
+                buf = []
+        if buf:
+            yield from self._flush(buf)
+
+    def _flush(self, buf):
+        polished = self.polish_many([(d, q) for _, d, q in buf])
+        return ((k, p) for (k, _, _), p in zip(buf, polished))
+
+    # ─── batching / requests ────────────────────────────────────────
+    def _pack(self, pending):
+        batch, used = [], 0
+        for p in pending:
+            cost = _tokens(p[2])
+            if batch and used + cost > self.token_budget:
+                yield batch
+                batch, used = [], 0
+            batch.append(p); used += cost
+        if batch:
+            yield batch
+
+    def _run_batch(self, batch) -> List[Tuple[int, str, Dict[str, Any]]]:
+        try:
+            replies = self._request(batch)
+        except _openai_errors()[1] as e:       # retries used up: halves would only hit it again
+            LOG.warning("Polish failed for %d questions: %s", len(batch), e)
+            self._count("failed", len(batch))
+            return []
+        except (ValueError, KeyError, TypeError) as e:   # malformed reply
+            if len(batch) > 1:                 # one bad item shouldn't sink the rest
+                mid = len(batch) // 2
+                return self._run_batch(batch[:mid]) + self._run_batch(batch[mid:])
+            LOG.warning("Polish failed: %s", e)
+            self._count("failed")
+            return []
+        done = []
+        for n, (i, key, data, _) in enumerate(batch):
+            new = replies.get(n)
+            if new is not None and same_but_spacing(data, new):
+                done.append((i, key, new))
+                self._count("polished")
+            else:
+                self._count("rejected")
+        return done
+
+    def _request(self, batch) -> Dict[int, Any]:
+        payload = {"items": [{"id": n, "type": q, "data": d}
+                             for n, (_, _, d, q) in enumerate(batch)]}
+        max_tokens = min(16384, int(_tokens(payload) * 1.3) + 256)
+        retryable, _ = _openai_errors()
+        for attempt in range(self.max_retries + 1):
+            self._limiter.wait()
+            self._count("requests")
+            try:
+                r = self.client.chat.completions.create(
+                    model=self.model,
+                    response_format={"type": "json_object"},
+                    messages=[{"role": "system", "content": SYSTEM_PROMPT},
+                              {"role": "user", "content": json.dumps(payload, ensure_ascii=False)}],
+                    max_tokens=max_tokens)
+                break
+            except retryable as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = _retry_after(e) or min(60.0, 2 ** attempt) * random.uniform(0.5, 1.5)
+                inc("polish_retries_total", error=type(e).__name__)
+                LOG.info("polish: %s – retrying in %.1fs", type(e).__name__, delay)
+                time.sleep(delay)
+        body = json.loads(r.choices[0].message.content)
+        return {int(it["id"]): it["data"] for it in body["items"]}
+
+def _retry_after(e: Exception) -> Optional[float]:
+    resp = getattr(e, "response", None)
+    try:
+        return float(resp.headers.get("retry-after")) if resp is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,242 @@
+# ░░░  GMAT-Club Scraper – multi-account session broker  ░░░
+#
+# Several GMAT Club accounts, one cookie jar each (<cookie_dir>/<email>.pkl,
+# same pickled Selenium cookie list _save_cookies() writes).  The broker
+#
+#   • says whether a jar is still good from the cookies alone – the phpBB
+#     `*_u` cookie holds the user id ("1" = guest) – and, now and then, from
+#     one small HTTP probe instead of a rendered page
+#   • re-logs accounts in a background thread before their cookies expire,
+#     one login per account at a time (single-flight), so workers on the
+#     other accounts never wait for it
+#   • binds browsers to accounts in proportion to each account's `rpm`
+#     budget and paces every page a browser takes to that budget
+#
+# The login itself needs a browser, so it is passed in (`login=`) – main_code
+# supplies refresh_session().  Accounts file: JSON list of
+# {"email", "password", "rpm"}; rpm 0 means unlimited.
+
+from __future__ import annotations
+import json, logging, os, pickle, threading, time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import metrics
+from page_cache import DEFAULT_ROOT
+
+LOG = logging.getLogger("gmat.scraper.sessions")
+
+PROBE_URL   = os.getenv("GMAT_SITE", "https://gmatclub.com").rstrip("/") + "/forum/ucp.php?i=ucp_main"
+_PROBE_MARK = b"mode=logout"
+_GUEST_UID  = ("", "1", "0")
+
+
+class SessionError(RuntimeError):
+    """No account can currently be used (all failed to log in)."""
+
+
+class Account:
+    def __init__(self, email: str, password: str, cookie_file: Path, rpm: float = 20):
+        self.email, self.password, self.cookie_file, self.rpm = email, password, cookie_file, rpm
+        self.key = cookie_file.stem
+        self.state = "unknown"                  # ok / stale / failed
+        self.bound = 0                          # browsers logged in as this account
+        self.checked_at = self.failed_at = 0.0
+        self.generation = 0                     # bumped by every successful login
+        self.login_lock = threading.Lock()
+        self._next = 0.0                        # earliest start of the next page
+
+    def cookies(self) -> List[Dict[str, Any]]:
+        try:
+            return pickle.loads(self.cookie_file.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return []
+
+    def cookie_status(self, now: Optional[float] = None) -> Tuple[bool, Optional[float]]:
+        """(logged in according to the jar, earliest expiry of the login cookies)."""
+        now = now or time.time()
+        logged_in, expiry = False, None
+        for c in self.cookies():
+            name, exp = c.get("name", ""), c.get("expiry")
+            if exp is not None and exp < now:
+                continue
+            if name.endswith("_u") and str(c.get("value")) not in _GUEST_UID:
+                logged_in = True
+            if exp is not None and name.endswith(("_u", "_k", "_sid")):
+                expiry = exp if expiry is None else min(expiry, exp)
+        return logged_in, expiry
+
+
+def cookie_name(email: str) -> str:
+    """emmarose0012@gmail.com → emmarose0012_gmail_com.pkl (the old COOKIE_FILE name)."""
+    return email.replace("@", "_").replace(".", "_") + ".pkl"
+
+
+class SessionBroker:
+    def __init__(self, accounts: Iterable[Dict[str, Any]], *,
+                 login: Optional[Callable[[Account], None]] = None,
+                 cookie_dir: Optional[Path] = None, rpm_scale: float = 1.0,
+                 refresh_before: float = 6 * 3600, check_every: float = 300,
+                 probe_every: float = 1800, retry_failed_after: float = 900,
+                 probe_url: str = PROBE_URL):
+        cookie_dir = Path(cookie_dir or DEFAULT_ROOT / "sessions")
+        cookie_dir.mkdir(parents=True, exist_ok=True)
+        self.accounts = [Account(a["email"], a["password"], cookie_dir / cookie_name(a["email"]),
+                                 float(a.get("rpm", 20)) * rpm_scale) for a in accounts]
+        if not self.accounts:
+            raise ValueError("SessionBroker needs at least one account")
+        self.login = login
+        self.refresh_before, self.check_every = refresh_before, check_every
+        self.probe_every, self.retry_failed_after = probe_every, retry_failed_after
+        self.probe_url = probe_url
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kw) -> "SessionBroker":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")), **kw)
+
+    # ─── validation ─────────────────────────────────────────────────
+    def valid(self, acct: Account) -> bool:
+        """Cheap: the jar holds an unexpired, non-guest login."""
+        ok, _ = acct.cookie_status()
+        return ok
+
+    def probe(self, acct: Account) -> Optional[bool]:
+        """One HTTP request with the jar's cookies; None if the site could not be reached."""
+        import requests
+        s, host = requests.Session(), urlsplit(self.probe_url).hostname
+        for c in acct.cookies():
+            s.cookies.set(c["name"], c["value"], domain=c.get("domain", host),
+                          path=c.get("path", "/"))
+        try:
+            with s.get(self.probe_url, timeout=15, stream=True, allow_redirects=False) as r:
+                if r.status_code in (301, 302, 303):
+                    return False                        # bounced to the login form
+                head = b""
+                for chunk in r.iter_content(16384):
+                    head += chunk
+                    if _PROBE_MARK in head or len(head) > 1 << 17:
+                        break
+                return _PROBE_MARK in head
+        except requests.RequestException as e:
+            LOG.info("sessions: probe for %s failed (%s)", acct.key, e)
+            return None
+        finally:
+            s.close()
+
+    def needs_refresh(self, acct: Account, now: Optional[float] = None) -> bool:
+        now = now or time.time()
+        if acct.state == "failed" and now - acct.failed_at < self.retry_failed_after:
+            return False
+        ok, expiry = acct.cookie_status(now)
+        if not ok or (expiry is not None and expiry - now < self.refresh_before):
+            return True
+        if now - acct.checked_at >= self.probe_every:
+            acct.checked_at = now
+            if self.probe(acct) is False:
+                return True
+        if acct.state != "ok":
+            acct.state = "ok"
+        return False
+
+    # ─── login (single-flight per account) ──────────────────────────
+    def refresh(self, acct: Account, login: Optional[Callable[[Account], None]] = None) -> bool:
+        """
+        Log `acct` in again with `login` (default: the broker's).  Callers that
+        arrive while another thread is already doing it just wait for that
+        login instead of starting their own.
+        """
+        seen = acct.generation
+        with acct.login_lock:
+            if acct.generation != seen:
+                return acct.state == "ok"
+            fn = login or self.login
+            if fn is None:
+                raise SessionError(f"no login function to refresh {acct.key}")
+            t0 = time.perf_counter()
+            try:
+                with metrics.span("session_login", account=acct.key):
+                    fn(acct)
+            except Exception as e:
+                acct.state, acct.failed_at = "failed", time.time()
+                metrics.inc("session_logins_total", account=acct.key, outcome="failed")
+                LOG.warning("sessions: login for %s failed: %s", acct.key, e)
+                return False
+            acct.state, acct.checked_at = "ok", time.time()
+            acct.generation += 1
+            metrics.inc("session_logins_total", account=acct.key, outcome="ok")
+            LOG.info("sessions: %s logged in (%.1fs)", acct.key, time.perf_counter() - t0)
+            return True
+
+    # ─── handing out accounts ───────────────────────────────────────
+    def assign(self) -> Account:
+        """Account for a new browser: usable, and fewest browsers per unit of rpm."""
+        now = time.time()
+        with self._lock:
+            usable = [a for a in self.accounts if a.state != "failed"
+                      or now - a.failed_at >= self.retry_failed_after]
+            if not usable:
+                raise SessionError("every account failed to log in recently")
+            acct = min(usable, key=lambda a: ((a.bound + 1) / a.rpm if a.rpm > 0 else 0.0,
+                                              a.bound))     # rpm 0: unlimited, as in throttle()
+            acct.bound += 1
+        return acct
+
+    def release(self, acct: Account):
+        with self._lock:
+            acct.bound = max(0, acct.bound - 1)
+
+    def throttle(self, acct: Account) -> float:
+        """Block until `acct` may start another page; returns the seconds waited."""
+        gap = 60.0 / acct.rpm if acct.rpm else 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, acct._next)
+            acct._next = start + gap
+        wait = start - now
+        if wait > 0:
+            metrics.inc("session_throttled_seconds_total", wait, account=acct.key)
+            time.sleep(wait)
+        return wait
+
+    # ─── background refresh ─────────────────────────────────────────
+    def start(self) -> "SessionBroker":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="session-broker", daemon=True)
+            self._thread.start()
+        return self
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for acct in self.accounts:
+                if self._stop.is_set():
+                    break
+                try:
+                    if self.needs_refresh(acct):
+                        LOG.info("sessions: refreshing %s in the background", acct.key)
+                        self.refresh(acct)
+                except Exception as e:              # never let the thread die
+                    LOG.warning("sessions: check of %s failed: %s", acct.key, e)
+            self._stop.wait(self.check_every)
+
+    def report(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        out = []
+        for a in self.accounts:
+            ok, expiry = a.cookie_status(now)
+            out.append({"account": a.key, "state": a.state, "cookies_ok": ok, "rpm": a.rpm,
+                        "browsers": a.bound,
+                        "expires_in_h": round((expiry - now) / 3600, 1) if expiry else None})
+        return out
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+    def __enter__(self):  return self.start()
+    def __exit__(self, *exc): self.close()
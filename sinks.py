@@ -0,0 +1,216 @@
+# ░░░  GMAT-Club Scraper – streaming result sinks  ░░░
+#
+# Each finished QuestionData is written the moment it arrives, so a run that
+# dies at hour three keeps everything up to the last page, and memory stays
+# flat however large the corpus is.  The written results double as the
+# checkpoint: sink.done(url) is True for every URL already stored, and
+# scrape_to() skips those on the next run.
+#
+#   JsonlSink   append-only <name>.jsonl  (+ <name>.errors.jsonl)
+#   SqliteSink  one row per URL in a `results` / `errors` table
+#
+# JsonlSink keeps an 8-byte digest of every finished URL in memory (about
+# 8 MB per 100k, half the URLs themselves; a false "done" needs a 64-bit
+# collision).  SqliteSink answers done() from its primary key and holds
+# nothing – use it for runs that resume over millions of URLs.
+
+from __future__ import annotations
+import hashlib, json, logging, os, sqlite3, threading, time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Set, Tuple, Union
+
+from dedup import DuplicateQuestion
+from main_code import QuestionType, scrape_many
+
+LOG = logging.getLogger("gmat.scraper.sink")
+
+
+class ResultSink(ABC):
+    """Base class: write() / fail() / done() / close(), usable as a context manager."""
+
+    @abstractmethod
+    def write(self, url: str, q_type: str, data: Dict[str, Any]): ...
+    @abstractmethod
+    def fail(self, url: str, q_type: str, error: BaseException): ...
+    @abstractmethod
+    def done(self, url: str) -> bool: ...
+    def close(self): pass
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc): self.close()
+
+
+def _record(url: str, q_type: str, **kw) -> str:
+    return json.dumps({"url": url, "q_type": getattr(q_type, "value", q_type),
+                       "ts": round(time.time(), 3), **kw}, ensure_ascii=False) + "\n"
+
+def _digest(url: str) -> bytes:
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+
+def _repair_tail(path: Path):
+    """Drop a half-written last line left by a crash."""
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b"\n":
+            return
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0:                              # walk back to the last "\n"
+            step = min(pos, 1 << 16)
+            f.seek(pos - step)
+            i = f.read(step).rfind(b"\n")
+            if i >= 0:
+                pos = pos - step + i + 1
+                break
+            pos -= step
+        f.truncate(pos)
+    LOG.warning("sink: truncated partial last record in %s", path)
+
+
+class JsonlSink(ResultSink):
+    def __init__(self, path: Union[str, Path], *, sync_every: int = 50):
+        self.path = Path(path)
+        self.err_path = self.path.with_suffix(".errors.jsonl")
+        self.sync_every = sync_every
+        self._lock = threading.Lock()
+        self._done: Set[bytes] = set()             # _digest(url), not the URLs
+        self._unsynced = 0
+        _repair_tail(self.path)
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    self._done.add(_digest(json.loads(line)["url"]))
+            LOG.info("sink: resuming %s (%d already done)", self.path, len(self._done))
+        self._out = open(self.path, "a", encoding="utf-8")
+        self._err = open(self.err_path, "a", encoding="utf-8")
+
+    def write(self, url, q_type, data):
+        line = _record(url, q_type, data=data)
+        with self._lock:
+            self._out.write(line)
+            self._out.flush()
+            self._done.add(_digest(url))
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                os.fsync(self._out.fileno())
+                self._unsynced = 0
+
+    def fail(self, url, q_type, error):
+        with self._lock:
+            self._err.write(_record(url, q_type, error=f"{type(error).__name__}: {error}"))
+            self._err.flush()
+
+    def done(self, url):
+        return _digest(url) in self._done
+
+    def close(self):
+        with self._lock:
+            for f in (self._out, self._err):
+                if not f.closed:
+                    f.flush(); os.fsync(f.fileno()); f.close()
+
+
+class SqliteSink(ResultSink):
+    def __init__(self, path: Union[str, Path]):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS results (url TEXT PRIMARY KEY, q_type TEXT,
+                                                data TEXT NOT NULL, ts REAL);
+            CREATE TABLE IF NOT EXISTS errors  (url TEXT, q_type TEXT, error TEXT, ts REAL);
+        """)
+
+    def write(self, url, q_type, data):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?,?,?,?)",
+                             (url, getattr(q_type, "value", q_type),
+                              json.dumps(data, ensure_ascii=False), time.time()))
+
+    def fail(self, url, q_type, error):
+        with self._lock, self._db:
+            self._db.execute("INSERT INTO errors VALUES (?,?,?,?)",
+                             (url, getattr(q_type, "value", q_type),
+                              f"{type(error).__name__}: {error}", time.time()))
+
+    def done(self, url):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM results WHERE url=?", (url,)).fetchone() is not None
+
+    def rows(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Stream stored results back without loading them all."""
+        cur = self._db.cursor()
+        for url, q, data in cur.execute("SELECT url, q_type, data FROM results"):
+            yield url, q, json.loads(data)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def open_sink(path: Union[str, Path]) -> ResultSink:
+    """.jsonl → JsonlSink, .sqlite / .db → SqliteSink."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".sqlite", ".sqlite3", ".db"):
+        return SqliteSink(path)
+    if suffix in (".jsonl", ".ndjson"):
+        return JsonlSink(path)
+    raise ValueError(f"don't know how to write results to {path!r}")
+
+
+def read_results(path: Union[str, Path]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Stream (url, q_type, data) back out of a .jsonl / .sqlite result file, read-only."""
+    path = Path(path)
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    d = json.loads(line)
+                    yield d["url"], d.get("q_type"), d["data"]
+        return
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        for url, q, data in db.execute("SELECT url, q_type, data FROM results"):
+            yield url, q, json.loads(data)
+    finally:
+        db.close()
+
+
+def scrape_to(sink: ResultSink, jobs: Iterable[Tuple[str, Any]], **scrape_kw) -> Dict[str, int]:
+    """
+    Stream scrape_many() into `sink`, skipping URLs the sink already holds.
+    `jobs` may be a lazy iterator; nothing is collected in memory.
+    """
+    counts = {"skipped": 0, "written": 0, "failed": 0, "duplicates": 0}
+    types: Dict[str, Any] = {}
+
+    def todo():
+        for url, q in jobs:
+            if sink.done(url):
+                counts["skipped"] += 1
+                continue
+            types[url] = QuestionType(q) if q else None
+            yield url, q
+
+    user_hook = scrape_kw.pop("on_detect", None)
+
+    def detected(url, q, conf):            # store the detected type, not the label
+        types[url] = q
+        if user_hook is not None:
+            user_hook(url, q, conf)
+
+    for url, res in scrape_many(todo(), on_detect=detected, **scrape_kw):
+        q = types.pop(url, None)
+        if isinstance(res, DuplicateQuestion):     # stored as a marker so reruns skip it
+            sink.write(url, q, res.as_result())
+            counts["duplicates"] += 1
+        elif isinstance(res, Exception):
+            sink.fail(url, q, res)
+            counts["failed"] += 1
+        else:
+            sink.write(url, q, res)
+            counts["written"] += 1
+    LOG.info("sink: %s", counts)
+    return counts
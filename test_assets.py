@@ -0,0 +1,138 @@
+# ░░░  GMAT-Club Scraper – asset store tests  ░░░
+#
+# AssetStore against images served by conftest `serve`; `site.hits` lists
+# every request path.  Downloads from a paced host must reach the limiter.
+
+from __future__ import annotations
+from collections import Counter
+
+import pytest
+
+from assets import AssetStore, image_urls
+from main_code import HttpFetcher
+from throttle import RateLimiter
+
+CHART = b"\x89PNG\r\n\x1a\n" + b"chart" * 100
+OTHER = b"GIF89a" + b"other" * 50
+
+FILES = {                                   # path → (content type, body)
+    "/img/chart.png":            ("image/png", CHART),
+    "/img/chart-copy.png":       ("image/png", CHART),     # same bytes, second URL
+    "/download/file.php?id=7":   ("image/gif", OTHER),     # no extension in the URL
+    "/img/page.png":             ("text/html", b"<html>login</html>"),
+    "/img/huge.png":             ("image/png", b"x" * 4096),
+}
+
+
+@pytest.fixture
+def site(serve):
+    return serve({path: (200, ctype, body) for path, (ctype, body) in FILES.items()})
+
+@pytest.fixture
+def store(tmp_path):
+    http = HttpFetcher(cookie_file=tmp_path / "no-cookies.pkl", pool_size=4)
+    s = AssetStore(tmp_path / "assets", http=http, workers=4, max_bytes=1024)
+    yield s
+    s.close()
+    http.close()
+
+def _blobs(store):
+    return sorted(p.name for p in (store.root / "blobs").rglob("*") if p.is_file())
+
+
+def test_image_urls():
+    data = {"image_url": "a.png", "blocks": [{"image_url": "b.png"}, {"text": "x"}],
+            "tabs": {"t1": {"image_url": ""}, "t2": {"image_url": "a.png"}}}
+    assert list(image_urls(data)) == ["a.png", "b.png", "a.png"]
+
+
+# ─── dedup ─────────────────────────────────────────────────────────
+def test_same_url_and_same_bytes_are_stored_once(site, store):
+    urls = [site.base + "/img/chart.png"] * 3 + [site.base + "/img/chart-copy.png",
+                                                 site.base + "/download/file.php?id=7"]
+    assert store.fetch(urls) == {"downloaded": 3, "failed": 0}
+    assert Counter(site.hits) == {"/img/chart.png": 1, "/img/chart-copy.png": 1,
+                         "/download/file.php?id=7": 1}
+    a, b = store.path(urls[0]), store.path(urls[3])
+    assert a == b and a.read_bytes() == CHART
+    gif = store.path(urls[-1])
+    assert gif.suffix == ".gif" and gif.read_bytes() == OTHER
+    assert len(_blobs(store)) == 2
+
+def test_rejects_non_images_and_oversized(site, store):
+    urls = [site.base + "/img/page.png", site.base + "/img/huge.png", site.base + "/img/nope.png"]
+    assert store.fetch(urls) == {"downloaded": 0, "failed": 3}
+    assert all(store.path(u) is None for u in urls)
+    assert _blobs(store) == []                     # no .part left behind
+    assert not list((store.root / "blobs").glob(".*.part"))
+
+
+# ─── resume ────────────────────────────────────────────────────────
+def test_second_run_fetches_only_what_is_missing(site, store, tmp_path):
+    urls = [site.base + "/img/chart.png", site.base + "/download/file.php?id=7"]
+    store.fetch(urls)
+    store.close()
+
+    http = HttpFetcher(cookie_file=tmp_path / "no-cookies.pkl")
+    again = AssetStore(store.root, http=http)
+    assert again.fetch(urls) == {"downloaded": 0, "failed": 0}
+    assert len(site.hits) == 2
+
+    again.path(urls[1]).unlink()                   # blob lost: fetched again
+    assert again.fetch(urls) == {"downloaded": 1, "failed": 0}
+    assert site.hits.count("/download/file.php?id=7") == 2
+    again.close()
+    http.close()
+
+def test_failures_are_retried_up_to_max_tries(site, store):
+    url = site.base + "/img/nope.png"
+    for _ in range(5):
+        store.fetch([url])
+    assert site.hits.count("/img/nope.png") == store.max_tries
+
+
+# ─── localize / stream ─────────────────────────────────────────────
+def test_stream_localizes_relative_urls(site, store):
+    page = site.base + "/forum/msr-123.html"
+    results = [(page, {"blocks": [{"image_url": "/img/chart.png"},
+                                  {"image_url": "/img/chart-copy.png"}]}),
+               (page, ValueError("scrape failed")),
+               (page, {"image_url": "/img/nope.png"})]
+    out = list(store.stream(results, window=2))
+    assert [u for u, _ in out] == [page] * 3
+
+    blocks = out[0][1]["blocks"]
+    assert blocks[0]["image_src"] == "/img/chart.png"
+    assert blocks[0]["image_url"] == blocks[1]["image_url"] == str(
+        store.path(site.base + "/img/chart.png"))
+    assert isinstance(out[1][1], ValueError)
+    assert out[2][1] == {"image_url": "/img/nope.png"}        # left alone
+
+
+# ─── pacing ────────────────────────────────────────────────────────
+def test_site_downloads_feed_the_limiter(serve, tmp_path):
+    site = serve({"/img/chart.png": (200, "image/png", CHART),
+                  "/download/file.php?id=9": (429, {"Retry-After": "20"}, "slow down")})
+    limiter = RateLimiter(rate=4, jitter=0)
+    http = HttpFetcher(cookie_file=tmp_path / "no-cookies.pkl", limiter=limiter)
+    store = AssetStore(tmp_path / "assets", http=http, paced_hosts={"127.0.0.1"})
+    try:
+        assert store.fetch([site.base + "/img/chart.png"]) == {"downloaded": 1, "failed": 0}
+        assert limiter.stats()["127.0.0.1"]["rate"] == 4
+        assert store.fetch([site.base + "/download/file.php?id=9"])["failed"] == 1
+    finally:
+        store.close()
+        http.close()
+    host = limiter.stats()["127.0.0.1"]
+    assert host["rate"] == 2 and host["paused_s"] >= 19
+
+def test_other_hosts_are_not_paced(site, tmp_path):
+    limiter = RateLimiter(jitter=0)
+    http = HttpFetcher(cookie_file=tmp_path / "no-cookies.pkl", limiter=limiter)
+    store = AssetStore(tmp_path / "assets", http=http)          # paces the site's host only
+    try:
+        assert store.fetch([site.base + "/img/chart.png"])["downloaded"] == 1
+    finally:
+        store.close()
+        http.close()
+    assert limiter.stats() == {}
@@ -0,0 +1,90 @@
+# ░░░  GMAT-Club Scraper – stand-in server / end-to-end bench tests  ░░░
+#
+# bench/standin.py in-process: members vs guests, pagination, injected
+# faults and ETags.  bench_e2e.py itself runs as a subprocess, since it
+# points GMAT_SITE at the stand-in before main_code is imported.
+
+from __future__ import annotations
+import json, subprocess, sys
+from pathlib import Path
+
+import pytest
+import requests
+
+from main_code import HttpFetcher, parse_html
+
+BENCH = Path(__file__).resolve().parent / "bench"
+sys.path.insert(0, str(BENCH))
+import bench_e2e                                        # noqa: E402
+from standin import StandIn                             # noqa: E402
+
+
+@pytest.fixture
+def standin():
+    made = []
+
+    def start(**kw):
+        made.append(StandIn(**kw))
+        made[-1].start()
+        return made[-1]
+    yield start
+    for si in made:
+        si.close()
+
+
+def test_members_get_spoilers_guests_do_not(standin, tmp_path):
+    si = standin()
+    url, q = si.topics(types=["cr"])[0]
+    bench_e2e.cookie_jar(si.base_url, tmp_path / "cookies.pkl")
+    http = HttpFetcher(cookie_file=tmp_path / "cookies.pkl", pool_size=1)
+    member = http.fetch(url)
+    http.close()
+    guest = HttpFetcher(cookie_file=tmp_path / "none.pkl", pool_size=1)
+    assert guest.scrape(url, q) is None                # spoiler bodies removed
+    guest.close()
+    name = url.rsplit("/", 1)[1].split("-")[1]
+    want = json.loads((BENCH / "fixtures" / q / f"{name}.expected.json").read_text(encoding="utf-8"))
+    assert parse_html(member, q) == want
+    assert si.stats()["logins"] == 1
+
+def test_reply_pages_and_pagination(standin):
+    si = standin(pages=3, replies=4)
+    url, _ = si.topics(1)[0]
+    first = requests.get(url).text
+    assert url.rsplit(".", 1)[0].rsplit("/", 1)[1] + "-40.html" in first
+    last = requests.get(url.replace(".html", "-40.html"))
+    assert last.status_code == 200 and last.text.count('class="post bg1') == 4
+    assert requests.get(url.replace(".html", "-60.html")).status_code == 404
+
+def test_faults(standin):
+    si = standin(rate_limit=1, retry_after=3)
+    url, _ = si.topics(1)[0]
+    answers = [requests.get(url) for _ in range(3)]
+    assert answers[0].status_code == 200 and answers[-1].status_code == 429
+    assert answers[-1].headers["Retry-After"] == "3"
+    si.rate_limit, si.error_rate = 0, 1.0
+    assert requests.get(url).status_code == 500
+    si.error_rate, si.cf_rate = 0, 1.0
+    r = requests.get(url)
+    assert r.status_code == 403 and "Just a moment" in r.text
+    assert si.stats()["challenges"] == 1 and si.stats()["rate_limited"] >= 1
+
+def test_etag_answers_304(standin):
+    si = standin()
+    url, _ = si.topics(1)[0]
+    etag = requests.get(url).headers["ETag"]
+    assert requests.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_bench_script(tmp_path):
+    out = tmp_path / "now.json"
+    subprocess.run([sys.executable, str(BENCH / "bench_e2e.py"), "-c", "1", "-n", "4",
+                    "--json", str(out)], check=True, capture_output=True, timeout=120)
+    results = json.loads(out.read_text())
+    assert set(results) == set(bench_e2e.MODES)
+    assert all(r["1"]["fail_rate"] == 0 and r["1"]["pages"] == 4 for r in results.values())
+
+    slower = {m: {"1": dict(r["1"], pages_per_min=r["1"]["pages_per_min"] * 10)}
+              for m, r in results.items()}
+    assert len(list(bench_e2e.regressions(results, slower, 0.2))) == len(results)
+    assert list(bench_e2e.regressions(results, results, 0.2)) == []
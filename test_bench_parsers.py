@@ -0,0 +1,45 @@
+# ░░░  GMAT-Club Scraper – offline parser benchmark tests  ░░░
+#
+# Every recorded fixture parses to its *.expected.json, the fixtures on
+# disk are what make_fixtures.py builds, and the benchmark script itself
+# runs clean.
+
+from __future__ import annotations
+import json, random, sys
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+import main_code
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "bench"))
+import bench_parsers, make_fixtures                     # noqa: E402
+
+FIXTURES = list(bench_parsers.fixtures())
+
+
+@pytest.mark.parametrize("name,q,path", FIXTURES, ids=[f[0] for f in FIXTURES])
+def test_fixture_matches_expected(name, q, path):
+    want = json.loads(path.with_suffix(".expected.json").read_text(encoding="utf-8"))
+    assert main_code.parse_html(path.read_text(encoding="utf-8"), q) == want
+
+def test_every_snapshot_parser_has_a_fixture():
+    assert {q for _, q, _ in FIXTURES} == set(main_code.SNAPSHOT_PARSERS)
+
+@pytest.mark.parametrize("q,name", [(q, n) for q, b in make_fixtures.CASES.items() for n in b])
+def test_fixtures_are_reproducible(q, name):
+    html = make_fixtures.CASES[q][name](random.Random(f"{q}/{name}"))
+    assert html == (make_fixtures.OUT / q / f"{name}.html").read_text(encoding="utf-8")
+
+
+def test_adjacent_blocks_give_one_line_break():
+    soup = BeautifulSoup("<div><p>one</p> <p>two</p><table><tr><td>a</td></tr>"
+                         "<tr><td>b</td></tr></table></div>", "html.parser")
+    assert main_code._inner_text(soup.div) == "one\ntwo\na\nb"
+
+def test_bench_script(tmp_path, capsys):
+    out = tmp_path / "bench.json"
+    assert bench_parsers.main(["-k", "basic", "-n", "2", "--json", str(out)]) == 0
+    rows = json.loads(out.read_text())
+    assert rows and all(r["ok"] for r in rows)
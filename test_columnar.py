@@ -0,0 +1,94 @@
+# ░░░  GMAT-Club Scraper – columnar export tests  ░░░
+#
+# Results from the bench fixtures (every type) exported to Parquet and Arrow
+# streams in a temporary directory, then loaded back.
+
+from __future__ import annotations
+import json
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from columnar import RECORDS, SCHEMAS, ColumnarWriter, arrow_schema, export, load  # noqa: E402
+from main_code import QuestionType                                         # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "bench" / "fixtures"
+
+
+def _expected(q: str, name: str = "basic"):
+    return json.loads((FIXTURES / q / f"{name}.expected.json").read_text(encoding="utf-8"))
+
+def _results(n: int = 3):
+    """n copies each of the CR, DS and TABLES fixtures, with distinct URLs."""
+    return [(f"https://x/{q}-{i}.html", q, _expected(q)) for q in ("cr", "ds", "tables")
+            for i in range(n)]
+
+
+@pytest.mark.parametrize("fmt,ext", [("parquet", "parquet"), ("arrow", "arrows")])
+def test_round_trip(tmp_path, fmt, ext):
+    assert export(_results() + [("https://x/u.html", None, {})], tmp_path, fmt=fmt, batch=2) \
+        == {"cr": 3, "ds": 3, "tables": 3}
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{q}.{ext}" for q in ("cr", "ds", "tables")]
+    for q in ("cr", "ds", "tables"):
+        recs = list(load(tmp_path / f"{q}.{ext}"))
+        assert [r.url for r in recs] == [f"https://x/{q}-{i}.html" for i in range(3)]
+        assert isinstance(recs[0], RECORDS[QuestionType(q)])
+        assert all(r.as_dict() == _expected(q) for r in recs)
+
+@pytest.mark.parametrize("fmt,ext", [("parquet", "parquet"), ("arrow", "arrows")])
+def test_every_bench_fixture_round_trips(tmp_path, fmt, ext):
+    results = [(f"https://x/{q}/{p.stem}.html", q, json.loads(p.read_text(encoding="utf-8")))
+               for q in sorted(SCHEMAS, key=lambda q: q.value)
+               for p in sorted((FIXTURES / q.value).glob("*.expected.json"))]
+    assert {q for _, q, _ in results} == set(SCHEMAS)
+    export(results, tmp_path, fmt=fmt)
+    loaded = {r.url: r.as_dict() for q in SCHEMAS for r in load(tmp_path / f"{q.value}.{ext}")}
+    assert loaded == {url: data for url, _, data in results}
+
+def test_missing_opt_fields_stay_missing():
+    cls = RECORDS[QuestionType.GRAPHS]
+    assert cls.optional == {"image_src"}
+    assert "image_src" not in cls("u", passage="p").as_dict()
+    assert cls("u", image_src="assets/a.png").as_dict()["image_src"] == "assets/a.png"
+    assert cls("u").as_dict()["passage"] is None                # plain fields are kept
+
+def test_repeated_strings_are_dictionary_columns_and_shared_on_load(tmp_path):
+    schema = arrow_schema(QuestionType.TABLES)
+    assert pa.types.is_dictionary(schema.field("difficulty").type)
+    assert pa.types.is_dictionary(schema.field("headers").type.value_type)
+    assert schema.metadata[b"q_type"] == b"tables"
+    export(_results(), tmp_path)
+    a, b = list(load(tmp_path / "tables.parquet"))[:2]
+    assert a.difficulty is b.difficulty and a.headers[0] is b.headers[0]
+
+def test_unknown_fields_are_dropped(tmp_path):
+    with ColumnarWriter(tmp_path) as w:
+        w.write("https://x/1", QuestionType.DS, {**_expected("ds"), "polished": True})
+    rec, = load(tmp_path / "ds.parquet")
+    assert rec.as_dict() == _expected("ds")
+    with pytest.raises(ValueError):
+        ColumnarWriter(tmp_path, fmt="csv")
+
+
+# ─── partial loads ─────────────────────────────────────────────────
+@pytest.mark.parametrize("fmt,ext", [("parquet", "parquet"), ("arrow", "arrows")])
+def test_columns_and_filters(tmp_path, fmt, ext):
+    rows = _results(2)
+    rows[0][2]["difficulty"] = "805+ Level"
+    export(rows, tmp_path, fmt=fmt, batch=1)
+    path = tmp_path / f"cr.{ext}"
+    rec, = load(path, columns=["answer"], filters=[("difficulty", "==", "805+ Level")])
+    assert rec.url == "https://x/cr-0.html" and rec.answer == _expected("cr")["answer"]
+    assert rec.prompt is None and rec.difficulty is None      # filtered on, not loaded
+    assert [r.url for r in load(path, filters=[("url", "in", ["https://x/cr-1.html"])])] \
+        == ["https://x/cr-1.html"]
+    with pytest.raises(ValueError):
+        list(load(path, filters=[("answer", "~", "B")]))
+
+@pytest.mark.parametrize("fmt,ext", [("parquet", "parquet"), ("arrow", "arrows")])
+def test_rows_alone_bring_their_headers(tmp_path, fmt, ext):
+    export(_results(1), tmp_path, fmt=fmt)
+    rec, = load(tmp_path / f"tables.{ext}", columns=["rows"])
+    assert rec.as_dict()["rows"] == _expected("tables")["rows"]
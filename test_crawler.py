@@ -0,0 +1,181 @@
+# ░░░  GMAT-Club Scraper – crawler / frontier tests  ░░░
+#
+# Frontier state handling on a temporary SQLite file, and crawl() against
+# listing pages served by conftest `serve`.
+
+from __future__ import annotations
+
+import pytest
+
+import crawler
+from crawler import Frontier, crawl, parse_listing, scrape_frontier, topic_id
+from main_code import QuestionType
+from throttle import RateLimiter
+
+_ROW = '<li class="row"><a class="topictitle" href="{href}">{title}</a>{tags}</li>'
+_TAG = '<a class="tag_css_link">{}</a>'
+
+def _listing(title: str, rows, nxt=None) -> str:
+    body = "".join(_ROW.format(href=h, title=t, tags=_TAG.format(g) if g else "")
+                   for h, t, g in rows)
+    link = f'<a rel="next" href="{nxt}">Next</a>' if nxt else ""
+    return f"<html><head><title>{title}</title></head><body><ul>{body}</ul>{link}</body></html>"
+
+# two pages of a CR sub-forum (topic 1002 on both) and an untyped tag page
+PAGES = {
+    "/forum/cr/": _listing("Critical Reasoning (CR)", [
+        ("/forum/weaken-the-plan-1001.html", "Weaken", None),
+        ("/forum/boldface-1002.html", "Boldface", None),
+        ("/forum/numbers-1003.html#p5", "Numbers", "Data Sufficiency"),
+    ], nxt="/forum/cr/?start=20"),
+    "/forum/cr/?start=20": _listing("Critical Reasoning (CR)", [
+        ("/forum/boldface-1002.html", "Boldface", None),
+        ("/forum/viewtopic.php?t=1004", "Old style", None),
+    ]),
+    "/forum/tags/hard/": _listing("Hard questions", [
+        ("/forum/mystery-2001.html", "Mystery", None),
+        ("/forum/boldface-1002.html", "Boldface", None),
+    ]),
+}
+
+
+@pytest.fixture
+def site(serve):
+    return serve({path: (200, "text/html; charset=utf-8", html) for path, html in PAGES.items()})
+
+@pytest.fixture
+def frontier(tmp_path):
+    f = Frontier(tmp_path / "frontier.sqlite")
+    yield f
+    f.close()
+
+def _fast() -> RateLimiter:
+    return RateLimiter(rate=100, burst=50, jitter=0)
+
+def _topics(n: int, q_type=QuestionType.CR):
+    return [{"topic_id": 1000 + i, "url": f"https://x/forum/t-{1000 + i}.html",
+             "title": f"t{i}", "q_type": q_type} for i in range(n)]
+
+
+# ─── parsing ───────────────────────────────────────────────────────
+def test_topic_id():
+    assert topic_id("https://gmatclub.com/forum/some-slug-123456.html") == 123456
+    assert topic_id("https://gmatclub.com/forum/viewtopic.php?f=1&t=987") == 987
+    assert topic_id("https://gmatclub.com/forum/critical-reasoning-139/") is None
+
+def test_parse_listing():
+    topics, nxt, page_type = parse_listing(PAGES["/forum/cr/"], "https://x/forum/cr/")
+    assert page_type is QuestionType.CR
+    assert [t["topic_id"] for t in topics] == [1001, 1002, 1003]
+    assert topics[2]["url"] == "https://x/forum/numbers-1003.html"
+    assert [t["q_type"] for t in topics] == [QuestionType.CR, QuestionType.CR, QuestionType.DS]
+    assert nxt == ["https://x/forum/cr/?start=20"]
+
+
+# ─── frontier ──────────────────────────────────────────────────────
+def test_lease_is_exclusive_and_typed_first(frontier):
+    frontier.listing_done("L", _topics(3) + [{"topic_id": 2001, "url": "https://x/u-2001.html",
+                                              "title": "u", "q_type": None}], [], None)
+    first = frontier.lease(2)
+    assert first == [("https://x/forum/t-1000.html", QuestionType.CR),
+                     ("https://x/forum/t-1001.html", QuestionType.CR)]
+    assert frontier.lease(5) == [("https://x/forum/t-1002.html", QuestionType.CR)]
+    assert frontier.lease(5, include_untyped=True) == [("https://x/u-2001.html", None)]
+    assert frontier.lease(5, include_untyped=True) == []
+    assert frontier.counts()["topics"] == {"leased": 4}
+
+def test_recover_returns_only_stale_leases(tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    f = Frontier(path, lease_timeout=3600)
+    f.listing_done("L", _topics(3), [], None)
+    f.lease(2)
+    assert f.recover() == 0                          # still fresh
+    f._exec("UPDATE topics SET leased_at=leased_at-7200 WHERE topic_id=1000")
+    assert f.recover() == 1
+    assert f.counts()["topics"] == {"new": 2, "leased": 1}
+    assert f.lease(1) == [("https://x/forum/t-1000.html", QuestionType.CR)]
+    f.close()
+
+def test_reopen_recovers_crashed_leases(tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    f = Frontier(path)
+    f.listing_done("L", _topics(2), [], None)
+    leased = f.lease(2)
+    f.done(leased[0][0])
+    f.close()                                        # "crash" with one lease out
+
+    f = Frontier(path, lease_timeout=-1)             # recover() runs on open
+    assert f.counts()["topics"] == {"done": 1, "new": 1}
+    assert f.lease(5) == [leased[1]]
+    f.close()
+
+def test_failed_retries_then_gives_up(frontier):
+    frontier.listing_done("L", _topics(1), [], None)
+    for _ in range(2):
+        (url, _), = frontier.lease(1)
+        frontier.failed(url, "ScrapeError: boom", max_tries=3)
+        assert frontier.counts()["topics"] == {"new": 1}
+    (url, _), = frontier.lease(1)
+    frontier.failed(url, "ScrapeError: boom", max_tries=3)
+    assert frontier.counts()["topics"] == {"failed": 1}
+    assert frontier.lease(1) == []
+
+def test_later_listing_types_untyped_topic(frontier):
+    untyped = [{"topic_id": 5, "url": "https://x/a-005.html", "title": "a", "q_type": None}]
+    frontier.listing_done("L1", untyped, [], None)
+    frontier.listing_done("L2", [dict(untyped[0], q_type=QuestionType.PS)], [], None)
+    assert frontier.lease(1) == [("https://x/a-005.html", QuestionType.PS)]
+
+
+# ─── crawl ─────────────────────────────────────────────────────────
+def test_crawl_walks_pages_once(site, frontier, limiter):
+    seeds = [site.base + "/forum/cr/", (site.base + "/forum/tags/hard/", None)]
+    own = _fast()
+    assert crawl(frontier, seeds, limiter=own) == 3
+    assert "127.0.0.1" in own.stats() and limiter.stats() == {}   # paced once, by `own`
+    assert sorted(site.hits) == sorted(PAGES)
+    assert frontier.counts() == {"listings": {"done": 3}, "topics": {"new": 5}}
+    typed = dict((topic_id(u), q) for u, q in frontier.lease(10, include_untyped=True))
+    assert typed == {1001: QuestionType.CR, 1002: QuestionType.CR, 1003: QuestionType.DS,
+                     1004: QuestionType.CR, 2001: None}
+
+    site.hits.clear()
+    assert crawl(frontier, seeds, limiter=_fast()) == 0   # all done: nothing refetched
+    assert site.hits == []
+
+def test_crawl_resumes_after_max_pages(site, frontier):
+    assert crawl(frontier, [site.base + "/forum/cr/"], limiter=_fast(), max_pages=1) == 1
+    assert frontier.counts()["listings"] == {"done": 1, "todo": 1}
+    assert crawl(frontier, limiter=_fast()) == 1
+    assert site.hits == ["/forum/cr/", "/forum/cr/?start=20"]
+
+def test_crawl_marks_missing_listing_failed(site, frontier):
+    assert crawl(frontier, [site.base + "/forum/gone/"], limiter=_fast()) == 0
+    assert frontier.counts()["listings"] == {"failed": 1}
+    assert site.hits == ["/forum/gone/"] * 3
+
+
+# ─── scrape_frontier ───────────────────────────────────────────────
+def test_scrape_frontier_records_results_and_types(frontier, monkeypatch):
+    frontier.listing_done("L", _topics(2) + [{"topic_id": 2001, "url": "https://x/u-2001.html",
+                                              "title": "u", "q_type": None}], [], None)
+
+    def fake_scrape_many(jobs, *, on_detect=None, **kw):
+        for url, q in jobs:
+            if q is None:
+                on_detect(url, QuestionType.RC, 0.9)
+                yield url, {"passage": "p"}
+            elif url.endswith("1001.html"):
+                yield url, RuntimeError("boom")
+            else:
+                yield url, {"question": "q"}
+    monkeypatch.setattr(crawler, "scrape_many", fake_scrape_many)
+    seen = []
+    out = dict(scrape_frontier(frontier, chunk=2, on_detect=lambda u, q, c: seen.append((u, q))))
+    assert seen == [("https://x/u-2001.html", QuestionType.RC)]
+    assert set(out) == {"https://x/forum/t-1000.html", "https://x/forum/t-1001.html",
+                        "https://x/u-2001.html"}
+    assert frontier.counts()["topics"] == {"done": 2, "failed": 1}     # after 3 tries
+    with frontier._lock:
+        assert frontier._db.execute("SELECT q_type FROM topics WHERE topic_id=2001"
+                                    ).fetchone() == ("rc",)
@@ -0,0 +1,83 @@
+# ░░░  GMAT-Club Scraper – near-duplicate index tests  ░░░
+#
+# Signatures and the SQLite index on their own, the HTTP path against a
+# stub topic re-posted under a second URL, and scrape_to() recording a
+# duplicate as a marker.
+
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+import pytest
+
+import sinks
+from dedup import DupIndex, DuplicateQuestion, signature, similarity
+from main_code import HttpFetcher, QuestionType
+from sinks import open_sink, scrape_to
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "bench"))
+import bench_dedup                                      # noqa: E402
+
+HTML = "text/html; charset=utf-8"
+Q = ("If the city doubles the toll on the northern bridge, commuters will switch to "
+     "the southern tunnel, which is already congested at rush hour. "
+     "Which of the following most weakens the argument?")
+
+
+@pytest.fixture
+def index():
+    with DupIndex(":memory:") as idx:
+        yield idx
+
+
+def test_signature_ignores_case_blanks_and_spoiler_noise():
+    assert signature(Q) == signature("  " + Q.upper().replace(" ", "\n ") + "\nShow Spoiler OA")
+    assert signature("") is None and signature("  ??  ") is None
+    assert similarity(signature(Q), signature(Q.replace("northern", "eastern"))) > 0.8
+    assert similarity(signature(Q), signature("A different question about ratios entirely.")) < 0.2
+
+def test_check_finds_stored_near_copy(index):
+    assert index.add("https://x/1", index.check("https://x/1", Q), "cr")
+    with pytest.raises(DuplicateQuestion) as e:
+        index.check("https://x/2", "Re-post:  " + Q.upper())
+    assert e.value.of == "https://x/1" and e.value.similarity >= index.threshold
+    assert e.value.as_result()["duplicate_of"] == "https://x/1"
+    index.check("https://x/1", Q)                       # its own URL is not a duplicate
+
+def test_rc_and_msr_are_not_stored(index):
+    assert not index.wants("rc") and index.wants(QuestionType.CR) and index.wants(None)
+    assert not index.add("https://x/rc", signature(Q), QuestionType.RC)
+    assert len(index) == 0 and index.query(signature(Q)) is None
+
+def test_index_survives_reopen(tmp_path):
+    with DupIndex(tmp_path / "d.sqlite") as idx:
+        assert idx.add_many([("https://x/1", signature(Q), "cr"),
+                             ("https://x/2", signature("Another stem entirely, about rates."), "ps"),
+                             ("https://x/3", None, "cr")]) == 2
+    with DupIndex(tmp_path / "d.sqlite") as idx:
+        assert len(idx) == 2 and idx.query(signature(Q))[0] == "https://x/1"
+
+
+def test_http_path_skips_reposted_topic(serve, pages, index):
+    site = serve({"/forum/cr-1.html": (200, HTML, pages["cr"]),
+                  "/forum/cr-9.html": (200, HTML, pages["cr"])})
+    http = HttpFetcher(pool_size=1)
+    assert http.scrape(site.base + "/forum/cr-1.html", QuestionType.CR, dedup=index)
+    with pytest.raises(DuplicateQuestion):
+        http.scrape(site.base + "/forum/cr-9.html", QuestionType.CR, dedup=index)
+    http.close()
+    assert len(index) == 1
+
+def test_scrape_to_writes_duplicate_marker(tmp_path, monkeypatch):
+    def fake_scrape_many(jobs, **kw):
+        for url, q in jobs:
+            yield url, DuplicateQuestion(url, "https://x/1", 0.93) if url.endswith("/2") else {}
+    monkeypatch.setattr(sinks, "scrape_many", fake_scrape_many)
+    with open_sink(tmp_path / "r.jsonl") as sink:
+        counts = scrape_to(sink, [("https://x/1", "cr"), ("https://x/2", "cr")])
+        assert counts["duplicates"] == 1 and counts["failed"] == 0
+        assert sink.done("https://x/2")
+
+
+def test_bench_script(capsys):
+    assert bench_dedup.main(["-n", "2000", "-q", "100", "--budget-ms", "50"]) == 0
@@ -0,0 +1,81 @@
+# ░░░  GMAT-Club Scraper – question type detection tests  ░░░
+#
+# detect_type() on the recorded bench fixtures and the conftest pages,
+# _resolve_type()'s override rules, detection on the HTTP fast path and
+# the detected type reaching polish.
+
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+import pytest
+
+import main_code
+from main_code import HttpFetcher, QuestionType, ScrapeError, detect_type, infer_type
+from page_cache import PageCache
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "bench"))
+from bench_parsers import fixtures                      # noqa: E402
+
+FIXTURES = list(fixtures())
+CR, DS, PS, RC = QuestionType.CR, QuestionType.DS, QuestionType.PS, QuestionType.RC
+
+
+@pytest.mark.parametrize("name,q,path", FIXTURES, ids=[f[0] for f in FIXTURES])
+def test_fixture_type_is_detected(name, q, path):
+    found, conf = detect_type(path.read_text(encoding="utf-8"))
+    assert found is q and 0 < conf <= 1
+
+def test_detects_conftest_pages(pages):
+    assert detect_type(pages["cr"])[0] is CR
+    assert detect_type(pages["ds"])[0] is DS
+    assert detect_type(pages["tables"])[0] is QuestionType.TABLES
+    assert detect_type("<html><body><p>hello</p></body></html>") == (None, 0)
+
+def test_infer_type():
+    assert infer_type(None, "Critical Reasoning (CR)") is CR
+    assert infer_type("Two-Part Analysis", "CR") is QuestionType.TPA
+    assert infer_type("Hard questions") is None
+
+
+# ─── given vs detected ─────────────────────────────────────────────
+def test_resolve_type():
+    seen = []
+
+    def report(url, q, conf):
+        seen.append((q, conf))
+    assert main_code._resolve_type("u", CR, (RC, 0.5), report) is CR       # not sure enough
+    assert main_code._resolve_type("u", DS, (PS, 0.99), report) is DS      # same parser
+    assert seen == []
+    assert main_code._resolve_type("u", CR, (RC, 0.99), report) is RC
+    assert main_code._resolve_type("u", None, (PS, 0.4), report) is PS
+    assert seen == [(RC, 0.99), (PS, 0.4)]
+    with pytest.raises(ScrapeError):
+        main_code._resolve_type("u", None, (None, 0))
+
+
+def test_http_detects_untyped_pages(serve, pages, tmp_path):
+    site = serve({"/forum/t-1.html": (200, "text/html; charset=utf-8", pages["ds"])})
+    http, seen = HttpFetcher(cookie_file=tmp_path / "none.pkl"), []
+    try:
+        data = http.scrape(site.base + "/forum/t-1.html", None,
+                           on_detect=lambda u, q, c: seen.append(q))
+    finally:
+        http.close()
+    assert data["answer"] == "B" and seen == [DS]
+
+def test_untyped_scrape_polishes_with_the_detected_type(serve, pages, tmp_path, monkeypatch):
+    polished = []
+    monkeypatch.setattr(main_code, "_polish", lambda d, q: polished.append(q) or d)
+    site = serve({"/forum/t-1.html": (200, "text/html; charset=utf-8", pages["ds"])})
+    url = site.base + "/forum/t-1.html"
+    cache = PageCache(tmp_path / "cache")
+    http = HttpFetcher(cookie_file=tmp_path / "none.pkl")
+    try:
+        for _ in range(2):                              # HTTP, then the cached result
+            main_code.scrape(url=url, email="e", password="p", polish=True,
+                             http=http, cache=cache)
+    finally:
+        http.close()
+        cache.close()
+    assert polished == [DS, DS] and site.hits == ["/forum/t-1.html"]
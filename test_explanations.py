@@ -0,0 +1,114 @@
+# ░░░  GMAT-Club Scraper – explanation post tests  ░░░
+#
+# Thread URLs and ranking on their own, and ExplanationCollector reading a
+# three-page stub thread (conftest `serve`) whose last page is blocked –
+# alone, with a PageCache, and behind scrape()'s HTTP path.
+
+from __future__ import annotations
+
+import pytest
+from bs4 import BeautifulSoup
+
+from explanations import ExplanationCollector, page_count, page_url, parse_posts, rank
+from main_code import HttpFetcher, scrape
+from page_cache import PageCache
+
+HTML = "text/html; charset=utf-8"
+TOPIC = "/forum/bridge-tolls-119740.html"
+
+
+def _post(author, text, kudos=0, expert=False):
+    badge = '<span class="expert-badge"></span>' if expert else ""
+    return (f'<div class="post"><div class="author"><a class="username">{author}</a>{badge}</div>'
+            f'<div class="item text">{text}</div><span class="kudos-count">{kudos} Kudos</span></div>')
+
+def _page(*posts, pages=3):
+    links = "".join(f'<a href="/forum/bridge-tolls-119740-{20 * i}.html">{i + 1}</a>'
+                    for i in range(1, pages))
+    return f"<html><body>{''.join(posts)}<div class='pagination'>{links}</div></body></html>"
+
+THREAD = {
+    TOPIC: (200, HTML, _page(_post("asker", "The question itself."),
+                             _post("ann", "B, because tolls push drivers away.", kudos=4),
+                             _post("bob", "I think D.", kudos=0))),
+    "/forum/bridge-tolls-119740-20.html": (200, HTML, _page(
+        _post("GMATNinja", "Official: the answer is B.", kudos=2, expert=True),
+        _post("cy", "Agree with B, good one.", kudos=9))),
+    "/forum/bridge-tolls-119740-40.html": (403, HTML, "<title>Just a moment...</title>"),
+}
+
+
+def test_page_urls():
+    assert page_url("https://x/forum/t-119740.html", 3) == "https://x/forum/t-119740-40.html"
+    assert page_url("https://x/forum/t-119740-40.html", 1) == "https://x/forum/t-119740.html"
+    assert page_url("https://x/viewtopic.php?t=5&start=20", 2) == "https://x/viewtopic.php?t=5&start=20"
+    assert page_url("https://x/viewtopic.php?t=5&start=20", 1) == "https://x/viewtopic.php?t=5"
+
+def test_page_count_from_pagination():
+    soup = BeautifulSoup(THREAD[TOPIC][2], "html.parser")
+    assert page_count(soup, "https://x" + TOPIC) == 3
+    assert page_count(BeautifulSoup("<p>no links</p>", "html.parser"), "https://x" + TOPIC) == 1
+    listing = BeautifulSoup('<a href="/forum/critical-reasoning-cr-138-400.html">21</a>'
+                            '<a href="/forum/viewforum.php?f=138&start=400">21</a>', "html.parser")
+    assert page_count(listing, "https://x" + TOPIC) == 1              # forum pagination
+
+def test_parse_and_rank():
+    posts = parse_posts(BeautifulSoup(THREAD[TOPIC][2], "html.parser"), 1)
+    assert [p["author"] for p in posts] == ["ann", "bob"]            # question post skipped
+    assert posts[0]["kudos"] == 4 and not posts[0]["expert"]
+    expert = dict(posts[1], author="pro", kudos=0, expert=True)
+    assert [p["author"] for p in rank(posts + [expert], max_posts=5)] == ["pro", "ann"]
+    assert len(rank(posts, max_posts=1, min_kudos=0)) == 1
+
+
+@pytest.fixture
+def collector():
+    made = []
+
+    def make(**kw):
+        made.append(ExplanationCollector(http=HttpFetcher(pool_size=2), **kw))
+        return made[-1]
+    yield make
+    for ex in made:
+        ex.close()
+        ex.http.close()
+
+def test_collects_best_replies_across_pages(serve, collector):
+    site = serve(THREAD)
+    ex = collector(max_posts=3)
+    best = ex.submit(site.base + TOPIC).result()
+    assert [p["author"] for p in best] == ["GMATNinja", "cy", "ann"]
+    assert [p["page"] for p in best] == [2, 2, 1]
+    assert sorted(site.hits) == sorted(THREAD)                      # blocked page skipped
+
+def test_max_pages_bounds_fetches(serve, collector):
+    site = serve(THREAD)
+    best = collector(max_pages=1).collect(site.base + TOPIC)
+    assert [p["author"] for p in best] == ["ann"] and site.hits == [TOPIC]
+
+def test_fill_sets_cr_explanation():
+    posts = [{"text": "Because B."}]
+    assert ExplanationCollector.fill({"explanation": ""}, posts)["explanation"] == "Because B."
+    assert ExplanationCollector.fill({"answer": "B"}, []) == {"answer": "B", "explanations": []}
+
+
+# ─── cache and scrape() ────────────────────────────────────────────
+def test_reply_pages_never_touch_the_topic_row(serve, collector, tmp_path):
+    site = serve(THREAD)
+    cache = PageCache(tmp_path / "cache")
+    url = site.base + TOPIC
+    cache.put(url, THREAD[TOPIC][2], q_type="cr", result={"answer": "B"}, parser_version=1)
+    collector(cache=cache).collect(url)
+    assert TOPIC not in site.hits                   # page 1 came from the topic's row
+    assert cache.get_result(url, 1) == {"answer": "B"}
+    assert cache.get_html("explain:" + page_url(url, 2)) == THREAD[TOPIC.replace(".html", "-20.html")][2]
+
+def test_scrape_hands_page_one_to_the_collector(serve, collector, pages):
+    topic = pages["cr"].replace("</body>", _page().split("<body>")[1].split("</body>")[0] + "</body>")
+    site = serve(dict(THREAD, **{TOPIC: (200, HTML, topic)}))
+    ex = collector()
+    http = HttpFetcher(pool_size=1)
+    data = scrape(url=site.base + TOPIC, q_type="cr", email="e", password="p", http=http, explain=ex)
+    http.close()
+    assert site.hits.count(TOPIC) == 1
+    assert data["answer"] == "B" and data["explanation"] == "Official: the answer is B."
@@ -0,0 +1,71 @@
+# ░░░  GMAT-Club Scraper – HTTP fast path tests  ░░░
+
+from __future__ import annotations
+import pickle
+
+import pytest
+
+import main_code
+from main_code import DriverPool, HttpFetcher, QuestionType, parse_html, scrape
+
+HTML = "text/html; charset=utf-8"
+CHALLENGE = "<html><head><title>Just a moment...</title></head><body></body></html>"
+
+
+@pytest.fixture
+def site(serve, pages):
+    guest = pages["cr"].replace('<div class="downRow">OA: B</div>', "")
+    return serve({
+        "/forum/cr-1.html":    (200, HTML, pages["cr"]),
+        "/forum/ds-2.html":    (200, HTML, pages["ds"]),
+        "/forum/guest-3.html": (200, HTML, guest),
+        "/forum/table-4.html": (200, HTML, pages["tables"]),
+        "/forum/cf-5.html":    (403, HTML, CHALLENGE),
+        "/forum/cf-6.html":    (200, HTML, CHALLENGE),
+        "/forum/cookie.html":  lambda h: (200, "text/plain", h.headers.get("Cookie", "")),
+    })
+
+@pytest.fixture
+def http(tmp_path):
+    jar = tmp_path / "cookies.pkl"
+    jar.write_bytes(pickle.dumps([{"name": "phpbb3_u", "value": "42", "domain": "127.0.0.1"},
+                                  {"name": "broken"}]))
+    f = HttpFetcher(cookie_file=jar, pool_size=2)
+    yield f
+    f.close()
+
+
+def test_reuses_saved_browser_cookies(site, http):
+    assert http.fetch(site.base + "/forum/cookie.html") == "phpbb3_u=42"
+
+def test_parses_server_rendered_pages(site, http, pages):
+    assert http.scrape(site.base + "/forum/cr-1.html", QuestionType.CR) == \
+        parse_html(pages["cr"], "cr")
+    assert http.scrape(site.base + "/forum/ds-2.html", "ps")["answer"] == "B"
+
+@pytest.mark.parametrize("path, q", [
+    ("/forum/guest-3.html", "cr"),         # spoiler not in the static HTML
+    ("/forum/table-4.html", "ds"),         # JS-built markup
+    ("/forum/cf-5.html", "cr"),            # Cloudflare, 403
+    ("/forum/cf-6.html", "cr"),            # Cloudflare, 200
+    ("/forum/gone.html", "cr"),            # 404
+])
+def test_declines(site, http, path, q):
+    assert http.scrape(site.base + path, q) is None
+
+def test_browser_only_types_are_not_fetched(site, http):
+    assert http.scrape(site.base + "/forum/table-4.html", QuestionType.TABLES) is None
+    assert site.hits == []
+
+
+# ─── scrape() ──────────────────────────────────────────────────────
+def test_scrape_uses_chrome_only_when_declined(site, http, drivers, pages, monkeypatch):
+    monkeypatch.setattr(main_code.time, "sleep", lambda s: None)
+    monkeypatch.setattr(main_code, "take_snapshot", lambda drv, *a, **kw: pages["cr"])
+    with DriverPool(1, email="e", password="p") as pool:
+        kw = dict(q_type=QuestionType.CR, email="e", password="p", pool=pool, http=http,
+                  snapshot=True)
+        assert scrape(url=site.base + "/forum/cr-1.html", **kw)["answer"] == "B"
+        assert drivers == []                       # no browser started
+        assert scrape(url=site.base + "/forum/cf-5.html", **kw)["answer"] == "B"
+    assert drivers[0].visited == [site.base + "/forum/cf-5.html"]
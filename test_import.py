@@ -0,0 +1,58 @@
+# ░░░  GMAT-Club Scraper – import / Chrome probe tests  ░░░
+#
+# Importing the modules in a fresh interpreter starts no subprocess and
+# loads none of the heavy stacks; chrome_major() probes once per binary.
+
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+import pytest
+
+import main_code
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "bench"))
+import bench_import                                     # noqa: E402
+
+
+@pytest.mark.parametrize("mod", [*bench_import.MODULES, "pipeline"])
+def test_import_is_side_effect_free(mod):
+    r = bench_import.run_once(mod)
+    assert r["spawned"] == [] and r["heavy"] == []
+
+
+@pytest.fixture
+def probe(monkeypatch, tmp_path):
+    """Counts _detect_chrome_major() calls; `probe.result` is returned or raised."""
+    class Probe:
+        calls, result, key = 0, 120, "chrome:1"
+    p = Probe()
+
+    def detect():
+        p.calls += 1
+        if isinstance(p.result, BaseException):
+            raise p.result
+        return p.result
+    monkeypatch.setattr(main_code, "_detect_chrome_major", detect)
+    monkeypatch.setattr(main_code, "_chrome_key", lambda: p.key)
+    monkeypatch.setattr(main_code, "CHROME_VERSION_FILE", tmp_path / "chrome_version.json")
+    monkeypatch.setattr(main_code, "_chrome_major", None)
+    monkeypatch.setattr(main_code, "_chrome_error", None)
+    return p
+
+def test_chrome_major_is_cached_on_disk(probe, monkeypatch):
+    assert main_code.chrome_major() == 120 and main_code.CHROME_MAJOR == 120
+    monkeypatch.setattr(main_code, "_chrome_major", None)      # a new process
+    assert main_code.chrome_major() == 120 and probe.calls == 1
+    probe.key, probe.result = "chrome:2", 121                   # Chrome updated
+    monkeypatch.setattr(main_code, "_chrome_major", None)
+    assert main_code.chrome_major() == 121 and probe.calls == 2
+
+def test_failed_probe_is_remembered_per_binary(probe):
+    probe.result = FileNotFoundError("google-chrome")
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="Chrome version"):
+            main_code.chrome_major()
+    assert probe.calls == 1
+    probe.key, probe.result = "chrome:new", 122                  # Chrome installed
+    assert main_code.chrome_major() == 122 and probe.calls == 2
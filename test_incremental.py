@@ -0,0 +1,142 @@
+# ░░░  GMAT-Club Scraper – incremental re-scrape tests  ░░░
+#
+# rescrape() against topics served by conftest `serve`: each topic's HTML
+# and ETag can be changed between runs, and `site.hits` shows what was
+# fetched.  Browser-only topics go to a stubbed scrape_many().
+
+from __future__ import annotations
+
+import pytest
+
+import incremental
+from incremental import TopicState, diff_fields, rescrape
+from main_code import HttpFetcher, QuestionType, page_fingerprint
+
+HTML = "text/html; charset=utf-8"
+
+
+class _Topic:
+    """Route handler: answers 304 while the client's ETag is current."""
+
+    def __init__(self, html, etag=None):
+        self.html, self.etag = html, etag
+
+    def __call__(self, handler):
+        headers = {"Content-Type": HTML}
+        if self.etag:
+            headers["ETag"] = self.etag
+            if handler.headers.get("If-None-Match") == self.etag:
+                return 304, headers, ""
+        return 200, headers, self.html
+
+
+@pytest.fixture
+def topics(pages):
+    return {"/forum/cr-1.html": _Topic(pages["cr"] + '<div class="reply">12 views</div>', '"v1"'),
+            "/forum/ds-2.html": _Topic(pages["ds"]),
+            "/forum/table-3.html": _Topic(pages["tables"])}
+
+@pytest.fixture
+def site(serve, topics):
+    return serve(topics)
+
+@pytest.fixture
+def http(tmp_path):
+    f = HttpFetcher(cookie_file=tmp_path / "none.pkl", pool_size=4)
+    yield f
+    f.close()
+
+@pytest.fixture
+def state(tmp_path):
+    with TopicState(tmp_path / "state.sqlite") as s:
+        yield s
+
+@pytest.fixture
+def browser(monkeypatch):
+    """URLs handed to scrape_many(); each gets {"answer": browser.answer}."""
+    def fake_scrape_many(jobs, *, on_detect=None, **kw):
+        for url, q in jobs:
+            fake_scrape_many.asked.append(url)
+            if q is None:
+                on_detect(url, QuestionType.TABLES, 0.9)
+            yield url, {"answer": fake_scrape_many.answer}
+    fake_scrape_many.asked, fake_scrape_many.answer = [], "Yes"
+    monkeypatch.setattr(incremental, "scrape_many", fake_scrape_many)
+    return fake_scrape_many
+
+
+def _run(state, site, http, jobs=None):
+    jobs = jobs or [(site.base + "/forum/cr-1.html", "cr"), (site.base + "/forum/ds-2.html", None),
+                    (site.base + "/forum/table-3.html", None)]
+    return {url.rsplit("/", 1)[1]: (status, diff)
+            for url, status, diff in rescrape(state, jobs, http=http, probe_workers=2)}
+
+
+def test_diff_fields():
+    old = {"answer": "B", "questions": [{"official": "A"}, {"official": "C"}], "tags": ["x"]}
+    new = {"answer": "B", "questions": [{"official": "A"}, {"official": "D"}], "tags": ["x", "y"],
+           "extra": 1}
+    assert diff_fields(old, new) == {"questions[1].official": ("C", "D"),
+                                     "tags": (["x"], ["x", "y"]), "extra": (None, 1)}
+    assert diff_fields(old, old) == {}
+
+def test_fingerprint_ignores_replies_and_session_ids(pages):
+    fp = page_fingerprint(pages["cr"])
+    assert page_fingerprint(pages["cr"] + '<div class="reply">new reply</div>') == fp
+    assert page_fingerprint(pages["cr"].replace("<br>", '<a href="x.php?sid=ab12">s</a><br>', 1)) \
+        == page_fingerprint(pages["cr"].replace("<br>", '<a href="x.php?sid=ff00">s</a><br>', 1))
+    assert page_fingerprint(pages["cr"].replace("OA: B", "OA: C")) != fp
+    assert page_fingerprint("<html><body>no post</body></html>") is None
+
+
+def test_first_run_then_nothing_changed(state, site, http, browser):
+    first = _run(state, site, http)
+    assert {k: s for k, (s, _) in first.items()} == {"cr-1.html": "new", "ds-2.html": "new",
+                                                     "table-3.html": "new"}
+    assert browser.asked == [site.base + "/forum/table-3.html"]      # only DI needs Chrome
+    assert state.get(site.base + "/forum/ds-2.html")["q_type"] == "ds"
+    assert state.get(site.base + "/forum/table-3.html")["q_type"] == "tables"
+
+    browser.asked.clear()
+    again = _run(state, site, http)
+    assert {s for s, _ in again.values()} == {"unchanged"}
+    assert browser.asked == []
+
+def test_only_edited_topics_are_reparsed(state, site, http, topics, browser):
+    _run(state, site, http)
+    topics["/forum/cr-1.html"].html += '<div class="reply">another reply</div>'
+    topics["/forum/cr-1.html"].etag = '"v2"'                          # fingerprint decides
+    topics["/forum/ds-2.html"].html = topics["/forum/ds-2.html"].html.replace("OA: B", "OA: D")
+    out = _run(state, site, http)
+    assert out["cr-1.html"] == ("unchanged", {})
+    assert out["ds-2.html"] == ("changed", {"answer": ("B", "D")})
+    assert state.get(site.base + "/forum/ds-2.html")["result"]["answer"] == "D"
+    with state._lock:
+        rows = state._db.execute("SELECT field, old, new FROM changes").fetchall()
+    assert rows == [("answer", '"B"', '"D"')]
+
+def test_seeded_topics_get_a_fingerprint(state, site, http, pages, browser):
+    url = site.base + "/forum/ds-2.html"
+    assert state.seed([(url, "ds", http.parse(url, pages["ds"],
+                                                    QuestionType.DS))]) == 1
+    assert _run(state, site, http, [(url, None)]) == {"ds-2.html": ("unchanged", {})}
+    assert state.get(url)["fingerprint"] == page_fingerprint(pages["ds"])
+    assert state.get(url)["parser_ver"] == incremental.PARSER_VERSION
+
+def test_new_parser_version_reparses_everything(state, site, http, browser, monkeypatch):
+    _run(state, site, http)
+    site.hits.clear()
+    browser.asked.clear()
+    monkeypatch.setattr(incremental, "PARSER_VERSION", incremental.PARSER_VERSION + 1)
+    out = _run(state, site, http)                   # same ETags, same fingerprints
+    assert out == {"cr-1.html": ("changed", {}), "ds-2.html": ("changed", {}),
+                   "table-3.html": ("changed", {})}
+    assert browser.asked == [site.base + "/forum/table-3.html"]
+    assert {state.get(site.base + t)["parser_ver"] for t in site.hits} == {
+        incremental.PARSER_VERSION}
+    assert {s for s, _ in _run(state, site, http).values()} == {"unchanged"}
+
+def test_failed_probe_goes_to_the_browser(state, serve, http, browser):
+    url = serve({"/forum/cr-9.html": (503, HTML, "busy")}).base + "/forum/cr-9.html"
+    assert list(rescrape(state, [(url, "cr")], http=http)) == [(url, "new", {})]
+    assert browser.asked == [url]
@@ -0,0 +1,100 @@
+# ░░░  GMAT-Club Scraper – lean browsing tests  ░░░
+#
+# What lean mode asks of Chrome (page-load strategy, DevTools URL blocks),
+# checked against a recording stand-in for the browser, and the per-page
+# load stats.
+
+from __future__ import annotations
+from fnmatch import fnmatch
+
+import pytest
+
+import main_code, metrics
+from main_code import DriverPool
+
+KEPT = ("https://gmatclub.com/forum/some-topic-123.html",
+        "https://gmatclub.com/forum/styles/gmatclub/template/forum_fn.js",
+        "https://challenges.cloudflare.com/turnstile/v0/api.js")
+BLOCKED = ("https://gmatclub.com/forum/download/file.php?id=7",
+           "https://cdn.gmatclub.com/img/chart.png?v=2",
+           "https://www.googletagmanager.com/gtm.js?id=GTM-1",
+           "https://fonts.gstatic.com/s/roboto.woff2")
+
+
+class _Chrome:
+    window_handles = ["main"]
+
+    def __init__(self, stats=(420.0, 1300.0, 50_000, 12)):
+        self.cdp, self.stats = [], stats
+
+    def execute(self, command, params=None):
+        return {}
+
+    def execute_cdp_cmd(self, cmd, args):
+        self.cdp.append((cmd, args))
+
+    def execute_script(self, js, *args):
+        if js != main_code._PAGE_STATS_JS:
+            return 1                                     # DriverPool's health check
+        if isinstance(self.stats, Exception):
+            raise self.stats
+        return list(self.stats)
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """(headless, lean) of every browser _start_chrome() was asked for."""
+    calls = []
+
+    def start(headless, lean=False):
+        calls.append((headless, lean))
+        return _Chrome()
+    monkeypatch.setattr(main_code, "_start_chrome", start)
+    return calls
+
+def _blocked(drv):
+    (enable, _), (cmd, args) = drv.cdp
+    assert (enable, cmd) == ("Network.enable", "Network.setBlockedURLs")
+    return args["urls"]
+
+def _hit(urls, url):
+    return any(fnmatch(url, p) for p in urls)
+
+
+def test_full_mode_blocks_nothing(started):
+    drv = main_code._new_driver(True)
+    assert drv.cdp == [] and started == [(True, False)]
+
+def test_lean_blocks_heavy_resources_only(started):
+    urls = _blocked(main_code._new_driver(True, lean=True))
+    assert started == [(True, True)]
+    assert all(_hit(urls, u) for u in BLOCKED)
+    assert not any(_hit(urls, u) for u in KEPT)
+    assert not _hit(urls, "https://gmatclub.com/forum/styles/gmatclub/theme/stylesheet.css")
+
+def test_block_css_adds_stylesheets(started):
+    urls = _blocked(main_code._new_driver(False, lean=True, block_css=True))
+    assert _hit(urls, "https://gmatclub.com/forum/styles/gmatclub/theme/stylesheet.css")
+    assert not any(_hit(urls, u) for u in KEPT)
+
+def test_pool_starts_lean_browsers(started, monkeypatch):
+    monkeypatch.setattr(main_code, "_ensure_login", lambda drv, email, pw: None)
+    with DriverPool(1, email="e", password="p", lean=True, block_css=True) as pool:
+        with pool.checkout() as drv:
+            assert _hit(_blocked(drv), "https://x/site.css")
+    assert started == [(True, True)]
+
+
+# ─── page stats ────────────────────────────────────────────────────
+def test_page_stats_are_booked():
+    assert main_code.page_stats(_Chrome()) == {"ready_s": 0.42, "load_s": 1.3,
+                                               "bytes": 50_000, "resources": 12}
+    metrics.REGISTRY.reset()
+    main_code._load_driver_stack()
+    main_code._page_stats(_Chrome())
+    main_code._page_stats(_Chrome(stats=main_code.WebDriverException("gone")))   # ignored
+    snap = metrics.REGISTRY.snapshot()
+    counters = {c["name"]: c["value"] for c in snap["counters"]}
+    assert counters == {"page_bytes_total": 50_000, "page_resources_total": 12}
+    assert [h["count"] for h in snap["histograms"] if h["name"] == "page_ready_seconds"] == [1]
+    metrics.REGISTRY.reset()
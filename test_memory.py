@@ -0,0 +1,93 @@
+# ░░░  GMAT-Club Scraper – memory governor tests  ░░░
+#
+# RSS readings of this very process, the governor's page / RSS limits
+# recycling FakeDrivers through a real DriverPool, labelling detected
+# pages, and spill() on every result source.
+
+from __future__ import annotations
+import os
+
+import pytest
+
+import main_code, memory
+from main_code import DriverPool
+from memory import MemoryGovernor, self_rss, tree_rss
+from page_cache import PageCache
+
+
+def test_rss_of_this_process():
+    own = self_rss()
+    assert own and own > 1 << 20
+    assert tree_rss([os.getpid()]) >= own // 2
+    assert tree_rss([]) is None and tree_rss([0]) is None
+
+def test_proc_table_knows_parent():
+    if not os.path.isdir("/proc"):
+        pytest.skip("no /proc")
+    table = memory._proc_table()
+    assert table[os.getpid()][0] == os.getppid()
+
+
+@pytest.fixture
+def pool(drivers, tmp_path):
+    def make(**kw):
+        return DriverPool(1, email="e", password="p", governor=MemoryGovernor(root=tmp_path, **kw))
+    return make
+
+def test_browser_recycled_after_max_pages(pool, drivers):
+    p = pool(max_pages=2)
+    for _ in range(5):
+        with p.checkout():
+            pass
+    p.close()
+    assert len(drivers) == 3 and drivers[0].quitted and drivers[1].quitted
+
+def test_browser_recycled_over_rss(pool, drivers, monkeypatch):
+    monkeypatch.setattr(memory, "tree_rss", lambda pids: 2_000 << 20)
+    monkeypatch.setattr(main_code._ctx, "q_type", "cr", raising=False)
+    p = pool(max_pages=0, max_rss_mb=1500)
+    with p.checkout():
+        pass
+    with p.checkout():
+        pass
+    p.close()
+    assert len(drivers) == 2
+    assert p.governor.peaks()["cr"]["browser_mb"] == 2000
+
+
+def test_spill_moves_large_strings(tmp_path):
+    gov = MemoryGovernor(spill_bytes=10, root=tmp_path)
+    big = "<html>" + "x" * 100 + "</html>"
+    out = gov.spill({"_todo": big, "answer": "B"})
+    assert out["answer"] == "B" and "_todo" not in out
+    assert open(out["_todo_file"]).read() == big
+    assert gov.spill({"_todo": big})["_todo_file"] == out["_todo_file"]
+    assert len(list((tmp_path / "spill").iterdir())) == 1
+    small = {"answer": "B"}
+    assert gov.spill(small) is small and gov.spill(["not a dict"]) == ["not a dict"]
+
+def test_detected_pages_are_booked_once_labelled(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory, "tree_rss", lambda pids: 300 << 20)
+    gov = MemoryGovernor(root=tmp_path)
+    gov.after_page(1, [1], "auto", ref="https://x/1")
+    gov.after_page(1, [1], "auto")                          # no ref: booked as "auto"
+    assert set(gov.peaks()) == {"auto"}
+    gov.label("https://x/1", "ds")
+    gov.label("https://x/unknown", "cr")
+    assert set(gov.peaks()) == {"auto", "ds"} and gov.peaks()["ds"]["browser_mb"] == 300
+    monkeypatch.setattr(memory, "_MAX_UNLABELLED", 2)
+    for i in range(5):
+        gov.after_page(1, [1], "auto", ref=f"https://x/f{i}")   # failed parses never label
+    assert len(gov._unlabelled) == 2
+
+def test_cached_results_are_spilled_too(drivers, tmp_path):
+    cache = PageCache(tmp_path / "cache")
+    big = {"answer": "B", "_todo": "x" * 200}
+    cache.put("https://x/t-1.html", "<p>cached</p>", q_type="cr", result=big,
+              parser_version=main_code.PARSER_VERSION)
+    with DriverPool(1, email="e", password="p",
+                    governor=MemoryGovernor(spill_bytes=100, root=tmp_path)) as p:
+        data = main_code.scrape(url="https://x/t-1.html", q_type="cr", email="e", password="p",
+                                pool=p, cache=cache)
+    assert "_todo" not in data and open(data["_todo_file"]).read() == "x" * 200
+    assert drivers == []
@@ -0,0 +1,116 @@
+# ░░░  GMAT-Club Scraper – metrics tests  ░░░
+#
+# A private Metrics registry per test: spans, counters, driver command
+# counting and the three export formats.
+
+from __future__ import annotations
+import json
+
+import pytest
+
+import metrics
+from main_code import HttpFetcher, QuestionType, scrape
+from metrics import Metrics, cprofile_hook, instrument_driver
+
+
+@pytest.fixture
+def reg():
+    return Metrics(default_labels=lambda: {"q_type": "cr"})
+
+
+def _hist(reg, **labels):
+    return next(h for h in reg.snapshot()["histograms"] if h["labels"] == labels)
+
+
+def test_spans_nest_and_book_driver_commands(reg):
+    class Drv:
+        def execute(self, command, params=None):
+            return command
+    drv = instrument_driver(Drv(), reg)
+    with reg.span("scrape"):
+        drv.execute("get")
+        with reg.span("parse"):
+            assert reg.current_stage() == "parse"
+            drv.execute("findElement"); drv.execute("findElement")
+    assert reg.current_stage() == "-"
+    cmds = {(c["labels"]["command"], c["labels"]["stage"]): c["value"]
+            for c in reg.snapshot()["counters"]}
+    assert cmds == {("get", "scrape"): 1, ("findElement", "parse"): 2}
+    assert _hist(reg, q_type="cr", stage="parse")["count"] == 1
+
+def test_histogram_buckets_are_cumulative(reg):
+    for s in (0.01, 0.3, 0.3, 200):
+        reg.observe("wait_seconds", s, step="spoiler")
+    h = _hist(reg, q_type="cr", step="spoiler")
+    assert (h["count"], h["max"]) == (4, 200)
+    assert h["buckets"]["0.05"] == 1 and h["buckets"]["0.5"] == 3 and h["buckets"]["+Inf"] == 4
+
+def test_span_times_failing_blocks_too(reg):
+    with pytest.raises(ValueError):
+        with reg.span("parse"):
+            raise ValueError
+    assert _hist(reg, q_type="cr", stage="parse")["count"] == 1
+
+
+# ─── export ────────────────────────────────────────────────────────
+def test_prometheus_text(reg, tmp_path):
+    reg.inc("pages_total", source="http")
+    reg.inc("pages_total", 2, source="cache")
+    reg.inc("failures_total", error='say "hi"')
+    reg.observe("stage_seconds", 0.2, stage="parse")
+    reg.write_prometheus(tmp_path / "gmat.prom")
+    text = (tmp_path / "gmat.prom").read_text()
+    assert text.count("# TYPE gmat_pages_total counter") == 1
+    assert 'gmat_pages_total{q_type="cr",source="cache"} 2' in text
+    assert 'gmat_failures_total{error="say \\"hi\\"",q_type="cr"} 1' in text
+    assert 'gmat_stage_seconds_bucket{q_type="cr",stage="parse",le="0.25"} 1' in text
+    assert 'gmat_stage_seconds_count{q_type="cr",stage="parse"} 1' in text
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_jsonl_and_event_stream(reg, tmp_path):
+    reg.inc("retries_total")
+    reg.write_jsonl(tmp_path / "m.jsonl")
+    reg.write_jsonl(tmp_path / "m.jsonl")
+    snaps = [json.loads(ln) for ln in (tmp_path / "m.jsonl").read_text().splitlines()]
+    assert len(snaps) == 2 and snaps[0]["counters"][0]["name"] == "retries_total"
+
+    reg.events_to(tmp_path / "events.jsonl")
+    with reg.span("navigate"):
+        pass
+    reg.events_to(None)
+    with reg.span("parse"):
+        pass
+    ev, = map(json.loads, (tmp_path / "events.jsonl").read_text().splitlines())
+    assert ev["stage"] == "navigate" and ev["q_type"] == "cr"
+
+    reg.reset()
+    assert reg.snapshot()["counters"] == [] and reg.snapshot()["histograms"] == []
+
+def test_cprofile_hook_dumps_matching_spans(reg, tmp_path):
+    hook = cprofile_hook(["parse"], tmp_path / "prof")
+    reg.add_hook(hook)
+    with reg.span("parse"):
+        sum(range(1000))
+    with reg.span("navigate"):
+        pass
+    reg.remove_hook(hook)
+    with reg.span("parse"):
+        pass
+    assert [p.name.split("-")[:2] for p in (tmp_path / "prof").iterdir()] == [["parse", "cr"]]
+
+
+# ─── main_code wiring ──────────────────────────────────────────────
+def test_scrape_books_source_and_stages(serve, pages, tmp_path):
+    site = serve({"/forum/cr-1.html": (200, "text/html; charset=utf-8", pages["cr"])})
+    metrics.REGISTRY.reset()
+    http = HttpFetcher(cookie_file=tmp_path / "none.pkl")
+    try:
+        scrape(url=site.base + "/forum/cr-1.html", q_type=QuestionType.CR, http=http,
+               email="e", password="p")
+    finally:
+        http.close()
+    snap = metrics.REGISTRY.snapshot()
+    assert [(c["name"], c["labels"]) for c in snap["counters"] if c["name"] == "pages_total"] \
+        == [("pages_total", {"q_type": "cr", "source": "http"})]
+    assert {"scrape", "http"} <= {h["labels"].get("stage") for h in snap["histograms"]}
+    metrics.REGISTRY.reset()
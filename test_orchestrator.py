@@ -0,0 +1,140 @@
+# ░░░  GMAT-Club Scraper – orchestrator tests  ░░░
+#
+# WorkQueue on a temporary SQLite file (several connections stand in for
+# several processes), one worker loop run in-process with scrape_many()
+# stubbed, manifests and export.
+
+from __future__ import annotations
+import json, threading
+
+import pytest
+
+import orchestrator
+from main_code import QuestionType
+from orchestrator import WorkQueue, export, read_manifest
+
+
+@pytest.fixture
+def qpath(tmp_path):
+    return tmp_path / "queue.sqlite"
+
+@pytest.fixture
+def queue(qpath):
+    q = WorkQueue(qpath, max_tries=2)
+    yield q
+    q.close()
+
+def _jobs(n: int, q_type="cr"):
+    return [(f"https://x/t-{i}.html", q_type) for i in range(n)]
+
+
+def test_add_skips_queued_urls(queue):
+    assert queue.add(_jobs(3) + [("https://x/u.html", None)], chunk=2) == 4
+    assert queue.add(_jobs(5)) == 2
+    assert queue.counts() == {"new": 6, "leased": 0, "done": 0, "failed": 0}
+    assert ("https://x/u.html", None) in queue.lease("w", 10)
+
+def test_concurrent_leases_never_overlap(queue, qpath):
+    queue.add(_jobs(200))
+    got, errors = [], []
+
+    def worker(name):
+        q = WorkQueue(qpath)
+        try:
+            while batch := q.lease(name, 3):
+                got.extend(u for u, _ in batch)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            q.close()
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors and len(got) == 200 and len(set(got)) == 200
+    assert queue.counts()["leased"] == 200
+
+def test_failed_jobs_retry_until_max_tries(queue):
+    queue.add(_jobs(1))
+    (url, q), = queue.lease("w", 1)
+    assert q is QuestionType.CR
+    queue.failed("w", url, "ScrapeError: boom")
+    assert queue.counts()["new"] == 1
+    queue.lease("w", 1)
+    queue.failed("w", url, "ScrapeError: boom")
+    assert queue.counts()["failed"] == 1 and queue.lease("w", 1) == []
+
+
+# ─── requeue ───────────────────────────────────────────────────────
+def test_requeue_dead_worker(queue):
+    queue.add(_jobs(4))
+    for w in ("a", "b"):
+        queue.register(w)
+        queue.lease(w, 2)
+    assert queue.requeue(stale_after=60) == 0                 # both heartbeats fresh
+    assert queue.requeue("a", stale_after=60) == 2
+    assert len(queue.lease("c", 5)) == 2 and queue.counts()["leased"] == 4
+
+def test_requeue_stale_heartbeat_and_old_lease(queue):
+    queue.add(_jobs(3))
+    for w in ("a", "b", "c"):
+        queue.register(w)
+        queue.lease(w, 1)
+    queue._tx(lambda db: db.execute("UPDATE workers SET beat_at=beat_at-600 WHERE id='a'"))
+    queue._tx(lambda db: db.execute("UPDATE jobs SET leased_at=leased_at-7200 WHERE worker='b'"))
+    assert queue.requeue(stale_after=60, lease_timeout=3600) == 2
+    assert queue.counts() == {"new": 2, "leased": 1, "done": 0, "failed": 0}
+
+
+# ─── worker loop ───────────────────────────────────────────────────
+class _Pool:
+    def __init__(self, *a, **kw):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def test_worker_drains_queue(queue, qpath, monkeypatch):
+    queue.add(_jobs(5) + [("https://x/bad.html", "ds")])
+
+    def fake_scrape_many(jobs, **kw):
+        for url, q in jobs:
+            yield url, ValueError("no post") if "bad" in url else {"url": url, "q": q.value}
+    monkeypatch.setattr(orchestrator, "DriverPool", _Pool)
+    monkeypatch.setattr(orchestrator, "scrape_many", fake_scrape_many)
+    opts = dict(email="e", password="p", headless=True, snapshot=True, http_first=False,
+                polish=False, cache=None, retries=0, max_tries=2, batch=2, beat=0.05,
+                lean=True, block_css=False, max_pages=200, max_rss_mb=1500)
+    orchestrator._worker_main(str(qpath), "w1", opts)
+    assert queue.counts() == {"new": 0, "leased": 0, "done": 5, "failed": 1}
+    w, = queue.workers()
+    assert (w["id"], w["done"], w["failed"]) == ("w1", 5, 2)
+
+
+# ─── manifests / export ────────────────────────────────────────────
+def test_read_manifest(tmp_path):
+    csv = tmp_path / "m.csv"
+    csv.write_text("url,q_type\n# comment\nhttps://x/1,cr\n\nhttps://x/2,\nhttps://x/3\n")
+    assert list(read_manifest(csv)) == [("https://x/1", "cr"), ("https://x/2", None),
+                                        ("https://x/3", None)]
+    tsv = tmp_path / "m.tsv"
+    tsv.write_text("https://x/1\tds\n")
+    assert list(read_manifest(tsv)) == [("https://x/1", "ds")]
+    jl = tmp_path / "m.jsonl"
+    jl.write_text('{"url": "https://x/1", "q_type": "rc"}\n\n{"url": "https://x/2"}\n')
+    assert list(read_manifest(jl)) == [("https://x/1", "rc"), ("https://x/2", None)]
+
+def test_export_merges_results(queue, qpath, tmp_path):
+    queue.add(_jobs(2))
+    (u1, _), (u2, _) = queue.lease("w", 2)
+    queue.done("w", u1, {"answer": "B"})
+    queue.failed("w", u2, "ScrapeError: a")
+    queue.lease("w", 1)
+    queue.failed("w", u2, "ScrapeError: b")
+    out = tmp_path / "out.jsonl"
+    assert export(qpath, out) == {"written": 1, "failed": 1}
+    rec, = map(json.loads, out.read_text().splitlines())
+    assert (rec["url"], rec["q_type"], rec["data"]) == (u1, "cr", {"answer": "B"})
+    err, = map(json.loads, out.with_suffix(".errors.jsonl").read_text().splitlines())
+    assert err["error"] == "RuntimeError: ScrapeError: b"
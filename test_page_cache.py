@@ -0,0 +1,130 @@
+# ░░░  GMAT-Club Scraper – page cache tests  ░░░
+
+from __future__ import annotations
+import random, string, threading
+
+import pytest
+
+import main_code
+from main_code import DriverPool, QuestionType, parse_html, reparse_cache, scrape
+from page_cache import PageCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = PageCache(tmp_path / "cache", ttl=3600)
+    yield c
+    c.close()
+
+def _blobs(c: PageCache):
+    return sorted(p.name for p in (c.root / "blobs").rglob("*.html.gz"))
+
+def _noise(n: int, seed: int) -> str:
+    rng = random.Random(seed)                    # gzip can't shrink it much
+    return "".join(rng.choice(string.ascii_letters) for _ in range(n))
+
+def _age(c: PageCache, seconds: float):
+    c._db.execute("UPDATE pages SET fetched_at=fetched_at-?", (seconds,))
+    c._db.commit()
+
+
+def test_round_trip_ignores_fragment(cache):
+    cache.put("https://x/t-1.html", "<p>one</p>", q_type="cr", result={"a": 1},
+              parser_version=3)
+    assert cache.get_html("https://x/t-1.html#p42") == "<p>one</p>"
+    assert cache.get_result("https://x/t-1.html", 3) == {"a": 1}
+    assert cache.get_result("https://x/t-1.html", 3, "cr") == {"a": 1}
+    assert cache.get_result("https://x/t-1.html", 2) is None        # older parser
+    assert cache.get_result("https://x/t-1.html", 3, "ds") is None  # other type
+    assert cache.get_html("https://x/t-2.html") is None
+
+def test_identical_bodies_share_a_blob(cache):
+    cache.put("https://x/a.html", "<p>same</p>")
+    cache.put("https://x/b.html", "<p>same</p>")
+    assert len(_blobs(cache)) == 1
+    cache.put("https://x/a.html", "<p>changed</p>")
+    assert len(_blobs(cache)) == 2                # b still needs the old body
+    cache.put("https://x/b.html", "<p>changed</p>")
+    assert len(_blobs(cache)) == 1                # the old body is gone
+
+def test_ttl(cache):
+    cache.put("https://x/a.html", "<p>a</p>", result={"a": 1}, parser_version=1)
+    _age(cache, 7200)
+    assert cache.get_html("https://x/a.html") is None
+    assert cache.get_result("https://x/a.html", 1) is None
+    assert cache.get_html("https://x/a.html", ignore_ttl=True) == "<p>a</p>"
+    assert cache.evict() == 1
+    assert _blobs(cache) == []
+
+def test_lru_eviction_by_size(tmp_path):
+    c = PageCache(tmp_path / "cache", ttl=None, max_bytes=None)
+    for i in range(2):
+        c.put(f"https://x/{i}.html", _noise(10_000, i))
+    c.max_bytes = int(c.total_bytes() * 1.25)     # room for two and a half pages
+    c.get_html("https://x/0.html")                # 1 is now the least recently used
+    c.put("https://x/2.html", _noise(10_000, 2))
+    assert c.get_html("https://x/1.html") is None
+    assert c.get_html("https://x/0.html") and c.get_html("https://x/2.html")
+    assert c.total_bytes() <= c.max_bytes and len(_blobs(c)) == 2
+    c.close()
+
+def test_running_total_matches_the_index(tmp_path):
+    c = PageCache(tmp_path / "cache", ttl=None)
+    for i in range(4):
+        c.put(f"https://x/{i}.html", _noise(2_000, i % 2))           # two shared bodies
+    c.put("https://x/0.html", _noise(2_000, 9))                      # replaces, keeps blob 0
+    c.put("https://x/2.html", _noise(2_000, 9))                      # blob 0 orphaned
+    assert c.total_bytes() == c._sum_bytes()
+    c.max_bytes = c.total_bytes() - 1
+    c.evict()
+    assert c.total_bytes() == c._sum_bytes() <= c.max_bytes
+    c.close()
+    c = PageCache(tmp_path / "cache", ttl=None)
+    assert c.total_bytes() == c._sum_bytes()
+    c.close()
+
+def test_concurrent_writers_of_one_body(cache):
+    errors, html = [], _noise(50_000, 1)
+
+    def put(i):
+        try:
+            cache.put(f"https://x/{i}.html", html)
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=put, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == [] and len(_blobs(cache)) == 1
+    assert all(cache.get_html(f"https://x/{i}.html") == html for i in range(8))
+    assert not list((cache.root / "blobs").rglob("*.tmp"))
+
+
+# ─── scrape / re-parse ─────────────────────────────────────────────
+def test_reparse_cache_updates_stale_results(cache, pages):
+    cache.put("https://x/cr.html", pages["cr"], q_type="cr", result={"old": True},
+              parser_version=main_code.PARSER_VERSION - 1)
+    cache.put("https://x/ds.html", pages["ds"], q_type="ds",
+              result=parse_html(pages["ds"], "ds"), parser_version=main_code.PARSER_VERSION)
+    cache.put("https://x/bad.html", "<p>no post</p>", q_type="ds")
+    _age(cache, 7200)                             # expired pages are re-parsed too
+    out = dict(reparse_cache(cache))
+    assert set(out) == {"https://x/cr.html", "https://x/bad.html"}
+    assert out["https://x/cr.html"] == parse_html(pages["cr"], "cr")
+    assert isinstance(out["https://x/bad.html"], main_code.ScrapeError)
+    cache.ttl = None
+    assert cache.get_result("https://x/cr.html", main_code.PARSER_VERSION) == \
+        out["https://x/cr.html"]
+    assert [u for u, _ in reparse_cache(cache)] == ["https://x/bad.html"]
+
+def test_scrape_serves_fresh_pages_from_cache(cache, drivers, pages, monkeypatch):
+    monkeypatch.setattr(main_code.time, "sleep", lambda s: None)
+    monkeypatch.setattr(main_code, "take_snapshot", lambda drv, *a, **kw: pages["cr"])
+    with DriverPool(1, email="e", password="p") as pool:
+        kw = dict(url="https://x/t-1.html", q_type=QuestionType.CR, email="e", password="p",
+                  pool=pool, cache=cache)
+        first = scrape(**kw)                      # browser snapshot, written back
+        assert cache.get_html("https://x/t-1.html") == pages["cr"]
+        assert scrape(**kw) == first
+    assert drivers[0].visited == ["https://x/t-1.html"]
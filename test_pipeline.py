@@ -0,0 +1,136 @@
+# ░░░  GMAT-Club Scraper – pipeline tests  ░░░
+#
+# Pipeline stages without a browser: a pool that hands out placeholder
+# drivers and a _fetch_page that returns the offline fixtures
+# (bench/fixtures/<type>/basic.html).
+
+from __future__ import annotations
+import contextlib, json
+from pathlib import Path
+
+import pytest
+
+import main_code, pipeline
+from main_code import QuestionType, ScrapeError
+from page_cache import PageCache
+from pipeline import Pipeline
+from sinks import ResultSink
+
+FIXTURES = Path(__file__).resolve().parent / "bench" / "fixtures"
+
+
+def _fixture(q: str):
+    return ((FIXTURES / q / "basic.html").read_text(encoding="utf-8"),
+            json.loads((FIXTURES / q / "basic.expected.json").read_text(encoding="utf-8")))
+
+
+class _Pool:
+    size, governor = 2, None
+
+    @contextlib.contextmanager
+    def checkout(self):
+        yield object()
+
+    def close(self):
+        pass
+
+
+class _Sink(ResultSink):
+    def __init__(self):
+        self.written, self.failed = {}, {}
+
+    def write(self, url, q_type, data):
+        self.written[url] = (q_type, data)
+
+    def fail(self, url, q_type, error):
+        self.failed[url] = (q_type, error)
+
+    def done(self, url):
+        return url in self.written
+
+
+class _Polish:
+    def __init__(self):
+        self.seen = []
+
+    def polish_many(self, items):
+        self.seen += [(d.get("answer"), q) for d, q in items]
+        return [dict(d, polished=True) for d, _ in items]
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """URLs _fetch_page was asked for; /<type>/… serves that fixture, /bad/… fails."""
+    calls = []
+
+    def fake_fetch(drv, url, q_type, dedup=None, snapshot=True):
+        calls.append(url)
+        kind = url.split("/")[3]
+        if kind == "bad":
+            raise ScrapeError("no post body")
+        return _fixture(kind)[0], None
+    monkeypatch.setattr(pipeline, "_fetch_page", fake_fetch)
+    return calls
+
+def _jobs(*kinds, typed=True):
+    return [(f"https://x/{k}/t-{i}.html", k if typed and k != "bad" else None)
+            for i, k in enumerate(kinds)]
+
+
+def test_snapshot_run(fetched):
+    sink = _Sink()
+    jobs = _jobs("cr", "ds", "ps", "bad")
+    out = dict(Pipeline(pool=_Pool(), sink=sink, retries=0).run(jobs))
+    assert set(out) == {u for u, _ in jobs}
+    for url, q in jobs[:3]:
+        assert out[url]["answer"] == _fixture(q)[1]["answer"]
+        assert sink.written[url][0] == q
+    assert isinstance(out[jobs[3][0]], ScrapeError)
+    assert set(sink.failed) == {jobs[3][0]}
+
+def test_detects_types(fetched):
+    sink, seen = _Sink(), []
+    jobs = _jobs("cr", "ds", typed=False)
+    out = dict(Pipeline(pool=_Pool(), sink=sink, retries=0,
+                        on_detect=lambda u, q, c: seen.append((u, q))).run(jobs))
+    assert sorted(seen) == [(jobs[0][0], QuestionType.CR), (jobs[1][0], QuestionType.DS)]
+    assert {u: q for u, (q, _) in sink.written.items()} == {jobs[0][0]: "cr", jobs[1][0]: "ds"}
+    assert out[jobs[0][0]]["answer"] == "D"
+
+
+# ─── cache ─────────────────────────────────────────────────────────
+def test_live_mode_with_cache_parses_from_html(fetched, tmp_path):
+    cache = PageCache(tmp_path / "cache")
+    pipe = Pipeline(pool=_Pool(), snapshot=False, cache=cache, retries=0)
+    assert pipe.parsers > 0                         # the cache needs the HTML, so parse it
+    (url, data), = pipe.run(_jobs("cr"))
+    assert data["answer"] == "D"
+    assert cache.get_html(url) == _fixture("cr")[0]
+    assert cache.get_result(url, main_code.PARSER_VERSION) == data
+
+def test_cache_hit_skips_fetch_and_polishes_with_stored_type(fetched, tmp_path, monkeypatch):
+    cache = PageCache(tmp_path / "cache")
+    jobs = _jobs("cr", "ds", typed=False)
+    list(Pipeline(pool=_Pool(), cache=cache, retries=0).run(jobs))
+    assert len(fetched) == 2
+    assert cache.q_type(jobs[0][0]) == "cr"
+
+    stage = _Polish()
+    monkeypatch.setattr(pipeline, "_polish_stage", lambda: stage)
+    sink = _Sink()
+    out = dict(Pipeline(pool=_Pool(), cache=cache, retries=0, polish=True,
+                        polish_linger=0.05, sink=sink).run(jobs))
+    assert len(fetched) == 2                        # served from the cache
+    assert all(d["polished"] for d in out.values())
+    assert sorted(stage.seen) == [("C", QuestionType.DS), ("D", QuestionType.CR)]
+    assert {q for q, _ in sink.written.values()} == {"cr", "ds"}
+
+
+# ─── shutdown ──────────────────────────────────────────────────────
+def test_early_close_stops_threads(fetched):
+    pipe = Pipeline(pool=_Pool(), retries=0, queue_size=1)
+    it = pipe.run(_jobs(*["cr"] * 20))
+    next(it)
+    it.close()
+    assert len(fetched) < 20
+    assert len(list(pipe.run(_jobs("ps")))) == 1    # usable again afterwards
@@ -0,0 +1,139 @@
+# ░░░  GMAT-Club Scraper – polish stage tests  ░░░
+#
+# PolishStage talks to a stub chat-completions route (conftest `serve`)
+# through the real openai client; `model.reply` decides what each request
+# gets back.
+
+from __future__ import annotations
+import json
+
+import pytest
+
+from polish import PolishStage, needs_polish, same_but_spacing
+
+
+def _fixed(items):
+    """Well-behaved model: collapse every blank run."""
+    def fix(d):
+        if isinstance(d, dict):
+            return {k: fix(v) for k, v in d.items()}
+        return " ".join(d.split()) if isinstance(d, str) else d
+    return {"items": [{"id": it["id"], "data": fix(it["data"])} for it in items]}
+
+
+class _Model:
+    """Route handler: records each request's items and answers with `reply`."""
+
+    def __init__(self):
+        self.requests, self.reply, self.base_url = [], _fixed, ""
+
+    def __call__(self, handler):
+        body = json.loads(handler.body)
+        items = json.loads(body["messages"][-1]["content"])["items"]
+        self.requests.append(items)
+        reply = self.reply(items)
+        if isinstance(reply, int):                    # an HTTP error status
+            return reply, "application/json", json.dumps({"error": {"message": "stub", "type": "stub"}})
+        content = reply if isinstance(reply, str) else json.dumps(reply)
+        return 200, "application/json", json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}]})
+
+
+@pytest.fixture
+def model(serve):
+    m = _Model()
+    m.base_url = serve({"/v1/chat/completions": m}).base + "/v1"
+    return m
+
+@pytest.fixture
+def stage(model, tmp_path):
+    def make(**kw):
+        kw.setdefault("rpm", 0)
+        kw.setdefault("max_retries", 0)
+        return PolishStage(base_url=model.base_url, cache_path=tmp_path / "polish.sqlite", **kw)
+    return make
+
+
+def _q(n: int):
+    return {"question": f"Question  {n} has  doubled blanks.", "options": {"A": f"one  {n}"}}, "cr"
+
+
+# ─── reply validation ──────────────────────────────────────────────
+def test_same_but_spacing():
+    assert same_but_spacing({"a": "x  y", "b": ["p q"]}, {"a": "x y", "b": ["pq"]})
+    assert not same_but_spacing({"a": "x y"}, {"a": "x z"})
+    assert not same_but_spacing({"a": "x"}, {"a": "x", "b": "y"})
+    assert not same_but_spacing(["a", "b"], ["a"])
+    assert not same_but_spacing({"a": "1"}, {"a": 1})
+
+def test_needs_polish():
+    assert needs_polish({"q": ["glued.Sentence here"]})
+    assert needs_polish("two  blanks")
+    assert not needs_polish({"q": "Fine as it is.", "n": 3})
+
+def test_reply_changing_text_is_rejected(model, stage):
+    model.reply = lambda items: {"items": [{"id": it["id"], "data": {**it["data"], "question": "other"}}
+                                           for it in items]}
+    ps = stage()
+    q = _q(1)
+    assert ps.polish_many([q]) == [q[0]]
+    assert ps.stats["rejected"] == 1 and ps.stats["polished"] == 0
+
+def test_missing_id_is_rejected(model, stage):
+    model.reply = lambda items: _fixed(items[1:])
+    ps = stage()
+    qs = [_q(1), _q(2)]
+    out = ps.polish_many(qs)
+    assert out[0] == qs[0][0]
+    assert out[1]["question"] == "Question 2 has doubled blanks."
+    assert ps.stats["rejected"] == 1 and ps.stats["polished"] == 1
+
+
+# ─── batching ──────────────────────────────────────────────────────
+def test_packs_within_token_budget(model, stage):
+    ps = stage(token_budget=10_000)
+    out = ps.polish_many([_q(n) for n in range(6)])
+    assert len(model.requests) == 1 and len(model.requests[0]) == 6
+    assert [o["options"]["A"] for o in out] == [f"one {n}" for n in range(6)]
+
+    model.requests.clear()
+    stage(token_budget=1, use_cache=False).polish_many([_q(n) for n in range(3)])
+    assert sorted(len(r) for r in model.requests) == [1, 1, 1]
+
+def test_skips_clean_and_cached(model, stage):
+    clean = ({"question": "Nothing to fix."}, "cr")
+    ps = stage()
+    ps.polish_many([clean, _q(1)])
+    assert len(model.requests) == 1 and len(model.requests[0]) == 1
+
+    ps = stage()                                      # same cache file
+    out = ps.polish_many([_q(1)])
+    assert len(model.requests) == 1
+    assert ps.stats["cached"] == 1 and out[0]["question"] == "Question 1 has doubled blanks."
+
+def test_type_is_sent(model, stage):
+    stage().polish_many([(_q(1)[0], "ds")])
+    assert model.requests[0][0]["type"] == "ds"
+
+def test_malformed_reply_splits_batch(model, stage):
+    def reply(items):
+        if any("7" in it["data"]["question"] for it in items):
+            return "not json"
+        return _fixed(items)
+    model.reply = reply
+    ps = stage(token_budget=10_000)
+    qs = [_q(n) for n in range(4)] + [_q(7)]
+    out = ps.polish_many(qs)
+    assert out[-1] == qs[-1][0]
+    assert [o["question"] for o in out[:4]] == [f"Question {n} has doubled blanks." for n in range(4)]
+    assert ps.stats["failed"] == 1 and ps.stats["polished"] == 4
+
+@pytest.mark.parametrize("status", [429, 500])
+def test_exhausted_retries_do_not_split(model, stage, status):
+    model.reply = lambda items: status
+    ps = stage(token_budget=10_000)
+    qs = [_q(n) for n in range(4)]
+    assert ps.polish_many(qs) == [q for q, _ in qs]
+    assert len(model.requests) == 1 and ps.stats["failed"] == 4
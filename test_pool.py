@@ -0,0 +1,95 @@
+# ░░░  GMAT-Club Scraper – driver pool / scrape_many tests  ░░░
+
+from __future__ import annotations
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+import main_code
+from main_code import DriverPool, QuestionType, ScrapeError, scrape_many
+
+
+@pytest.fixture
+def pool(drivers):
+    p = DriverPool(2, email="e", password="p")
+    yield p
+    p.close()
+
+
+def test_checkout_reuses_drivers(pool, drivers):
+    for _ in range(3):
+        with pool.checkout() as drv:
+            first = drv
+    assert len(drivers) == 1 and first is drivers[0]
+
+def test_grows_to_size_then_waits(pool, drivers):
+    with pool.checkout() as a, pool.checkout() as b:
+        assert a is not b
+        with pytest.raises(TimeoutError):
+            with pool.checkout(timeout=0.1):
+                pass
+    assert len(drivers) == 2
+
+def test_unhealthy_driver_is_replaced_on_checkout(pool, drivers):
+    with pool.checkout() as drv:
+        pass
+    drv.alive = False
+    with pool.checkout() as fresh:
+        assert fresh is not drv
+    assert drv.quitted and len(drivers) == 2
+
+def test_driver_that_broke_is_discarded(pool, drivers):
+    with pytest.raises(WebDriverException):
+        with pool.checkout() as drv:
+            raise WebDriverException("tab crashed")
+    assert drv.quitted
+    with pool.checkout() as fresh:
+        assert fresh is not drv
+
+def test_timeout_keeps_a_healthy_driver(pool, drivers):
+    with pytest.raises(TimeoutException):
+        with pool.checkout() as drv:
+            raise TimeoutException("slow page")
+    assert not drv.quitted
+    with pool.checkout() as again:
+        assert again is drv
+
+def test_close_quits_idle_drivers(drivers):
+    p = DriverPool(2, email="e", password="p")
+    with p.checkout(), p.checkout():
+        pass
+    p.close()
+    assert all(d.quitted for d in drivers)
+    with pytest.raises(RuntimeError):
+        with p.checkout():
+            pass
+
+
+# ─── scrape_many ───────────────────────────────────────────────────
+def test_scrape_many_survives_failures_and_broken_drivers(drivers, monkeypatch):
+    seen, lock = [], threading.Lock()
+
+    def fake_page(drv, url, q_type, polish, *a, **kw):
+        with lock:
+            seen.append((url, drv))
+        if url.endswith("crash") and sum(u == url for u, _ in seen) == 1:
+            drv.alive = False
+            raise WebDriverException("renderer crashed")
+        if url.endswith("bad"):
+            raise ScrapeError("no post body")
+        drv.get(url)
+        return {"url": url, "type": q_type.value}
+    monkeypatch.setattr(main_code, "_scrape_page", fake_page)
+
+    jobs = [(f"https://x/{i}", "cr") for i in range(6)] + [("https://x/crash", "ds"),
+                                                            ("https://x/bad", "ps")]
+    out = dict(scrape_many(jobs, email="e", password="p", workers=2, retries=1))
+    assert set(out) == {u for u, _ in jobs}
+    assert out["https://x/crash"] == {"url": "https://x/crash", "type": "ds"}
+    assert isinstance(out["https://x/bad"], ScrapeError)
+    assert out["https://x/3"]["type"] == QuestionType.CR.value
+    (_, broken), (_, retried) = [(u, d) for u, d in seen if u.endswith("crash")]
+    assert broken.quitted and retried is not broken
+    assert len(drivers) <= 3                       # at most one replacement
+    assert all(d.quitted for d in drivers)         # the batch closed its own pool
@@ -0,0 +1,141 @@
+# ░░░  GMAT-Club Scraper – session broker tests  ░░░
+#
+# SessionBroker with jars written straight into a temporary cookie dir and
+# a counting login function; probe() against conftest `serve`.
+
+from __future__ import annotations
+import pickle, threading, time
+
+import pytest
+
+import main_code
+from main_code import DriverPool
+from sessions import SessionBroker, SessionError, cookie_name
+
+DAY = 86400
+
+
+def _jar(acct, uid="42", expires_in=30 * DAY):
+    exp = time.time() + expires_in
+    acct.cookie_file.write_bytes(pickle.dumps([
+        {"name": "phpbb3_x_u", "value": uid, "expiry": exp},
+        {"name": "phpbb3_x_sid", "value": "s", "expiry": exp + DAY},
+        {"name": "other", "value": "1"}]))
+
+@pytest.fixture
+def logins():
+    """Accounts logged in so far; the login writes a fresh jar."""
+    done = []
+
+    def login(acct):
+        time.sleep(0.05)
+        if acct.email.startswith("bad"):
+            raise RuntimeError("wrong password")
+        _jar(acct)
+        done.append(acct.key)
+    login.done = done
+    return login
+
+@pytest.fixture
+def broker(tmp_path, logins):
+    b = SessionBroker([{"email": "a@x.com", "password": "p", "rpm": 600},
+                       {"email": "b@x.com", "password": "p", "rpm": 1200}],
+                      login=logins, cookie_dir=tmp_path, retry_failed_after=60)
+    yield b
+    b.close()
+
+
+def test_cookie_name():
+    assert cookie_name("emmarose0012@gmail.com") == "emmarose0012_gmail_com.pkl"
+
+def test_valid_reads_the_jar(broker):
+    a, _ = broker.accounts
+    assert not broker.valid(a)                               # no jar yet
+    _jar(a, uid="1")
+    assert not broker.valid(a)                               # guest
+    _jar(a, expires_in=-60)
+    assert not broker.valid(a)                               # expired
+    _jar(a)
+    assert broker.valid(a) and not broker.needs_refresh(a, time.time())
+    assert a.state == "ok"
+    _jar(a, expires_in=3600)                                 # inside refresh_before
+    assert broker.needs_refresh(a)
+
+
+# ─── login ─────────────────────────────────────────────────────────
+def test_refresh_is_single_flight(broker, logins):
+    a, _ = broker.accounts
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(broker.refresh(a)))
+               for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [True] * 6 and logins.done == [a.key]
+    assert broker.valid(a) and a.generation == 1
+
+def test_failed_account_is_skipped(tmp_path, logins):
+    b = SessionBroker([{"email": "bad@x.com", "password": "p"}], login=logins,
+                      cookie_dir=tmp_path, retry_failed_after=60)
+    acct, = b.accounts
+    assert b.refresh(acct) is False and acct.state == "failed"
+    assert not b.needs_refresh(acct)                         # no retry storm
+    with pytest.raises(SessionError):
+        b.assign()
+    acct.failed_at -= 120
+    assert b.assign() is acct
+
+
+# ─── assign / throttle ─────────────────────────────────────────────
+def test_assign_follows_rpm(broker):
+    a, b = broker.accounts
+    got = [broker.assign() for _ in range(6)]
+    assert got.count(b) == 4 and got.count(a) == 2
+    broker.release(b)
+    assert broker.assign() is b
+
+def test_rpm_zero_is_unlimited(tmp_path):
+    broker = SessionBroker([{"email": "a@x.com", "password": "p", "rpm": 0},
+                            {"email": "b@x.com", "password": "p", "rpm": 600}],
+                           cookie_dir=tmp_path)
+    a, _ = broker.accounts
+    assert [broker.assign() for _ in range(3)] == [a, a, a]
+    assert broker.throttle(a) == 0 and broker.throttle(a) == 0
+
+def test_throttle_paces_each_account(tmp_path):
+    broker = SessionBroker([{"email": "a@x.com", "password": "p", "rpm": 600}],
+                           cookie_dir=tmp_path)
+    acct, = broker.accounts
+    t0 = time.monotonic()
+    waits = [broker.throttle(acct) for _ in range(4)]
+    assert waits[0] == 0 and time.monotonic() - t0 >= 0.25
+
+
+# ─── probe ─────────────────────────────────────────────────────────
+def test_probe(serve, broker):
+    site = serve({"/ucp": (200, "text/html", "<a href='ucp.php?mode=logout'>Logout</a>"),
+                  "/login": (302, {"Location": "/ucp.php?mode=login"}, ""),
+                  "/guest": (200, "text/html", "<a href='ucp.php?mode=login'>Login</a>")})
+    a, _ = broker.accounts
+    _jar(a)
+    for path, want in (("/ucp", True), ("/login", False), ("/guest", False)):
+        broker.probe_url = site.base + path
+        assert broker.probe(a) is want
+    broker.probe_url = "http://127.0.0.1:9/ucp"
+    assert broker.probe(a) is None
+
+
+# ─── DriverPool wiring ─────────────────────────────────────────────
+def test_pool_spreads_browsers_over_accounts(broker, drivers, monkeypatch):
+    monkeypatch.setattr(main_code, "_login_as", lambda drv, br, acct: None)
+    a, b = broker.accounts
+    pool = DriverPool(3, broker=broker)
+    held = [pool.checkout() for _ in range(3)]
+    for cm in held:
+        cm.__enter__()
+    assert (a.bound, b.bound) == (1, 2)
+    for cm in held:
+        cm.__exit__(None, None, None)
+    pool.close()
+    assert (a.bound, b.bound) == (0, 0)
@@ -0,0 +1,93 @@
+# ░░░  GMAT-Club Scraper – result sink tests  ░░░
+#
+# Both sinks on temporary files: write / fail / done, resuming after a
+# reopen, and scrape_to() against a stubbed scrape_many().
+
+from __future__ import annotations
+import json
+
+import pytest
+
+import sinks
+from main_code import QuestionType
+from sinks import JsonlSink, ResultSink, SqliteSink, open_sink, read_results, scrape_to
+
+
+@pytest.fixture(params=["results.jsonl", "results.sqlite"])
+def path(request, tmp_path):
+    return tmp_path / request.param
+
+
+def test_resume_after_reopen(path):
+    with open_sink(path) as sink:
+        sink.write("https://x/1", QuestionType.CR, {"answer": "B"})
+        sink.fail("https://x/2", "ds", ValueError("no post"))
+        assert sink.done("https://x/1") and not sink.done("https://x/2")
+    with open_sink(path) as sink:
+        assert sink.done("https://x/1") and not sink.done("https://x/2")
+    assert list(read_results(path)) == [("https://x/1", "cr", {"answer": "B"})]
+
+def test_open_sink_by_suffix(tmp_path):
+    assert isinstance(open_sink(tmp_path / "a.ndjson"), JsonlSink)
+    assert isinstance(open_sink(tmp_path / "a.db"), SqliteSink)
+    with pytest.raises(ValueError):
+        open_sink(tmp_path / "a.csv")
+
+def test_incomplete_sink_fails_on_creation():
+    class NoDone(ResultSink):
+        def write(self, url, q_type, data): pass
+        def fail(self, url, q_type, error): pass
+    with pytest.raises(TypeError):
+        NoDone()
+
+
+def test_jsonl_records_and_errors(tmp_path):
+    with JsonlSink(tmp_path / "r.jsonl", sync_every=1) as sink:
+        sink.write("https://x/1", QuestionType.CR, {"answer": "B"})
+        sink.fail("https://x/2", QuestionType.DS, ValueError("no post"))
+    rec, = map(json.loads, (tmp_path / "r.jsonl").read_text().splitlines())
+    assert (rec["url"], rec["q_type"], rec["data"]) == ("https://x/1", "cr", {"answer": "B"})
+    err, = map(json.loads, (tmp_path / "r.errors.jsonl").read_text().splitlines())
+    assert err["error"] == "ValueError: no post"
+
+def test_jsonl_drops_half_written_line(tmp_path):
+    p = tmp_path / "r.jsonl"
+    with JsonlSink(p) as sink:
+        sink.write("https://x/1", "cr", {"answer": "B"})
+    with open(p, "a") as f:
+        f.write('{"url": "https://x/2", "da')               # crash mid-write
+    with JsonlSink(p) as sink:
+        assert sink.done("https://x/1") and not sink.done("https://x/2")
+        sink.write("https://x/3", "cr", {})
+    assert [json.loads(ln)["url"] for ln in p.read_text().splitlines()] == ["https://x/1", "https://x/3"]
+
+def test_jsonl_remembers_digests_not_urls(tmp_path):
+    p = tmp_path / "r.jsonl"
+    with JsonlSink(p) as sink:
+        sink.write("https://x/" + "long-topic-slug-" * 8 + "1.html", "cr", {})
+    with JsonlSink(p) as sink:
+        assert sink.done("https://x/" + "long-topic-slug-" * 8 + "1.html")
+        assert not sink.done("https://x/2")
+        assert {len(d) for d in sink._done} == {8}
+
+def test_sqlite_rows(tmp_path):
+    with SqliteSink(tmp_path / "r.sqlite") as sink:
+        sink.write("https://x/1", QuestionType.PS, {"answer": "A"})
+        sink.write("https://x/1", QuestionType.PS, {"answer": "C"})     # replaced
+        assert list(sink.rows()) == [("https://x/1", "ps", {"answer": "C"})]
+
+
+def test_scrape_to_skips_stored_urls(path, monkeypatch):
+    asked = []
+
+    def fake_scrape_many(jobs, **kw):
+        for url, q in jobs:
+            asked.append(url)
+            yield url, ValueError("boom") if url.endswith("/bad") else {"url": url}
+    monkeypatch.setattr(sinks, "scrape_many", fake_scrape_many)
+    jobs = [("https://x/1", "cr"), ("https://x/2", "ds"), ("https://x/bad", "ps")]
+    with open_sink(path) as sink:
+        sink.write("https://x/1", "cr", {})
+        assert scrape_to(sink, iter(jobs)) == {"skipped": 1, "written": 1, "failed": 1, "duplicates": 0}
+        assert sink.done("https://x/2") and not sink.done("https://x/bad")
+    assert asked == ["https://x/2", "https://x/bad"]
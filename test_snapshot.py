@@ -0,0 +1,47 @@
+# ░░░  GMAT-Club Scraper – snapshot parser tests  ░░░
+
+from __future__ import annotations
+
+import pytest
+
+import main_code
+from main_code import DriverPool, QuestionType, ScrapeError, parse_html, scrape
+
+
+def test_cr(pages):
+    data = parse_html(pages["cr"], QuestionType.CR)
+    assert data["prompt"] == ("The council argues that the new bridge will cut traffic.\n"
+                              "Which of the following most weakens the argument?")
+    assert data["options"]["B"] == "The bridge is narrow."
+    assert list(data["options"]) == list("ABCDE")
+    assert (data["answer"], data["difficulty"], data["explanation"]) == \
+        ("B", "Sub 505 Level", "")
+
+@pytest.mark.parametrize("q", ["ds", "ps"])
+def test_ds_and_ps_share_a_layout(pages, q):
+    data = parse_html(pages["ds"], q)
+    assert data["question"] == "Is x > 0?\n(1) x^2 = 4\n(2) x^3 = 8"
+    assert data["options"]["D"] == "EACH statement ALONE is sufficient"
+    assert data["answer"] == "B"
+
+def test_tables(pages):
+    data = parse_html(pages["tables"], "tables")
+    assert data["headers"] == ["Region", "Sales"]
+    assert data["rows"][1] == {"cells": {"Region": "South", "Sales": "7"}}
+    assert data["statements"] == [{"prompt": "North sold more than South.", "answer": "Yes"},
+                                  {"prompt": "South sold more than 10.", "answer": "No"}]
+
+def test_wrong_shape_raises(pages):
+    with pytest.raises(ScrapeError):
+        parse_html("<html><body>Login to view</body></html>", QuestionType.DS)
+    with pytest.raises(ScrapeError):
+        parse_html(pages["cr"], QuestionType.RC)
+
+def test_scrape_parses_one_snapshot(drivers, pages, monkeypatch):
+    monkeypatch.setattr(main_code.time, "sleep", lambda s: None)
+    monkeypatch.setattr(main_code, "take_snapshot", lambda drv, *a, **kw: pages["cr"])
+    with DriverPool(1, email="e", password="p") as pool:
+        data = scrape(url="https://x/t-1.html", q_type=QuestionType.CR, email="e",
+                      password="p", pool=pool, snapshot=True)
+    assert data == parse_html(pages["cr"], "cr")
+    assert drivers[0].visited == ["https://x/t-1.html"]
@@ -0,0 +1,50 @@
+# ░░░  GMAT-Club Scraper – text normalisation tests  ░░░
+#
+# textproc helpers on hand-written post bodies, plus the bench's parity
+# check on a small synthetic corpus.
+
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+import textproc as tp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "bench"))
+import bench_textproc                                   # noqa: E402
+
+DS = "Is  x > 0?\t\n (1)\xa0x^2 = 4 \n(2) x^3 = 8\n(A) one\n(B) two\n______\nfooter"
+CR = "Which  weakens it?\nA- Tolls.\nb-  Narrow.\nShow Spoiler\nOA: B"
+
+
+def test_clean_collapses_blanks_but_keeps_lines():
+    assert tp.clean(" a \t b\xa0\xa0c \r\n\nd  ") == "a b c\n\nd"
+
+def test_split_opts_and_cut_boilerplate():
+    stem, opts = tp.extract(DS)
+    assert stem == "Is x > 0?\n(1) x^2 = 4\n(2) x^3 = 8"
+    assert opts == {"A": "one", "B": "two"}
+
+def test_cr_mode_cuts_spoiler_and_uses_dash_splitter():
+    assert tp.extract(CR, cr=True) == ("Which weakens it?", {"A": "Tolls.", "B": "Narrow."})
+
+def test_clean_opt_cuts_at_earliest_marker():
+    assert tp.clean_opt("text\n______\nNew to the GMAT Club?\nShow Answer") == "text"
+    assert tp.clean_opt("text\nShow Answer\n______") == "text"
+
+def test_answers():
+    assert tp.first_choice("Show Spoiler\nOA: d because") == "D"
+    assert tp.first_choice("it is C for sure") == "C"
+    assert tp.explode_answer_blob("1. A  2.C 3- e", 3) == ["A", "C", "E"]
+    assert tp.explode_answer_blob("OA: B", 3) == ["B"]
+
+def test_strip_rc_noise():
+    assert tp.strip_rc_noise("Passage.\n00:00\nShow Answer\nQuestion Stats:\nMore.") == "Passage.\nMore."
+
+
+def test_batch_helpers_match_single_calls():
+    blobs = [DS, CR, "no options here"]
+    assert list(tp.extract_many(blobs)) == [tp.extract(b) for b in blobs]
+    assert list(tp.clean_many(blobs)) == [tp.clean(b) for b in blobs]
+
+def test_bench_parity(capsys):
+    assert bench_textproc.main(["--n", "60"]) == 0
@@ -0,0 +1,78 @@
+# ░░░  GMAT-Club Scraper – rate limiter tests  ░░░
+#
+# RateLimiter's AIMD feedback on its own, HttpFetcher reporting a 429 from
+# a stub server, and the narrow in-browser retries sharing one budget.
+
+from __future__ import annotations
+import time
+
+import pytest
+
+import main_code
+from main_code import HttpFetcher, ScrapeError, _narrow_retries
+from throttle import BLOCKED, OK, SLOW, RateLimiter, retry_after
+
+URL = "https://gmatclub.com/forum/t-1.html"
+
+
+def test_feedback_adjusts_rate():
+    lim = RateLimiter(rate=1, step=0.5, grow_every=2, jitter=0)
+    for _ in range(4):
+        lim.report(URL, OK)
+    assert lim.stats()["gmatclub.com"]["rate"] == 2
+    lim.report(URL, SLOW)
+    assert lim.stats()["gmatclub.com"]["rate"] == 1.6
+    lim.report(URL, BLOCKED, retry_after=30)
+    host = lim.stats()["gmatclub.com"]
+    assert host["rate"] == 0.8 and 29 <= host["paused_s"] <= 30
+
+def test_backoff_doubles_and_resets():
+    lim = RateLimiter(rate=1, base_backoff=10, jitter=0)
+    lim.report(URL, BLOCKED)
+    first = lim.stats()["gmatclub.com"]["paused_s"]
+    lim.report(URL, BLOCKED)
+    assert lim.stats()["gmatclub.com"]["paused_s"] > first + 10
+    lim.report(URL, OK)
+    assert lim._hosts["gmatclub.com"].strikes == 0
+
+def test_hosts_are_paced_separately():
+    lim = RateLimiter(rate=10, burst=1, jitter=0)
+    assert lim.wait(URL) == 0
+    assert lim.wait("https://other.example/") == 0
+    t0 = time.monotonic()
+    lim.wait(URL)
+    assert 0.05 < time.monotonic() - t0 < 0.5
+
+def test_retry_after_header():
+    assert retry_after("12") == 12 and retry_after("-3") == 0
+    assert retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None and retry_after(None) is None
+
+
+def test_http_429_slows_the_host(serve):
+    site = serve({"/forum/t-1.html": (429, {"Retry-After": "20"}, "slow down")})
+    lim = RateLimiter(rate=4, jitter=0)
+    http = HttpFetcher(pool_size=1, limiter=lim)
+    assert http.fetch(site.base + "/forum/t-1.html") is None
+    http.close()
+    host = lim.stats()["127.0.0.1"]
+    assert host["rate"] == 2 and host["paused_s"] >= 19
+
+
+def test_narrow_retries_reparse_then_navigate():
+    calls = []
+
+    def attempt(navigate):
+        calls.append(navigate)
+        if len(calls) < 3:
+            raise ScrapeError("no options yet")
+        return "ok"
+    budget = [2]
+    assert _narrow_retries(URL, budget, attempt) == "ok"
+    assert calls == [True, False, True] and budget == [0]
+
+def test_narrow_retries_leave_dead_browsers_to_the_caller():
+    def attempt(navigate):
+        raise main_code.WebDriverException("session deleted")
+    main_code._load_driver_stack()
+    with pytest.raises(main_code.WebDriverException):
+        _narrow_retries(URL, [3], attempt)
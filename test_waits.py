@@ -0,0 +1,84 @@
+# ░░░  GMAT-Club Scraper – event-driven wait tests  ░░░
+#
+# The spoiler / answer helpers against a scripted driver: `answers` is what
+# the one-shot DOM read returns, `ready` whether a MutationObserver wait
+# would see content, and `clicks` records every spoiler button pressed.
+
+from __future__ import annotations
+
+import pytest
+
+import main_code
+
+
+class _El:
+    def __init__(self, drv, name):
+        self.drv, self.name = drv, name
+
+    def click(self):
+        self.drv.clicks.append(self.name)
+
+    def find_element(self, by, sel):
+        return _El(self.drv, f"{self.name}/{sel}")
+
+
+class _Driver:
+    def __init__(self, answers, ready=True, opened=""):
+        self.answers, self.ready, self.opened = answers, ready, opened
+        self.clicks, self.scripts = [], 0
+
+    def execute_script(self, js, *args):
+        self.scripts += 1
+        return list(self.answers) if not args else self.opened
+
+    def execute_async_script(self, js, target, ms):
+        return self.ready
+
+    def find_element(self, by, sel):
+        return _El(self, sel)
+
+    def find_elements(self, by, sel):
+        return [_El(self, f"{sel}[{i}]") for i in range(len(self.answers))]
+
+
+@pytest.fixture(autouse=True)
+def report():
+    main_code._load_driver_stack()
+    main_code.reset_wait_report()
+    yield
+    main_code.reset_wait_report()
+    vars(main_code._ctx).pop("q_type", None)
+
+
+def test_hidden_answers_are_read_without_clicking():
+    drv = _Driver(["OA: B", "OA: D"])
+    assert main_code._get_answer_texts(drv) == ["OA: B", "OA: D"]
+    assert drv.clicks == [] and drv.scripts == 1
+
+def test_only_empty_blocks_are_opened():
+    drv = _Driver(["OA: B", ""], opened="OA: C")
+    assert main_code._get_answer_texts(drv) == ["OA: B", "OA: C"]
+    assert drv.clicks == ["answer-block[1]/btn-show-answer"]
+
+def test_open_spoiler_skips_click_when_body_is_present():
+    drv = _Driver([], ready=True)
+    main_code._open_spoiler(drv)
+    assert drv.clicks == []
+    drv.ready = False
+    main_code._open_spoiler(drv)
+    assert drv.clicks == [".upRow a"]
+
+
+def test_wait_report_books_saved_time_per_type():
+    main_code._ctx.q_type = "cr"
+    main_code._get_answer_texts(_Driver(["OA: B"]))
+    main_code._get_answer_texts(_Driver(["OA: A"]), step="tpa")
+    main_code._ctx.q_type = "ds"
+    main_code._open_spoiler(_Driver([]))
+    rep = main_code.wait_report()
+    assert set(rep) == {"cr", "ds"} and set(rep["cr"]) == {"answer", "tpa"}
+    assert rep["cr"]["answer"]["n"] == 1
+    assert 0 < rep["cr"]["answer"]["saved_s"] <= main_code._OLD_SLEEPS["answer"]
+    assert rep["ds"]["spoiler"]["waited_s"] < main_code._OLD_SLEEPS["spoiler"]
+    main_code.reset_wait_report()
+    assert main_code.wait_report() == {}
@@ -0,0 +1,152 @@
+# ░░░  GMAT-Club Scraper – text normalisation  ░░░
+#
+# Every pattern is compiled once at import.  extract() bundles clean → split
+# → scrub into one call per post body – three passes over the text, not one;
+# extract_many() / clean_many() run the same thing over a stored corpus,
+# optionally across processes.
+#
+# Pure stdlib on purpose: parse-only workers import this without selenium.
+
+from __future__ import annotations
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+Options = Dict[str, str]
+
+# ─── patterns ───────────────────────────────────────────────────────
+_OPT_RE = re.compile(
+    r"""
+    (?:^|\n|\r)            # start of line
+    [\s\(\[]*              # optional whitespace / opening bracket
+    (?P<lbl>[A-E])         # capture A-E
+    [\)\].\-–:]?           # closing ) ] . : - –
+    \s+                    # at least one space before the real text
+    """,
+    re.I | re.VERBOSE,
+)
+_OPT_CR_RE  = re.compile(r"(?m)^[A-Ea-e]-\s*")
+_SPOILER_RE = re.compile(r"Show\s+Spoiler")
+_CUT_RE     = re.compile(r"\nShow\s*Answer|\n_{5,}|\nNew to the GMAT Club\?", re.I)
+
+_OA_RE = re.compile(
+    r"""\b          # word-boundary
+        (?:OA|Answer|Correct)   # usual keywords
+        [\s\:\-\–]*             # :, -, – or just spaces
+        ([A-E])                 # capture A … E
+        \b""",
+    re.I | re.X,
+)
+_LETTER_RE  = re.compile(r"\b([A-E])\b")
+_QA_LINE_RE = re.compile(r"\b(\d+)\s*[\.\:\-]?\s*([A-E])\b", re.I)
+
+_RC_NOISE_RE = re.compile(
+    r"""
+    ^\s*(?:                       # entire line contains ONLY …
+        \d{2}:\d{2} |                #   00:00 timers
+        Show\s+Answer | Hide | Show\s+Spoiler |
+        History | Add\s+Mistake |
+        Difficulty: | Question\s+Stats: |
+        Date | Time | Result | not\s+attempted\s+yet
+    )\s*$""",
+    re.I | re.X
+)
+
+# ─── single-string helpers ──────────────────────────────────────────
+def clean(t: str) -> str:
+    """Collapse runs of blanks to one space and normalise line breaks.
+    Line breaks themselves are kept – the option splitters need them.
+    (str.split/join beats a per-line re.sub here, ~4x.)"""
+    return "\n".join(" ".join(ln.split()) for ln in t.splitlines()).strip()
+
+def split_opts(raw: str) -> Tuple[str, Options]:
+    """
+    Works for
+        (A) text   •  A- text   •  A) text   •  (A). text
+    Returns (stem, {"A": ..., "B": ...})
+    """
+    matches = list(_OPT_RE.finditer(raw))
+    if not matches:
+        return raw.strip(), {}
+    opts = {}
+    for m, nxt in zip(matches, matches[1:] + [None]):
+        opts[m.group("lbl").upper()] = raw[m.end(): nxt.start() if nxt else len(raw)].strip()
+    return raw[: matches[0].start()].strip(), opts
+
+def split_opts_cr(raw: str) -> Tuple[str, Options]:
+    """`A- text` / `b- text` lines → (stem, {"A": …}); letters by position."""
+    parts = _OPT_CR_RE.split(raw.strip())
+    if len(parts) == 1:                      # no choices found
+        return raw.strip(), {}
+    return parts[0].strip(), {ltr: txt.strip() for ltr, txt in zip("ABCDE", parts[1:])}
+
+def clean_opt(txt: str) -> str:
+    """Cut GMAT-Club boiler-plate (spoiler button, ____ rule, footer)."""
+    m = _CUT_RE.search(txt)
+    return (txt[: m.start()] if m else txt).strip()
+
+def strip_rc_noise(block: str) -> str:
+    """Remove GC timer / statistics lines from a question-stem block."""
+    return "\n".join(
+        ln for ln in block.splitlines() if not _RC_NOISE_RE.match(ln)
+    ).strip()
+
+def first_choice(txt: str) -> str:
+    """
+    Extract the FIRST A-E choice from a spoiler block.
+    Falls back to the first stand-alone capital A-E if no keyword present.
+    """
+    m = _OA_RE.search(txt) or _LETTER_RE.search(txt)
+    return m.group(1).upper() if m else ""
+
+def explode_answer_blob(blob: str, n_q: int) -> List[str]:
+    """
+    If `blob` contains several '1. A  2.B' style answers, return them as
+    a list of length `n_q`.  Otherwise return [first_choice(blob)].
+    """
+    found = _QA_LINE_RE.findall(blob)
+    if len(found) < n_q:
+        return [first_choice(blob)]
+    out = [""] * n_q
+    for num, letter in found:
+        idx = int(num) - 1
+        if 0 <= idx < n_q:
+            out[idx] = letter.upper()
+    return out
+
+def extract(raw: str, *, cr: bool = False) -> Tuple[str, Options]:
+    """
+    Post body → (stem, options): clean, split, scrub – one call, three passes.
+    `cr=True` cuts at the first "Show Spoiler" and tries the `A-` splitter
+    first, exactly like the CR parser.
+    """
+    if cr:
+        raw = _SPOILER_RE.split(raw, 1)[0]
+    raw = clean(raw)
+    if cr:
+        stem, opts = split_opts_cr(raw)
+        if opts:
+            return stem, opts
+    stem, opts = split_opts(raw)
+    return stem, {k: clean_opt(v) for k, v in opts.items()}
+
+# ─── batch API (corpus re-processing) ───────────────────────────────
+def _run(fn, blobs: Iterable[str], processes: int, chunksize: int) -> Iterator:
+    if processes <= 1:
+        return map(fn, blobs)
+    ex = ProcessPoolExecutor(processes)
+    def gen():
+        with ex:
+            yield from ex.map(fn, blobs, chunksize=chunksize)
+    return gen()
+
+def clean_many(blobs: Iterable[str], *, processes: int = 1,
+               chunksize: int = 512) -> Iterator[str]:
+    """clean() over many blobs, lazily; `processes > 1` fans out."""
+    return _run(clean, blobs, processes, chunksize)
+
+def extract_many(blobs: Iterable[str], *, cr: bool = False, processes: int = 1,
+                 chunksize: int = 512) -> Iterator[Tuple[str, Options]]:
+    """extract() over many stored post bodies, in input order."""
+    return _run(partial(extract, cr=cr), blobs, processes, chunksize)
@@ -0,0 +1,140 @@
+# ░░░  GMAT-Club Scraper – adaptive per-host rate limiter  ░░░
+#
+# Replaces the fixed 1.5–3 s sleep before every page.  One token bucket per
+# host, shared by every browser and HttpFetcher of the process:
+#
+#   healthy answer        every `grow_every` in a row add `step` req/s (up to max_rate)
+#   5xx / timeout         rate × 0.8
+#   Cloudflare / 429      rate × 0.5 and the host is paused: Retry-After if
+#                         the server sent one, else base_backoff · 2^(strikes-1)
+#                         (capped, ±25 % jitter); strikes reset on success
+#
+# wait() reserves the next slot under the lock and sleeps outside it, so
+# concurrent callers queue up fairly instead of all waking at once.  A
+# small random extra (`jitter` of one interval) keeps requests from
+# looking machine-timed.  Seconds spent waiting and seconds spent in
+# slot() go to scheduler_seconds_total{state="throttled"|"working"}.
+
+from __future__ import annotations
+import logging, random, threading, time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import metrics
+
+LOG = logging.getLogger("gmat.scraper.throttle")
+
+OK, SLOW, BLOCKED = "ok", "slow", "blocked"
+
+
+class _Host:
+    __slots__ = ("rate", "tokens", "stamp", "paused_until", "strikes", "streak",
+                 "throttled", "working")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate, self.tokens, self.stamp = rate, burst, time.monotonic()
+        self.paused_until, self.strikes, self.streak = 0.0, 0, 0
+        self.throttled = self.working = 0.0
+
+
+class RateLimiter:
+    """Thread-safe AIMD token bucket per host; see module header."""
+
+    def __init__(self, rate: float = 0.5, *, burst: float = 2, min_rate: float = 0.05,
+                 max_rate: float = 4.0, step: float = 0.05, grow_every: int = 5,
+                 base_backoff: float = 5.0, max_backoff: float = 300.0, jitter: float = 0.3):
+        self.rate, self.burst, self.min_rate, self.max_rate = rate, burst, min_rate, max_rate
+        self.step, self.grow_every, self.jitter = step, grow_every, jitter
+        self.base_backoff, self.max_backoff = base_backoff, max_backoff
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, key: str) -> _Host:
+        h = self._hosts.get(key)
+        if h is None:
+            h = self._hosts[key] = _Host(self.rate, self.burst)
+        return h
+
+    def _refill(self, h: _Host, now: float):
+        h.tokens = min(self.burst, h.tokens + (now - h.stamp) * h.rate)
+        h.stamp = now
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).hostname or url
+
+    # ─── pacing ─────────────────────────────────────────────────────
+    def wait(self, url: str) -> float:
+        """Block until the host of `url` may take another request; returns the seconds waited."""
+        key = self.host_of(url)
+        with self._lock:
+            h, now = self._host(key), time.monotonic()
+            self._refill(h, now)
+            h.tokens -= 1                       # negative: a reservation in the future
+            delay = max(-h.tokens / h.rate, 0.0) + random.uniform(0, self.jitter / h.rate)
+            h.throttled += delay
+        if delay > 0:
+            metrics.inc("scheduler_seconds_total", delay, state="throttled", host=key)
+            time.sleep(delay)
+        return delay
+
+    @contextmanager
+    def slot(self, url: str):
+        """wait(), then count the time spent in the block as working time."""
+        self.wait(url)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            key = self.host_of(url)
+            with self._lock:
+                self._host(key).working += dt
+            metrics.inc("scheduler_seconds_total", dt, state="working", host=key)
+
+    # ─── feedback ───────────────────────────────────────────────────
+    def report(self, url: str, outcome: str, retry_after: Optional[float] = None):
+        """Tell the limiter how a request to `url` went: OK, SLOW or BLOCKED."""
+        key = self.host_of(url)
+        with self._lock:
+            h, now = self._host(key), time.monotonic()
+            self._refill(h, now)
+            if outcome == OK:
+                h.strikes, h.streak = 0, h.streak + 1
+                if h.streak >= self.grow_every:
+                    h.rate, h.streak = min(self.max_rate, h.rate + self.step), 0
+            elif outcome == SLOW:
+                h.rate, h.streak = max(self.min_rate, h.rate * 0.8), 0
+            else:
+                h.rate, h.streak = max(self.min_rate, h.rate * 0.5), 0
+                h.strikes += 1
+                pause = retry_after if retry_after is not None else min(
+                    self.max_backoff, self.base_backoff * 2 ** (h.strikes - 1)
+                ) * random.uniform(0.75, 1.25)
+                # the pause is a debt of tokens: no burst once it is over
+                h.tokens = min(h.tokens, 0.0) - pause * h.rate
+                h.paused_until = now - h.tokens / h.rate
+            rate = h.rate
+        metrics.inc("scheduler_feedback_total", outcome=outcome, host=key)
+        if outcome == BLOCKED:
+            LOG.warning("throttle: %s blocked us – %.2f req/s, paused %.0fs",
+                        key, rate, pause)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """{host: {"rate", "paused_s", "throttled_s", "working_s"}}."""
+        now = time.monotonic()
+        with self._lock:
+            return {k: {"rate": round(h.rate, 3),
+                        "paused_s": round(max(0.0, h.paused_until - now), 1),
+                        "throttled_s": round(h.throttled, 1),
+                        "working_s": round(h.working, 1)}
+                    for k, h in self._hosts.items()}
+
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds of a Retry-After header (delta-seconds form; HTTP dates → None)."""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None